@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import json
 from dataclasses import dataclass
 from datetime import datetime
@@ -8,6 +7,18 @@ from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, unquote, urlparse
 
 import aiohttp
+
+from aqb_orchestrator_client import (
+    BACKEND_QUERY_SSE,
+    BACKEND_SYNC,
+    AgentTurn,
+    OrchestratorClient,
+    RetryBudget,
+    RetryPolicy,
+)
+from aqb_sse_manager import SseSubscriptionManager
+
+
 @dataclass
 class AgentResponse:
     conversation_id: str
@@ -39,64 +50,26 @@ class AgentResponse:
             "guideList": self.guide_list,
         }
 
+    @classmethod
+    def from_turn(cls, turn: AgentTurn) -> "AgentResponse":
+        return cls(
+            conversation_id=turn.conversation_id,
+            connect_time=turn.connect_time,
+            chat_time=turn.chat_time,
+            response_time_sec=turn.response_time_sec,
+            assistant_message=turn.assistant_message,
+            data_ui_list=turn.data_ui_list,
+            guide_list=turn.guide_list,
+            raw_event=turn.raw_event,
+            error=turn.error,
+        )
 
-class ApplicantAgentClient:
-    def __init__(
-        self,
-        base_url: str,
-        bearer_token: str,
-        cms_token: str,
-        mrs_session: str,
-        origin: str,
-        referer: str,
-        max_parallel: int = 3,
-    ):
-        self.base_url = base_url.rstrip("/")
-        self.bearer_token = bearer_token.strip()
-        self.cms_token = cms_token.strip()
-        self.mrs_session = mrs_session.strip()
-        self.origin = origin.strip()
-        self.referer = referer.strip()
-        self.semaphore = asyncio.Semaphore(max_parallel)
-
-    def headers(self, for_sse: bool = False) -> Dict[str, str]:
-        h = {
-            "authorization": f"Bearer {self.bearer_token}",
-            "cms-access-token": self.cms_token,
-            "mrs-session": self.mrs_session,
-            "origin": self.origin,
-            "referer": self.referer,
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        }
-        if for_sse:
-            h["accept"] = "text/event-stream"
-        else:
-            h["accept"] = "application/json, text/plain, */*"
-            h["content-type"] = "application/json"
-        return h
-
-    async def send_query(
-        self, session: aiohttp.ClientSession, message: str, conversation_id: Optional[str],
-        context: Optional[Dict[str, Any]] = None,
-        target_assistant: Optional[str] = None
-    ) -> Tuple[Optional[str], str]:
-        url = f"{self.base_url}/api/v2/ai/orchestrator/query"
-        payload = {"conversationId": conversation_id, "userMessage": message}
-        if context:
-            payload["context"] = context
-        if target_assistant:
-            payload["targetAssistant"] = target_assistant
 
-        try:
-            async with session.post(url, headers=self.headers(), json=payload, timeout=30) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("conversationId"), ""
-                return None, f"HTTP {resp.status}: {(await resp.text())[:200]}"
-        except asyncio.TimeoutError:
-            return None, "timeout(30s)"
-        except Exception as e:
-            return None, f"{type(e).__name__}: {str(e)[:120]}"
+class ApplicantAgentClient(OrchestratorClient):
+    """
+    지원자 관리 에이전트 클라이언트. 호출/파싱은 aqb_orchestrator_client.OrchestratorClient 공용 구현을 쓰고,
+    여기서는 Streamlit 화면들이 쓰는 기존 반환 형식(AgentResponse/dict)만 맞춘다.
+    """
 
     async def test_orchestrator_sync(
         self,
@@ -123,219 +96,18 @@ class ApplicantAgentClient:
           "error": str
         }
         """
-        url = f"{self.base_url}/api/v1/ai/prompt/orchestrator/test"
-        payload: Dict[str, Any] = {
-            "conversationId": conversation_id or "",
-            "userMessage": message,
-            "context": context or {},
-        }
-        if target_assistant:
-            payload["targetAssistant"] = target_assistant
-
-        try:
-            timeout = aiohttp.ClientTimeout(total=120)
-            async with session.post(url, headers=self.headers(), json=payload, timeout=timeout) as resp:
-                if resp.status != 200:
-                    return {
-                        "conversation_id": "",
-                        "assistant_message": "",
-                        "data_ui_list": [],
-                        "guide_list": [],
-                        "execution_processes": [],
-                        "workers": [],
-                        "worker_ms_map": {},
-                        "response_time_sec": None,
-                        "error": f"HTTP {resp.status}: {(await resp.text())[:200]}",
-                    }
-
-                data = await resp.json()
-                workers = data.get("worker", []) or []
-                conversation_id_out = str(data.get("conversationId", "") or "")
-
-                # 체인 마지막에서 assistantMessage/dataUIList/guideList를 우선 탐색
-                assistant_message = ""
-                data_ui_list: List[Dict[str, Any]] = []
-                guide_list: List[Dict[str, Any]] = []
-
-                execution_processes: List[Dict[str, Any]] = []
-                worker_ms_map: Dict[str, float] = {}
-                total_ms = 0.0
-                worker_type_count: Dict[str, int] = {}
-
-                for w in workers:
-                    worker_type = str((w or {}).get("type", "") or "")
-                    output = (w or {}).get("output", {}) or {}
-                    ms_val = (w or {}).get("ms", 0)
-                    try:
-                        ms_float = float(ms_val)
-                    except Exception:
-                        ms_float = 0.0
-
-                    total_ms += ms_float
-
-                    seq = worker_type_count.get(worker_type, 0)
-                    worker_type_count[worker_type] = seq + 1
-                    worker_key = f"{worker_type}#{seq}"
-                    worker_ms_map[worker_key] = ms_float
-
-                    summary = worker_type
-                    sub_worker = output.get("subWorker") if isinstance(output, dict) else None
-                    if sub_worker:
-                        summary = f"{worker_type} -> {sub_worker}"
-
-                    execution_processes.append(
-                        {
-                            "messageSummary": summary,
-                            "workerType": worker_type,
-                            "ms": ms_float,
-                            "index": len(execution_processes),
-                        }
-                    )
-
-                for w in reversed(workers):
-                    output = (w or {}).get("output", {}) or {}
-                    if not isinstance(output, dict):
-                        continue
-                    msg = output.get("assistantMessage")
-                    if msg:
-                        assistant_message = str(msg)
-                        data_ui_list = output.get("dataUIList", []) or []
-                        guide_list = output.get("guideList", []) or []
-                        break
-
-                return {
-                    "conversation_id": conversation_id_out,
-                    "assistant_message": assistant_message,
-                    "data_ui_list": data_ui_list,
-                    "guide_list": guide_list,
-                    "execution_processes": execution_processes,
-                    "workers": workers,
-                    "worker_ms_map": worker_ms_map,
-                    "response_time_sec": round(total_ms / 1000.0, 4),
-                    "error": "",
-                }
-        except asyncio.TimeoutError:
-            return {
-                "conversation_id": "",
-                "assistant_message": "",
-                "data_ui_list": [],
-                "guide_list": [],
-                "execution_processes": [],
-                "workers": [],
-                "worker_ms_map": {},
-                "response_time_sec": None,
-                "error": "timeout(120s)",
-            }
-        except Exception as e:
-            return {
-                "conversation_id": "",
-                "assistant_message": "",
-                "data_ui_list": [],
-                "guide_list": [],
-                "execution_processes": [],
-                "workers": [],
-                "worker_ms_map": {},
-                "response_time_sec": None,
-                "error": f"{type(e).__name__}: {str(e)[:120]}",
-            }
+        turn = await self.call(
+            message,
+            backend=BACKEND_SYNC,
+            conversation_id=conversation_id,
+            context=context,
+            target_assistant=target_assistant,
+            session=session,
+        )
+        return turn.to_sync_dict()
 
     async def subscribe_sse(self, session: aiohttp.ClientSession, conversation_id: str) -> AgentResponse:
-        url = f"{self.base_url}/api/v1/ai/orchestrator/chat-room/sse/subscribe"
-        params = {"conversationId": conversation_id}
-
-        connect_time: Optional[datetime] = None
-        chat_time: Optional[datetime] = None
-
-        buffer = ""
-        current_event = None
-        last_heartbeat = datetime.now()
-
-        assistant_message = ""
-        data_ui_list: List[Dict[str, Any]] = []
-        guide_list: List[Dict[str, Any]] = []
-        raw_event: Optional[Dict[str, Any]] = None
-
-        try:
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with session.get(url, headers=self.headers(for_sse=True), params=params, timeout=timeout) as resp:
-                async for chunk in resp.content.iter_any():
-                    buffer += chunk.decode("utf-8", errors="ignore")
-
-                    # heartbeat timeout (30s)
-                    if (datetime.now() - last_heartbeat).total_seconds() > 30:
-                        return AgentResponse(
-                            conversation_id=conversation_id,
-                            connect_time=connect_time,
-                            chat_time=chat_time,
-                            response_time_sec=None,
-                            assistant_message=assistant_message,
-                            data_ui_list=data_ui_list,
-                            guide_list=guide_list,
-                            raw_event=raw_event,
-                            error="heartbeat timeout(30s)",
-                        )
-
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        line = line.strip()
-
-                        if line.startswith("event:"):
-                            current_event = line.replace("event:", "").strip()
-                            if current_event == "CONNECT":
-                                connect_time = datetime.now()
-                            elif current_event == "HEARTBEAT":
-                                last_heartbeat = datetime.now()
-
-                        elif line.startswith("data:"):
-                            data_str = line.replace("data:", "", 1).strip()
-                            if current_event != "CHAT":
-                                continue
-                            if not data_str.startswith("{"):
-                                continue
-                            try:
-                                data = json.loads(data_str)
-                            except Exception:
-                                continue
-
-                            if data.get("messageType") == "ASSISTANT":
-                                chat_time = datetime.now()
-                                raw_event = data
-                                assistant = data.get("assistant", {}) or {}
-                                assistant_message = assistant.get("assistantMessage", "") or ""
-                                data_ui_list = assistant.get("dataUIList", []) or []
-                                guide_list = assistant.get("guideList", []) or []
-
-                                rt = None
-                                if connect_time and chat_time:
-                                    rt = (chat_time - connect_time).total_seconds()
-                                return AgentResponse(
-                                    conversation_id=conversation_id,
-                                    connect_time=connect_time,
-                                    chat_time=chat_time,
-                                    response_time_sec=rt,
-                                    assistant_message=assistant_message,
-                                    data_ui_list=data_ui_list,
-                                    guide_list=guide_list,
-                                    raw_event=raw_event,
-                                    error="",
-                                )
-
-            return AgentResponse(
-                conversation_id=conversation_id,
-                connect_time=connect_time,
-                chat_time=chat_time,
-                response_time_sec=None,
-                assistant_message=assistant_message,
-                data_ui_list=data_ui_list,
-                guide_list=guide_list,
-                raw_event=raw_event,
-                error="sse ended without assistant",
-            )
-
-        except asyncio.TimeoutError:
-            return AgentResponse(conversation_id, connect_time, chat_time, None, "", [], [], None, "sse timeout(60s)")
-        except Exception as e:
-            return AgentResponse(conversation_id, connect_time, chat_time, None, "", [], [], None, f"{type(e).__name__}:{str(e)[:120]}")
+        return AgentResponse.from_turn(await self.subscribe(session, conversation_id))
 
     async def subscribe_sse_extended(
         self, session: aiohttp.ClientSession, conversation_id: str
@@ -358,132 +130,8 @@ class ApplicantAgentClient:
             "error": str
         }
         """
-        url = f"{self.base_url}/api/v1/ai/orchestrator/chat-room/sse/subscribe"
-        params = {"conversationId": conversation_id}
-
-        connect_time: Optional[datetime] = None
-        chat_time: Optional[datetime] = None
-
-        buffer = ""
-        current_event = None
-        last_heartbeat = datetime.now()
-
-        assistant_message = ""
-        data_ui_list: List[Dict[str, Any]] = []
-        guide_list: List[Dict[str, Any]] = []
-        execution_processes: List[Dict[str, Any]] = []
-        raw_events: List[Dict[str, Any]] = []
-
-        try:
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with session.get(url, headers=self.headers(for_sse=True), params=params, timeout=timeout) as resp:
-                async for chunk in resp.content.iter_any():
-                    buffer += chunk.decode("utf-8", errors="ignore")
-
-                    if (datetime.now() - last_heartbeat).total_seconds() > 30:
-                        return {
-                            "conversation_id": conversation_id,
-                            "connect_time": connect_time,
-                            "chat_time": chat_time,
-                            "response_time_sec": None,
-                            "assistant_message": assistant_message,
-                            "data_ui_list": data_ui_list,
-                            "guide_list": guide_list,
-                            "execution_processes": execution_processes,
-                            "raw_events": raw_events,
-                            "error": "heartbeat timeout(30s)",
-                        }
-
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        line = line.strip()
-
-                        if line.startswith("event:"):
-                            current_event = line.replace("event:", "").strip()
-                            if current_event == "CONNECT":
-                                connect_time = datetime.now()
-                            elif current_event == "HEARTBEAT":
-                                last_heartbeat = datetime.now()
-
-                        elif line.startswith("data:"):
-                            data_str = line.replace("data:", "", 1).strip()
-                            if not data_str.startswith("{"):
-                                continue
-                            try:
-                                data = json.loads(data_str)
-                            except Exception:
-                                continue
-
-                            raw_events.append({"event": current_event, "data": data})
-
-                            # CHAT 이벤트 처리
-                            if current_event == "CHAT":
-                                if data.get("messageType") == "ASSISTANT":
-                                    chat_time = datetime.now()
-                                    assistant = data.get("assistant", {}) or {}
-                                    assistant_message = assistant.get("assistantMessage", "") or ""
-                                    data_ui_list = assistant.get("dataUIList", []) or []
-                                    guide_list = assistant.get("guideList", []) or []
-
-                                    rt = None
-                                    if connect_time and chat_time:
-                                        rt = (chat_time - connect_time).total_seconds()
-                                    return {
-                                        "conversation_id": conversation_id,
-                                        "connect_time": connect_time,
-                                        "chat_time": chat_time,
-                                        "response_time_sec": rt,
-                                        "assistant_message": assistant_message,
-                                        "data_ui_list": data_ui_list,
-                                        "guide_list": guide_list,
-                                        "execution_processes": execution_processes,
-                                        "raw_events": raw_events,
-                                        "error": "",
-                                    }
-
-                            # CHAT_EXECUTION_PROCESS 이벤트 처리
-                            elif current_event == "CHAT_EXECUTION_PROCESS":
-                                execution_processes.append(data)
-
-            return {
-                "conversation_id": conversation_id,
-                "connect_time": connect_time,
-                "chat_time": chat_time,
-                "response_time_sec": None,
-                "assistant_message": assistant_message,
-                "data_ui_list": data_ui_list,
-                "guide_list": guide_list,
-                "execution_processes": execution_processes,
-                "raw_events": raw_events,
-                "error": "sse ended without assistant",
-            }
-
-        except asyncio.TimeoutError:
-            return {
-                "conversation_id": conversation_id,
-                "connect_time": connect_time,
-                "chat_time": chat_time,
-                "response_time_sec": None,
-                "assistant_message": "",
-                "data_ui_list": [],
-                "guide_list": [],
-                "execution_processes": execution_processes,
-                "raw_events": raw_events,
-                "error": "sse timeout(60s)",
-            }
-        except Exception as e:
-            return {
-                "conversation_id": conversation_id,
-                "connect_time": connect_time,
-                "chat_time": chat_time,
-                "response_time_sec": None,
-                "assistant_message": "",
-                "data_ui_list": [],
-                "guide_list": [],
-                "execution_processes": execution_processes,
-                "raw_events": raw_events,
-                "error": f"{type(e).__name__}:{str(e)[:120]}",
-            }
+        turn = await self.subscribe(session, conversation_id, collect_raw_events=True)
+        return turn.to_sse_dict()
 
     async def run_n_times(
         self,
@@ -494,58 +142,61 @@ class ApplicantAgentClient:
         context: Optional[Dict[str, Any]] = None,
         target_assistant: Optional[str] = None,
         independent_sessions: bool = False,
+        sse_manager: Optional[SseSubscriptionManager] = None,
+        retry_budget: Optional[RetryBudget] = None,
     ) -> Tuple[List[Optional[AgentResponse]], str]:
         """
         동일 conversationId에서 N번 호출을 수행하며, 실패 시 자동 재시도.
         - n_calls: 호출 횟수 (기본 1회, 일관성 테스트를 위해 2~4회 가능)
-        - max_retries: 각 단계별 최대 재시도 횟수 (기본 2회)
+        - max_retries: 호출별 최대 재시도 횟수 (기본 2회, 2초 기준 decorrelated jitter)
+          · 2차 이후 호출은 같은 대화에 메시지가 중복되지 않도록 요청이 서버에 닿지 않은 오류만 재시도
+          · 401/403 등 재시도해도 소용없는 오류는 바로 실패
         - context: API 호출 시 전달할 context 객체
         - target_assistant: 특정 어시스턴트 지정 (예: RECRUIT_PLAN_ASSISTANT)
         - independent_sessions: True면 매 호출마다 새 채팅방(conversationId=None)으로 실행
+        - sse_manager: 주어지면 구독을 대화 단위로 재사용하고, 2차 이후 호출은 send_query 전에 먼저 구독
+          (응답 시간은 기존과 같이 CONNECT 기준, 이미 연결돼 있던 구독이면 send_query 완료 시점부터)
+        - retry_budget: run 전체가 공유하는 재시도 예산 (장애 시 재시도 폭주 방지)
         """
-        retry_delay = 2.0
+        policy = RetryPolicy(max_retries=max_retries, base_delay_sec=2.0)
         responses: List[Optional[AgentResponse]] = []
         conv_id: Optional[str] = None
         last_err = ""
 
         for call_idx in range(n_calls):
-            resp: Optional[AgentResponse] = None
-
-            for attempt in range(max_retries + 1):
-                cid_in = None if independent_sessions else conv_id
-                cid, err = await self.send_query(
-                    session, query,
-                    conversation_id=cid_in,
-                    context=context,
-                    target_assistant=target_assistant
-                )
-                if not cid:
-                    last_err = f"send_query#{call_idx + 1} failed: {err}"
-                    if attempt < max_retries:
-                        await asyncio.sleep(retry_delay)
-                    continue
+            cid_in = None if independent_sessions else conv_id
+            turn = await self.call(
+                query,
+                backend=BACKEND_QUERY_SSE,
+                conversation_id=cid_in,
+                context=context,
+                target_assistant=target_assistant,
+                session=session,
+                retry_policy=policy,
+                retry_budget=retry_budget,
+                sse_manager=sse_manager,
+            )
 
+            resp: Optional[AgentResponse] = None
+            if turn.error and turn.stage != "sse":
+                last_err = f"send_query#{call_idx + 1} failed: {turn.error}"
+            else:
                 # 첫 호출에서 conversationId 획득
                 if conv_id is None and not independent_sessions:
-                    conv_id = cid
-
-                resp = await self.subscribe_sse(session, cid)
-                if resp.error:
-                    last_err = f"sse#{call_idx + 1} failed: {resp.error}"
-                    if attempt < max_retries:
-                        await asyncio.sleep(retry_delay)
-                    continue
-
-                # 성공
-                last_err = ""
-                break
+                    conv_id = turn.conversation_id
+                resp = AgentResponse.from_turn(turn)
+                last_err = f"sse#{call_idx + 1} failed: {turn.error}" if turn.error else ""
+            if sse_manager is not None and independent_sessions and turn.conversation_id:
+                await sse_manager.release(turn.conversation_id)
 
             responses.append(resp)
 
             # 첫 호출 실패 시 이후 호출 중단
             if call_idx == 0 and (resp is None or resp.error):
-                return responses, last_err
+                break
 
+        if sse_manager is not None and conv_id:
+            await sse_manager.release(conv_id)
         return responses, last_err
 
     async def run_double(
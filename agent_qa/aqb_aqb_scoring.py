@@ -2,15 +2,25 @@ from __future__ import annotations
 
 import asyncio
 import json
+import math
+import multiprocessing
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from urllib.parse import parse_qs, unquote, urlparse
 
 import aiohttp
+import numpy as np
 import pandas as pd
 
+from aqb_consistency import SIMILARITY_EXACT, ConsistencyEngine
 from aqb_openai_judge import openai_judge_with_retry
 
+try:  # pyarrow가 있으면 프로세스 간 청크 전달을 Arrow IPC(컬럼 버퍼)로, 없으면 DataFrame pickle
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    pa = None
+
 AQB_SCORE_COLUMNS: List[str] = [
     "run_id",
     "query_id",
@@ -118,10 +128,39 @@ _ERROR_MARKERS = (
 )
 
 _ROUND_ALIASES = ["회차", "run_id", "run", "execution_round", "batch", "batch_id"]
+_ID_ALIASES = ["ID", "query_id", "질의ID"]
+_QUERY_ALIASES = ["질의", "query", "query_text"]
+_EXPECTED_FILTER_ALIASES = ["기대 필터/열", "expected_filters", "기대 필터"]
+_DETECTED_FILTER_ALIASES = ["감지된 필터", "1차 감지된 필터", "2차 감지된 필터", "detected_filters"]
+_EXPECTED_DATAKEY_ALIASES = ["기대 datakey", "기대 데이터키", "expected_datakey", "expected_datakeys"]
+_DETECTED_DATAKEY_ALIASES = ["사용 datakey", "감지된 datakey", "detected_datakey", "detected_datakeys"]
+_GROUND_TRUTH_ALIASES = ["ground_truth", "ground truth", "검증 API 결과", "검증api 결과", "정답 수치", "검증 수치", "gt"]
+_TTFT_ALIASES = ["ttft", "ttft_sec", "ttft(초)", "첫 응답 시간(초)", "초기 반응 시간(초)"]
+_AGENT_TYPE_ALIASES = ["agent_type", "agent type", "에이전트 유형", "에이전트 타입"]
+_ADDITIONAL_TOOL_CALL_ALIASES = ["추가 도구 호출 수", "additional_tool_calls"]
+_TOOL_CALL_ALIASES = ["도구 호출 수", "tool_calls", "tools_called"]
+_CALL_COUNT_ALIASES = ["호출 횟수", "n_calls", "call_count"]
+_ISSUE_ALIASES = ["특이사항", "error", "오류"]
 _ORDINALS = ["1차", "2차", "3차", "4차"]
 _RESPONSE_COLS = [f"{o} 답변" for o in _ORDINALS]
 _RESPONSE_TIME_COLS = [f"{o} 답변 시간(초)" for o in _ORDINALS]
 _RESPONSE_STATUS_COLS = [f"{o} 응답 상태" for o in _ORDINALS]
+_BUTTON_URL_COLS = [f"{o} buttonUrl" for o in _ORDINALS]
+_RAW_RESPONSE_COLS = [f"{o} 답변 raw" for o in _ORDINALS] + ["raw"]
+_EXECUTION_AGENT_TYPES = ("execution", "navigation", "execution_or_navigation")
+
+# 행마다 다시 컴파일하지 않도록 규칙 단계에서 쓰는 패턴은 모듈 로드 시 한 번만 컴파일
+_NUMBER_RE = re.compile(r"[-+]?\d{1,3}(?:,\d{3})*(?:\.\d+)?%?|[-+]?\d+(?:\.\d+)?%?")
+_TEXT_TOKEN_RE = re.compile(r"[a-z0-9가-힣]+")
+_URL_DATAKEY_RE = re.compile(r"(?:dataKey|datakey)=([A-Za-z0-9_\-.]+)")
+_TOKEN_SEPARATOR_RE = re.compile(r"[;|/]")
+_ERROR_MARKER_RE = re.compile("|".join(re.escape(marker) for marker in _ERROR_MARKERS))
+_STATUS_ERROR_RE = re.compile("에러|실패|timeout|오류|fail")
+
+# 컬럼 단위 규칙 단계의 행 청크 크기 (중간 object 배열 메모리 상한)
+RULE_CHUNK_ROWS = 2000
+# 이보다 적은 행은 프로세스 풀 기동 비용이 더 커서 rule_workers를 지정해도 현재 프로세스에서 계산
+PARALLEL_MIN_ROWS = 2000
 
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -204,10 +243,12 @@ def _extract_numbers(text: str) -> List[float]:
     s = _to_str(text)
     if not s:
         return []
-    pattern = re.compile(r"[-+]?\d{1,3}(?:,\d{3})*(?:\.\d+)?%?|[-+]?\d+(?:\.\d+)?%?")
+    return _parse_number_tokens(_NUMBER_RE.findall(s))
+
+
+def _parse_number_tokens(tokens: Iterable[str]) -> List[float]:
     nums: List[float] = []
-    for m in pattern.finditer(s):
-        tok = m.group(0)
+    for tok in tokens:
         if not tok:
             continue
         is_pct = tok.endswith("%")
@@ -236,7 +277,7 @@ def _tokenize_text(text: str) -> List[str]:
     s = _to_str(text).lower()
     if not s:
         return []
-    return [t for t in re.findall(r"[a-z0-9가-힣]+", s) if len(t) > 1]
+    return [t for t in _TEXT_TOKEN_RE.findall(s) if len(t) > 1]
 
 
 def _text_similarity(a: str, b: str) -> float:
@@ -255,7 +296,7 @@ def _contains_error_text(text: str) -> bool:
     s = _to_str(text).lower()
     if not s:
         return False
-    return any(marker in s for marker in _ERROR_MARKERS)
+    return _ERROR_MARKER_RE.search(s) is not None
 
 
 def _extract_datakeys_from_url(url: str) -> List[str]:
@@ -276,7 +317,7 @@ def _extract_datakeys_from_url(url: str) -> List[str]:
             if tok:
                 keys.append(tok)
 
-    for tok in re.findall(r"(?:dataKey|datakey)=([A-Za-z0-9_\-.]+)", u):
+    for tok in _URL_DATAKEY_RE.findall(u):
         if tok:
             keys.append(tok)
 
@@ -378,7 +419,7 @@ def _collect_statuses(row: pd.Series) -> List[str]:
 
 
 def _collect_expected_filters(row: pd.Series, columns: Sequence[str]) -> List[str]:
-    col = _pick_col(columns, ["기대 필터/열", "expected_filters", "기대 필터"])
+    col = _pick_col(columns, _EXPECTED_FILTER_ALIASES)
     if not col:
         return []
     return _parse_tokens(_to_str(row.get(col)))
@@ -386,7 +427,7 @@ def _collect_expected_filters(row: pd.Series, columns: Sequence[str]) -> List[st
 
 def _collect_detected_filters(row: pd.Series, columns: Sequence[str]) -> List[str]:
     vals: List[str] = []
-    for alias in ["감지된 필터", "1차 감지된 필터", "2차 감지된 필터", "detected_filters"]:
+    for alias in _DETECTED_FILTER_ALIASES:
         col = _pick_col(columns, [alias])
         if col:
             vals.extend(_parse_tokens(_to_str(row.get(col))))
@@ -404,7 +445,7 @@ def _collect_detected_filters(row: pd.Series, columns: Sequence[str]) -> List[st
 
 def _collect_expected_datakeys(row: pd.Series, columns: Sequence[str]) -> List[str]:
     vals: List[str] = []
-    for alias in ["기대 datakey", "기대 데이터키", "expected_datakey", "expected_datakeys"]:
+    for alias in _EXPECTED_DATAKEY_ALIASES:
         col = _pick_col(columns, [alias])
         if col:
             vals.extend(_parse_tokens(_to_str(row.get(col))))
@@ -423,17 +464,16 @@ def _collect_expected_datakeys(row: pd.Series, columns: Sequence[str]) -> List[s
 def _collect_detected_datakeys(row: pd.Series, columns: Sequence[str]) -> List[str]:
     vals: List[str] = []
 
-    for alias in ["사용 datakey", "감지된 datakey", "detected_datakey", "detected_datakeys"]:
+    for alias in _DETECTED_DATAKEY_ALIASES:
         col = _pick_col(columns, [alias])
         if col:
             vals.extend(_parse_tokens(_to_str(row.get(col))))
 
-    for prefix in _ORDINALS:
-        col = f"{prefix} buttonUrl"
+    for col in _BUTTON_URL_COLS:
         if col in row.index:
             vals.extend(_extract_datakeys_from_url(_to_str(row.get(col))))
 
-    for raw_col in [f"{o} 답변 raw" for o in _ORDINALS] + ["raw"]:
+    for raw_col in _RAW_RESPONSE_COLS:
         if raw_col in row.index:
             vals.extend(_extract_datakeys_from_raw_json(_to_str(row.get(raw_col))))
 
@@ -449,28 +489,215 @@ def _collect_detected_datakeys(row: pd.Series, columns: Sequence[str]) -> List[s
 
 
 def _collect_ground_truth_text(row: pd.Series, columns: Sequence[str]) -> str:
-    col = _pick_col(
-        columns,
-        [
-            "ground_truth",
-            "ground truth",
-            "검증 API 결과",
-            "검증api 결과",
-            "정답 수치",
-            "검증 수치",
-            "gt",
-        ],
-    )
+    col = _pick_col(columns, _GROUND_TRUTH_ALIASES)
     return _to_str(row.get(col)) if col else ""
 
 
 def _collect_ttft(row: pd.Series, columns: Sequence[str]) -> Optional[float]:
-    col = _pick_col(columns, ["ttft", "ttft_sec", "ttft(초)", "첫 응답 시간(초)", "초기 반응 시간(초)"])
+    col = _pick_col(columns, _TTFT_ALIASES)
     if not col:
         return None
     return _to_float(row.get(col))
 
 
+def _text_col(src: pd.DataFrame, col: Optional[str]) -> pd.Series:
+    """컬럼 전체에 `_to_str`과 같은 정규화를 한 번에 적용. 컬럼이 없으면 빈 문자열."""
+    if not col or col not in src.columns:
+        return pd.Series([""] * len(src), index=src.index, dtype=object)
+    series = src[col]
+    if isinstance(series.dtype, pd.StringDtype):
+        # 문자열 dtype: 결측은 dtype의 na_value(NaN 또는 pd.NA)를 `_to_str` 한 값과 같게 채운다.
+        text = series.fillna(_to_str(series.dtype.na_value)).astype(object).str.strip()
+    elif series.dtype == object:
+        # 순수 문자열 컬럼만 astype(str) 고속 경로, 그 외(bytes/숫자 혼합 등)는 str() 그대로 적용
+        if pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+            values = series.astype(str).to_numpy(dtype=object, copy=True)
+        else:
+            values = np.array([str(v) for v in series.tolist()], dtype=object)
+        missing = series.isna().to_numpy(dtype=bool)
+        if missing.any():
+            values[missing] = [_to_str(v) for v in series[missing].tolist()]
+        text = pd.Series(values, index=series.index, dtype=object).str.strip()
+    else:
+        return series.map(_to_str).astype(object)
+    return text.mask(text.str.lower().eq("nan"), "")
+
+
+def _float_col(src: pd.DataFrame, col: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(값, 존재 여부) 배열. 숫자 dtype은 그대로 쓰고 문자열은 `_to_float` 규칙으로 변환."""
+    n = len(src)
+    if not col or col not in src.columns:
+        return np.full(n, np.nan), np.zeros(n, dtype=bool)
+    series = src[col]
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "fiu":
+        values = series.to_numpy(dtype=float)
+        return values, ~np.isnan(values)
+
+    values = np.full(n, np.nan)
+    present = np.zeros(n, dtype=bool)
+    for i, text in enumerate(_text_col(src, col).tolist()):
+        if not text:
+            continue
+        try:
+            values[i] = float(text)
+        except Exception:
+            try:
+                values[i] = float(text.replace(",", ""))
+            except Exception:
+                continue
+        present[i] = True
+    return values, present
+
+
+def _contains_col(text: pd.Series, pattern: re.Pattern) -> np.ndarray:
+    return text.str.lower().str.contains(pattern).to_numpy(dtype=bool, copy=True)
+
+
+def _unique_tokens(tokens: Iterable[str]) -> List[str]:
+    uniq: List[str] = []
+    seen = set()
+    for tok in tokens:
+        if not tok:
+            continue
+        low = tok.lower()
+        if low in seen:
+            continue
+        seen.add(low)
+        uniq.append(tok)
+    return uniq
+
+
+def _token_col(src: pd.DataFrame, col: Optional[str]) -> List[List[str]]:
+    """`_parse_tokens`의 컬럼 버전: 구분자 치환/분할은 pandas 문자열 연산으로 처리."""
+    if not col or col not in src.columns:
+        return [[] for _ in range(len(src))]
+    parts = _text_col(src, col).str.replace(_TOKEN_SEPARATOR_RE, ",", regex=True).str.split(",")
+    return [_unique_tokens(p.strip() for p in row) if row != [""] else [] for row in parts.tolist()]
+
+
+def _merge_token_cols(n: int, token_cols: Sequence[List[List[str]]]) -> List[List[str]]:
+    if not token_cols:
+        return [[] for _ in range(n)]
+    if len(token_cols) == 1:
+        return token_cols[0]
+    merged: List[List[str]] = []
+    for row in zip(*token_cols):
+        filled = [tokens for tokens in row if tokens]
+        if len(filled) <= 1:
+            merged.append(list(filled[0]) if filled else [])
+        else:
+            merged.append(_unique_tokens(tok for tokens in filled for tok in tokens))
+    return merged
+
+
+def _response_text_cols(src: pd.DataFrame) -> Tuple[Dict[str, pd.Series], List[List[str]], np.ndarray]:
+    """응답 컬럼별 정규화 텍스트, 행별 응답 목록, `응답` 단일 컬럼 fallback 사용 여부."""
+    texts = {col: _text_col(src, col) for col in _RESPONSE_COLS if col in src.columns}
+    lists = [text.tolist() for text in texts.values()]
+    if lists:
+        responses = [[t for t in row if t] for row in zip(*lists)]
+    else:
+        responses = [[] for _ in range(len(src))]
+
+    fallback_used = np.zeros(len(src), dtype=bool)
+    if "응답" in src.columns:
+        for i, text in enumerate(_text_col(src, "응답").tolist()):
+            if not responses[i] and text:
+                responses[i] = [text]
+                fallback_used[i] = True
+    return texts, responses, fallback_used
+
+
+def _response_time_avg_col(src: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """행별 평균 응답시간. 열 순서대로 더해 `_mean`의 합산 순서와 같은 값을 만든다."""
+    n = len(src)
+    total = np.zeros(n)
+    count = np.zeros(n, dtype=int)
+    for col in _RESPONSE_TIME_COLS:
+        if col in src.columns:
+            values, present = _float_col(src, col)
+            total = total + np.where(present, values, 0.0)
+            count += present
+
+    if "응답 시간(초)" in src.columns:
+        values, present = _float_col(src, "응답 시간(초)")
+        use = (count == 0) & present
+        total = np.where(use, values, total)
+        count = np.where(use, 1, count)
+
+    has_avg = count > 0
+    avg = np.divide(total, count, out=np.full(n, np.nan), where=has_avg)
+    return avg, has_avg
+
+
+def _datakeys_from_url_col(text: pd.Series) -> List[List[str]]:
+    return [_extract_datakeys_from_url(url) if url else [] for url in text.tolist()]
+
+
+def _datakeys_from_raw_col(text: pd.Series) -> List[List[str]]:
+    out: List[List[str]] = []
+    for raw in text.tolist():
+        # datakey 키가 나올 수 없는 본문(유니코드 이스케이프도 없음)은 json 파싱을 건너뛴다.
+        low = raw.lower()
+        if not raw or ("datakey" not in low and "data_key" not in low and "\\u" not in raw):
+            out.append([])
+        else:
+            out.append(_extract_datakeys_from_raw_json(raw))
+    return out
+
+
+def _agent_type_col(
+    src: pd.DataFrame,
+    explicit_col: Optional[str],
+    expected_filters: Sequence[List[str]],
+    expected_datakeys: Sequence[List[str]],
+) -> List[str]:
+    raw = _text_col(src, explicit_col).str.lower()
+    explicit = np.select(
+        [
+            raw.str.contains("applicant|지원자").to_numpy(dtype=bool),
+            raw.str.contains("move|이동|url").to_numpy(dtype=bool),
+            raw.str.contains("execute|실행").to_numpy(dtype=bool),
+        ],
+        ["applicant_management", "navigation", "execution"],
+        default=raw.to_numpy(dtype=object),
+    ).tolist()
+
+    has_btn = np.zeros(len(src), dtype=bool)
+    for col in _BUTTON_URL_COLS:
+        if col in src.columns:
+            has_btn |= _text_col(src, col).ne("").to_numpy(dtype=bool)
+
+    out: List[str] = []
+    for i, agent_type in enumerate(explicit):
+        if agent_type:
+            out.append(agent_type)
+        elif expected_datakeys[i] or (has_btn[i] and not expected_filters[i]):
+            out.append("execution_or_navigation")
+        else:
+            out.append("applicant_management")
+    return out
+
+
+def _precheck_counts(src: pd.DataFrame, consistency_min_runs: int) -> Dict[str, int]:
+    """사전 점검 커버리지 집계. 행 순회 없이 컬럼 단위로 센다."""
+    columns = list(src.columns)
+    _response_texts, responses, _fallback_used = _response_text_cols(src)
+    response_counts = np.array([len(r) for r in responses], dtype=int)
+    expected_filters = _token_col(src, _pick_col(columns, _EXPECTED_FILTER_ALIASES))
+    expected_datakeys = _merge_token_cols(
+        len(src), [_token_col(src, _pick_col(columns, [alias])) for alias in _EXPECTED_DATAKEY_ALIASES]
+    )
+    return {
+        "response": int((response_counts > 0).sum()),
+        "consistency": int((response_counts >= consistency_min_runs).sum()),
+        "speed": int(_response_time_avg_col(src)[1].sum()),
+        "condition": sum(1 for filters, datakeys in zip(expected_filters, expected_datakeys) if filters or datakeys),
+        "ground_truth": int(_text_col(src, _pick_col(columns, _GROUND_TRUTH_ALIASES)).ne("").sum()),
+        "ttft": int(_float_col(src, _pick_col(columns, _TTFT_ALIASES))[1].sum()),
+    }
+
+
 def build_aqb_precheck_report(
     df: pd.DataFrame,
     consistency_min_runs: int = 3,
@@ -507,13 +734,13 @@ def build_aqb_precheck_report(
             "hard_fail": True,
         }, detail_df
 
-    query_col = _pick_col(columns, ["ID", "query_id", "질의ID"])
+    query_col = _pick_col(columns, _ID_ALIASES)
     if query_col:
         _add("문항 ID 컬럼", "PASS", f"`{query_col}` 컬럼 사용", "info")
     else:
         _add("문항 ID 컬럼", "WARN", "ID 컬럼이 없어 row 기반으로 자동 생성합니다.", "quality")
 
-    text_col = _pick_col(columns, ["질의", "query", "query_text"])
+    text_col = _pick_col(columns, _QUERY_ALIASES)
     if text_col:
         _add("질의 컬럼", "PASS", f"`{text_col}` 컬럼 사용", "info")
     else:
@@ -525,27 +752,13 @@ def build_aqb_precheck_report(
     else:
         _add("응답 컬럼", "FAIL", "응답 컬럼(응답 또는 n차 답변)이 없습니다.", "blocking")
 
-    response_ready = 0
-    consistency_ready = 0
-    speed_ready = 0
-    condition_ready = 0
-    gt_ready = 0
-    ttft_ready = 0
-
-    for _, row in src.iterrows():
-        responses = _collect_response_texts(row)
-        if responses:
-            response_ready += 1
-        if len(responses) >= consistency_min_runs:
-            consistency_ready += 1
-        if _collect_response_times(row):
-            speed_ready += 1
-        if _collect_expected_filters(row, columns) or _collect_expected_datakeys(row, columns):
-            condition_ready += 1
-        if _collect_ground_truth_text(row, columns):
-            gt_ready += 1
-        if _collect_ttft(row, columns) is not None:
-            ttft_ready += 1
+    counts = _precheck_counts(src, consistency_min_runs)
+    response_ready = counts["response"]
+    consistency_ready = counts["consistency"]
+    speed_ready = counts["speed"]
+    condition_ready = counts["condition"]
+    gt_ready = counts["ground_truth"]
+    ttft_ready = counts["ttft"]
 
     def _pct(v: int) -> float:
         return round((float(v) / float(total)) * 100.0, 2) if total > 0 else 0.0
@@ -641,7 +854,7 @@ def _infer_agent_type(
     expected_filters: Sequence[str],
     expected_datakeys: Sequence[str],
 ) -> str:
-    explicit_col = _pick_col(columns, ["agent_type", "agent type", "에이전트 유형", "에이전트 타입"])
+    explicit_col = _pick_col(columns, _AGENT_TYPE_ALIASES)
     if explicit_col:
         raw = _to_str(row.get(explicit_col)).lower()
         if raw:
@@ -658,7 +871,7 @@ def _infer_agent_type(
     if expected_filters:
         return "applicant_management"
 
-    has_btn = any(_to_str(row.get(f"{o} buttonUrl")) for o in _ORDINALS)
+    has_btn = any(_to_str(row.get(col)) for col in _BUTTON_URL_COLS)
     if has_btn:
         return "execution_or_navigation"
     return "applicant_management"
@@ -676,13 +889,13 @@ def _infer_additional_tool_calls(
     expected_filters: Sequence[str],
     expected_datakeys: Sequence[str],
 ) -> int:
-    direct_col = _pick_col(columns, ["추가 도구 호출 수", "additional_tool_calls"])
+    direct_col = _pick_col(columns, _ADDITIONAL_TOOL_CALL_ALIASES)
     if direct_col:
         v = _to_float(row.get(direct_col))
         if v is not None:
             return max(0, int(round(v)))
 
-    total_col = _pick_col(columns, ["도구 호출 수", "tool_calls", "tools_called"])
+    total_col = _pick_col(columns, _TOOL_CALL_ALIASES)
     if total_col:
         v = _to_float(row.get(total_col))
         if v is not None:
@@ -698,7 +911,7 @@ def _infer_additional_tool_calls(
 
 
 def _inferred_expected_calls(row: pd.Series, columns: Sequence[str], responses: Sequence[str]) -> int:
-    col = _pick_col(columns, ["호출 횟수", "n_calls", "call_count"])
+    col = _pick_col(columns, _CALL_COUNT_ALIASES)
     if col:
         v = _to_float(row.get(col))
         if v is not None and v > 0:
@@ -721,7 +934,7 @@ def _detect_error_or_blank(
     responses: Sequence[str],
     expected_calls: int,
 ) -> bool:
-    issue_col = _pick_col(columns, ["특이사항", "error", "오류"])
+    issue_col = _pick_col(columns, _ISSUE_ALIASES)
     if issue_col and _contains_error_text(_to_str(row.get(issue_col))):
         return True
 
@@ -792,8 +1005,10 @@ def _compute_numeric_match(
     responses: Sequence[str],
     ground_truth_text: str,
     tolerance_pct: float,
+    gt_nums: Optional[List[float]] = None,
 ) -> Tuple[str, str]:
-    gt_nums = _extract_numbers(ground_truth_text)
+    if gt_nums is None:
+        gt_nums = _extract_numbers(ground_truth_text)
     if not gt_nums:
         return "unknown", "Ground Truth 수치가 없어 수치 비교는 제한됨"
 
@@ -831,9 +1046,10 @@ def _score_accuracy_applicant(
     responses: Sequence[str],
     ground_truth_text: str,
     tolerance_pct: float,
+    gt_nums: Optional[List[float]] = None,
 ) -> Tuple[int, str]:
     filter_grade, filter_note = _filter_match_grade(expected_filters, detected_filters)
-    num_status, num_note = _compute_numeric_match(responses, ground_truth_text, tolerance_pct)
+    num_status, num_note = _compute_numeric_match(responses, ground_truth_text, tolerance_pct, gt_nums=gt_nums)
 
     if num_status == "unknown":
         if filter_grade == "exact":
@@ -1039,11 +1255,15 @@ def _score_consistency_under_min(
     tolerance_pct: float,
     policy: str,
     min_runs: int,
+    engine: Optional[ConsistencyEngine] = None,
 ) -> Tuple[int, str]:
     if policy == "two_run_proxy" and len(responses) >= 2:
         a, b = responses[0], responses[1]
-        sim = _text_similarity(a, b) >= 0.45
-        num_state = _pair_numeric_state(a, b, tolerance_pct)
+        if engine is not None:
+            sim, num_state = engine.pair(engine.profile(a), engine.profile(b))
+        else:
+            sim = _text_similarity(a, b) >= 0.45
+            num_state = _pair_numeric_state(a, b, tolerance_pct)
 
         if sim and num_state == "exact":
             return 3, f"임시 2회 평가: 숫자+결론 일치 (정식 기준 {min_runs}회 미충족)"
@@ -1154,6 +1374,450 @@ async def _run_llm_scoring(
     return out
 
 
+_SPEED_SINGLE_BANDS = ((5, 8, 10, 15, 20), ("<=5초", "5~8초", "8~10초", "10~15초", "15~20초", "20초 초과"))
+_SPEED_MULTI_APPLICANT_BANDS = ((20, 30, 40, 50, 60), ("<=20초", "20~30초", "30~40초", "40~50초", "50~60초", "60초 초과"))
+_SPEED_MULTI_DEFAULT_BANDS = ((10, 15, 20, 30, 45), ("<=10초", "10~15초", "15~20초", "20~30초", "30~45초", "45초 초과"))
+
+
+def _speed_band_col(avg: np.ndarray, bounds: Sequence[float]) -> np.ndarray:
+    """`avg <= bound`를 처음 만족하는 구간 번호 (0 -> 5점, len(bounds) -> 0점)."""
+    return np.searchsorted(np.asarray(bounds, dtype=float), avg, side="left")
+
+
+def _speed_reason(avg_sec: float, band: int, labels: Sequence[str], has_error: bool, has_avg: bool) -> str:
+    if has_error:
+        return "에러/타임아웃/빈 응답"
+    if not has_avg:
+        return "응답 시간 측정값 없음"
+    return f"{avg_sec:.2f}초 ({labels[band]})"
+
+
+def _make_row_info(
+    *,
+    idx: int,
+    run_id: str,
+    query_id: str,
+    query_text: str,
+    agent_type: str,
+    semantic: Tuple[int, str],
+    consistency: Tuple[int, str],
+    accuracy: Tuple[int, str],
+    speed: Tuple[float, str],
+    stability: Tuple[int, str],
+    single_score: int,
+    multi_score: int,
+    avg_response_time: Optional[float],
+    additional_tool_calls: int,
+    ttft_pass: str,
+    has_error_or_blank: bool,
+    mapping_grade: str,
+    expected_conditions: List[str],
+    detected_conditions: List[str],
+    responses: List[str],
+) -> Dict[str, Any]:
+    return {
+        "row_idx": int(idx),
+        "run_id": run_id,
+        "query_id": query_id,
+        "query_text": query_text,
+        "agent_type": agent_type,
+        "semantic_score": int(semantic[0]),
+        "semantic_reason": semantic[1],
+        "semantic_calc_method": "rule_based",
+        "consistency_score": int(consistency[0]),
+        "consistency_reason": consistency[1],
+        "consistency_calc_method": "rule_based",
+        "accuracy_score": int(accuracy[0]),
+        "accuracy_reason": accuracy[1],
+        "accuracy_calc_method": "rule_based",
+        "speed_score": float(speed[0]),
+        "speed_reason": speed[1],
+        "speed_calc_method": "rule_based",
+        "stability_score": int(stability[0]),
+        "stability_reason": stability[1],
+        "stability_calc_method": "rule_based",
+        "speed_single_score": int(single_score),
+        "speed_multi_score": int(multi_score),
+        "response_time_avg_sec": round(float(avg_response_time), 3) if avg_response_time is not None else "",
+        "additional_tool_calls": int(additional_tool_calls),
+        "ttft_pass": ttft_pass,
+        "response_error_or_blank": bool(has_error_or_blank),
+        "semantic_mapping_grade": mapping_grade,
+        "expected_conditions": expected_conditions,
+        "detected_conditions": detected_conditions,
+        "responses": responses,
+    }
+
+
+def _queue_llm_tasks(
+    llm_tasks: List[Tuple[str, int, str]],
+    info: Dict[str, Any],
+    *,
+    api_key: str,
+    use_semantic_llm: bool,
+    use_consistency_llm: bool,
+    consistency_min_runs: int,
+    tolerance_pct: float,
+) -> None:
+    idx = int(info["row_idx"])
+    responses = info["responses"]
+    if use_semantic_llm and api_key and responses and not info["response_error_or_blank"]:
+        llm_tasks.append(
+            (
+                "semantic",
+                idx,
+                _semantic_prompt(
+                    query=info["query_text"],
+                    expected_conditions=info["expected_conditions"],
+                    detected_conditions=info["detected_conditions"],
+                    response_text=responses[0],
+                    agent_type=info["agent_type"],
+                ),
+            )
+        )
+
+    if use_consistency_llm and api_key and len(responses) >= consistency_min_runs:
+        llm_tasks.append(
+            (
+                "consistency",
+                idx,
+                _consistency_prompt(query=info["query_text"], responses=responses, tolerance_pct=tolerance_pct),
+            )
+        )
+
+
+def _score_consistency_rule(
+    responses: Sequence[str],
+    tolerance_pct: float,
+    consistency_min_runs: int,
+    consistency_under_min_policy: str,
+    engine: Optional[ConsistencyEngine] = None,
+    max_runs: Optional[int] = 3,
+) -> Tuple[int, str]:
+    """engine이 없으면 기존 쌍별 함수(기준 구현), 있으면 응답별 토큰/숫자 캐시를 쓰는 일관성 엔진."""
+    if len(responses) >= consistency_min_runs:
+        if engine is not None:
+            return engine.score(responses, max_runs=max_runs)
+        return _score_consistency_three(responses=responses, tolerance_pct=tolerance_pct)
+    return _score_consistency_under_min(
+        responses=responses,
+        tolerance_pct=tolerance_pct,
+        policy=consistency_under_min_policy,
+        min_runs=consistency_min_runs,
+        engine=engine,
+    )
+
+
+def _resolve_rule_columns(columns: Sequence[str]) -> Dict[str, Any]:
+    """컬럼 별칭은 청크/행마다가 아니라 실행당 한 번만 해석."""
+
+    def _each(aliases: Sequence[str]) -> List[str]:
+        return [col for col in (_pick_col(columns, [alias]) for alias in aliases) if col]
+
+    return {
+        "round": _pick_col(columns, _ROUND_ALIASES),
+        "expected_filters": _pick_col(columns, _EXPECTED_FILTER_ALIASES),
+        "detected_filters": _each(_DETECTED_FILTER_ALIASES),
+        "expected_datakeys": _each(_EXPECTED_DATAKEY_ALIASES),
+        "detected_datakeys": _each(_DETECTED_DATAKEY_ALIASES),
+        "ground_truth": _pick_col(columns, _GROUND_TRUTH_ALIASES),
+        "ttft": _pick_col(columns, _TTFT_ALIASES),
+        "agent_type": _pick_col(columns, _AGENT_TYPE_ALIASES),
+        "additional_tool_calls": _pick_col(columns, _ADDITIONAL_TOOL_CALL_ALIASES),
+        "tool_calls": _pick_col(columns, _TOOL_CALL_ALIASES),
+        "call_count": _pick_col(columns, _CALL_COUNT_ALIASES),
+        "issue": _pick_col(columns, _ISSUE_ALIASES),
+    }
+
+
+def _build_rule_rows_chunk(
+    src: pd.DataFrame,
+    resolved: Dict[str, Any],
+    engine: ConsistencyEngine,
+    consistency_max_runs: Optional[int],
+    *,
+    id_col: str,
+    query_col: str,
+    api_key: str,
+    tolerance_pct: float,
+    use_semantic_llm: bool,
+    use_consistency_llm: bool,
+    consistency_min_runs: int,
+    consistency_under_min_policy: str,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int, str]]]:
+    n = len(src)
+    run_ids = _text_col(src, resolved["round"]).tolist()
+    query_ids = _text_col(src, id_col).tolist()
+    query_texts = _text_col(src, query_col).tolist()
+
+    response_texts, responses, fallback_used = _response_text_cols(src)
+    avg, has_avg = _response_time_avg_col(src)
+
+    # 토큰/datakey 목록: 구분자 분할은 컬럼 연산, URL/raw JSON 파싱은 값이 있는 칸만
+    expected_filters = _token_col(src, resolved["expected_filters"])
+    detected_filters = _merge_token_cols(n, [_token_col(src, col) for col in resolved["detected_filters"]])
+    expected_datakeys = _merge_token_cols(n, [_token_col(src, col) for col in resolved["expected_datakeys"]])
+    detected_datakeys = _merge_token_cols(
+        n,
+        [_token_col(src, col) for col in resolved["detected_datakeys"]]
+        + [_datakeys_from_url_col(_text_col(src, col)) for col in _BUTTON_URL_COLS if col in src.columns]
+        + [_datakeys_from_raw_col(_text_col(src, col)) for col in _RAW_RESPONSE_COLS if col in src.columns],
+    )
+    ground_truths = _text_col(src, resolved["ground_truth"])
+    gt_numbers = [_parse_number_tokens(tokens) for tokens in ground_truths.str.findall(_NUMBER_RE).tolist()]
+    agent_types = _agent_type_col(src, resolved["agent_type"], expected_filters, expected_datakeys)
+
+    # 기대 호출 횟수: 명시 컬럼 > 응답이 채워진 최대 차수 > 응답 수
+    call_values, call_present = _float_col(src, resolved["call_count"])
+    max_filled = np.zeros(n, dtype=int)
+    for order, col in enumerate(_RESPONSE_COLS, start=1):
+        if col in response_texts:
+            max_filled = np.where(response_texts[col].ne("").to_numpy(dtype=bool), order, max_filled)
+    expected_calls: List[int] = []
+    for value, present, filled, row_responses in zip(
+        call_values.tolist(), call_present.tolist(), max_filled.tolist(), responses
+    ):
+        if present and value > 0:
+            expected_calls.append(int(round(value)))
+        else:
+            expected_calls.append(filled if filled > 0 else max(1, len(row_responses)))
+
+    # 에러/빈 응답 판정 (`_detect_error_or_blank`와 같은 조건의 OR)
+    response_errors = {col: _contains_col(text, _ERROR_MARKER_RE) for col, text in response_texts.items()}
+    has_error = _contains_col(_text_col(src, resolved["issue"]), _ERROR_MARKER_RE)
+    has_error |= np.array([not r for r in responses], dtype=bool)
+    for col in _RESPONSE_STATUS_COLS:
+        if col in src.columns:
+            has_error |= _contains_col(_text_col(src, col), _STATUS_ERROR_RE)
+    checked_calls = np.array([min(calls, len(_RESPONSE_COLS)) for calls in expected_calls], dtype=int)
+    for order, col in enumerate(_RESPONSE_COLS):
+        if col in response_texts:
+            blank = response_texts[col].eq("").to_numpy(dtype=bool)
+            has_error |= (checked_calls > order) & (blank | response_errors[col])
+    for errors in response_errors.values():
+        has_error |= errors
+    if fallback_used.any():
+        has_error |= fallback_used & _contains_col(_text_col(src, "응답"), _ERROR_MARKER_RE)
+
+    # 속도/안정성/TTFT 등급은 배열 단위로 산출
+    applicant = np.array([t == "applicant_management" for t in agent_types], dtype=bool)
+    single_band = _speed_band_col(avg, _SPEED_SINGLE_BANDS[0])
+    multi_band = np.where(
+        applicant,
+        _speed_band_col(avg, _SPEED_MULTI_APPLICANT_BANDS[0]),
+        _speed_band_col(avg, _SPEED_MULTI_DEFAULT_BANDS[0]),
+    )
+    speed_ok = has_avg & ~has_error
+    single_scores = np.where(speed_ok, 5 - single_band, 0)
+    multi_scores = np.where(speed_ok, 5 - multi_band, 0)
+    ttft_values, ttft_present = _float_col(src, resolved["ttft"])
+    ttft_pass = np.where(ttft_present, np.where(ttft_values <= 1.0, "PASS", "FAIL"), "N/A").tolist()
+
+    direct_values, direct_present = _float_col(src, resolved["additional_tool_calls"])
+    total_values, total_present = _float_col(src, resolved["tool_calls"])
+
+    row_infos: List[Dict[str, Any]] = []
+    llm_tasks: List[Tuple[str, int, str]] = []
+    avg_list = avg.tolist()
+    for i, idx in enumerate(src.index.tolist()):
+        row_responses = responses[i]
+        agent_type = agent_types[i]
+        row_error = bool(has_error[i])
+
+        if agent_type in _EXECUTION_AGENT_TYPES:
+            accuracy = _score_accuracy_execute(expected_datakeys[i], detected_datakeys[i])
+            mapping_grade, _mapping_note = _datakey_grade(expected_datakeys[i], detected_datakeys[i])
+            expected_conditions = expected_datakeys[i]
+            detected_conditions = detected_datakeys[i]
+        else:
+            accuracy = _score_accuracy_applicant(
+                expected_filters=expected_filters[i],
+                detected_filters=detected_filters[i],
+                responses=row_responses,
+                ground_truth_text=ground_truths.iat[i],
+                tolerance_pct=tolerance_pct,
+                gt_nums=gt_numbers[i],
+            )
+            mapping_grade, _mapping_note = _filter_match_grade(expected_filters[i], detected_filters[i])
+            expected_conditions = expected_filters[i]
+            detected_conditions = detected_filters[i]
+
+        if direct_present[i]:
+            additional_tool_calls = max(0, int(round(float(direct_values[i]))))
+        elif total_present[i]:
+            additional_tool_calls = max(0, int(round(float(total_values[i]))) - 1)
+        elif expected_datakeys[i]:
+            additional_tool_calls = max(0, len(_norm_set(expected_datakeys[i])) - 1)
+        else:
+            non_period = [f for f in expected_filters[i] if not _is_period_like_filter(f)]
+            additional_tool_calls = max(0, len(_norm_set(non_period)) - 1) if non_period else 0
+
+        row_has_avg = bool(has_avg[i])
+        single_score = int(single_scores[i])
+        multi_score = int(multi_scores[i])
+        if additional_tool_calls > 0:
+            labels = _SPEED_MULTI_APPLICANT_BANDS[1] if applicant[i] else _SPEED_MULTI_DEFAULT_BANDS[1]
+            reason = _speed_reason(avg_list[i], int(multi_band[i]), labels, row_error, row_has_avg)
+            speed = (float(multi_score), f"복수 도구 기준: {reason}")
+        else:
+            reason = _speed_reason(avg_list[i], int(single_band[i]), _SPEED_SINGLE_BANDS[1], row_error, row_has_avg)
+            speed = (float(single_score), f"단일 도구 기준: {reason}")
+
+        info = _make_row_info(
+            idx=int(idx),
+            run_id=run_ids[i] or "run-1",
+            query_id=query_ids[i] or f"row-{idx + 1}",
+            query_text=query_texts[i],
+            agent_type=agent_type,
+            semantic=_score_semantic_rule(
+                mapping_grade=mapping_grade,
+                response_text=row_responses[0] if row_responses else "",
+                has_error_or_blank=row_error,
+                agent_type=agent_type,
+            ),
+            consistency=_score_consistency_rule(
+                row_responses,
+                tolerance_pct,
+                consistency_min_runs,
+                consistency_under_min_policy,
+                engine=engine,
+                max_runs=consistency_max_runs,
+            ),
+            accuracy=accuracy,
+            speed=speed,
+            stability=_score_stability(row_error),
+            single_score=single_score,
+            multi_score=multi_score,
+            avg_response_time=avg_list[i] if row_has_avg else None,
+            additional_tool_calls=additional_tool_calls,
+            ttft_pass=ttft_pass[i],
+            has_error_or_blank=row_error,
+            mapping_grade=mapping_grade,
+            expected_conditions=expected_conditions,
+            detected_conditions=detected_conditions,
+            responses=row_responses,
+        )
+        _queue_llm_tasks(
+            llm_tasks,
+            info,
+            api_key=api_key,
+            use_semantic_llm=use_semantic_llm,
+            use_consistency_llm=use_consistency_llm,
+            consistency_min_runs=consistency_min_runs,
+            tolerance_pct=tolerance_pct,
+        )
+        row_infos.append(info)
+
+    return row_infos, llm_tasks
+
+
+def _build_rule_rows_columnar(
+    src: pd.DataFrame,
+    *,
+    chunk_rows: int = RULE_CHUNK_ROWS,
+    consistency_similarity: str = SIMILARITY_EXACT,
+    consistency_max_runs: Optional[int] = 3,
+    **options: Any,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int, str]]]:
+    """컬럼 단위 규칙 단계. 행 청크별로 처리해 중간 배열 크기를 제한하고 결과는 입력 순서대로 이어 붙인다."""
+    resolved = _resolve_rule_columns(list(src.columns))
+    # 응답 프로필(토큰/숫자) 캐시는 실행 전체에서 공유
+    engine = ConsistencyEngine(tolerance_pct=options["tolerance_pct"], similarity=consistency_similarity)
+    row_infos: List[Dict[str, Any]] = []
+    llm_tasks: List[Tuple[str, int, str]] = []
+    step = max(1, int(chunk_rows))
+    for start in range(0, len(src), step):
+        infos, tasks = _build_rule_rows_chunk(
+            src.iloc[start : start + step], resolved, engine, consistency_max_runs, **options
+        )
+        row_infos.extend(infos)
+        llm_tasks.extend(tasks)
+    return row_infos, llm_tasks
+
+
+def _encode_rule_chunk(chunk: pd.DataFrame) -> Tuple[str, Any]:
+    """워커로 보낼 청크. Arrow IPC 스트림(bytes)은 행마다 파이썬 객체를 pickle하지 않아 전달 비용이 작다."""
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(chunk, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # 숫자/문자열이 섞인 object 컬럼 등 Arrow 타입으로 못 바꾸는 청크
+            table = None
+        if table is not None:
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return "arrow", (sink.getvalue().to_pybytes(), {str(k): str(v) for k, v in chunk.dtypes.items()})
+    return "pickle", chunk
+
+
+def _decode_rule_chunk(kind: str, payload: Any) -> pd.DataFrame:
+    if kind != "arrow":
+        return payload
+    data, dtypes = payload
+    chunk = pa.ipc.open_stream(data).read_all().to_pandas()
+    # object 컬럼이 Arrow 왕복 후 문자열 dtype으로 바뀌지 않도록 원래 dtype으로 되돌림 (_text_col 경로 동일)
+    return chunk.astype({col: dtype for col, dtype in dtypes.items() if str(chunk[col].dtype) != dtype})
+
+
+def _rule_chunk_worker(
+    encoded: Tuple[str, Any],
+    resolved: Dict[str, Any],
+    consistency_similarity: str,
+    consistency_max_runs: Optional[int],
+    options: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int, str]]]:
+    """프로세스 풀 워커 진입점 (모듈 최상위 함수여야 pickle 가능)."""
+    engine = ConsistencyEngine(tolerance_pct=options["tolerance_pct"], similarity=consistency_similarity)
+    return _build_rule_rows_chunk(
+        _decode_rule_chunk(*encoded), resolved, engine, consistency_max_runs, **options
+    )
+
+
+async def _build_rule_rows_parallel(
+    src: pd.DataFrame,
+    *,
+    workers: int,
+    chunk_rows: int = RULE_CHUNK_ROWS,
+    consistency_similarity: str = SIMILARITY_EXACT,
+    consistency_max_runs: Optional[int] = 3,
+    **options: Any,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int, str]]]:
+    """
+    columnar 규칙 단계를 프로세스 풀에 행 청크 단위로 나눠 계산. 결과는 입력 순서대로 이어 붙여 columnar와 동일.
+    - 이벤트 루프는 run_in_executor로 기다리기만 하므로 그동안 다른 코루틴(LLM 호출 등)이 계속 진행됨
+    - spawn 컨텍스트 사용: 스레드가 떠 있는 프로세스(Streamlit/aiohttp)를 fork하지 않음
+    - 일관성 프로필 캐시는 워커별로 따로 쌓임 (결과에는 영향 없음)
+    """
+    resolved = _resolve_rule_columns(list(src.columns))
+    step = max(1, min(int(chunk_rows), math.ceil(len(src) / workers)))
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        futures = [
+            loop.run_in_executor(
+                pool,
+                _rule_chunk_worker,
+                _encode_rule_chunk(src.iloc[start : start + step]),
+                resolved,
+                consistency_similarity,
+                consistency_max_runs,
+                options,
+            )
+            for start in range(0, len(src), step)
+        ]
+        results = await asyncio.gather(*futures)
+    finally:
+        # 워커 프로세스 종료 대기(join)도 루프 밖 스레드에서
+        await loop.run_in_executor(None, pool.shutdown)
+    row_infos: List[Dict[str, Any]] = []
+    llm_tasks: List[Tuple[str, int, str]] = []
+    for infos, tasks in results:
+        row_infos.extend(infos)
+        llm_tasks.extend(tasks)
+    return row_infos, llm_tasks
+
+
 async def run_aqb_scoring_async(
     df: pd.DataFrame,
     api_key: str,
@@ -1164,171 +1828,53 @@ async def run_aqb_scoring_async(
     use_consistency_llm: bool = True,
     consistency_min_runs: int = 3,
     consistency_under_min_policy: str = "two_run_proxy",  # zero | two_run_proxy
+    rule_chunk_rows: int = RULE_CHUNK_ROWS,
+    consistency_similarity: str = SIMILARITY_EXACT,  # exact | minhash
+    consistency_max_runs: Optional[int] = 3,  # None이면 전체 응답(N-way)으로 일관성 평가
+    rule_workers: int = 0,  # 2 이상이면 columnar 규칙 단계를 프로세스 풀(코어 수만큼)로 분산
 ) -> pd.DataFrame:
     """
     AQB v1.2.0 문항 점수 계산.
     - 문항 단위 지표 점수 산출
     - TTFT는 PASS/FAIL 컬럼만 산출 (종합 점수 미반영)
+    - 규칙 단계는 컬럼 단위(columnar)로 계산
+    - 일관성은 aqb_consistency 엔진 사용 (minhash 유사도, N회 평가는 columnar에서만 지원)
+    - rule_workers >= 2: 규칙 단계를 프로세스 풀로 분산 (PARALLEL_MIN_ROWS 미만이면 현재 프로세스에서 계산)
+      LLM 호출은 그대로 현재 이벤트 루프에서 비동기로 진행
     """
     src = normalize_columns(df)
     columns = list(src.columns)
 
-    id_col = _pick_col(columns, ["ID", "query_id", "질의ID"]) or "ID"
-    query_col = _pick_col(columns, ["질의", "query", "query_text"]) or "질의"
-
-    row_infos: List[Dict[str, Any]] = []
-    llm_tasks: List[Tuple[str, int, str]] = []
-
-    for idx, row in src.iterrows():
-        run_id = _collect_run_id(row, columns)
-        query_id = _to_str(row.get(id_col)) or f"row-{idx + 1}"
-        query_text = _to_str(row.get(query_col))
-
-        responses = _collect_response_texts(row)
-        response_times = _collect_response_times(row)
-        avg_response_time = _mean(response_times)
-
-        expected_filters = _collect_expected_filters(row, columns)
-        detected_filters = _collect_detected_filters(row, columns)
-        expected_datakeys = _collect_expected_datakeys(row, columns)
-        detected_datakeys = _collect_detected_datakeys(row, columns)
-        ground_truth_text = _collect_ground_truth_text(row, columns)
-
-        agent_type = _infer_agent_type(row, columns, expected_filters, expected_datakeys)
-
-        expected_calls = _inferred_expected_calls(row, columns, responses)
-        has_error_or_blank = _detect_error_or_blank(
-            row=row,
-            columns=columns,
-            responses=responses,
-            expected_calls=expected_calls,
-        )
-
-        # Accuracy
-        if agent_type in ("execution", "navigation", "execution_or_navigation"):
-            accuracy_score, accuracy_reason = _score_accuracy_execute(expected_datakeys, detected_datakeys)
-            mapping_grade, _mapping_note = _datakey_grade(expected_datakeys, detected_datakeys)
-            expected_conditions = expected_datakeys
-            detected_conditions = detected_datakeys
-        else:
-            accuracy_score, accuracy_reason = _score_accuracy_applicant(
-                expected_filters=expected_filters,
-                detected_filters=detected_filters,
-                responses=responses,
-                ground_truth_text=ground_truth_text,
-                tolerance_pct=tolerance_pct,
-            )
-            mapping_grade, _mapping_note = _filter_match_grade(expected_filters, detected_filters)
-            expected_conditions = expected_filters
-            detected_conditions = detected_filters
-
-        # Semantic (rule baseline)
-        semantic_score, semantic_reason = _score_semantic_rule(
-            mapping_grade=mapping_grade,
-            response_text=responses[0] if responses else "",
-            has_error_or_blank=has_error_or_blank,
-            agent_type=agent_type,
+    id_col = _pick_col(columns, _ID_ALIASES) or "ID"
+    query_col = _pick_col(columns, _QUERY_ALIASES) or "질의"
+
+    rule_options: Dict[str, Any] = {
+        "id_col": id_col,
+        "query_col": query_col,
+        "api_key": api_key,
+        "tolerance_pct": tolerance_pct,
+        "use_semantic_llm": use_semantic_llm,
+        "use_consistency_llm": use_consistency_llm,
+        "consistency_min_runs": consistency_min_runs,
+        "consistency_under_min_policy": consistency_under_min_policy,
+    }
+    if int(rule_workers or 0) >= 2 and len(src) >= PARALLEL_MIN_ROWS:
+        row_infos, llm_tasks = await _build_rule_rows_parallel(
+            src,
+            workers=int(rule_workers),
+            chunk_rows=rule_chunk_rows,
+            consistency_similarity=consistency_similarity,
+            consistency_max_runs=consistency_max_runs,
+            **rule_options,
         )
-
-        # Consistency (rule)
-        if len(responses) >= consistency_min_runs:
-            consistency_score, consistency_reason = _score_consistency_three(
-                responses=responses,
-                tolerance_pct=tolerance_pct,
-            )
-        else:
-            consistency_score, consistency_reason = _score_consistency_under_min(
-                responses=responses,
-                tolerance_pct=tolerance_pct,
-                policy=consistency_under_min_policy,
-                min_runs=consistency_min_runs,
-            )
-
-        # Speed
-        additional_tool_calls = _infer_additional_tool_calls(
-            row=row,
-            columns=columns,
-            expected_filters=expected_filters,
-            expected_datakeys=expected_datakeys,
+    else:
+        row_infos, llm_tasks = _build_rule_rows_columnar(
+            src,
+            chunk_rows=rule_chunk_rows,
+            consistency_similarity=consistency_similarity,
+            consistency_max_runs=consistency_max_runs,
+            **rule_options,
         )
-        single_score, single_reason = _score_speed_single(avg_response_time, has_error_or_blank)
-        multi_score, multi_reason = _score_speed_multi(avg_response_time, has_error_or_blank, agent_type)
-
-        if additional_tool_calls > 0:
-            speed_score = float(multi_score)
-            speed_reason = f"복수 도구 기준: {multi_reason}"
-        else:
-            speed_score = float(single_score)
-            speed_reason = f"단일 도구 기준: {single_reason}"
-
-        # Stability
-        stability_score, stability_reason = _score_stability(has_error_or_blank)
-
-        # TTFT (pass/fail only)
-        ttft = _collect_ttft(row, columns)
-        if ttft is None:
-            ttft_pass = "N/A"
-        else:
-            ttft_pass = "PASS" if ttft <= 1.0 else "FAIL"
-
-        row_info: Dict[str, Any] = {
-            "row_idx": int(idx),
-            "run_id": run_id,
-            "query_id": query_id,
-            "query_text": query_text,
-            "agent_type": agent_type,
-            "semantic_score": int(semantic_score),
-            "semantic_reason": semantic_reason,
-            "semantic_calc_method": "rule_based",
-            "consistency_score": int(consistency_score),
-            "consistency_reason": consistency_reason,
-            "consistency_calc_method": "rule_based",
-            "accuracy_score": int(accuracy_score),
-            "accuracy_reason": accuracy_reason,
-            "accuracy_calc_method": "rule_based",
-            "speed_score": float(speed_score),
-            "speed_reason": speed_reason,
-            "speed_calc_method": "rule_based",
-            "stability_score": int(stability_score),
-            "stability_reason": stability_reason,
-            "stability_calc_method": "rule_based",
-            "speed_single_score": int(single_score),
-            "speed_multi_score": int(multi_score),
-            "response_time_avg_sec": round(float(avg_response_time), 3) if avg_response_time is not None else "",
-            "additional_tool_calls": int(additional_tool_calls),
-            "ttft_pass": ttft_pass,
-            "response_error_or_blank": bool(has_error_or_blank),
-            "semantic_mapping_grade": mapping_grade,
-            "expected_conditions": expected_conditions,
-            "detected_conditions": detected_conditions,
-            "responses": responses,
-        }
-
-        if use_semantic_llm and api_key and responses and not has_error_or_blank:
-            llm_tasks.append(
-                (
-                    "semantic",
-                    int(idx),
-                    _semantic_prompt(
-                        query=query_text,
-                        expected_conditions=expected_conditions,
-                        detected_conditions=detected_conditions,
-                        response_text=responses[0],
-                        agent_type=agent_type,
-                    ),
-                )
-            )
-
-        if use_consistency_llm and api_key and len(responses) >= consistency_min_runs:
-            llm_tasks.append(
-                (
-                    "consistency",
-                    int(idx),
-                    _consistency_prompt(query=query_text, responses=responses, tolerance_pct=tolerance_pct),
-                )
-            )
-
-        row_infos.append(row_info)
 
     llm_results: Dict[Tuple[int, str], Tuple[Optional[int], str]] = {}
     if llm_tasks and api_key:
@@ -9,13 +9,24 @@ import aiohttp
 import pandas as pd
 
 from aqb_agent_client import AgentResponse, ApplicantAgentClient, parse_button_url
+from aqb_checkpoint import RowCheckpointLog, apply_checkpoint
 from aqb_openai_judge import (
     estimate_cost_usd,
     openai_judge_with_retry,
     postprocess_eval_json,
     derive_csv_fields_from_eval,
 )
-from aqb_prompt_template import safe_fill_template
+from aqb_orchestrator_client import RetryBudget
+from aqb_prompt_assembly import (
+    LAYOUT_INLINE,
+    PROMPT_LAYOUTS,
+    PromptCacheStats,
+    compile_template,
+    get_token_counter,
+    truncate_to_tokens,
+)
+from aqb_sse_manager import SseSubscriptionManager
+from aqb_usage_ledger import OpenAIUsageLedger, prompt_version_label
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     df.columns = [str(c).strip() for c in df.columns]
@@ -77,6 +88,9 @@ def build_surrogate_response_payload(row: pd.Series, prefix: str) -> Optional[Di
     }
 
 
+JUDGE_TEMPLATE_KEYS = ("query_id", "query", "expected_filters", "response_1", "response_2")
+
+
 async def run_applicant_calls_async(
     df: pd.DataFrame,
     client: ApplicantAgentClient,
@@ -88,6 +102,7 @@ async def run_applicant_calls_async(
     target_assistant: Optional[str] = None,
     independent_sessions: bool = False,
     auto_save_callback: Optional[Callable[[pd.DataFrame], None]] = None,
+    checkpoint_path: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     CSV df를 받아, 지원자 에이전트를 N차로 호출해 df에 컬럼을 채움.
@@ -97,7 +112,11 @@ async def run_applicant_calls_async(
     - context: API 호출 시 전달할 context 객체
     - target_assistant: 특정 어시스턴트 지정 (예: RECRUIT_PLAN_ASSISTANT)
     - independent_sessions: True면 호출마다 새 채팅방으로 실행(일관성 실험용)
-    - auto_save_callback: 10개 완료 시마다 호출되는 자동 저장 콜백
+    - auto_save_callback: 10개 완료 시마다 호출되는 자동 저장 콜백 (df 전체 직렬화)
+    - checkpoint_path: 행 결과를 완료 즉시 한 줄씩 덧붙이는 NDJSON 체크포인트 (aqb_checkpoint)
+        · 파일이 이미 있으면 재생해서 완료 행 값을 채우고 그 행은 다시 호출하지 않음(재개)
+        · 호출이 실패(err)한 행은 ok=False로 기록되어 재개 시 only_missing 규칙에 따라 다시 호출됨
+        · 끝나면 compact()로 행당 마지막 기록만 남김. 결과를 저장한 뒤 파일 삭제는 호출측 몫
     """
     df = df.copy()
 
@@ -112,12 +131,22 @@ async def run_applicant_calls_async(
             col_name = f"{prefix} {suffix}"
             if col_name not in df.columns:
                 df[col_name] = ""
+            # 답변 시간(float) 등 혼합 값을 행 단위로 넣으므로 object로 통일 (pandas 3의 str dtype은 float 대입 불가)
+            df[col_name] = df[col_name].astype(object)
+
+    # 체크포인트 재생: 이전 실행에서 끝난 행은 값을 채우고 대상에서 제외
+    checkpoint = RowCheckpointLog(checkpoint_path) if checkpoint_path else None
+    resumed = set()
+    if checkpoint is not None:
+        df, resumed = apply_checkpoint(df, checkpoint.replay(), id_col=id_col)
 
     # 대상 row 인덱스 구성
     target_idxs: List[int] = []
     for i, r in df.iterrows():
         if limit_rows is not None and len(target_idxs) >= limit_rows:
             break
+        if i in resumed:
+            continue
         if only_missing:
             # 첫 번째 호출 컬럼만 체크
             if not is_blank(r.get("1차 답변")):
@@ -126,68 +155,94 @@ async def run_applicant_calls_async(
 
     total = len(target_idxs)
     if total == 0:
+        if checkpoint is not None:
+            checkpoint.compact()
         return df
 
-    connector = aiohttp.TCPConnector(limit=50, ssl=False)
-    timeout = aiohttp.ClientTimeout(total=120)
-
-    done = 0
-    start_time = time.time()
-    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-        tasks = []
+    try:
+        connector = aiohttp.TCPConnector(limit=50, ssl=False)
+        timeout = aiohttp.ClientTimeout(total=120)
 
-        async def _run_one(idx: int):
-            async with client.semaphore:
-                query = str(df.loc[idx, query_col])
-                responses, err = await client.run_n_times(
-                    session, query, n_calls=n_calls,
-                    context=context,
-                    target_assistant=target_assistant,
-                    independent_sessions=independent_sessions,
-                )
-
-                out = {
-                    "idx": idx,
-                    "err": err,
-                    "responses": responses,
-                }
-                return out
-
-        for idx in target_idxs:
-            tasks.append(asyncio.create_task(_run_one(idx)))
-
-        for fut in asyncio.as_completed(tasks):
-            res = await fut
-            idx = res["idx"]
-            err = res["err"]
-            responses: List[Optional[AgentResponse]] = res["responses"]
-
-            # 각 호출 결과를 동적 컬럼에 저장
-            for i, resp in enumerate(responses):
-                if resp is None:
-                    continue
-                prefix = ordinals[i]
-                df.at[idx, f"{prefix} 답변"] = resp.assistant_message
-                df.at[idx, f"{prefix} 답변 시간(초)"] = round(resp.response_time_sec, 2) if resp.response_time_sec is not None else ""
-                df.at[idx, f"{prefix} 답변 raw"] = json.dumps(resp.assistant_payload, ensure_ascii=False)
-                df.at[idx, f"{prefix} buttonUrl"] = resp.button_url
-                parsed = parse_button_url(resp.button_url)
-                df.at[idx, f"{prefix} 감지된 필터"] = ",".join(parsed["filter_types"])
-
-            if err:
-                if "특이사항" not in df.columns:
-                    df["특이사항"] = ""
-                df.at[idx, "특이사항"] = str(err)
-
-            done += 1
-            elapsed = time.time() - start_time
-            if progress_cb:
-                progress_cb(done, total, f"[{df.loc[idx, id_col]}] calls done (err={bool(err)})", elapsed, done)
-
-            # 자동 저장: 10개 완료 시마다
-            if auto_save_callback and done % 10 == 0:
-                auto_save_callback(df)
+        done = 0
+        start_time = time.time()
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            tasks = []
+            # SSE 소켓은 커넥터 한도보다 적게 잡아 send_query용 연결이 항상 남도록 함
+            sse_manager = SseSubscriptionManager(
+                session, client.base_url, client.headers(for_sse=True), max_sockets=40,
+            )
+            # 재시도 총량은 run 전체 기준 (ATS 장애 시 행마다 재시도가 겹쳐 부하가 커지지 않게)
+            retry_budget = RetryBudget()
+
+            async def _run_one(idx: int):
+                async with client.semaphore:
+                    query = str(df.loc[idx, query_col])
+                    responses, err = await client.run_n_times(
+                        session, query, n_calls=n_calls,
+                        context=context,
+                        target_assistant=target_assistant,
+                        independent_sessions=independent_sessions,
+                        sse_manager=sse_manager,
+                        retry_budget=retry_budget,
+                    )
 
+                    out = {
+                        "idx": idx,
+                        "err": err,
+                        "responses": responses,
+                    }
+                    return out
+
+            for idx in target_idxs:
+                tasks.append(asyncio.create_task(_run_one(idx)))
+
+            for fut in asyncio.as_completed(tasks):
+                res = await fut
+                idx = res["idx"]
+                err = res["err"]
+                responses: List[Optional[AgentResponse]] = res["responses"]
+
+                # 각 호출 결과를 동적 컬럼에 저장
+                values: Dict[str, Any] = {}
+                for i, resp in enumerate(responses):
+                    if resp is None:
+                        continue
+                    prefix = ordinals[i]
+                    values[f"{prefix} 답변"] = resp.assistant_message
+                    values[f"{prefix} 답변 시간(초)"] = round(resp.response_time_sec, 2) if resp.response_time_sec is not None else ""
+                    values[f"{prefix} 답변 raw"] = json.dumps(resp.assistant_payload, ensure_ascii=False)
+                    values[f"{prefix} buttonUrl"] = resp.button_url
+                    parsed = parse_button_url(resp.button_url)
+                    values[f"{prefix} 감지된 필터"] = ",".join(parsed["filter_types"])
+
+                if err:
+                    if "특이사항" not in df.columns:
+                        df["특이사항"] = pd.Series("", index=df.index, dtype=object)
+                    values["특이사항"] = str(err)
+
+                for col, value in values.items():
+                    df.at[idx, col] = value
+                if checkpoint is not None:
+                    # 실패(err) 행은 ok=False로 남겨 재개 시 다시 호출되게 함
+                    checkpoint.append(idx, df.loc[idx, id_col] if id_col in df.columns else "", values, ok=not err)
+
+                done += 1
+                elapsed = time.time() - start_time
+                if progress_cb:
+                    progress_cb(done, total, f"[{df.loc[idx, id_col]}] calls done (err={bool(err)})", elapsed, done)
+
+                # 자동 저장: 10개 완료 시마다
+                if auto_save_callback and done % 10 == 0:
+                    auto_save_callback(df)
+
+            await sse_manager.aclose()
+
+        if checkpoint is not None:
+            checkpoint.compact()
+    finally:
+        # 실패/취소로 빠져나가도 append 파일 핸들은 닫음 (compact() 경로에서는 이미 닫혀 있음)
+        if checkpoint is not None:
+            checkpoint.close()
     return df
 
 
@@ -204,10 +259,29 @@ async def run_openai_judge_async(
     price_input_per_1m: float = 0.0,
     price_output_per_1m: float = 0.0,
     price_cached_input_per_1m: float = 0.0,
+    max_tokens_per_response: Optional[int] = None,
+    prompt_layout: str = LAYOUT_INLINE,
+    cache_stats: Optional[PromptCacheStats] = None,
+    usage_ledger_path: Optional[str] = None,
+    run_id: Optional[str] = None,
 ) -> Tuple[pd.DataFrame, int]:
     """
     df에 있는 1차/2차 raw를 바탕으로 OpenAI 평가를 수행하고, 결과 컬럼을 채움.
+
+    - 템플릿은 실행마다 한 번만 컴파일 (aqb_prompt_assembly)
+    - max_tokens_per_response: 있으면 응답 raw를 글자 수 대신 토큰 예산으로 자름
+    - prompt_layout="static_prefix": 템플릿을 앞에 고정하고 행별 값을 뒤에 붙여 OpenAI 프롬프트 캐시 적중
+    - cache_stats: 넘기면 이번 실행의 input/cached 토큰 합계를 누적 (캐시 비율 확인용)
+    - usage_ledger_path: 있으면 OpenAI 호출마다 사용량 원장(aqb_usage_ledger)에 한 줄씩 기록
+      (실패 호출 포함, prompt_version은 템플릿 해시, run_id 없으면 실행 시각으로 생성)
     """
+    if prompt_layout not in PROMPT_LAYOUTS:
+        raise ValueError(f"prompt_layout must be one of {', '.join(PROMPT_LAYOUTS)}")
+    compiled = compile_template(prompt_template, JUDGE_TEMPLATE_KEYS)
+    token_counter = get_token_counter()
+    if cache_stats is not None and not cache_stats.prefix_tokens:
+        cache_stats.prefix_tokens = token_counter.count(compiled.cacheable_prefix(prompt_layout))
+
     df = df.copy()
     df = normalize_columns(df)
 
@@ -282,6 +356,17 @@ async def run_openai_judge_async(
     if total == 0:
         return df, 0
 
+    ledger: Optional[OpenAIUsageLedger] = None
+    if usage_ledger_path:
+        ledger = OpenAIUsageLedger(
+            usage_ledger_path,
+            price_input_per_1m=price_input_per_1m,
+            price_output_per_1m=price_output_per_1m,
+            price_cached_input_per_1m=price_cached_input_per_1m,
+        )
+        run_id = run_id or f"judge_{time.strftime('%Y%m%d_%H%M%S')}"
+        prompt_version = prompt_version_label(prompt_template)
+
     sem = asyncio.Semaphore(max_parallel)
 
     timeout = aiohttp.ClientTimeout(total=120)
@@ -293,11 +378,16 @@ async def run_openai_judge_async(
                 query = str(df.loc[idx, query_col])
                 expected = str(df.loc[idx, expected_col])
 
-                r1_raw = truncate_text(str(df.loc[idx, "1차 답변 raw"]), max_chars_per_response)
-                r2_raw = truncate_text(str(df.loc[idx, "2차 답변 raw"]), max_chars_per_response)
+                r1_raw = str(df.loc[idx, "1차 답변 raw"])
+                r2_raw = str(df.loc[idx, "2차 답변 raw"])
+                if max_tokens_per_response:
+                    r1_raw = truncate_to_tokens(r1_raw, max_tokens_per_response, token_counter)
+                    r2_raw = truncate_to_tokens(r2_raw, max_tokens_per_response, token_counter)
+                else:
+                    r1_raw = truncate_text(r1_raw, max_chars_per_response)
+                    r2_raw = truncate_text(r2_raw, max_chars_per_response)
 
-                prompt_text = safe_fill_template(
-                    prompt_template,
+                prompt_text = compiled.render(
                     {
                         "query_id": qid,
                         "query": query,
@@ -305,10 +395,15 @@ async def run_openai_judge_async(
                         "response_1": r1_raw,
                         "response_2": r2_raw,
                     },
+                    layout=prompt_layout,
                 )
 
+                started = time.perf_counter()
                 eval_obj, usage, err = await openai_judge_with_retry(session, api_key, model, prompt_text)
-                return {"idx": idx, "qid": qid, "eval": eval_obj, "usage": usage, "err": err}
+                latency_ms = int((time.perf_counter() - started) * 1000)
+                if cache_stats is not None:
+                    cache_stats.add(usage)
+                return {"idx": idx, "qid": qid, "eval": eval_obj, "usage": usage, "err": err, "latency_ms": latency_ms}
 
         tasks = [asyncio.create_task(_judge_one(idx)) for idx in target_idxs]
 
@@ -321,6 +416,17 @@ async def run_openai_judge_async(
             eval_obj = res["eval"]
             usage = res.get("usage") or {}
 
+            if ledger is not None:
+                ledger.record(
+                    run_id=run_id,
+                    run_item_id=qid,
+                    model=model,
+                    prompt_version=prompt_version,
+                    usage=usage,
+                    latency_ms=res["latency_ms"],
+                    error="" if eval_obj is not None else err,
+                )
+
             if eval_obj is None:
                 df.at[idx, "특이사항"] = f"LLM 평가 실패: {err}"
             else:
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+import pandas as pd
+
+from aqb_ndjson_log import NdjsonAppendLog
+
+# ============================================================
+# 벌크 실행 행 단위 체크포인트 (append-only NDJSON)
+#  - 행 결과가 나올 때마다 한 줄({"idx", "id", "ok", "values"})만 덧붙여 씀 → 행당 O(1), 전체 df 재직렬화 없음
+#  - 재개: 로그를 재생(replay)해서 완료 행 값을 df에 채우고 해당 행은 다시 호출하지 않음
+#    (ok=False로 기록된 실패 행은 값만 채우고 재개 대상에서 빼서 다시 호출될 수 있게 함)
+#  - 같은 행이 여러 번 기록되면 마지막 줄이 우선, 중간에 끊겨 깨진 마지막 줄은 무시
+#  - compact(): 행당 마지막 기록만 남겨 임시 파일에 쓴 뒤 교체 (os.replace)
+# ============================================================
+
+
+def _json_value(value: Any) -> Any:
+    """numpy 스칼라/NaN 등을 JSON으로 안전하게 기록할 수 있는 값으로 변환."""
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, float):
+        return None if value != value else value
+    item = getattr(value, "item", None)
+    if callable(item):
+        return _json_value(item())
+    return str(value)
+
+
+def _index_key(idx: Hashable) -> Any:
+    value = _json_value(idx)
+    return value if isinstance(value, (str, int)) else str(value)
+
+
+class RowCheckpointLog:
+    """
+    행 결과 append-only 로그 (파일 처리는 aqb_ndjson_log.NdjsonAppendLog).
+    - append(): 한 줄 기록 후 flush (fsync=True면 OS 장애까지 대비해 매 줄 fsync)
+    - replay(): {idx: 기록} (행마다 마지막 기록)
+    - compact(): 중복 기록 제거
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self._log = NdjsonAppendLog(path, fsync=fsync)
+
+    def __enter__(self) -> "RowCheckpointLog":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def append(self, idx: Hashable, row_id: Any, values: Dict[str, Any], ok: bool = True) -> None:
+        self._log.append(
+            {
+                "idx": _index_key(idx),
+                "id": "" if row_id is None else str(row_id),
+                "ok": bool(ok),
+                "values": {str(k): _json_value(v) for k, v in values.items()},
+            }
+        )
+
+    def close(self) -> None:
+        self._log.close()
+
+    def replay(self) -> Dict[Any, Dict[str, Any]]:
+        records: Dict[Any, Dict[str, Any]] = {}
+        for record in self._log.read():
+            if "idx" not in record or not isinstance(record.get("values"), dict):
+                continue
+            records[record["idx"]] = record
+        return records
+
+    def compact(self) -> int:
+        """행당 마지막 기록만 남긴다. 남은 행 수 반환."""
+        self.close()
+        if not os.path.exists(self.path):
+            return 0
+        records = self.replay()
+        self._log.rewrite(records.values())
+        return len(records)
+
+
+def apply_checkpoint(
+    df: pd.DataFrame,
+    records: Dict[Any, Dict[str, Any]],
+    id_col: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Set[Hashable]]:
+    """
+    replay() 결과를 df에 채운다 (df는 제자리 수정).
+    id_col이 있으면 기록 시점의 ID가 같은 행에만 적용 (다른 CSV의 로그를 잘못 재생하지 않도록).
+    반환: (df, 완료 행 인덱스 집합) - ok=False 기록(호출 실패 행)은 값만 채우고 집합에서 제외
+    ("ok" 키가 없는 이전 형식 기록은 완료로 간주)
+    """
+    applied: Set[Hashable] = set()
+    if not records:
+        return df, applied
+    keys = {_index_key(idx): idx for idx in df.index}
+    for key, record in records.items():
+        idx = keys.get(key)
+        if idx is None:
+            continue
+        if id_col and id_col in df.columns and str(df.at[idx, id_col]) != str(record.get("id", "")):
+            continue
+        for col, value in record["values"].items():
+            if col not in df.columns:
+                df[col] = pd.Series("", index=df.index, dtype=object)
+            df.at[idx, col] = "" if value is None else value
+        if record.get("ok", True):
+            applied.add(idx)
+    return df, applied
+
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ============================================================
+# 응답 일관성(N-way) 엔진
+#  - 응답마다 토큰 집합/숫자 목록을 한 번만 추출해 ResponseProfile로 캐시 (쌍마다 재토큰화/재추출 없음)
+#  - 유사도: similarity="exact"는 토큰 집합 Jaccard(기존 규칙과 동일한 값),
+#            similarity="minhash"는 MinHash 서명 일치율(추정값)을 전체 쌍에 대해 한 번에(행렬) 계산,
+#            응답 수가 lsh_min_runs 이상이면 LSH 밴드 버킷으로 후보 쌍만 비교
+#  - 점수: 3회면 AQB v1.2.0 일관성 루브릭과 동일, N회는 같은 기준을 쌍 비율/과반 그룹으로 일반화
+#  - agent_qa/aqb_consistency.py 와 backoffice app/lib/aqb_consistency.py 가 같은 내용
+# ============================================================
+
+SIMILARITY_EXACT = "exact"
+SIMILARITY_MINHASH = "minhash"
+SIMILARITY_MODES = (SIMILARITY_EXACT, SIMILARITY_MINHASH)
+
+DEFAULT_CONCLUSION_THRESHOLD = 0.45
+
+_TOKEN_RE = re.compile(r"[a-z0-9가-힣]+")
+# 기존 규칙과 같은 숫자 패턴에서 '%'만 그룹 밖으로 뺌 (findall이 숫자 부분만 돌려줌)
+_NUMBER_RE = re.compile(r"([-+]?\d{1,3}(?:,\d{3})*(?:\.\d+)?|[-+]?\d+(?:\.\d+)?)%?")
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+NUM_EXACT = "exact"
+NUM_WITHIN_TOL = "within_tol"
+NUM_NO_NUMBERS = "no_numbers"
+NUM_MISMATCH = "mismatch"
+
+
+def tokenize(text: str) -> frozenset:
+    s = str(text or "").strip().lower()
+    if not s:
+        return frozenset()
+    return frozenset(t for t in _TOKEN_RE.findall(s) if len(t) > 1)
+
+
+def extract_numbers(text: str) -> Tuple[float, ...]:
+    s = str(text or "").strip()
+    if not s:
+        return ()
+    # 패턴상 쉼표 제거 후 항상 float 변환 가능
+    return tuple(float(tok.replace(",", "")) if "," in tok else float(tok) for tok in _NUMBER_RE.findall(s))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    union = len(a) + len(b) - inter
+    return float(inter) / float(union) if union else 0.0
+
+
+def _relative_close(a: float, b: float, tolerance_pct: float) -> bool:
+    base = max(abs(a), abs(b), 1e-9)
+    return (abs(a - b) / base) <= (tolerance_pct / 100.0)
+
+
+def numeric_state(a: Sequence[float], b: Sequence[float], tolerance_pct: float) -> str:
+    """앞에서부터 같은 위치의 숫자끼리 비교: exact / within_tol / no_numbers / mismatch."""
+    if not a and not b:
+        return NUM_NO_NUMBERS
+    if not a or not b:
+        return NUM_MISMATCH
+
+    exact = True
+    tol = True
+    for va, vb in zip(a, b):
+        if va != vb:
+            exact = False
+        if not _relative_close(va, vb, tolerance_pct=tolerance_pct):
+            tol = False
+
+    if exact:
+        return NUM_EXACT
+    if tol:
+        return NUM_WITHIN_TOL
+    return NUM_MISMATCH
+
+
+class MinHasher:
+    """토큰 집합 -> MinHash 서명 (crc32 토큰 해시 + (a*x+b) mod 2^61-1 순열, 32bit)."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        if num_perm <= 0:
+            raise ValueError("num_perm must be positive")
+        rng = np.random.RandomState(seed)
+        self.num_perm = int(num_perm)
+        # a, b < 2^31 이고 토큰 해시 < 2^32 이므로 a*x+b 는 uint64에서 넘치지 않음
+        self._a = rng.randint(1, 1 << 31, size=self.num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=self.num_perm).astype(np.uint64)
+        self._token_hashes: Dict[str, int] = {}
+
+    def _token_hash(self, token: str) -> int:
+        value = self._token_hashes.get(token)
+        if value is None:
+            value = self._token_hashes[token] = zlib.crc32(token.encode("utf-8"))
+        return value
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter((self._token_hash(t) for t in tokens), dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+class ResponseProfile:
+    __slots__ = ("text", "tokens", "numbers", "signature")
+
+    def __init__(self, text: str, tokens: frozenset, numbers: Tuple[float, ...], signature: Optional[np.ndarray]):
+        self.text = text
+        self.tokens = tokens
+        self.numbers = numbers
+        self.signature = signature
+
+
+class ConsistencyEngine:
+    """
+    반복 응답 간 일관성 평가.
+    - profile(): 응답 1건을 한 번만 토큰화/숫자 추출 (같은 텍스트는 캐시 재사용)
+    - pair(): 두 응답의 (결론 일치 여부, 숫자 상태)
+    - score(): N회 응답 일관성 점수(0~5)와 근거. 3회면 AQB v1.2.0 루브릭과 같은 결과/문구
+    - summarize(): 점수 + 쌍 단위 결론/숫자 일치 비율
+    """
+
+    def __init__(
+        self,
+        tolerance_pct: float = 1.0,
+        threshold: float = DEFAULT_CONCLUSION_THRESHOLD,
+        similarity: str = SIMILARITY_EXACT,
+        num_perm: int = 64,
+        bands: int = 32,
+        seed: int = 1,
+        lsh_min_runs: int = 64,
+    ):
+        if similarity not in SIMILARITY_MODES:
+            raise ValueError(f"similarity must be one of {', '.join(SIMILARITY_MODES)}")
+        if similarity == SIMILARITY_MINHASH and (bands <= 0 or num_perm % bands):
+            raise ValueError("num_perm must be a positive multiple of bands")
+        self.tolerance_pct = float(tolerance_pct)
+        self.threshold = float(threshold)
+        self.similarity = similarity
+        self.bands = int(bands)
+        self.lsh_min_runs = int(lsh_min_runs)
+        self._hasher = MinHasher(num_perm=num_perm, seed=seed) if similarity == SIMILARITY_MINHASH else None
+        self._cache: Dict[str, ResponseProfile] = {}
+
+    # -----------------------------
+    # 응답 프로필 / 쌍 비교
+    # -----------------------------
+    def profile(self, text: str) -> ResponseProfile:
+        key = str(text or "")
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        tokens = tokenize(key)
+        signature = self._hasher.signature(tokens) if self._hasher is not None else None
+        profile = ResponseProfile(key, tokens, extract_numbers(key), signature)
+        self._cache[key] = profile
+        return profile
+
+    def profiles(self, texts: Iterable[str]) -> List[ResponseProfile]:
+        return [self.profile(text) for text in texts]
+
+    def similarity_of(self, a: ResponseProfile, b: ResponseProfile) -> float:
+        if a.signature is None or b.signature is None or not a.tokens or not b.tokens:
+            return jaccard(a.tokens, b.tokens)
+        return float(np.count_nonzero(a.signature == b.signature)) / float(a.signature.size)
+
+    def pair(self, a: ResponseProfile, b: ResponseProfile) -> Tuple[bool, str]:
+        same_conclusion = self.similarity_of(a, b) >= self.threshold
+        return same_conclusion, numeric_state(a.numbers, b.numbers, self.tolerance_pct)
+
+    def _signature_similarities(self, profiles: Sequence[ResponseProfile]) -> np.ndarray:
+        """minhash 모드 전체 쌍 유사도 행렬 (n x n x num_perm 비교 한 번). 빈 응답 규칙은 jaccard와 동일."""
+        signatures = np.stack([p.signature for p in profiles])
+        sims = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+        empty = np.fromiter((not p.tokens for p in profiles), dtype=bool, count=len(profiles))
+        sims[empty[:, None] & empty[None, :]] = 1.0
+        sims[empty[:, None] ^ empty[None, :]] = 0.0
+        return sims
+
+    def _candidate_pairs(self, profiles: Sequence[ResponseProfile]) -> Optional[set]:
+        """
+        minhash 모드 + 응답 수 lsh_min_runs 이상: LSH 밴드 버킷이 하나라도 겹치는 쌍만 후보. 그 외는 None(전체 쌍).
+        기본 32밴드 x 2행이면 후보 임계가 Jaccard 약 0.18 → 결론 임계(0.45) 근처 쌍은 거의 놓치지 않음.
+        """
+        if self._hasher is None or len(profiles) < self.lsh_min_runs:
+            return None
+        rows = self._hasher.num_perm // self.bands
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        empty: List[int] = []
+        for i, profile in enumerate(profiles):
+            if not profile.tokens:
+                empty.append(i)
+                continue
+            for band in range(self.bands):
+                key = (band, profile.signature[band * rows : (band + 1) * rows].tobytes())
+                buckets.setdefault(key, []).append(i)
+
+        candidates = set()
+        for members in list(buckets.values()) + [empty]:
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    candidates.add((members[x], members[y]))
+        return candidates
+
+    def pair_matrix(self, profiles: Sequence[ResponseProfile]) -> Dict[Tuple[int, int], Tuple[bool, Optional[str]]]:
+        """모든 i<j 쌍의 (결론 일치, 숫자 상태). 결론이 다르면 숫자 상태는 계산하지 않는다(None)."""
+        candidates = self._candidate_pairs(profiles)
+        sims = (
+            self._signature_similarities(profiles)
+            if self._hasher is not None and candidates is None and len(profiles) > 1
+            else None
+        )
+        out: Dict[Tuple[int, int], Tuple[bool, Optional[str]]] = {}
+        for i in range(len(profiles)):
+            for j in range(i + 1, len(profiles)):
+                if candidates is not None and (i, j) not in candidates:
+                    out[(i, j)] = (False, None)
+                    continue
+                similarity = sims[i, j] if sims is not None else self.similarity_of(profiles[i], profiles[j])
+                same = similarity >= self.threshold
+                state = numeric_state(profiles[i].numbers, profiles[j].numbers, self.tolerance_pct) if same else None
+                out[(i, j)] = (same, state)
+        return out
+
+    # -----------------------------
+    # 점수
+    # -----------------------------
+    def score(
+        self,
+        texts: Sequence[str],
+        max_runs: Optional[int] = 3,
+        min_runs: int = 3,
+    ) -> Tuple[int, str]:
+        """max_runs=None이면 주어진 응답 전체(N-way)로 평가."""
+        selected = list(texts if max_runs is None else texts[:max_runs])
+        if len(selected) < min_runs or len(selected) < 2:
+            return 0, f"{min_runs}회 응답이 없어 일관성 평가 불가"
+        score, reason, _stats = self._score_profiles(self.profiles(selected))
+        return score, reason
+
+    def summarize(self, texts: Sequence[str]) -> Optional[Dict[str, object]]:
+        selected = [str(t) for t in texts if str(t or "").strip()]
+        if len(selected) < 2:
+            return None
+        score, reason, stats = self._score_profiles(self.profiles(selected))
+        return {"runs": len(selected), "score": score, "reason": reason, **stats}
+
+    def _score_profiles(self, profiles: Sequence[ResponseProfile]) -> Tuple[int, str, Dict[str, float]]:
+        n = len(profiles)
+        matrix = self.pair_matrix(profiles)
+        total = len(matrix)
+        conclusion_edges = [pair for pair, (same, _state) in matrix.items() if same]
+        exact_edges = [pair for pair, (same, state) in matrix.items() if same and state == NUM_EXACT]
+        tol_count = sum(
+            1 for same, state in matrix.values() if same and state in (NUM_EXACT, NUM_WITHIN_TOL, NUM_NO_NUMBERS)
+        )
+        mismatch_edges = [pair for pair, (same, state) in matrix.items() if same and state == NUM_MISMATCH]
+        stats = {
+            "pairAgreement": round(len(conclusion_edges) / total, 4),
+            "numericAgreement": round(tol_count / total, 4),
+        }
+
+        all_conclusion = len(conclusion_edges) == total
+        if all_conclusion and len(exact_edges) == total:
+            return 5, f"{n}회 모두 숫자/결론 일치", stats
+        if all_conclusion and tol_count == total:
+            return 4, f"{n}회 결론 일치 + 숫자 허용오차(±{self.tolerance_pct:.1f}%) 이내", stats
+
+        # 숫자+결론이 일치하는 과반 그룹 (3회면 '한 쌍이라도 일치'와 같음)
+        exact_group = max((len(c) for c in _components(n, exact_edges)), default=1)
+        if exact_edges and exact_group * 2 > n:
+            label = "2회는" if n == 3 else f"{exact_group}회는"
+            return 3, f"{n}회 중 {label} 숫자+결론 일치", stats
+
+        # 결론만 일치하는 과반 그룹 안에 숫자 불일치 쌍이 있는 경우
+        for component in _components(n, conclusion_edges):
+            if len(component) * 2 > n and any(i in component and j in component for i, j in mismatch_edges):
+                label = "2회" if n == 3 else f"{len(component)}회"
+                return 2, f"{n}회 중 {label} 결론은 유사하나 숫자 불일치", stats
+
+        if all_conclusion and not exact_edges and tol_count == 0:
+            return 1, f"{n}회 결론은 유사하나 숫자가 매번 다름", stats
+        return 0, f"{n}회 응답이 상이", stats
+
+
+def _components(n: int, edges: Sequence[Tuple[int, int]]) -> List[set]:
+    parent = list(range(n))
+
+    def _find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in edges:
+        ri, rj = _find(i), _find(j)
+        if ri != rj:
+            parent[ri] = rj
+
+    groups: Dict[int, set] = {}
+    for i in range(n):
+        groups.setdefault(_find(i), set()).add(i)
+    return list(groups.values())
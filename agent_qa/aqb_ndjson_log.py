@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+# ============================================================
+# append-only NDJSON 로그 (aqb_checkpoint 행 체크포인트, aqb_usage_ledger 사용량 원장 공용)
+#  - append(): 레코드 한 줄을 덧붙이고 flush (fsync=True면 매 줄 fsync) → 중단돼도 앞선 줄은 남음
+#  - 파일 핸들은 첫 append 때 열고 close()까지 유지
+#  - 이전 실행이 줄 중간에서 끊겼으면 새 기록을 다음 줄부터 씀
+#  - read(): 깨진 줄(쓰는 도중 중단)과 dict가 아닌 줄은 건너뜀
+#  - rewrite(): 임시 파일에 쓴 뒤 os.replace로 교체 (compact 용)
+# ============================================================
+
+
+def ends_without_newline(path: str) -> bool:
+    """파일이 비어 있지 않고 마지막 바이트가 줄바꿈이 아니면 True."""
+    with open(path, "rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        if fh.tell() == 0:
+            return False
+        fh.seek(-1, os.SEEK_END)
+        return fh.read(1) != b"\n"
+
+
+class NdjsonAppendLog:
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._fh = None
+
+    def __enter__(self) -> "NdjsonAppendLog":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        if self._fh is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+            if ends_without_newline(self.path):
+                # 이전 실행이 줄 중간에서 끊긴 경우 다음 기록이 깨진 줄에 이어 붙지 않도록
+                self._fh.write("\n")
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def read(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        records: List[Dict[str, Any]] = []
+        with open(self.path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 쓰는 도중 중단된 줄
+                    continue
+                if isinstance(record, dict):
+                    records.append(record)
+        return records
+
+    def rewrite(self, records: Iterable[Dict[str, Any]]) -> None:
+        """기존 내용을 records로 원자적으로 교체한다 (열린 append 핸들은 먼저 닫음)."""
+        self.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            for record in records:
+                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
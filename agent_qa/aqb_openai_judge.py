@@ -46,17 +46,25 @@ def extract_usage_fields(resp_json: Dict[str, Any]) -> Dict[str, int]:
     }
 
 
-def estimate_cost_usd(
-    usage: Dict[str, int],
+def add_usage(total: Dict[str, int], usage: Dict[str, int]) -> Dict[str, int]:
+    """재시도한 시도의 usage를 total에 더한다 (실패한 시도도 과금되므로 모두 합산)."""
+    for key, value in (usage or {}).items():
+        total[key] = total.get(key, 0) + int(value or 0)
+    return total
+
+
+def token_cost_usd(
+    input_tokens: float,
+    cached_tokens: float,
+    output_tokens: float,
     price_input_per_1m: float,
     price_output_per_1m: float,
     price_cached_input_per_1m: float,
 ) -> float:
-    if not usage:
-        return 0.0
-    inp = float(usage.get("input_tokens", 0) or 0)
-    out = float(usage.get("output_tokens", 0) or 0)
-    cached = float(usage.get("cached_tokens", 0) or 0)
+    """cached_tokens는 input_tokens에 포함된 값이므로 그 부분만 캐시 단가로 계산한다."""
+    inp = float(input_tokens or 0)
+    out = float(output_tokens or 0)
+    cached = float(cached_tokens or 0)
     uncached = max(0.0, inp - cached)
 
     cost = 0.0
@@ -67,6 +75,26 @@ def estimate_cost_usd(
     if price_output_per_1m > 0:
         cost += (out / 1_000_000.0) * float(price_output_per_1m)
     return float(cost)
+
+
+def estimate_cost_usd(
+    usage: Dict[str, int],
+    price_input_per_1m: float,
+    price_output_per_1m: float,
+    price_cached_input_per_1m: float,
+) -> float:
+    if not usage:
+        return 0.0
+    return token_cost_usd(
+        usage.get("input_tokens", 0),
+        usage.get("cached_tokens", 0),
+        usage.get("output_tokens", 0),
+        price_input_per_1m,
+        price_output_per_1m,
+        price_cached_input_per_1m,
+    )
+
+
 def extract_openai_output_text(resp_json: Dict[str, Any]) -> str:
     """
     Responses API 응답에서 텍스트를 최대한 안전하게 추출.
@@ -228,19 +256,18 @@ async def openai_judge_with_retry(
 ) -> Tuple[Optional[Dict[str, Any]], Dict[str, int], str]:
     wait = 2.0
     last_err = ""
-    last_usage: Dict[str, int] = {}
+    total_usage: Dict[str, int] = {}
 
     for _attempt in range(max_retries + 1):
         result, usage, err = await openai_judge_once(session, api_key, model, prompt_text)
-        if usage:
-            last_usage = usage
+        add_usage(total_usage, usage)
         if result is not None and not err:
-            return result, last_usage, ""
+            return result, total_usage, ""
         last_err = err or "unknown"
         await asyncio.sleep(wait)
         wait *= 2
 
-    return None, last_usage, last_err
+    return None, total_usage, last_err
 
 
 def postprocess_eval_json(
@@ -0,0 +1,977 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from aqb_sse_parser import iter_sse_events
+
+# ============================================================
+# ATS Orchestrator 공용 비동기 클라이언트
+#  - 백엔드 3종을 하나의 인터페이스(call)로 제공
+#      * sync      : POST /api/v1/ai/prompt/orchestrator/test (worker 체인 동기 응답)
+#      * query_sse : POST /api/v2/ai/orchestrator/query + chat-room SSE 구독
+#      * query     : POST /api/v2/ai/orchestrator/query (conversationId만 반환)
+#  - 세션 풀: 호출 시 session을 넘기지 않으면 클라이언트가 소유한 세션(커넥터 공유)을 재사용
+#  - 응답은 __slots__ 기반 AgentTurn 하나로 통일 (기존 dict/dataclass 계약은 변환 메서드로 유지)
+#  - 오류는 문자열(error) + 분류(error_kind)로 반환 → 재시도 가능/불가를 호출자가 구분 가능
+#  - 재시도는 RetryPolicy(decorrelated jitter)로 교체 가능, RetryBudget으로 run 단위 재시도 총량 제한
+#  - 환경(base_url)별 CircuitBreaker를 프로세스 전역으로 공유, Deadline으로 남은 시간만큼만 호출/재시도
+#  - 호출 지표는 ClientMetrics에 누적
+#  - backoffice(app/lib/aqb_orchestrator_client.py)에도 같은 내용으로 복사해 사용
+# ============================================================
+
+QUERY_PATH = "/api/v2/ai/orchestrator/query"
+SYNC_TEST_PATH = "/api/v1/ai/prompt/orchestrator/test"
+SSE_SUBSCRIBE_PATH = "/api/v1/ai/orchestrator/chat-room/sse/subscribe"
+
+BACKEND_SYNC = "sync"
+BACKEND_QUERY_SSE = "query_sse"
+BACKEND_QUERY = "query"
+BACKENDS = (BACKEND_SYNC, BACKEND_QUERY_SSE, BACKEND_QUERY)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# -----------------------------
+# 오류 분류
+# -----------------------------
+ERROR_CONNECT = "connect"            # 연결 자체 실패 → 요청이 서버에 닿지 않음
+ERROR_TRANSPORT = "transport"        # 연결 후 끊김 → 서버가 처리했을 수도 있음
+ERROR_TIMEOUT = "timeout"
+ERROR_THROTTLED = "throttled"        # 429
+ERROR_SERVER = "server"              # 5xx
+ERROR_AUTH = "auth"                  # 401/403 (토큰 만료 등, 재시도 무의미)
+ERROR_CLIENT = "client"              # 그 외 4xx
+ERROR_PROTOCOL = "protocol"          # 응답 형식 오류, SSE가 assistant 없이 종료 등
+ERROR_CIRCUIT_OPEN = "circuit_open"  # 환경 차단 중이라 호출하지 않음
+ERROR_DEADLINE = "deadline"          # 남은 시간 없음
+
+RETRYABLE_ERRORS = frozenset({ERROR_CONNECT, ERROR_TRANSPORT, ERROR_TIMEOUT, ERROR_THROTTLED, ERROR_SERVER, ERROR_PROTOCOL})
+# 같은 대화에 메시지가 중복으로 쌓이면 안 되는 호출(비멱등)은 "서버에 닿지 않았다"가 확실한 오류만 재시도
+UNDELIVERED_ERRORS = frozenset({ERROR_CONNECT, ERROR_THROTTLED})
+UNDELIVERED_STATUSES = frozenset({502, 503})
+# 위 분류는 메시지 전송 단계 오류에만 적용 (SSE 구독 단계 오류는 POST가 이미 성공한 뒤)
+UNDELIVERED_STAGES = frozenset({"send", "sync"})
+# 환경 장애로 보고 circuit breaker 실패로 세는 오류
+BREAKER_FAILURE_ERRORS = frozenset({ERROR_CONNECT, ERROR_TRANSPORT, ERROR_TIMEOUT, ERROR_SERVER})
+
+
+def classify_http_status(status: int) -> str:
+    if status == 429:
+        return ERROR_THROTTLED
+    if status in (401, 403):
+        return ERROR_AUTH
+    if status >= 500:
+        return ERROR_SERVER
+    return ERROR_CLIENT
+
+
+def classify_exception(exc: BaseException) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return ERROR_TIMEOUT
+    if isinstance(exc, (aiohttp.ClientConnectorError, aiohttp.ClientProxyConnectionError)):
+        return ERROR_CONNECT
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return classify_http_status(exc.status)
+    if isinstance(exc, (aiohttp.ClientPayloadError, aiohttp.ContentTypeError, ValueError)):
+        return ERROR_PROTOCOL
+    if isinstance(exc, (aiohttp.ClientError, OSError)):
+        return ERROR_TRANSPORT
+    return ERROR_PROTOCOL
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        return None
+
+
+class AgentTurn:
+    """오케스트레이터 1회 호출 결과 (백엔드 공통)."""
+
+    __slots__ = (
+        "backend",
+        "conversation_id",
+        "assistant_message",
+        "data_ui_list",
+        "guide_list",
+        "execution_processes",
+        "workers",
+        "worker_ms_map",
+        "response_time_sec",
+        "connect_time",
+        "chat_time",
+        "raw_event",
+        "raw_events",
+        "attempts",
+        "error",
+        "error_kind",
+        "status",
+        "stage",
+        "retry_after_sec",
+    )
+
+    def __init__(
+        self,
+        backend: str,
+        conversation_id: str = "",
+        assistant_message: str = "",
+        data_ui_list: Optional[List[Dict[str, Any]]] = None,
+        guide_list: Optional[List[Dict[str, Any]]] = None,
+        execution_processes: Optional[List[Dict[str, Any]]] = None,
+        workers: Optional[List[Dict[str, Any]]] = None,
+        worker_ms_map: Optional[Dict[str, float]] = None,
+        response_time_sec: Optional[float] = None,
+        connect_time: Optional[datetime] = None,
+        chat_time: Optional[datetime] = None,
+        raw_event: Optional[Dict[str, Any]] = None,
+        raw_events: Optional[List[Dict[str, Any]]] = None,
+        attempts: int = 1,
+        error: str = "",
+        error_kind: str = "",
+        status: Optional[int] = None,
+        stage: str = "",
+        retry_after_sec: Optional[float] = None,
+    ):
+        self.backend = backend
+        self.conversation_id = conversation_id
+        self.assistant_message = assistant_message
+        self.data_ui_list = data_ui_list if data_ui_list is not None else []
+        self.guide_list = guide_list if guide_list is not None else []
+        self.execution_processes = execution_processes if execution_processes is not None else []
+        self.workers = workers if workers is not None else []
+        self.worker_ms_map = worker_ms_map if worker_ms_map is not None else {}
+        self.response_time_sec = response_time_sec
+        self.connect_time = connect_time
+        self.chat_time = chat_time
+        self.raw_event = raw_event
+        self.raw_events = raw_events if raw_events is not None else []
+        self.attempts = attempts
+        self.error = error
+        self.error_kind = error_kind
+        self.status = status
+        self.stage = stage
+        self.retry_after_sec = retry_after_sec
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    @property
+    def retryable(self) -> bool:
+        return bool(self.error) and self.error_kind in RETRYABLE_ERRORS
+
+    @property
+    def delivered(self) -> bool:
+        """요청이 서버에 닿았을 가능성이 있는지 (비멱등 호출 재시도 판단용)."""
+        if not self.error or self.stage not in UNDELIVERED_STAGES:
+            return True
+        return not (self.error_kind in UNDELIVERED_ERRORS or self.status in UNDELIVERED_STATUSES)
+
+    @property
+    def button_url(self) -> str:
+        for ui in self.data_ui_list or []:
+            ui_value = (ui or {}).get("uiValue", {}) or {}
+            if "buttonUrl" in ui_value:
+                return str(ui_value["buttonUrl"])
+        return ""
+
+    def to_sync_dict(self) -> Dict[str, Any]:
+        """test_orchestrator_sync 의 기존 dict 계약."""
+        return {
+            "conversation_id": self.conversation_id,
+            "assistant_message": self.assistant_message,
+            "data_ui_list": self.data_ui_list,
+            "guide_list": self.guide_list,
+            "execution_processes": self.execution_processes,
+            "workers": self.workers,
+            "worker_ms_map": self.worker_ms_map,
+            "response_time_sec": self.response_time_sec,
+            "error": self.error,
+            "error_kind": self.error_kind,
+            "attempts": self.attempts,
+        }
+
+    def to_sse_dict(self) -> Dict[str, Any]:
+        """subscribe_sse_extended 의 기존 dict 계약."""
+        return {
+            "conversation_id": self.conversation_id,
+            "connect_time": self.connect_time,
+            "chat_time": self.chat_time,
+            "response_time_sec": self.response_time_sec,
+            "assistant_message": self.assistant_message,
+            "data_ui_list": self.data_ui_list,
+            "guide_list": self.guide_list,
+            "execution_processes": self.execution_processes,
+            "raw_events": self.raw_events,
+            "error": self.error,
+            "error_kind": self.error_kind,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"AgentTurn(backend={self.backend!r}, conversation_id={self.conversation_id!r}, "
+            f"response_time_sec={self.response_time_sec!r}, error={self.error!r}, error_kind={self.error_kind!r})"
+        )
+
+
+def parse_sync_response(data: Dict[str, Any]) -> AgentTurn:
+    """sync 테스트 API 응답(worker 체인)을 AgentTurn으로 변환."""
+    workers = data.get("worker", []) or []
+    execution_processes: List[Dict[str, Any]] = []
+    worker_ms_map: Dict[str, float] = {}
+    worker_type_count: Dict[str, int] = {}
+    total_ms = 0.0
+
+    for w in workers:
+        worker_type = str((w or {}).get("type", "") or "")
+        output = (w or {}).get("output", {}) or {}
+        try:
+            ms_float = float((w or {}).get("ms", 0))
+        except Exception:
+            ms_float = 0.0
+        total_ms += ms_float
+
+        seq = worker_type_count.get(worker_type, 0)
+        worker_type_count[worker_type] = seq + 1
+        worker_ms_map[f"{worker_type}#{seq}"] = ms_float
+
+        summary = worker_type
+        sub_worker = output.get("subWorker") if isinstance(output, dict) else None
+        if sub_worker:
+            summary = f"{worker_type} -> {sub_worker}"
+        execution_processes.append(
+            {
+                "messageSummary": summary,
+                "workerType": worker_type,
+                "ms": ms_float,
+                "index": len(execution_processes),
+            }
+        )
+
+    # 체인 마지막에서 assistantMessage/dataUIList/guideList를 우선 탐색
+    assistant_message = ""
+    data_ui_list: List[Dict[str, Any]] = []
+    guide_list: List[Dict[str, Any]] = []
+    for w in reversed(workers):
+        output = (w or {}).get("output", {}) or {}
+        if not isinstance(output, dict):
+            continue
+        msg = output.get("assistantMessage")
+        if msg:
+            assistant_message = str(msg)
+            data_ui_list = output.get("dataUIList", []) or []
+            guide_list = output.get("guideList", []) or []
+            break
+
+    return AgentTurn(
+        BACKEND_SYNC,
+        conversation_id=str(data.get("conversationId", "") or ""),
+        assistant_message=assistant_message,
+        data_ui_list=data_ui_list,
+        guide_list=guide_list,
+        execution_processes=execution_processes,
+        workers=workers,
+        worker_ms_map=worker_ms_map,
+        response_time_sec=round(total_ms / 1000.0, 4),
+    )
+
+
+class RetryPolicy:
+    """
+    교체 가능한 재시도 정책. 기본값은 재시도 없음.
+    - should_retry(turn, idempotent): 재시도 가능한 오류이고, 비멱등 호출이면 서버에 닿지 않은 오류일 때만
+    - next_delay(previous_delay, turn): decorrelated jitter, min(max_delay, uniform(base, previous * 3))
+      → 같은 시점에 실패한 호출들이 같은 간격으로 다시 몰리지 않음. 429의 Retry-After는 하한으로 존중
+    """
+
+    __slots__ = ("max_retries", "base_delay_sec", "max_delay_sec", "_random")
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        base_delay_sec: float = 2.0,
+        max_delay_sec: float = 20.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay_sec = max(0.0, float(base_delay_sec))
+        self.max_delay_sec = max(self.base_delay_sec, float(max_delay_sec))
+        self._random = rng or random.Random()
+
+    def should_retry(self, turn: AgentTurn, idempotent: bool = True) -> bool:
+        if not turn.retryable:
+            return False
+        return idempotent or not turn.delivered
+
+    def next_delay(self, previous_delay: float, turn: Optional[AgentTurn] = None) -> float:
+        upper = max(self.base_delay_sec, previous_delay * 3.0)
+        delay = min(self.max_delay_sec, self._random.uniform(self.base_delay_sec, upper))
+        if turn is not None and turn.retry_after_sec is not None:
+            delay = max(delay, min(turn.retry_after_sec, self.max_delay_sec))
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+class RetryBudget:
+    """
+    run 단위 재시도 총량 제한. 첫 시도 ratio건당 재시도 1건(+ 최소 min_retries건)까지만 허용해
+    ATS 장애 시 재시도가 부하를 키우지 않도록 한다.
+    """
+
+    __slots__ = ("ratio", "min_retries", "requests", "retries", "denied", "_lock")
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        self.ratio = max(0.0, float(ratio))
+        self.min_retries = max(0, int(min_retries))
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.retries < self.min_retries + int(self.requests * self.ratio):
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": self.requests, "retries": self.retries, "denied": self.denied}
+
+
+class Deadline:
+    """호출 전체(재시도 포함)에 허용된 남은 시간. timeout_ms 같은 run 설정에서 만든다."""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + max(0.0, float(seconds)))
+
+    @classmethod
+    def from_timeout_ms(cls, timeout_ms: Optional[float]) -> Optional["Deadline"]:
+        if not timeout_ms or float(timeout_ms) <= 0:
+            return None
+        return cls.after(float(timeout_ms) / 1000.0)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def clip(self, timeout_sec: float) -> float:
+        return max(0.001, min(float(timeout_sec), self.remaining()))
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    환경 단위 circuit breaker.
+    - 연결 실패/타임아웃/5xx가 failure_threshold번 연속이면 open → reset_timeout_sec 동안 호출 없이 즉시 실패
+    - 이후 half_open에서 probe 1건만 통과, 성공하면 closed로 복귀하고 실패하면 다시 open
+    - 잡/스레드 여러 곳에서 공유하므로 상태 변경은 lock 안에서만
+    """
+
+    __slots__ = (
+        "key",
+        "failure_threshold",
+        "reset_timeout_sec",
+        "state",
+        "consecutive_failures",
+        "opened_at",
+        "open_count",
+        "_probe_in_flight",
+        "_clock",
+        "_lock",
+    )
+
+    def __init__(
+        self,
+        key: str = "",
+        failure_threshold: int = 5,
+        reset_timeout_sec: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.key = key
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout_sec = max(0.0, float(reset_timeout_sec))
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.open_count = 0
+        self._probe_in_flight = False
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN:
+                if self._clock() - self.opened_at < self.reset_timeout_sec:
+                    return False
+                self.state = CIRCUIT_HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def retry_in_sec(self) -> float:
+        with self._lock:
+            if self.state != CIRCUIT_OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout_sec - (self._clock() - self.opened_at))
+
+    def record(self, turn: AgentTurn) -> None:
+        if turn.error and turn.error_kind in BREAKER_FAILURE_ERRORS:
+            self.record_failure()
+        else:
+            # 4xx/형식 오류도 서버가 응답했다는 뜻이므로 환경은 살아 있음
+            self.record_success()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != CIRCUIT_OPEN:
+                    self.open_count += 1
+                self.state = CIRCUIT_OPEN
+                self.opened_at = self._clock()
+
+    def release_probe(self) -> None:
+        """probe 호출이 결과 없이 취소된 경우 다음 호출이 probe가 될 수 있게 풀어 준다."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "key": self.key,
+                "state": self.state,
+                "consecutiveFailures": self.consecutive_failures,
+                "openCount": self.open_count,
+            }
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def circuit_breaker_for(key: str, failure_threshold: int = 5, reset_timeout_sec: float = 30.0) -> CircuitBreaker:
+    """환경 키(base_url 등)별 공유 breaker. 처음 만들 때의 설정이 유지된다."""
+    normalized = str(key or "").strip().rstrip("/")
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(normalized)
+        if breaker is None:
+            breaker = CircuitBreaker(normalized, failure_threshold=failure_threshold, reset_timeout_sec=reset_timeout_sec)
+            _BREAKERS[normalized] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+class ClientMetrics:
+    """백엔드별 호출 수/오류 수/지연 누적치 (hot path라 dict 조회 2회 수준으로 유지)."""
+
+    __slots__ = ("calls", "errors", "retries", "short_circuits", "total_sec", "max_sec", "on_call")
+
+    def __init__(self, on_call: Optional[Callable[[str, float, str], None]] = None):
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.short_circuits: Dict[str, int] = {}
+        self.total_sec: Dict[str, float] = {}
+        self.max_sec: Dict[str, float] = {}
+        self.on_call = on_call
+
+    def record(self, backend: str, elapsed_sec: float, error: str = "") -> None:
+        self.calls[backend] = self.calls.get(backend, 0) + 1
+        self.total_sec[backend] = self.total_sec.get(backend, 0.0) + elapsed_sec
+        if elapsed_sec > self.max_sec.get(backend, 0.0):
+            self.max_sec[backend] = elapsed_sec
+        if error:
+            self.errors[backend] = self.errors.get(backend, 0) + 1
+        if self.on_call is not None:
+            self.on_call(backend, elapsed_sec, error)
+
+    def record_retry(self, backend: str) -> None:
+        self.retries[backend] = self.retries.get(backend, 0) + 1
+
+    def record_short_circuit(self, backend: str) -> None:
+        self.short_circuits[backend] = self.short_circuits.get(backend, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for backend in sorted(set(self.calls) | set(self.short_circuits)):
+            calls = self.calls.get(backend, 0)
+            total = self.total_sec.get(backend, 0.0)
+            out[backend] = {
+                "calls": calls,
+                "errors": self.errors.get(backend, 0),
+                "retries": self.retries.get(backend, 0),
+                "short_circuits": self.short_circuits.get(backend, 0),
+                "avg_sec": round(total / calls, 4) if calls else None,
+                "max_sec": round(self.max_sec.get(backend, 0.0), 4),
+            }
+        return out
+
+
+class OrchestratorClient:
+    def __init__(
+        self,
+        base_url: str,
+        bearer_token: str,
+        cms_token: str,
+        mrs_session: str,
+        origin: str,
+        referer: str,
+        max_parallel: int = 3,
+        connector_limit: int = 50,
+        query_timeout_sec: float = 30.0,
+        sync_timeout_sec: float = 120.0,
+        sse_timeout_sec: float = 60.0,
+        heartbeat_timeout_sec: float = 30.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Optional[ClientMetrics] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        use_shared_circuit_breaker: bool = True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.bearer_token = bearer_token.strip()
+        self.cms_token = cms_token.strip()
+        self.mrs_session = mrs_session.strip()
+        self.origin = origin.strip()
+        self.referer = referer.strip()
+        self.semaphore = asyncio.Semaphore(max_parallel)
+        self.connector_limit = max(1, int(connector_limit))
+        self.query_timeout_sec = float(query_timeout_sec)
+        self.sync_timeout_sec = float(sync_timeout_sec)
+        self.sse_timeout_sec = float(sse_timeout_sec)
+        self.heartbeat_timeout_sec = float(heartbeat_timeout_sec)
+        self.retry_policy = retry_policy or NO_RETRY
+        self.metrics = metrics or ClientMetrics()
+        # 같은 환경을 쓰는 클라이언트/잡은 breaker 하나를 공유
+        if circuit_breaker is None and use_shared_circuit_breaker:
+            circuit_breaker = circuit_breaker_for(self.base_url)
+        self.circuit_breaker = circuit_breaker
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._headers = self._build_headers(False)
+        self._sse_headers = self._build_headers(True)
+
+    # -----------------------------
+    # headers / session pool
+    # -----------------------------
+    def _build_headers(self, for_sse: bool) -> Dict[str, str]:
+        h = {
+            "authorization": f"Bearer {self.bearer_token}",
+            "cms-access-token": self.cms_token,
+            "mrs-session": self.mrs_session,
+            "origin": self.origin,
+            "referer": self.referer,
+            "user-agent": DEFAULT_USER_AGENT,
+        }
+        if for_sse:
+            h["accept"] = "text/event-stream"
+        else:
+            h["accept"] = "application/json, text/plain, */*"
+            h["content-type"] = "application/json"
+        return h
+
+    def headers(self, for_sse: bool = False) -> Dict[str, str]:
+        return dict(self._sse_headers if for_sse else self._headers)
+
+    def _pooled_session(self, session: Optional[aiohttp.ClientSession]) -> aiohttp.ClientSession:
+        if session is not None:
+            return session
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connector_limit, ssl=False)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "OrchestratorClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    # -----------------------------
+    # unified entry point
+    # -----------------------------
+    async def call(
+        self,
+        message: str,
+        backend: str = BACKEND_SYNC,
+        conversation_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        target_assistant: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        deadline: Optional[Deadline] = None,
+        sse_manager: Any = None,
+        collect_raw_events: bool = False,
+    ) -> AgentTurn:
+        """
+        backend 하나를 골라 호출하고, 실패 시 retry_policy(기본: 클라이언트 정책)에 따라 재시도.
+        - 기존 대화(conversation_id 있음)에 보내는 호출은 비멱등으로 보고, 서버에 닿지 않은 오류만 재시도
+          (POST 성공 후 SSE 구독 단계에서 실패하면 메시지는 다시 보내지 않고 구독만 재시도)
+        - retry_budget이 바닥나거나 deadline 안에 다음 시도를 끝낼 수 없으면 마지막 결과를 그대로 반환
+        - 환경 breaker가 open이면 호출하지 않고 error_kind=circuit_open 으로 즉시 반환
+        sse_manager(aqb_sse_manager.SseSubscriptionManager)는 query_sse 백엔드에서만 사용.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend: {backend}")
+        policy = retry_policy or self.retry_policy
+        idempotent = not conversation_id
+        if retry_budget is not None:
+            retry_budget.record_request()
+
+        attempt = 0
+        delay = 0.0
+        posted_conversation_id: Optional[str] = None
+        while True:
+            turn = await self._guarded_call(
+                backend, message, conversation_id, context, target_assistant,
+                session, deadline, sse_manager, collect_raw_events, posted_conversation_id,
+            )
+            turn.attempts = attempt + 1
+            # 비멱등 호출이 SSE 단계에서 실패했으면 재시도는 구독만 다시 하므로 멱등
+            resubscribe = not idempotent and turn.stage == "sse" and bool(turn.conversation_id)
+            if not turn.error or attempt >= policy.max_retries or not policy.should_retry(turn, idempotent or resubscribe):
+                return turn
+            if self.circuit_breaker is not None and self.circuit_breaker.state == CIRCUIT_OPEN:
+                # 이번 실패로 환경이 차단됐으면 재시도 대신 실제 원인을 그대로 반환
+                return turn
+            delay = policy.next_delay(delay, turn)
+            if deadline is not None and deadline.remaining() <= delay:
+                return turn
+            if retry_budget is not None and not retry_budget.try_spend():
+                return turn
+            attempt += 1
+            posted_conversation_id = turn.conversation_id if resubscribe else None
+            self.metrics.record_retry(backend)
+            await asyncio.sleep(delay)
+
+    async def _guarded_call(
+        self,
+        backend: str,
+        message: str,
+        conversation_id: Optional[str],
+        context: Optional[Dict[str, Any]],
+        target_assistant: Optional[str],
+        session: Optional[aiohttp.ClientSession],
+        deadline: Optional[Deadline],
+        sse_manager: Any,
+        collect_raw_events: bool,
+        posted_conversation_id: Optional[str] = None,
+    ) -> AgentTurn:
+        if deadline is not None and deadline.expired():
+            return AgentTurn(backend, conversation_id=conversation_id or "", error="deadline exceeded", error_kind=ERROR_DEADLINE)
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow_request():
+            self.metrics.record_short_circuit(backend)
+            return AgentTurn(
+                backend,
+                conversation_id=conversation_id or "",
+                error=f"circuit open: {breaker.key or self.base_url} (retry in {breaker.retry_in_sec():.0f}s)",
+                error_kind=ERROR_CIRCUIT_OPEN,
+            )
+        try:
+            turn = await self._call_once(
+                backend, message, conversation_id, context, target_assistant,
+                session, deadline, sse_manager, collect_raw_events, posted_conversation_id,
+            )
+        except BaseException:
+            if breaker is not None:
+                breaker.release_probe()
+            raise
+        if breaker is not None:
+            breaker.record(turn)
+        return turn
+
+    async def _call_once(
+        self,
+        backend: str,
+        message: str,
+        conversation_id: Optional[str],
+        context: Optional[Dict[str, Any]],
+        target_assistant: Optional[str],
+        session: Optional[aiohttp.ClientSession],
+        deadline: Optional[Deadline],
+        sse_manager: Any,
+        collect_raw_events: bool,
+        posted_conversation_id: Optional[str] = None,
+    ) -> AgentTurn:
+        if backend == BACKEND_SYNC:
+            return await self.call_sync(session, message, conversation_id, context, target_assistant, deadline=deadline)
+
+        if posted_conversation_id:
+            # 메시지는 이전 시도에서 이미 전송됨 → 같은 대화에 구독만 다시
+            sent_conversation_id = posted_conversation_id
+        else:
+            if backend == BACKEND_QUERY_SSE and sse_manager is not None and conversation_id:
+                await sse_manager.prepare(conversation_id)
+            sent = await self.post_query(session, message, conversation_id, context, target_assistant, deadline=deadline)
+            if sent.error or backend == BACKEND_QUERY:
+                sent.backend = backend
+                return sent
+            sent_conversation_id = sent.conversation_id
+        if sse_manager is not None:
+            return await self.wait_sse_turn(sse_manager, sent_conversation_id, deadline=deadline)
+        return await self.subscribe(session, sent_conversation_id, collect_raw_events=collect_raw_events, deadline=deadline)
+
+    # -----------------------------
+    # backends
+    # -----------------------------
+    @staticmethod
+    def _timeout_sec(default_sec: float, deadline: Optional[Deadline]) -> float:
+        return deadline.clip(default_sec) if deadline is not None else default_sec
+
+    @staticmethod
+    async def _http_error(backend: str, resp: aiohttp.ClientResponse, stage: str) -> AgentTurn:
+        return AgentTurn(
+            backend,
+            error=f"HTTP {resp.status}: {(await resp.text())[:200]}",
+            error_kind=classify_http_status(resp.status),
+            status=resp.status,
+            stage=stage,
+            retry_after_sec=parse_retry_after(resp.headers.get("Retry-After")),
+        )
+
+    async def send_query(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        message: str,
+        conversation_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        target_assistant: Optional[str] = None,
+    ) -> Tuple[Optional[str], str]:
+        turn = await self.post_query(session, message, conversation_id, context, target_assistant)
+        if turn.error:
+            return None, turn.error
+        return turn.conversation_id, ""
+
+    async def post_query(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        message: str,
+        conversation_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        target_assistant: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AgentTurn:
+        """v2 query 전송. 성공 시 conversation_id만 채운 AgentTurn(stage=send)."""
+        payload: Dict[str, Any] = {"conversationId": conversation_id, "userMessage": message}
+        if context:
+            payload["context"] = context
+        if target_assistant:
+            payload["targetAssistant"] = target_assistant
+
+        timeout_sec = self._timeout_sec(self.query_timeout_sec, deadline)
+        started = time.perf_counter()
+        try:
+            http = self._pooled_session(session)
+            timeout = aiohttp.ClientTimeout(total=timeout_sec)
+            async with http.post(self.base_url + QUERY_PATH, headers=self._headers, json=payload, timeout=timeout) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    cid = data.get("conversationId")
+                    if cid:
+                        turn = AgentTurn(BACKEND_QUERY, conversation_id=str(cid), status=200, stage="send")
+                    else:
+                        turn = AgentTurn(BACKEND_QUERY, error="conversationId missing", error_kind=ERROR_PROTOCOL, status=200, stage="send")
+                else:
+                    turn = await self._http_error(BACKEND_QUERY, resp, "send")
+        except asyncio.TimeoutError:
+            turn = AgentTurn(BACKEND_QUERY, error=f"timeout({int(timeout_sec)}s)", error_kind=ERROR_TIMEOUT, stage="send")
+        except Exception as e:
+            turn = AgentTurn(BACKEND_QUERY, error=f"{type(e).__name__}: {str(e)[:120]}", error_kind=classify_exception(e), stage="send")
+        if turn.error and not turn.conversation_id:
+            turn.conversation_id = conversation_id or ""
+        self.metrics.record(BACKEND_QUERY, time.perf_counter() - started, turn.error)
+        return turn
+
+    async def call_sync(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        message: str,
+        conversation_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        target_assistant: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AgentTurn:
+        payload: Dict[str, Any] = {
+            "conversationId": conversation_id or "",
+            "userMessage": message,
+            "context": context or {},
+        }
+        if target_assistant:
+            payload["targetAssistant"] = target_assistant
+
+        timeout_sec = self._timeout_sec(self.sync_timeout_sec, deadline)
+        started = time.perf_counter()
+        try:
+            http = self._pooled_session(session)
+            timeout = aiohttp.ClientTimeout(total=timeout_sec)
+            async with http.post(self.base_url + SYNC_TEST_PATH, headers=self._headers, json=payload, timeout=timeout) as resp:
+                if resp.status != 200:
+                    turn = await self._http_error(BACKEND_SYNC, resp, "sync")
+                else:
+                    turn = parse_sync_response(await resp.json())
+                    turn.status = 200
+        except asyncio.TimeoutError:
+            turn = AgentTurn(BACKEND_SYNC, error=f"timeout({int(timeout_sec)}s)", error_kind=ERROR_TIMEOUT)
+        except Exception as e:
+            turn = AgentTurn(BACKEND_SYNC, error=f"{type(e).__name__}: {str(e)[:120]}", error_kind=classify_exception(e))
+        turn.stage = "sync"
+        self.metrics.record(BACKEND_SYNC, time.perf_counter() - started, turn.error)
+        return turn
+
+    async def subscribe(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        conversation_id: str,
+        collect_raw_events: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> AgentTurn:
+        """
+        chat-room SSE를 구독해 첫 ASSISTANT 메시지까지 수집.
+        heartbeat 타임아웃은 소켓 read 타임아웃으로 적용 (HEARTBEAT 포함 아무 바이트도 없으면 끊김).
+        """
+        turn = AgentTurn(BACKEND_QUERY_SSE, conversation_id=conversation_id, stage="sse")
+        total_sec = self._timeout_sec(self.sse_timeout_sec, deadline)
+        started = time.perf_counter()
+        try:
+            http = self._pooled_session(session)
+            timeout = aiohttp.ClientTimeout(total=total_sec, sock_read=self.heartbeat_timeout_sec)
+            async with http.get(
+                self.base_url + SSE_SUBSCRIBE_PATH,
+                headers=self._sse_headers,
+                params={"conversationId": conversation_id},
+                timeout=timeout,
+            ) as resp:
+                if resp.status != 200:
+                    failed = await self._http_error(BACKEND_QUERY_SSE, resp, "sse")
+                    turn.error, turn.error_kind, turn.status = failed.error, failed.error_kind, failed.status
+                else:
+                    turn.status = 200
+                    await self._consume_sse(resp, turn, collect_raw_events)
+        except asyncio.TimeoutError:
+            turn.error_kind = ERROR_TIMEOUT
+            elapsed = time.perf_counter() - started
+            if elapsed < total_sec - 0.5:
+                turn.error = f"heartbeat timeout({int(self.heartbeat_timeout_sec)}s)"
+            else:
+                turn.error = f"sse timeout({int(total_sec)}s)"
+        except Exception as e:
+            turn.error = f"{type(e).__name__}:{str(e)[:120]}"
+            turn.error_kind = classify_exception(e)
+        self.metrics.record(BACKEND_QUERY_SSE, time.perf_counter() - started, turn.error)
+        return turn
+
+    async def _consume_sse(self, resp: aiohttp.ClientResponse, turn: AgentTurn, collect_raw_events: bool) -> None:
+        async for event in iter_sse_events(resp.content.iter_any()):
+            name = event.event
+            if name == "CONNECT":
+                turn.connect_time = datetime.now()
+                if not collect_raw_events:
+                    continue
+            elif name == "HEARTBEAT":
+                if not collect_raw_events:
+                    continue
+            elif name not in ("CHAT", "CHAT_EXECUTION_PROCESS"):
+                continue
+
+            data = event.json()
+            if not isinstance(data, dict):
+                continue
+            if collect_raw_events:
+                turn.raw_events.append({"event": name, "data": data})
+
+            if name == "CHAT_EXECUTION_PROCESS":
+                turn.execution_processes.append(data)
+            elif name == "CHAT" and data.get("messageType") == "ASSISTANT":
+                turn.chat_time = datetime.now()
+                self._fill_assistant(turn, data)
+                if turn.connect_time:
+                    turn.response_time_sec = (turn.chat_time - turn.connect_time).total_seconds()
+                return
+        turn.error = "sse ended without assistant"
+        turn.error_kind = ERROR_PROTOCOL
+
+    @staticmethod
+    def _fill_assistant(turn: AgentTurn, data: Dict[str, Any]) -> None:
+        assistant = data.get("assistant", {}) or {}
+        turn.raw_event = data
+        turn.assistant_message = assistant.get("assistantMessage", "") or ""
+        turn.data_ui_list = assistant.get("dataUIList", []) or []
+        turn.guide_list = assistant.get("guideList", []) or []
+
+    async def wait_sse_turn(self, sse_manager: Any, conversation_id: str, deadline: Optional[Deadline] = None) -> AgentTurn:
+        """SseSubscriptionManager로 받은 턴 결과를 AgentTurn으로 변환 (응답 시간은 subscribe와 같이 구독 CONNECT 기준)."""
+        timeout_sec = self._timeout_sec(self.sse_timeout_sec, deadline)
+        started = time.perf_counter()
+        result = await sse_manager.wait_assistant(conversation_id, started_at=datetime.now(), timeout_sec=timeout_sec)
+        turn = AgentTurn(
+            BACKEND_QUERY_SSE,
+            conversation_id=conversation_id,
+            execution_processes=list(result.execution_processes),
+            response_time_sec=result.response_time_sec,
+            connect_time=result.turn_connect_time,
+            chat_time=result.chat_time,
+            raw_events=list(result.raw_events),
+            error=result.error,
+            stage="sse",
+        )
+        if result.error:
+            if "timeout" in result.error:
+                turn.error_kind = ERROR_TIMEOUT
+            elif result.error.startswith("sse ended"):
+                turn.error_kind = ERROR_PROTOCOL
+            else:
+                turn.error_kind = ERROR_TRANSPORT
+        if result.data is not None:
+            self._fill_assistant(turn, result.data)
+        self.metrics.record(BACKEND_QUERY_SSE, time.perf_counter() - started, turn.error)
+        return turn
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import aiohttp
+
+from aqb_orchestrator_client import SSE_SUBSCRIBE_PATH
+from aqb_sse_parser import SseEvent, iter_sse_events
+
+# ============================================================
+# conversationId 단위 SSE 구독 관리자
+#  - chat-room/sse/subscribe 는 conversationId 하나당 GET 하나라서 한 소켓에 여러 대화를 실을 수는 없음
+#    → 대신 구독을 대화 단위 채널로 재사용하고, 전역 소켓 수를 FIFO 공정하게 제한한다
+#  - 대화 ID를 이미 아는 턴(2차 이후 호출, 멀티턴 후속 질의)은 send_query 전에 먼저 구독 → connect-after-send 경합 제거
+#  - ASSISTANT 이벤트는 conversationId별 대기 future로 라우팅 (같은 chatId 중복 전달 방지)
+#  - heartbeat 타임아웃은 대화별 소켓 read 타임아웃으로 적용 (HEARTBEAT/데이터가 30초간 없으면 끊음)
+#  - 턴이 끝난 구독은 idle_timeout_sec 동안 warm 상태로 유지 후 닫음
+#    (소켓 한도가 차면 warm 구독부터 닫아 대기 중인 구독에 슬롯을 넘김)
+#  - 메시지를 이미 보낸 턴의 구독은 소켓 대기열에서 기다리지 않음 (한도를 잠시 넘더라도 바로 연결)
+#  - 응답 시간은 기존과 같이 구독 CONNECT 기준 (send 전에 이미 연결돼 있던 구독이면 send 완료 시점)
+# ============================================================
+
+
+@dataclass
+class SseTurnResult:
+    conversation_id: str
+    started_at: Optional[datetime]
+    connect_time: Optional[datetime]
+    chat_time: Optional[datetime]
+    data: Optional[Dict[str, Any]]
+    execution_processes: List[Dict[str, Any]] = field(default_factory=list)
+    raw_events: List[Dict[str, Any]] = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def turn_connect_time(self) -> Optional[datetime]:
+        """이 턴의 기준 시점: 구독 CONNECT, 단 send 전에 이미 연결돼 있던(warm/prepare) 구독이면 send 완료 시점."""
+        if self.connect_time and (self.started_at is None or self.connect_time >= self.started_at):
+            return self.connect_time
+        return self.started_at
+
+    @property
+    def response_time_sec(self) -> Optional[float]:
+        connected = self.turn_connect_time
+        if connected and self.chat_time:
+            return (self.chat_time - connected).total_seconds()
+        return None
+
+    @property
+    def assistant(self) -> Dict[str, Any]:
+        return (self.data or {}).get("assistant", {}) or {}
+
+
+class _SseStreamClosed(Exception):
+    pass
+
+
+class _FairSocketLimiter:
+    """먼저 기다린 구독이 먼저 소켓을 얻는 세마포어 (asyncio.Semaphore는 깨어난 순서를 보장하지 않음)."""
+
+    def __init__(self, limit: int):
+        self._limit = max(1, int(limit))
+        self._in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for fut in self._waiters if not fut.done())
+
+    @property
+    def full(self) -> bool:
+        return self._in_use >= self._limit
+
+    async def acquire(
+        self,
+        force: bool = False,
+        on_queued: Optional[Callable[[asyncio.Future], None]] = None,
+    ) -> None:
+        """force=True면 한도와 무관하게 바로 통과. 대기열에 들어가면 on_queued(대기 future) 호출."""
+        if force or (self._in_use < self._limit and not self._waiters):
+            self._in_use += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        if on_queued is not None:
+            on_queued(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # 슬롯을 넘겨받은 직후 취소됨 → 다음 대기자에게 양보
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    def grant_now(self, fut: asyncio.Future) -> None:
+        """대기 중인 요청을 한도와 무관하게 즉시 통과시킨다."""
+        if fut.done():
+            return
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            return
+        self._in_use += 1
+        fut.set_result(None)
+
+    def release(self) -> None:
+        if self._in_use > self._limit:
+            # 한도를 넘겨 통과시킨 만큼은 대기자에게 넘기지 않고 반납
+            self._in_use -= 1
+            return
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                # 슬롯을 그대로 넘기므로 in_use는 유지
+                fut.set_result(None)
+                return
+        self._in_use = max(0, self._in_use - 1)
+
+
+class _Channel:
+    __slots__ = (
+        "conversation_id",
+        "task",
+        "connected",
+        "connect_time",
+        "waiters",
+        "pending",
+        "seen_chat_ids",
+        "execution_processes",
+        "raw_events",
+        "idle_handle",
+        "message_sent",
+        "slot_request",
+    )
+
+    def __init__(self, conversation_id: str):
+        self.conversation_id = conversation_id
+        self.task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+        self.connect_time: Optional[datetime] = None
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.pending: Deque[tuple] = deque()
+        self.seen_chat_ids: set = set()
+        self.execution_processes: List[Dict[str, Any]] = []
+        self.raw_events: List[Dict[str, Any]] = []
+        self.idle_handle: Optional[asyncio.TimerHandle] = None
+        self.message_sent = False
+        self.slot_request: Optional[asyncio.Future] = None
+
+    def cancel_idle(self) -> None:
+        if self.idle_handle is not None:
+            self.idle_handle.cancel()
+            self.idle_handle = None
+
+
+class SseSubscriptionManager:
+    """
+    여러 대화의 SSE 구독을 한 곳에서 관리한다.
+
+    사용 순서:
+      1) (대화 ID를 아는 경우) await manager.prepare(conversation_id)  # send_query 전에 구독
+      2) cid, err = await client.send_query(...)
+      3) turn = await manager.wait_assistant(cid, started_at=datetime.now())
+      4) 대화가 끝나면 await manager.release(cid) (생략 시 idle_timeout_sec 후 자동 종료)
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        headers: Dict[str, str],
+        max_sockets: int = 40,
+        heartbeat_timeout_sec: float = 30.0,
+        connect_timeout_sec: float = 10.0,
+        idle_timeout_sec: float = 5.0,
+        collect_raw_events: bool = False,
+    ):
+        self.session = session
+        self.url = f"{base_url.rstrip('/')}{SSE_SUBSCRIBE_PATH}"
+        self.headers = dict(headers)
+        self.heartbeat_timeout_sec = float(heartbeat_timeout_sec)
+        self.connect_timeout_sec = float(connect_timeout_sec)
+        self.idle_timeout_sec = float(idle_timeout_sec)
+        self.collect_raw_events = collect_raw_events
+        self._limiter = _FairSocketLimiter(max_sockets)
+        self._channels: Dict[str, _Channel] = {}
+
+    async def __aenter__(self) -> "SseSubscriptionManager":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "channels": len(self._channels),
+            "sockets_in_use": self._limiter.in_use,
+            "sockets_waiting": self._limiter.waiting,
+        }
+
+    # -----------------------------
+    # public API
+    # -----------------------------
+    async def prepare(self, conversation_id: str) -> None:
+        """send_query 전에 구독을 열어 둔다. 이전 턴의 남은 이벤트는 버린다."""
+        channel = self._ensure_channel(conversation_id)
+        channel.cancel_idle()
+        channel.pending.clear()
+        channel.execution_processes = []
+        channel.raw_events = []
+        try:
+            await asyncio.wait_for(asyncio.shield(channel.connected.wait()), timeout=self.connect_timeout_sec)
+        except asyncio.TimeoutError:
+            # 소켓 대기열이 길어도 send는 진행한다 (구독이 늦게 붙어도 wait_assistant에서 받음)
+            pass
+
+    async def wait_assistant(
+        self,
+        conversation_id: str,
+        started_at: Optional[datetime] = None,
+        timeout_sec: float = 60.0,
+    ) -> SseTurnResult:
+        channel = self._ensure_channel(conversation_id)
+        channel.cancel_idle()
+        # 메시지는 이미 보냈으므로 이 구독은 소켓 대기열에서 기다리지 않게 한다
+        channel.message_sent = True
+        if channel.slot_request is not None:
+            self._limiter.grant_now(channel.slot_request)
+
+        try:
+            if channel.pending:
+                data, chat_time, processes, raw_events = channel.pending.popleft()
+            else:
+                fut = asyncio.get_running_loop().create_future()
+                channel.waiters.append(fut)
+                try:
+                    data, chat_time, processes, raw_events = await asyncio.wait_for(fut, timeout=timeout_sec)
+                finally:
+                    if fut in channel.waiters:
+                        channel.waiters.remove(fut)
+        except asyncio.TimeoutError:
+            self._schedule_idle_close(channel)
+            return SseTurnResult(
+                conversation_id, started_at, channel.connect_time, None, None,
+                error=f"sse timeout({int(timeout_sec)}s)",
+            )
+        except _SseStreamClosed as e:
+            return SseTurnResult(conversation_id, started_at, channel.connect_time, None, None, error=str(e))
+
+        self._schedule_idle_close(channel)
+        return SseTurnResult(
+            conversation_id=conversation_id,
+            started_at=started_at or channel.connect_time,
+            connect_time=channel.connect_time,
+            chat_time=chat_time,
+            data=data,
+            execution_processes=processes,
+            raw_events=raw_events,
+        )
+
+    async def release(self, conversation_id: Optional[str]) -> None:
+        channel = self._channels.pop(str(conversation_id or ""), None)
+        if channel is not None:
+            await self._close_channel(channel)
+
+    async def aclose(self) -> None:
+        channels = list(self._channels.values())
+        self._channels.clear()
+        for channel in channels:
+            await self._close_channel(channel)
+
+    # -----------------------------
+    # internals
+    # -----------------------------
+    def _ensure_channel(self, conversation_id: str) -> _Channel:
+        key = str(conversation_id or "")
+        channel = self._channels.get(key)
+        if channel is None or channel.task is None or channel.task.done():
+            fresh = _Channel(key)
+            if channel is not None:
+                # 스트림이 끊긴 채널은 이미 전달한 chatId만 이어받아 중복 전달을 막는다
+                fresh.seen_chat_ids = channel.seen_chat_ids
+            fresh.task = asyncio.create_task(self._read_stream(fresh))
+            self._channels[key] = fresh
+            channel = fresh
+        return channel
+
+    def _schedule_idle_close(self, channel: _Channel) -> None:
+        channel.cancel_idle()
+        if channel.waiters or channel.task is None or channel.task.done():
+            return
+        loop = asyncio.get_running_loop()
+        channel.idle_handle = loop.call_later(self.idle_timeout_sec, self._close_if_idle, channel)
+
+    def _close_if_idle(self, channel: _Channel) -> None:
+        channel.idle_handle = None
+        if channel.waiters:
+            return
+        if self._channels.get(channel.conversation_id) is channel:
+            self._channels.pop(channel.conversation_id, None)
+        if channel.task is not None and not channel.task.done():
+            channel.task.cancel()
+
+    def _evict_idle_channels(self) -> None:
+        """소켓 한도가 찼을 때 턴이 끝나 warm 상태로만 남은 구독을 닫아 슬롯을 넘긴다."""
+        for channel in list(self._channels.values()):
+            if channel.idle_handle is not None and not channel.waiters and not channel.pending:
+                channel.cancel_idle()
+                self._close_if_idle(channel)
+
+    async def _close_channel(self, channel: _Channel) -> None:
+        channel.cancel_idle()
+        task = channel.task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _read_stream(self, channel: _Channel) -> None:
+        error = "sse ended without assistant"
+        try:
+            if self._limiter.full:
+                self._evict_idle_channels()
+            await self._limiter.acquire(
+                force=channel.message_sent,
+                on_queued=lambda fut: setattr(channel, "slot_request", fut),
+            )
+            try:
+                timeout = aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=self.connect_timeout_sec,
+                    sock_read=self.heartbeat_timeout_sec,
+                )
+                async with self.session.get(
+                    self.url,
+                    headers=self.headers,
+                    params={"conversationId": channel.conversation_id},
+                    timeout=timeout,
+                ) as resp:
+                    if resp.status != 200:
+                        error = f"HTTP {resp.status}: {(await resp.text())[:200]}"
+                        return
+                    channel.connected.set()
+                    async for event in iter_sse_events(resp.content.iter_any()):
+                        self._route(channel, event)
+            finally:
+                self._limiter.release()
+        except asyncio.CancelledError:
+            error = "sse closed"
+            raise
+        except asyncio.TimeoutError:
+            error = f"heartbeat timeout({int(self.heartbeat_timeout_sec)}s)"
+        except Exception as e:
+            error = f"{type(e).__name__}:{str(e)[:120]}"
+        finally:
+            channel.cancel_idle()
+            channel.connected.set()
+            while channel.waiters:
+                fut = channel.waiters.popleft()
+                if not fut.done():
+                    fut.set_exception(_SseStreamClosed(error))
+
+    def _route(self, channel: _Channel, event: SseEvent) -> None:
+        if event.event == "CONNECT":
+            channel.connect_time = datetime.now()
+            return
+        if event.event == "HEARTBEAT":
+            return
+
+        data = event.json()
+        if not isinstance(data, dict):
+            return
+        if self.collect_raw_events:
+            channel.raw_events.append({"event": event.event, "data": data})
+
+        if event.event == "CHAT_EXECUTION_PROCESS":
+            channel.execution_processes.append(data)
+            return
+        if event.event != "CHAT" or data.get("messageType") != "ASSISTANT":
+            return
+
+        chat_id = data.get("chatId")
+        if chat_id is not None:
+            if chat_id in channel.seen_chat_ids:
+                return
+            channel.seen_chat_ids.add(chat_id)
+
+        delivery = (data, datetime.now(), channel.execution_processes, channel.raw_events)
+        channel.execution_processes = []
+        channel.raw_events = []
+        while channel.waiters:
+            fut = channel.waiters.popleft()
+            if not fut.done():
+                fut.set_result(delivery)
+                return
+        channel.pending.append(delivery)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+# ============================================================
+# SSE(text/event-stream) 증분 파서
+#  - 청크를 bytearray에 누적하고 완성된 줄만 UTF-8로 디코딩 (한글 멀티바이트가 청크 경계에서 깨지지 않음)
+#  - 줄바꿈 탐색은 새로 들어온 바이트만 훑음 → 긴 미완성 줄을 청크마다 다시 훑는 O(n^2) 없음
+#  - 여러 줄 data:, 주석(:), id/retry 필드를 스펙대로 처리
+#  - JSON 파싱은 SseEvent.json() 호출 시점까지 미룸 (HEARTBEAT 등은 파싱하지 않음)
+# ============================================================
+
+_STR_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+class SseEvent:
+    __slots__ = ("event", "data", "id", "_json", "_json_parsed")
+
+    def __init__(self, event: str, data: str, id: Optional[str] = None):
+        self.event = event
+        self.data = data
+        self.id = id
+        self._json: Any = None
+        self._json_parsed = False
+
+    def json(self) -> Optional[Any]:
+        """data가 JSON 객체/배열이면 파싱 결과, 아니면 None (결과는 캐시)."""
+        if not self._json_parsed:
+            self._json_parsed = True
+            text = self.data.lstrip()
+            if text[:1] in ("{", "["):
+                try:
+                    self._json = json.loads(text)
+                except ValueError:
+                    self._json = None
+        return self._json
+
+    def __repr__(self) -> str:
+        return f"SseEvent(event={self.event!r}, id={self.id!r}, data={self.data[:60]!r})"
+
+
+class SseParser:
+    """
+    증분 SSE 파서. feed()는 완성된 이벤트를 지연(generator) 방식으로 돌려주므로
+    원하는 이벤트를 찾은 즉시 중단해도 남은 줄/바이트는 버퍼에 그대로 보존된다.
+
+    - 줄바꿈(LF)은 UTF-8 멀티바이트 중간에 나올 수 없으므로, 마지막 줄바꿈까지만 한 번에 디코딩하고
+      미완성 줄은 bytes 상태로 남겨 다음 청크와 이어 붙인다.
+    - keep_dataless: 오케스트레이터는 `event:HEARTBEAT` 처럼 data 없는 이벤트를 보내므로
+      기본값(True)에서는 이벤트명이 있으면 data가 비어도 전달한다. (False면 스펙대로 버림)
+    """
+
+    __slots__ = (
+        "keep_dataless",
+        "last_event_id",
+        "retry_ms",
+        "_buffer",
+        "_scan",
+        "_saw_cr",
+        "_lines",
+        "_line_idx",
+        "_event_type",
+        "_data_lines",
+        "_has_fields",
+    )
+
+    def __init__(self, keep_dataless: bool = True):
+        self.keep_dataless = keep_dataless
+        self.last_event_id: Optional[str] = None
+        self.retry_ms: Optional[int] = None
+        self._buffer = bytearray()
+        self._scan = 0
+        self._saw_cr = False
+        self._lines: List[str] = []
+        self._line_idx = 0
+        self._event_type = ""
+        self._data_lines: List[str] = []
+        self._has_fields = False
+
+    def feed(self, chunk: bytes) -> Iterable[SseEvent]:
+        if chunk:
+            self._buffer += chunk
+            if b"\r" in chunk:
+                self._saw_cr = True
+            elif b"\n" not in chunk and not self._saw_cr and self._line_idx >= len(self._lines):
+                # 긴 data 줄이 잘게 들어오는 동안에는 generator도 만들지 않는다
+                return ()
+        return self._drain()
+
+    def _take_complete_lines(self) -> bool:
+        """버퍼에서 완성된 줄들을 잘라 디코딩한다. 새로 훑는 범위는 마지막 호출 이후 들어온 바이트뿐."""
+        buffer = self._buffer
+        size = len(buffer)
+        if not self._saw_cr:
+            cut = buffer.rfind(b"\n", self._scan)
+            if cut < 0:
+                self._scan = size
+                return False
+            text = buffer[:cut].decode("utf-8", errors="replace")
+            del buffer[: cut + 1]
+            self._scan = 0
+            self._lines = text.split("\n")
+            self._line_idx = 0
+            return True
+
+        # `\r` 로 끝난 청크는 다음 청크의 `\n`과 합쳐 CRLF일 수 있으므로 마지막 바이트는 보류
+        limit = size - 1 if size and buffer[-1] == 0x0D else size
+        cut = max(buffer.rfind(b"\n", self._scan, limit), buffer.rfind(b"\r", self._scan, limit))
+        if cut < 0:
+            self._scan = limit
+            return False
+        text = buffer[:cut].decode("utf-8", errors="replace")
+        if buffer[cut] == 0x0A and text.endswith("\r"):
+            text = text[:-1]
+        del buffer[: cut + 1]
+        self._scan = 0
+        self._lines = _STR_LINE_END.split(text)
+        self._line_idx = 0
+        return True
+
+    def _drain(self) -> Iterator[SseEvent]:
+        while True:
+            lines = self._lines
+            if self._line_idx >= len(lines):
+                if not self._take_complete_lines():
+                    return
+                lines = self._lines
+            while self._line_idx < len(lines):
+                line = lines[self._line_idx]
+                self._line_idx += 1
+                if line:
+                    if line[0] == ":":
+                        continue
+                    self._process_field(line)
+                    continue
+                event = self._dispatch()
+                if event is not None:
+                    yield event
+
+    def _process_field(self, line: str) -> None:
+        field, sep, value = line.partition(":")
+        if sep and value[:1] == " ":
+            value = value[1:]
+
+        if field == "data":
+            self._data_lines.append(value)
+            self._has_fields = True
+        elif field == "event":
+            self._event_type = value.strip()
+            self._has_fields = True
+        elif field == "id":
+            if "\x00" not in value:
+                self.last_event_id = value
+        elif field == "retry":
+            if value.isdigit():
+                self.retry_ms = int(value)
+
+    def _dispatch(self) -> Optional[SseEvent]:
+        if not self._has_fields:
+            return None
+        event_type = self._event_type
+        data_lines = self._data_lines
+        self._event_type = ""
+        self._data_lines = []
+        self._has_fields = False
+        if not data_lines and not (self.keep_dataless and event_type):
+            return None
+        return SseEvent(event_type or "message", "\n".join(data_lines), self.last_event_id)
+
+
+async def iter_sse_events(chunks: AsyncIterable[bytes], parser: Optional[SseParser] = None) -> AsyncIterator[SseEvent]:
+    """aiohttp `resp.content.iter_any()` 같은 바이트 청크 스트림을 SseEvent 스트림으로 변환."""
+    sse_parser = parser or SseParser()
+    async for chunk in chunks:
+        for event in sse_parser.feed(chunk):
+            yield event
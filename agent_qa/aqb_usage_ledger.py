@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from aqb_ndjson_log import NdjsonAppendLog
+from aqb_openai_judge import estimate_cost_usd
+
+# ============================================================
+# OpenAI 호출 사용량 원장 (append-only NDJSON)
+#  - 호출 1건당 한 줄, 컬럼은 백오피스 openai_usage_ledger 테이블과 동일
+#    (source, run_id, run_item_id, model, prompt_version, 토큰 5종, latency_ms, cost_usd, error, created_at)
+#  - 실패한 호출도 기록 (error에 사유, 응답이 있었으면 토큰도 함께)
+#  - 비용은 aqb_openai_judge의 공통 단가 계산(estimate_cost_usd → token_cost_usd)으로 기록 시점에 계산
+#  - 여러 실행이 같은 파일에 계속 덧붙음 → run_id로 실행 구분
+# ============================================================
+
+SOURCE_STREAMLIT_JUDGE = "streamlit_judge"
+
+_TOKEN_FIELDS = ("input_tokens", "cached_tokens", "output_tokens", "reasoning_tokens", "total_tokens")
+
+
+def prompt_version_label(prompt: str) -> str:
+    """프롬프트 원문의 짧은 해시 (백오피스 prompt_version_label과 같은 규칙)."""
+    text = str(prompt or "")
+    if not text.strip():
+        return ""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+def _to_int(x: Any) -> int:
+    try:
+        return int(x or 0)
+    except Exception:
+        try:
+            return int(float(x))
+        except Exception:
+            return 0
+
+
+class OpenAIUsageLedger:
+    """
+    OpenAI 호출 사용량 append-only 로그 (파일 처리는 aqb_ndjson_log.NdjsonAppendLog).
+    - record(): 호출 1건을 한 줄로 기록하고 파일을 닫음 (fsync=True면 매 줄 fsync)
+      호출 간격이 초 단위라 매번 다시 열어도 비용이 작고, 실행이 예외로 끝나도 열린 핸들이 남지 않음
+    - read(): 기록 전체 (중간에 끊겨 깨진 줄은 무시)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        price_input_per_1m: float = 0.0,
+        price_output_per_1m: float = 0.0,
+        price_cached_input_per_1m: float = 0.0,
+        fsync: bool = False,
+    ):
+        self.path = path
+        self.price_input_per_1m = price_input_per_1m
+        self.price_output_per_1m = price_output_per_1m
+        self.price_cached_input_per_1m = price_cached_input_per_1m
+        self._log = NdjsonAppendLog(path, fsync=fsync)
+
+    def __enter__(self) -> "OpenAIUsageLedger":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def record(
+        self,
+        *,
+        run_id: str,
+        model: str,
+        usage: Optional[Dict[str, Any]],
+        run_item_id: str = "",
+        prompt_version: str = "",
+        latency_ms: Optional[int] = None,
+        error: str = "",
+        source: str = SOURCE_STREAMLIT_JUDGE,
+    ) -> Dict[str, Any]:
+        tokens = {key: _to_int((usage or {}).get(key)) for key in _TOKEN_FIELDS}
+        if not tokens["total_tokens"]:
+            tokens["total_tokens"] = tokens["input_tokens"] + tokens["output_tokens"]
+        entry: Dict[str, Any] = {
+            "source": source,
+            "run_id": str(run_id or ""),
+            "run_item_id": str(run_item_id or ""),
+            "model": str(model or ""),
+            "prompt_version": str(prompt_version or ""),
+            **tokens,
+            "latency_ms": None if latency_ms is None else int(latency_ms),
+            "cost_usd": estimate_cost_usd(
+                tokens,
+                price_input_per_1m=self.price_input_per_1m,
+                price_output_per_1m=self.price_output_per_1m,
+                price_cached_input_per_1m=self.price_cached_input_per_1m,
+            ),
+            "error": str(error or "")[:2000],
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        self._log.append(entry)
+        self._log.close()
+        return entry
+
+    def close(self) -> None:
+        self._log.close()
+
+    def read(self) -> List[Dict[str, Any]]:
+        return self._log.read()
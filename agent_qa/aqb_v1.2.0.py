@@ -57,12 +57,14 @@ from aqb_common_utils import (
     run_logic_check,
 )
 from aqb_openai_judge import openai_judge_with_retry
+from aqb_prompt_assembly import LAYOUT_INLINE, LAYOUT_STATIC_PREFIX, PromptCacheStats
 from aqb_prompt_template import ENV_PRESETS, read_prompt_template
 from aqb_runtime_utils import dataframe_to_excel_bytes, dataframes_to_excel_bytes, run_async
 from aqb_url_tester import UrlAgentTester, run_url_tests_async
 from aqb_aqb_scoring import (
     AQB_RULES_SUMMARY_MD,
     AQB_RUBRIC_MD,
+    PARALLEL_MIN_ROWS,
     build_aqb_agent_summary,
     build_aqb_precheck_report,
     build_aqb_round_summary,
@@ -166,6 +168,19 @@ def main():
         # 주요 설정 (항상 표시)
         judge_parallel = st.slider("LLM 병렬수", min_value=1, max_value=10, value=3, step=1)
         max_chars = st.slider("응답 최대 길이(평가 입력)", min_value=2000, max_value=30000, value=15000, step=1000)
+        max_tokens_per_response = st.number_input(
+            "응답 최대 토큰(평가 입력, 0=글자 수 기준)",
+            min_value=0,
+            max_value=30000,
+            value=0,
+            step=500,
+            help="0보다 크면 위 글자 수 대신 토큰 예산으로 응답 raw를 자릅니다.",
+        )
+        cache_friendly_prompt = st.checkbox(
+            "프롬프트 캐시 친화 배치",
+            value=True,
+            help="평가 프롬프트 템플릿을 앞에 그대로 두고 행별 입력 값은 맨 뒤에 붙여 OpenAI 프롬프트 캐시가 적용되게 합니다.",
+        )
 
         # 고급 설정 (접기)
         with st.expander("⚙️ 고급 설정", expanded=False):
@@ -291,6 +306,12 @@ def main():
             # 임시 저장 경로
             temp_save_path = os.path.join(script_dir, f"_autosave_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
 
+            # 행 단위 체크포인트: 업로드 파일 기준 고정 경로라 중단 후 같은 CSV로 다시 실행하면 완료 행은 건너뜀
+            checkpoint_stem = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in os.path.splitext(uploaded.name)[0])
+            checkpoint_path = os.path.join(script_dir, f"_checkpoint_{checkpoint_stem}_{n_calls}calls.ndjson")
+            if os.path.exists(checkpoint_path):
+                st.caption(f"♻️ 이전 실행 체크포인트가 있어 완료된 행은 건너뜁니다: {checkpoint_path}")
+
             def auto_save_callback(df_partial: pd.DataFrame):
                 try:
                     df_partial.to_csv(temp_save_path, index=False, encoding="utf-8-sig")
@@ -340,15 +361,22 @@ def main():
                             context=context_obj,
                             target_assistant=target_assistant,
                             independent_sessions=independent_sessions,
-                            auto_save_callback=auto_save_callback,
+                            checkpoint_path=checkpoint_path,
                         )
                     )
+                    # 결과는 끝난 뒤 한 번만 저장, 저장되면 체크포인트는 정리
+                    auto_save_callback(st.session_state["applicant_df"])
+                    if os.path.exists(temp_save_path) and os.path.exists(checkpoint_path):
+                        os.remove(checkpoint_path)
                     st.success("ATS 호출 완료")
 
             if run_judge or run_all:
                 if not openai_key:
                     st.error("OPENAI_API_KEY를 입력하세요.")
                 else:
+                    cache_stats = PromptCacheStats()
+                    # OpenAI 호출마다 사용량 원장에 한 줄씩 덧붙임 (모델/프롬프트 버전/토큰/지연/비용, 실패 호출 포함)
+                    usage_ledger_path = os.path.join(script_dir, "_openai_usage_ledger.ndjson")
                     df_result, eval_count = run_async(
                         run_openai_judge_async(
                             st.session_state["applicant_df"],
@@ -363,6 +391,10 @@ def main():
                             price_input_per_1m=price_input_per_1m,
                             price_output_per_1m=price_output_per_1m,
                             price_cached_input_per_1m=price_cached_input_per_1m,
+                            max_tokens_per_response=int(max_tokens_per_response) or None,
+                            prompt_layout=LAYOUT_STATIC_PREFIX if cache_friendly_prompt else LAYOUT_INLINE,
+                            cache_stats=cache_stats,
+                            usage_ledger_path=usage_ledger_path,
                         )
                     )
                     st.session_state["applicant_df"] = df_result
@@ -370,6 +402,12 @@ def main():
                         st.warning("LLM 평가 대상이 없습니다. (1차/2차 raw 데이터가 없거나 이미 평가 완료됨)")
                     else:
                         st.success(f"LLM 평가 완료 ({eval_count}건)")
+                        if cache_stats.cached_ratio is not None:
+                            st.caption(
+                                f"프롬프트 캐시: 입력 {cache_stats.input_tokens:,} 토큰 중 {cache_stats.cached_tokens:,} 토큰 캐시 적중"
+                                f" ({cache_stats.cached_ratio:.1%}), 고정 접두부 약 {cache_stats.prefix_tokens:,} 토큰"
+                            )
+                        st.caption(f"🧾 OpenAI 사용량 원장: {usage_ledger_path}")
 
             df_out = st.session_state["applicant_df"]
 
@@ -506,6 +544,15 @@ def main():
                         value=False,
                         help="차단 FAIL이 있어도 강제로 점수를 계산합니다.",
                     )
+                rule_workers = st.number_input(
+                    "규칙 계산 프로세스 수",
+                    min_value=0,
+                    max_value=max(2, os.cpu_count() or 1),
+                    value=0,
+                    step=1,
+                    help="2 이상이면 규칙 기반 채점을 여러 프로세스로 나눠 계산합니다. "
+                    f"{PARALLEL_MIN_ROWS:,}행 미만이면 무시됩니다. 0/1: 현재 프로세스에서 계산",
+                )
             else:
                 use_llm_boost = st.checkbox(
                     "의도/일관성 LLM 보강 평가 사용",
@@ -520,6 +567,7 @@ def main():
                     help="기본 ON 권장",
                 )
                 consistency_under_min_policy = "two_run_proxy" if allow_two_run_proxy else "zero"
+                rule_workers = 0
                 st.info(
                     "간편 모드 기본값: 허용오차 ±1.0%, 일관성 최소 3회, "
                     "TTFT는 PASS/FAIL만 표기(종합점수 미반영)."
@@ -564,6 +612,7 @@ def main():
                                 use_consistency_llm=bool(use_consistency_llm),
                                 consistency_min_runs=int(consistency_min_runs),
                                 consistency_under_min_policy=consistency_under_min_policy,
+                                rule_workers=int(rule_workers),
                             )
                         )
                     round_df = build_aqb_round_summary(score_df)
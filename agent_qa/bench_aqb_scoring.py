@@ -0,0 +1,455 @@
+"""
+bench_aqb_scoring.py
+- 목적: run_aqb_scoring_async 규칙 단계의 행 단위(rowwise, iterrows) 구현과 컬럼 단위(columnar) 구현 비교
+- 데이터: 회차/ID/질의, 1~4차 답변(빈칸/None/NaN/에러 문구 포함), 응답시간(숫자/콤마 문자열/결측),
+  필터/datakey 토큰, buttonUrl, raw JSON, Ground Truth, TTFT, 에이전트 유형, 호출 횟수 등을 섞은 합성 표
+- 검증: row_infos / llm_tasks / 사전 점검 집계가 두 구현에서 완전히 같은지 assert
+  (행 단위 기준 구현은 이 파일의 build_rule_rows_rowwise, 작은 표로 같은 비교를 하는 pytest는
+   tests/test_aqb_scoring_parity.py)
+- LLM 호출은 하지 않음 (규칙 단계만 측정, llm_tasks는 프롬프트 생성까지만 비교)
+- 일관성: 반복 횟수(N)별로 쌍마다 재토큰화하는 기존 방식과 aqb_consistency 엔진(exact/minhash) 비교
+- 프로세스 풀(rule_workers): columnar 단일 프로세스 대비 결과 동일성과 소요 시간(풀 기동 포함),
+  규칙 단계 동안 이벤트 루프가 막히지 않는지(최대 tick 지연) 비교
+
+실행:
+  python bench_aqb_scoring.py
+  python bench_aqb_scoring.py --rows 20000 --repeat 3 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import aqb_aqb_scoring as scoring
+from aqb_consistency import SIMILARITY_EXACT, SIMILARITY_MINHASH, ConsistencyEngine
+
+_FILTERS = ["경력 3년 이상", "최근 3개월", "서울", "백엔드", "서류 합격", "면접 대기", "Java", "Python"]
+_DATAKEYS = ["applicant.list", "applicant.detail", "job.posting", "interview.schedule", "evaluation.form"]
+_PHRASES = [
+    "조건에 맞는 지원자는 {n}명입니다.",
+    "총 {n:,}명 중 합격률은 {p}%입니다.",
+    "해당 공고의 지원자 {n}명을 찾았습니다.",
+    "요청하신 화면으로 이동합니다.",
+    "죄송합니다. 요청을 처리하는 중 오류가 발생했습니다.",
+    "timeout",
+]
+
+
+def _pick_tokens(rng: random.Random, pool: List[str], sep: str) -> str:
+    return sep.join(rng.sample(pool, rng.randint(1, 3)))
+
+
+def _response(rng: random.Random, n: int) -> Any:
+    roll = rng.random()
+    if roll < 0.05:
+        return None
+    if roll < 0.1:
+        return np.nan
+    if roll < 0.12:
+        return "  "
+    return rng.choice(_PHRASES).format(n=n + rng.choice([0, 0, 0, 1, 250]), p=rng.choice([12.5, 30, 45.25]))
+
+
+def _seconds(rng: random.Random) -> Any:
+    roll = rng.random()
+    if roll < 0.08:
+        return np.nan
+    if roll < 0.12:
+        return f"{rng.uniform(900, 1500):,.1f}"
+    if roll < 0.14:
+        return "n/a"
+    return round(rng.uniform(0.5, 70.0), 2)
+
+
+def _raw_json(rng: random.Random) -> Any:
+    roll = rng.random()
+    if roll < 0.3:
+        return np.nan
+    if roll < 0.35:
+        return "{broken json"
+    if roll < 0.45:
+        return json.dumps({"chat": {"messages": [{"text": "데이터 없음"}]}}, ensure_ascii=False)
+    return json.dumps(
+        {"dataUIList": [{"uiValue": {"dataKey": rng.choice(_DATAKEYS)}}], "meta": {"data_key": rng.choice(_DATAKEYS)}},
+        ensure_ascii=False,
+    )
+
+
+def build_frame(rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    records: List[Dict[str, Any]] = []
+    for i in range(rows):
+        n = rng.randint(1, 5000)
+        record: Dict[str, Any] = {
+            "회차": rng.choice(["1회차", "2회차", None]),
+            "ID": f"Q-{i:05d}" if rng.random() > 0.05 else np.nan,
+            "질의": f"조건에 맞는 지원자를 찾아줘 {i}",
+            "에이전트 유형": rng.choice(["", "지원자 관리", "화면 이동", "실행", "custom", None]),
+            "기대 필터": _pick_tokens(rng, _FILTERS, rng.choice([",", ";", "/", "|"])) if rng.random() > 0.3 else "",
+            "감지된 필터": _pick_tokens(rng, _FILTERS, ",") if rng.random() > 0.2 else np.nan,
+            "1차 감지된 필터": _pick_tokens(rng, _FILTERS, ";") if rng.random() > 0.7 else "",
+            "기대 datakey": _pick_tokens(rng, _DATAKEYS, ",") if rng.random() > 0.6 else "",
+            "사용 datakey": _pick_tokens(rng, _DATAKEYS, "|") if rng.random() > 0.5 else "",
+            "1차 buttonUrl": (
+                f"https://ats.example.com/move?dataKey={rng.choice(_DATAKEYS)}&x=1" if rng.random() > 0.6 else ""
+            ),
+            "1차 답변 raw": _raw_json(rng),
+            "ground_truth": f"{n:,}명" if rng.random() > 0.3 else "",
+            "ttft": rng.choice([0.4, 1.0, 1.8, np.nan, "0.9"]),
+            "호출 횟수": rng.choice([np.nan, np.nan, 2, 3, 4]),
+            "도구 호출 수": rng.choice([np.nan, np.nan, 1, 2, "3"]),
+            "특이사항": rng.choice(["", "", "", "타임아웃 발생", None]),
+            "1차 응답 상태": rng.choice(["성공", "성공", "실패", None]),
+        }
+        for order in scoring._ORDINALS[: rng.randint(1, 4)]:
+            record[f"{order} 답변"] = _response(rng, n)
+            record[f"{order} 답변 시간(초)"] = _seconds(rng)
+        records.append(record)
+    return pd.DataFrame(records)
+
+
+def build_single_response_frame(rows: int, seed: int = 11) -> pd.DataFrame:
+    """`응답` 단일 컬럼 + 정수 ID + 비연속 인덱스 형태 (구버전 결과 파일)."""
+    rng = random.Random(seed)
+    df = pd.DataFrame(
+        {
+            "ID": list(range(rows)),
+            "query": [f"질의 {i}" for i in range(rows)],
+            "응답": [_response(rng, i) for i in range(rows)],
+            "응답 시간(초)": [_seconds(rng) for _ in range(rows)],
+            "expected_filters": [_pick_tokens(rng, _FILTERS, ",") for _ in range(rows)],
+            "detected_filters": [_pick_tokens(rng, _FILTERS, ",") for _ in range(rows)],
+        }
+    )
+    df.index = [i * 3 + 1 for i in range(rows)]
+    return df
+
+
+def legacy_precheck_counts(src: pd.DataFrame, consistency_min_runs: int) -> Dict[str, int]:
+    """기존 build_aqb_precheck_report 의 iterrows 집계 루프를 그대로 옮긴 것."""
+    columns = list(src.columns)
+    counts = {"response": 0, "consistency": 0, "speed": 0, "condition": 0, "ground_truth": 0, "ttft": 0}
+    for _, row in src.iterrows():
+        responses = scoring._collect_response_texts(row)
+        if responses:
+            counts["response"] += 1
+        if len(responses) >= consistency_min_runs:
+            counts["consistency"] += 1
+        if scoring._collect_response_times(row):
+            counts["speed"] += 1
+        if scoring._collect_expected_filters(row, columns) or scoring._collect_expected_datakeys(row, columns):
+            counts["condition"] += 1
+        if scoring._collect_ground_truth_text(row, columns):
+            counts["ground_truth"] += 1
+        if scoring._collect_ttft(row, columns) is not None:
+            counts["ttft"] += 1
+    return counts
+
+
+def build_rule_rows_rowwise(
+    src: pd.DataFrame,
+    *,
+    id_col: str,
+    query_col: str,
+    api_key: str,
+    tolerance_pct: float,
+    use_semantic_llm: bool,
+    use_consistency_llm: bool,
+    consistency_min_runs: int,
+    consistency_under_min_policy: str,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int, str]]]:
+    """기존 run_aqb_scoring_async 의 행 단위(iterrows) 규칙 단계를 그대로 옮긴 것 (columnar 패리티 기준)."""
+    columns = list(src.columns)
+    row_infos: List[Dict[str, Any]] = []
+    llm_tasks: List[Tuple[str, int, str]] = []
+
+    for idx, row in src.iterrows():
+        run_id = scoring._collect_run_id(row, columns)
+        query_id = scoring._to_str(row.get(id_col)) or f"row-{idx + 1}"
+        query_text = scoring._to_str(row.get(query_col))
+
+        responses = scoring._collect_response_texts(row)
+        response_times = scoring._collect_response_times(row)
+        avg_response_time = scoring._mean(response_times)
+
+        expected_filters = scoring._collect_expected_filters(row, columns)
+        detected_filters = scoring._collect_detected_filters(row, columns)
+        expected_datakeys = scoring._collect_expected_datakeys(row, columns)
+        detected_datakeys = scoring._collect_detected_datakeys(row, columns)
+        ground_truth_text = scoring._collect_ground_truth_text(row, columns)
+
+        agent_type = scoring._infer_agent_type(row, columns, expected_filters, expected_datakeys)
+
+        expected_calls = scoring._inferred_expected_calls(row, columns, responses)
+        has_error_or_blank = scoring._detect_error_or_blank(
+            row=row,
+            columns=columns,
+            responses=responses,
+            expected_calls=expected_calls,
+        )
+
+        # Accuracy
+        if agent_type in scoring._EXECUTION_AGENT_TYPES:
+            accuracy = scoring._score_accuracy_execute(expected_datakeys, detected_datakeys)
+            mapping_grade, _mapping_note = scoring._datakey_grade(expected_datakeys, detected_datakeys)
+            expected_conditions = expected_datakeys
+            detected_conditions = detected_datakeys
+        else:
+            accuracy = scoring._score_accuracy_applicant(
+                expected_filters=expected_filters,
+                detected_filters=detected_filters,
+                responses=responses,
+                ground_truth_text=ground_truth_text,
+                tolerance_pct=tolerance_pct,
+            )
+            mapping_grade, _mapping_note = scoring._filter_match_grade(expected_filters, detected_filters)
+            expected_conditions = expected_filters
+            detected_conditions = detected_filters
+
+        # Semantic (rule baseline)
+        semantic = scoring._score_semantic_rule(
+            mapping_grade=mapping_grade,
+            response_text=responses[0] if responses else "",
+            has_error_or_blank=has_error_or_blank,
+            agent_type=agent_type,
+        )
+
+        # Consistency (rule)
+        consistency = scoring._score_consistency_rule(
+            responses, tolerance_pct, consistency_min_runs, consistency_under_min_policy
+        )
+
+        # Speed
+        additional_tool_calls = scoring._infer_additional_tool_calls(
+            row=row,
+            columns=columns,
+            expected_filters=expected_filters,
+            expected_datakeys=expected_datakeys,
+        )
+        single_score, single_reason = scoring._score_speed_single(avg_response_time, has_error_or_blank)
+        multi_score, multi_reason = scoring._score_speed_multi(avg_response_time, has_error_or_blank, agent_type)
+
+        if additional_tool_calls > 0:
+            speed = (float(multi_score), f"복수 도구 기준: {multi_reason}")
+        else:
+            speed = (float(single_score), f"단일 도구 기준: {single_reason}")
+
+        # TTFT (pass/fail only)
+        ttft = scoring._collect_ttft(row, columns)
+        if ttft is None:
+            ttft_pass = "N/A"
+        else:
+            ttft_pass = "PASS" if ttft <= 1.0 else "FAIL"
+
+        info = scoring._make_row_info(
+            idx=int(idx),
+            run_id=run_id,
+            query_id=query_id,
+            query_text=query_text,
+            agent_type=agent_type,
+            semantic=semantic,
+            consistency=consistency,
+            accuracy=accuracy,
+            speed=speed,
+            stability=scoring._score_stability(has_error_or_blank),
+            single_score=single_score,
+            multi_score=multi_score,
+            avg_response_time=avg_response_time,
+            additional_tool_calls=additional_tool_calls,
+            ttft_pass=ttft_pass,
+            has_error_or_blank=has_error_or_blank,
+            mapping_grade=mapping_grade,
+            expected_conditions=expected_conditions,
+            detected_conditions=detected_conditions,
+            responses=responses,
+        )
+        scoring._queue_llm_tasks(
+            llm_tasks,
+            info,
+            api_key=api_key,
+            use_semantic_llm=use_semantic_llm,
+            use_consistency_llm=use_consistency_llm,
+            consistency_min_runs=consistency_min_runs,
+            tolerance_pct=tolerance_pct,
+        )
+        row_infos.append(info)
+
+    return row_infos, llm_tasks
+
+
+def _rule_options(src: pd.DataFrame) -> Dict[str, Any]:
+    columns = list(src.columns)
+    return {
+        "id_col": scoring._pick_col(columns, scoring._ID_ALIASES) or "ID",
+        "query_col": scoring._pick_col(columns, scoring._QUERY_ALIASES) or "질의",
+        "api_key": "bench",  # 프롬프트 생성 경로까지 비교하기 위한 더미 키 (호출하지 않음)
+        "tolerance_pct": 1.0,
+        "use_semantic_llm": True,
+        "use_consistency_llm": True,
+        "consistency_min_runs": 3,
+        "consistency_under_min_policy": "two_run_proxy",
+    }
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def check_parity(name: str, df: pd.DataFrame, repeat: int, chunk_rows: int) -> None:
+    src = scoring.normalize_columns(df)
+    options = _rule_options(src)
+
+    rowwise_sec, (rowwise_infos, rowwise_tasks) = _best_of(
+        lambda: build_rule_rows_rowwise(src, **options), repeat
+    )
+    columnar_sec, (columnar_infos, columnar_tasks) = _best_of(
+        lambda: scoring._build_rule_rows_columnar(src, chunk_rows=chunk_rows, **options), repeat
+    )
+    legacy_counts_sec, legacy_counts = _best_of(lambda: legacy_precheck_counts(src, 3), repeat)
+    counts_sec, counts = _best_of(lambda: scoring._precheck_counts(src, 3), repeat)
+
+    assert len(rowwise_infos) == len(columnar_infos)
+    for expected, actual in zip(rowwise_infos, columnar_infos):
+        assert expected == actual, (expected, actual)
+    assert rowwise_tasks == columnar_tasks
+    assert legacy_counts == counts, (legacy_counts, counts)
+
+    print(
+        f"{name:>16} {len(df):>7} {rowwise_sec * 1000:>12.1f} {columnar_sec * 1000:>13.1f} "
+        f"{rowwise_sec / columnar_sec:>7.1f}x {legacy_counts_sec * 1000:>14.1f} {counts_sec * 1000:>12.1f}"
+        f"  tasks={len(columnar_tasks)}"
+    )
+
+
+def naive_pairwise(responses: List[str], tolerance_pct: float) -> int:
+    """기존 헬퍼를 N회로 늘렸을 때의 방식: 쌍마다 토큰화/숫자 추출을 다시 한다."""
+    agree = 0
+    for i in range(len(responses)):
+        for j in range(i + 1, len(responses)):
+            same = scoring._text_similarity(responses[i], responses[j]) >= 0.45
+            state = scoring._pair_numeric_state(responses[i], responses[j], tolerance_pct)
+            agree += int(same and state != "mismatch")
+    return agree
+
+
+def _long_response(rng: random.Random, n: int) -> str:
+    words = [f"{w}{rng.randint(0, 400)}" for w in ("지원자", "공고", "면접", "평가", "step") for _ in range(40)]
+    rng.shuffle(words)
+    return " ".join(words) + f" 합계 {n}명"
+
+
+def bench_consistency(queries: int, repeat: int) -> None:
+    rng = random.Random(13)
+    print(f"{'texts':>6} {'runs(N)':>8} {'queries':>8} {'naive(ms)':>10} {'exact(ms)':>10} {'minhash(ms)':>12}")
+    for kind, make in (("short", lambda q: scoring._to_str(_response(rng, q))), ("long", lambda q: _long_response(rng, q))):
+        for runs in (3, 10, 30):
+            groups = [[make(q) for _ in range(runs)] for q in range(queries)]
+            naive_sec, _ = _best_of(lambda: [naive_pairwise(g, 1.0) for g in groups], repeat)
+            exact_sec, exact_scores = _best_of(
+                lambda: [e.score(g, max_runs=None) for e in [ConsistencyEngine(similarity=SIMILARITY_EXACT)] for g in groups],
+                repeat,
+            )
+            minhash_sec, _ = _best_of(
+                lambda: [e.score(g, max_runs=None) for e in [ConsistencyEngine(similarity=SIMILARITY_MINHASH)] for g in groups],
+                repeat,
+            )
+            if runs == 3:
+                assert exact_scores == [scoring._score_consistency_three(g, 1.0) for g in groups]
+            print(
+                f"{kind:>6} {runs:>8} {queries:>8} {naive_sec * 1000:>10.1f} {exact_sec * 1000:>10.1f} "
+                f"{minhash_sec * 1000:>12.1f}"
+            )
+
+    # 반복 수가 큰 경우(LSH 후보 쌍 사용 구간): naive는 너무 느려 생략
+    large_queries = max(1, queries // 20)
+    for runs in (100, 200):
+        groups = [[_long_response(rng, q) for _ in range(runs)] for q in range(large_queries)]
+        exact_sec, _ = _best_of(
+            lambda: [e.score(g, max_runs=None) for e in [ConsistencyEngine(similarity=SIMILARITY_EXACT)] for g in groups],
+            repeat,
+        )
+        minhash_sec, _ = _best_of(
+            lambda: [e.score(g, max_runs=None) for e in [ConsistencyEngine(similarity=SIMILARITY_MINHASH)] for g in groups],
+            repeat,
+        )
+        print(f"{'long':>6} {runs:>8} {large_queries:>8} {'-':>10} {exact_sec * 1000:>10.1f} {minhash_sec * 1000:>12.1f}")
+
+
+async def _score_with_loop_probe(df: pd.DataFrame, workers: int) -> tuple[pd.DataFrame, float]:
+    """채점하는 동안 5ms 주기 코루틴을 돌려 이벤트 루프가 가장 오래 막힌 시간(초)을 잰다."""
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def _probe() -> None:
+        nonlocal worst
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            worst = max(worst, time.perf_counter() - started - 0.005)
+
+    probe = asyncio.create_task(_probe())
+    await asyncio.sleep(0)  # probe가 먼저 한 번 돌아야 채점 중 막힌 시간이 잡힘
+    try:
+        out = await scoring.run_aqb_scoring_async(df, api_key="", model="gpt-5.2", rule_workers=workers)
+    finally:
+        done.set()
+        await probe
+    return out, worst
+
+
+def bench_parallel(df: pd.DataFrame, repeat: int, workers: int) -> None:
+    print(f"{'mode':>16} {'rows':>7} {'total(ms)':>10} {'max loop block(ms)':>19}")
+    baseline = None
+    for name, count in (("columnar", 0), (f"process x{workers}", workers)):
+        sec, (out, blocked) = _best_of(lambda: asyncio.run(_score_with_loop_probe(df, count)), repeat)
+        if baseline is None:
+            baseline = out
+        else:
+            pd.testing.assert_frame_equal(baseline, out)
+        print(f"{name:>16} {len(df):>7} {sec * 1000:>10.1f} {blocked * 1000:>19.1f}")
+    print(f"transfer: {'arrow' if scoring.pa is not None else 'pickle'}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=5000, help="합성 문항 수")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--chunk-rows", type=int, default=scoring.RULE_CHUNK_ROWS)
+    ap.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="rule_workers (프로세스 수)")
+    args = ap.parse_args()
+
+    print(
+        f"{'frame':>16} {'rows':>7} {'rowwise(ms)':>12} {'columnar(ms)':>13} {'speedup':>8}"
+        f" {'precheck_old':>14} {'precheck_new':>12}"
+    )
+    check_parity("multi-response", build_frame(args.rows), args.repeat, args.chunk_rows)
+    check_parity("single-response", build_single_response_frame(args.rows), args.repeat, args.chunk_rows)
+    # 모든 컬럼이 object dtype 인 경우 (pandas 2.x 기본 / 엑셀 혼합 타입 컬럼)
+    check_parity("object-dtype", build_frame(args.rows, seed=5).astype(object), args.repeat, args.chunk_rows)
+    # 청크 경계가 결과에 영향을 주지 않는지 작은 청크로 한 번 더 확인
+    check_parity("small-chunks", build_frame(max(1, args.rows // 10), seed=3), 1, 64)
+    print("parity: OK")
+    print()
+    bench_consistency(max(1, args.rows // 10), args.repeat)
+    print()
+    if args.workers >= 2:
+        bench_parallel(build_frame(max(args.rows, scoring.PARALLEL_MIN_ROWS)), args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+bench_sse_parser.py
+- 목적: aqb_sse_parser.SseParser 와 기존 클라이언트의 SSE 루프(`buffer += chunk.decode(...)` + split)를 비교하는 마이크로벤치마크
+- 스트림: CONNECT / HEARTBEAT / CHAT_EXECUTION_PROCESS(한글) / 대용량 CHAT(ASSISTANT) 이벤트
+- 청크 크기별로 (1) 처리 시간 (2) 한글 멀티바이트 경계 손상 여부를 출력
+
+실행:
+  python bench_sse_parser.py
+  python bench_sse_parser.py --events 400 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from aqb_sse_parser import SseParser
+
+
+def build_stream(n_process_events: int, ui_rows: int) -> tuple[bytes, Dict[str, Any]]:
+    parts: List[str] = ["event:CONNECT\ndata:connected\n\n"]
+    for idx in range(n_process_events):
+        if idx % 10 == 0:
+            parts.append("event:HEARTBEAT\n\n")
+        process = {"messageSummary": f"지원자 목록을 조회하는 중입니다 ({idx})", "step": idx}
+        parts.append(f"event:CHAT_EXECUTION_PROCESS\ndata:{json.dumps(process, ensure_ascii=False)}\n\n")
+    final = {
+        "messageType": "ASSISTANT",
+        "chatId": "chat-1",
+        "assistant": {
+            "assistantMessage": "조건에 맞는 지원자 " + "홍길동, " * 200 + "입니다.",
+            "dataUIList": [
+                {"uiType": "TABLE", "uiValue": {"row": i, "name": f"지원자{i}", "memo": "경력 3년 이상 백엔드 개발자"}}
+                for i in range(ui_rows)
+            ],
+            "guideList": [],
+        },
+    }
+    parts.append(f"event:CHAT\ndata:{json.dumps(final, ensure_ascii=False)}\n\n")
+    return "".join(parts).encode("utf-8"), final
+
+
+def split_chunks(payload: bytes, min_size: int, max_size: int, seed: int = 7) -> List[bytes]:
+    rng = random.Random(seed)
+    chunks: List[bytes] = []
+    pos = 0
+    while pos < len(payload):
+        size = rng.randint(min_size, max_size)
+        chunks.append(payload[pos : pos + size])
+        pos += size
+    return chunks
+
+
+def legacy_loop(chunks: List[bytes]) -> Optional[Dict[str, Any]]:
+    """기존 클라이언트(subscribe_sse)의 파싱 루프를 그대로 옮긴 것."""
+    buffer = ""
+    current_event = None
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8", errors="ignore")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line = line.strip()
+            if line.startswith("event:"):
+                current_event = line.replace("event:", "").strip()
+            elif line.startswith("data:"):
+                data_str = line.replace("data:", "", 1).strip()
+                if current_event != "CHAT" or not data_str.startswith("{"):
+                    continue
+                try:
+                    data = json.loads(data_str)
+                except Exception:
+                    continue
+                if data.get("messageType") == "ASSISTANT":
+                    return data
+    return None
+
+
+def parser_loop(chunks: List[bytes]) -> Optional[Dict[str, Any]]:
+    parser = SseParser()
+    for chunk in chunks:
+        for event in parser.feed(chunk):
+            if event.event != "CHAT":
+                continue
+            data = event.json()
+            if isinstance(data, dict) and data.get("messageType") == "ASSISTANT":
+                return data
+    return None
+
+
+def _best_of(fn, chunks: List[bytes], repeat: int) -> tuple[float, Optional[Dict[str, Any]]]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(chunks)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=200, help="CHAT_EXECUTION_PROCESS 이벤트 수")
+    ap.add_argument("--ui-rows", type=int, default=300, help="최종 CHAT 이벤트의 dataUIList 행 수")
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+
+    payload, expected = build_stream(args.events, args.ui_rows)
+    print(f"stream size: {len(payload) / 1024:.1f} KiB")
+    print(f"{'chunk(bytes)':>14} {'chunks':>7} {'legacy(ms)':>11} {'parser(ms)':>11} {'speedup':>8}  legacy_ok  parser_ok")
+    for min_size, max_size in ((16, 64), (256, 1024), (1024, 4096), (8192, 16384)):
+        chunks = split_chunks(payload, min_size, max_size)
+        legacy_sec, legacy_result = _best_of(legacy_loop, chunks, args.repeat)
+        parser_sec, parser_result = _best_of(parser_loop, chunks, args.repeat)
+        print(
+            f"{f'{min_size}-{max_size}':>14} {len(chunks):>7} {legacy_sec * 1000:>11.2f} {parser_sec * 1000:>11.2f} "
+            f"{legacy_sec / parser_sec:>7.1f}x  {str(legacy_result == expected):>9}  {str(parser_result == expected):>9}"
+        )
+        assert parser_result == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,9 @@ from typing import Any, Dict, List, Optional, Tuple
 import aiohttp
 from dotenv import load_dotenv
 
+from aqb_orchestrator_client import AgentTurn, OrchestratorClient
+from aqb_sse_manager import SseSubscriptionManager
+
 # -----------------------------
 # Env presets (필요시 확장)
 # -----------------------------
@@ -211,40 +214,8 @@ def autopilot_next_user_message(
     return None, f"unhandled formType={form_type}"
 
 
-class ServiceAgentClient:
-    """ATS Orchestrator 기반 서비스 에이전트 호출 클라이언트"""
-
-    def __init__(
-        self,
-        base_url: str,
-        bearer_token: str,
-        cms_token: str,
-        mrs_session: str,
-        origin: str,
-        referer: str,
-    ):
-        self.base_url = base_url.rstrip("/")
-        self.bearer_token = bearer_token.strip()
-        self.cms_token = cms_token.strip()
-        self.mrs_session = mrs_session.strip()
-        self.origin = origin.strip()
-        self.referer = referer.strip()
-
-    def headers(self, for_sse: bool = False) -> Dict[str, str]:
-        h = {
-            "authorization": f"Bearer {self.bearer_token}",
-            "cms-access-token": self.cms_token,
-            "mrs-session": self.mrs_session,
-            "origin": self.origin,
-            "referer": self.referer,
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        }
-        if for_sse:
-            h["accept"] = "text/event-stream"
-        else:
-            h["accept"] = "application/json, text/plain, */*"
-            h["content-type"] = "application/json"
-        return h
+class ServiceAgentClient(OrchestratorClient):
+    """ATS Orchestrator 기반 서비스 에이전트 호출 클라이언트 (호출/파싱은 OrchestratorClient 공용 구현)"""
 
     async def send_query(
         self,
@@ -254,89 +225,31 @@ class ServiceAgentClient:
         context: Optional[Dict[str, Any]] = None,
         target_assistant: Optional[str] = None,
     ) -> Tuple[Optional[str], str]:
-        url = f"{self.base_url}/api/v2/ai/orchestrator/query"
-        payload: Dict[str, Any] = {"conversationId": conversation_id, "userMessage": user_message}
-        if context:
-            payload["context"] = context
-        if target_assistant:
-            payload["targetAssistant"] = target_assistant
-
-        try:
-            async with session.post(url, headers=self.headers(), json=payload, timeout=30) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("conversationId"), ""
-                return None, f"HTTP {resp.status}: {(await resp.text())[:300]}"
-        except asyncio.TimeoutError:
-            return None, "timeout(30s)"
-        except Exception as e:
-            return None, f"{type(e).__name__}: {str(e)[:200]}"
+        return await super().send_query(session, user_message, conversation_id, context, target_assistant)
 
     async def subscribe_sse(self, session: aiohttp.ClientSession, conversation_id: str) -> AssistantSnapshot:
-        url = f"{self.base_url}/api/v1/ai/orchestrator/chat-room/sse/subscribe"
-        params = {"conversationId": conversation_id}
-
-        buffer = ""
-        current_event = None
-        last_heartbeat = datetime.now()
-
-        try:
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with session.get(url, headers=self.headers(for_sse=True), params=params, timeout=timeout) as resp:
-                async for chunk in resp.content.iter_any():
-                    buffer += chunk.decode("utf-8", errors="ignore")
-
-                    if (datetime.now() - last_heartbeat).total_seconds() > 30:
-                        raise TimeoutError("heartbeat timeout(30s)")
-
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        line = line.strip()
-
-                        if line.startswith("event:"):
-                            current_event = line.replace("event:", "").strip()
-                            if current_event == "HEARTBEAT":
-                                last_heartbeat = datetime.now()
-
-                        elif line.startswith("data:"):
-                            if current_event != "CHAT":
-                                continue
-                            data_str = line.replace("data:", "", 1).strip()
-                            if not data_str.startswith("{"):
-                                continue
-                            try:
-                                data = json.loads(data_str)
-                            except Exception:
-                                continue
-
-                            if data.get("messageType") == "ASSISTANT":
-                                assistant = data.get("assistant", {}) or {}
-                                return AssistantSnapshot(
-                                    chat_id=data.get("chatId"),
-                                    created=data.get("createdDateTime"),
-                                    assistant_message=assistant.get("assistantMessage", "") or "",
-                                    data_ui_list=assistant.get("dataUIList", []) or [],
-                                    guide_list=assistant.get("guideList", []) or [],
-                                    raw_event=data,
-                                )
+        return self._snapshot_from_turn(await self.subscribe(session, conversation_id))
 
+    @staticmethod
+    def _snapshot_from_turn(turn: AgentTurn) -> AssistantSnapshot:
+        if turn.error:
             return AssistantSnapshot(
                 chat_id=None,
                 created=None,
                 assistant_message="",
                 data_ui_list=[],
                 guide_list=[],
-                raw_event={"error": "sse ended without assistant"},
-            )
-        except Exception as e:
-            return AssistantSnapshot(
-                chat_id=None,
-                created=None,
-                assistant_message="",
-                data_ui_list=[],
-                guide_list=[],
-                raw_event={"error": f"{type(e).__name__}: {str(e)[:200]}"},
+                raw_event={"error": turn.error},
             )
+        data = turn.raw_event or {}
+        return AssistantSnapshot(
+            chat_id=data.get("chatId"),
+            created=data.get("createdDateTime"),
+            assistant_message=turn.assistant_message,
+            data_ui_list=turn.data_ui_list,
+            guide_list=turn.guide_list,
+            raw_event=data,
+        )
 
     async def run_hybrid_multiturn(
         self,
@@ -346,6 +259,28 @@ class ServiceAgentClient:
         target_assistant: Optional[str] = None,
         max_user_turns: int = DEFAULT_MAX_USER_TURNS,
         prefer_keywords: Optional[List[str]] = None,
+        sse_manager: Optional[SseSubscriptionManager] = None,
+    ) -> RunResult:
+        """
+        sse_manager가 주어지면 autopilot 후속 턴은 같은 구독을 재사용하고 send_query 전에 먼저 구독한다.
+        """
+        run = await self._run_hybrid_multiturn(
+            session, initial_user_message, context, target_assistant,
+            max_user_turns, prefer_keywords, sse_manager,
+        )
+        if sse_manager is not None:
+            await sse_manager.release(run.conversation_id)
+        return run
+
+    async def _run_hybrid_multiturn(
+        self,
+        session: aiohttp.ClientSession,
+        initial_user_message: str,
+        context: Optional[Dict[str, Any]],
+        target_assistant: Optional[str],
+        max_user_turns: int,
+        prefer_keywords: Optional[List[str]],
+        sse_manager: Optional[SseSubscriptionManager],
     ) -> RunResult:
         started = _now_iso()
         turns: List[Turn] = []
@@ -366,6 +301,9 @@ class ServiceAgentClient:
                     turns=turns,
                 )
 
+            if sse_manager is not None and conv_id:
+                await sse_manager.prepare(conv_id)
+
             new_conv_id, err = await self.send_query(
                 session,
                 user_message=next_user_message,
@@ -386,7 +324,10 @@ class ServiceAgentClient:
 
             conv_id = new_conv_id
 
-            snap = await self.subscribe_sse(session, conv_id)
+            if sse_manager is not None:
+                snap = self._snapshot_from_turn(await self.wait_sse_turn(sse_manager, conv_id))
+            else:
+                snap = await self.subscribe_sse(session, conv_id)
             turns.append(Turn(user_message=next_user_message, assistant=snap, error=""))
 
             if "error" in (snap.raw_event or {}):
@@ -504,14 +445,16 @@ async def _cli_main():
     connector = aiohttp.TCPConnector(limit=5, ssl=False)
     timeout = aiohttp.ClientTimeout(total=120)
     async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-        run = await client.run_hybrid_multiturn(
-            session=session,
-            initial_user_message=args.message,
-            context=context,
-            target_assistant=(args.target_assistant or None),
-            max_user_turns=args.max_user_turns,
-            prefer_keywords=prefer,
-        )
+        async with SseSubscriptionManager(session, client.base_url, client.headers(for_sse=True), max_sockets=2) as sse_manager:
+            run = await client.run_hybrid_multiturn(
+                session=session,
+                initial_user_message=args.message,
+                context=context,
+                target_assistant=(args.target_assistant or None),
+                max_user_turns=args.max_user_turns,
+                prefer_keywords=prefer,
+                sse_manager=sse_manager,
+            )
 
     print(run_result_to_transcript_json(run))
 
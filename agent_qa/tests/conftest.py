@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# agent_qa 모듈은 패키지가 아니라 스크립트 디렉터리 기준으로 import (streamlit 실행과 동일)
+AGENT_QA_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_QA_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_QA_DIR))
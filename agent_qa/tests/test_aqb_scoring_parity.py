@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aqb_aqb_scoring as scoring
+from bench_aqb_scoring import (
+    _rule_options,
+    build_frame,
+    build_rule_rows_rowwise,
+    build_single_response_frame,
+    legacy_precheck_counts,
+)
+
+
+def _edge_frame() -> pd.DataFrame:
+    """결측/빈 문자열/공백/숫자 문자열이 섞인 작은 표."""
+    return pd.DataFrame(
+        {
+            "ID": ["E-1", "", np.nan, None, "E-5", "E-6"],
+            "질의": ["", np.nan, "질의", "  ", None, "질의 6"],
+            "1차 답변": [np.nan, "", "   ", "지원자는 1,200명입니다.", None, "nan"],
+            "1차 답변 시간(초)": [np.nan, "", "1,234.5", "n/a", 3, "0"],
+            "2차 답변": ["", np.nan, "지원자는 1200명입니다.", "오류가 발생했습니다", "", None],
+            "기대 필터": ["", np.nan, "서울, 백엔드", " ; ", None, "서울|서울"],
+            "감지된 필터": [np.nan, "", "서울", "백엔드", None, "서울"],
+            "ground_truth": ["", np.nan, "1,200명", None, "0명", " "],
+            "ttft": [np.nan, "", "0.9", 1.5, None, "abc"],
+        }
+    )
+
+
+def _assert_rule_parity(df: pd.DataFrame, chunk_rows: int = scoring.RULE_CHUNK_ROWS) -> None:
+    src = scoring.normalize_columns(df)
+    options = _rule_options(src)
+
+    rowwise_infos, rowwise_tasks = build_rule_rows_rowwise(src, **options)
+    columnar_infos, columnar_tasks = scoring._build_rule_rows_columnar(src, chunk_rows=chunk_rows, **options)
+
+    assert len(rowwise_infos) == len(columnar_infos) == len(src)
+    for expected, actual in zip(rowwise_infos, columnar_infos):
+        assert expected == actual
+    assert rowwise_tasks == columnar_tasks
+    assert scoring._precheck_counts(src, 3) == legacy_precheck_counts(src, 3)
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        pytest.param(lambda: build_frame(300), id="multi-response"),
+        pytest.param(lambda: build_frame(300, seed=5).astype(object), id="object-dtype"),
+        pytest.param(lambda: build_single_response_frame(200), id="single-response"),
+        pytest.param(_edge_frame, id="nan-and-blank"),
+    ],
+)
+def test_columnar_rule_stage_matches_rowwise_reference(frame):
+    _assert_rule_parity(frame())
+
+
+def test_columnar_rule_stage_matches_rowwise_across_chunk_boundaries():
+    _assert_rule_parity(build_frame(300, seed=3), chunk_rows=64)
+
+
+@pytest.mark.parametrize(
+    "missing",
+    [
+        ["ID", "질의"],
+        ["기대 필터", "감지된 필터", "1차 감지된 필터"],
+        ["기대 datakey", "사용 datakey", "1차 buttonUrl", "1차 답변 raw"],
+        ["ground_truth", "ttft", "호출 횟수", "도구 호출 수", "에이전트 유형"],
+    ],
+)
+def test_columnar_rule_stage_matches_rowwise_with_missing_columns(missing):
+    _assert_rule_parity(build_frame(200, seed=9).drop(columns=missing))
+
+
+def test_columnar_rule_stage_handles_frame_without_response_columns():
+    _assert_rule_parity(pd.DataFrame({"질의": ["a", "", np.nan], "기대 필터": ["서울", "", None]}))
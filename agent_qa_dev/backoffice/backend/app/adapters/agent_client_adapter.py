@@ -1,12 +1,31 @@
 from __future__ import annotations
 
+import time
 from typing import Optional
 
+from app.core.ats_circuit import get_environment_breaker
+from app.core.environment import environment_label
+from app.core.metrics import record_agent_call
 from app.lib.aqb_agent_client import ApplicantAgentClient
+from app.lib.aqb_orchestrator_client import Deadline, RetryBudget, RetryPolicy
+
+# Transport failures, timeouts and 5xx are retried with jitter inside the item's own timeout.
+DEFAULT_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay_sec=0.5, max_delay_sec=5.0)
 
 
 class AgentClientAdapter:
-    def __init__(self, base_url: str, bearer: str, cms: str, mrs: str, origin: str, referer: str, max_parallel: int = 3):
+    def __init__(
+        self,
+        base_url: str,
+        bearer: str,
+        cms: str,
+        mrs: str,
+        origin: str,
+        referer: str,
+        max_parallel: int = 3,
+        timeout_ms: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.client = ApplicantAgentClient(
             base_url=base_url,
             bearer_token=bearer,
@@ -15,7 +34,13 @@ class AgentClientAdapter:
             origin=origin,
             referer=referer,
             max_parallel=max_parallel,
+            retry_policy=retry_policy or DEFAULT_RETRY_POLICY,
+            circuit_breaker=get_environment_breaker(base_url),
         )
+        self.timeout_ms = timeout_ms
+        self.environment = environment_label(base_url)
+        # One adapter serves one run, so the budget caps retries for the whole run.
+        self.retry_budget = RetryBudget()
 
     async def test_orchestrator_sync(
         self,
@@ -25,10 +50,16 @@ class AgentClientAdapter:
         context: Optional[dict] = None,
         target_assistant: Optional[str] = None,
     ):
-        return await self.client.test_orchestrator_sync(
+        started = time.perf_counter()
+        result = await self.client.test_orchestrator_sync(
             session,
             query,
             conversation_id=conversation_id,
             context=context,
             target_assistant=target_assistant,
+            deadline=Deadline.from_timeout_ms(self.timeout_ms),
+            retry_budget=self.retry_budget,
         )
+        error_kind = str(result.get("error_kind") or "unknown") if result.get("error") else ""
+        record_agent_call(self.environment, time.perf_counter() - started, error_kind)
+        return result
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import time
+
+from app.core.metrics import record_openai_call
 from app.lib.aqb_openai_judge import openai_judge_with_retry
 
 
@@ -15,7 +18,8 @@ class OpenAIJudgeAdapter:
         schema_name: str = "judge_output",
         strict_schema: bool = True,
     ):
-        return await openai_judge_with_retry(
+        started = time.perf_counter()
+        result, usage, error = await openai_judge_with_retry(
             session,
             api_key,
             model,
@@ -24,3 +28,5 @@ class OpenAIJudgeAdapter:
             schema_name=schema_name,
             strict_schema=strict_schema,
         )
+        record_openai_call(model, time.perf_counter() - started, usage, error)
+        return result, usage, error
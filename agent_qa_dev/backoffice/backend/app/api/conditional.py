@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core import serialization
+
+
+def build_etag(payload: Any) -> str:
+    """Weak ETag of the response body, so every worker and restart derives the same tag."""
+    encoded = serialization.dumps_bytes(payload, sort_keys=True)
+    digest = hashlib.sha1(encoded).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def _opaque_tag(value: str) -> str:
+    text = value.strip()
+    if text.startswith("W/"):
+        text = text[2:]
+    return text
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    header = (if_none_match or "").strip()
+    if not header:
+        return False
+    if header == "*":
+        return True
+    expected = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == expected for candidate in header.split(","))
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 response when the client already holds `etag`, else tag `response`."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core import serialization
+
+
+class FastJSONResponse(JSONResponse):
+    """Default API response class: renders through ``serialization.dumps_bytes`` (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return serialization.dumps_bytes(content)
@@ -206,7 +206,7 @@ async def create_direct_run(payload: DirectRunRequest, db: Session = Depends(get
                 int(payload.maxParallel or 3),
             )
 
-        runner.run(job_id, _job)
+        runner.run(job_id, _job, job_type="generic_execute")
         return {
             "runId": run.id,
             "rowId": row_id,
@@ -268,7 +268,7 @@ async def execute_run(run_id: str, payload: RunSecretPayload, db: Session = Depe
             int(options.get("maxParallel") or 3),
         )
 
-    runner.run(job_id, _job)
+    runner.run(job_id, _job, job_type="generic_execute")
     return {"jobId": job_id, "status": runner.jobs[job_id]}
 
 
@@ -291,7 +291,7 @@ async def evaluate_run(run_id: str, payload: EvaluatePayload, db: Session = Depe
             int(payload.maxParallel),
         )
 
-    runner.run(job_id, _job)
+    runner.run(job_id, _job, job_type="generic_evaluate")
     return {"jobId": job_id, "status": runner.jobs[job_id]}
 
 
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.db import get_db
+from app.services.openai_usage import build_usage_report
+
+router = APIRouter(tags=["openai-usage"])
+
+
+@router.get("/openai-usage")
+def get_openai_usage(
+    groupBy: str = Query(default="run"),
+    source: Optional[str] = Query(default=None),
+    runId: Optional[str] = Query(default=None),
+    testSetId: Optional[str] = Query(default=None),
+    dateFrom: Optional[str] = Query(default=None),
+    dateTo: Optional[str] = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    try:
+        return build_usage_report(
+            db,
+            group_by=groupBy,
+            source=(source or "").strip() or None,
+            run_id=(runId or "").strip() or None,
+            test_set_id=(testSetId or "").strip() or None,
+            date_from=dateFrom,
+            date_to=dateTo,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -102,7 +102,7 @@ def create_query_generation_job(body: QueryGenerationJobRequest, db: Session = D
 
         return _coro()
 
-    runner.run(job_id, _job)
+    runner.run(job_id, _job, job_type="query_generation")
     return {"jobId": job_id, "status": runner.jobs[job_id]}
 
 
@@ -148,7 +148,7 @@ def create_report_generation_job(body: ReportGenerationJobRequest, db: Session =
 
         return _coro()
 
-    runner.run(job_id, _job)
+    runner.run(job_id, _job, job_type="report_generation")
     return {"jobId": job_id, "status": runner.jobs[job_id]}
 
 
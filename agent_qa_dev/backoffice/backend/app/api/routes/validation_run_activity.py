@@ -36,23 +36,18 @@ def list_validation_run_activity(
 ):
     actor_key = _normalize_actor_key(actorKey)
     repo = ValidationRunRepository(db)
-    inserted_count = repo.ensure_run_activity_rows(
+    counter = repo.sync_run_activity_counter(
         environment=environment,
         actor_key=actor_key,
-        limit=1000,
     )
-    if inserted_count > 0:
-        db.commit()
+    unread_count = int(counter.unread_count or 0) if counter is not None else 0
+    db.commit()
 
     activity_items = repo.list_run_activity_items(
         environment=environment,
         actor_key=actor_key,
         limit=limit,
     )
-    unread_count = repo.count_unread_run_activity_items(
-        environment=environment,
-        actor_key=actor_key,
-    )
 
     items: list[dict[str, object]] = []
 
@@ -93,10 +88,9 @@ def mark_validation_run_activity_read(
     repo = ValidationRunRepository(db)
 
     if body.markAll:
-        repo.ensure_run_activity_rows(
+        repo.sync_run_activity_counter(
             environment=body.environment,
             actor_key=actor_key,
-            limit=1000,
         )
         updated_count = repo.mark_all_run_activity_read(
             environment=body.environment,
@@ -8,14 +8,15 @@ import uuid
 from typing import Any, Optional
 
 import pandas as pd
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy.orm import Session
 
+from app.api.conditional import build_etag, conditional_response
 from app.core.db import get_db
 from app.core.environment import get_env_config
-from app.core.enums import Environment, EvalStatus, RunStatus
+from app.core.enums import Environment, EvalStatus, ItemEvalState, RunStatus
 from app.jobs.runner import runner
 from app.jobs.validation_evaluate_job import evaluate_validation_run
 from app.jobs.validation_execute_job import execute_validation_run
@@ -24,8 +25,14 @@ from app.repositories.validation_queries import ValidationQueryRepository
 from app.repositories.validation_query_groups import ValidationQueryGroupRepository
 from app.repositories.validation_runs import ValidationRunRepository
 from app.repositories.validation_settings import ValidationSettingsRepository
-from app.services.validation_compare import compare_validation_runs
-from app.services.validation_dashboard import build_group_dashboard, build_test_set_dashboard
+from app.services.validation_compare import (
+    COMPARE_MODES,
+    SIGNIFICANCE_DEFAULT_CONFIDENCE,
+    SIGNIFICANCE_DEFAULT_RESAMPLES,
+    compare_validation_runs_cached,
+)
+from app.services.validation_dashboard import build_group_dashboard, build_test_set_dashboard_cached
+from app.services.validation_run_events import parse_last_event_id, stream_run_events
 
 router = APIRouter(tags=["validation-runs"])
 
@@ -71,8 +78,10 @@ class EvaluatePayload(BaseModel):
 
     openaiModel: Optional[str] = None
     maxChars: int = 15000
+    maxInputTokens: Optional[int] = Field(default=None, ge=1)
     maxParallel: Optional[int] = None
     itemIds: list[str] = Field(default_factory=list)
+    force: bool = False
 
 
 class SaveQueryPayload(BaseModel):
@@ -500,6 +509,8 @@ def _analyze_expected_result_bulk_rows(
 
 @router.get("/validation-runs")
 def list_validation_runs(
+    request: Request,
+    response: Response,
     environment: Optional[Environment] = Query(default=None),
     testSetId: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
@@ -538,18 +549,24 @@ def list_validation_runs(
             agent_parallel_calls_default=cached_setting.agent_parallel_calls_default,
             timeout_ms_default=cached_setting.timeout_ms_default,
         ):
+            repo.mark_run_changed(row.id)
             rows_changed = True
     if rows_changed:
         db.commit()
-    return {
+    total = repo.count_runs(
+        environment=environment,
+        test_set_id=testSetId,
+        status=status,
+        evaluation_status=evaluationStatus,
+    )
+    payload = {
         "items": [repo.build_run_payload(row) for row in rows],
-        "total": repo.count_runs(
-            environment=environment,
-            test_set_id=testSetId,
-            status=status,
-            evaluation_status=evaluationStatus,
-        ),
+        "total": total,
     }
+    not_modified = conditional_response(request, response, build_etag(payload))
+    if not_modified is not None:
+        return not_modified
+    return payload
 
 
 @router.post("/validation-runs")
@@ -644,7 +661,7 @@ def create_validation_run(body: ValidationRunCreateRequest, db: Session = Depend
 
 
 @router.get("/validation-runs/{run_id}")
-def get_validation_run(run_id: str, db: Session = Depends(get_db)):
+def get_validation_run(run_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
     repo = ValidationRunRepository(db)
     setting_repo = ValidationSettingsRepository(db)
     run = repo.get_run(run_id)
@@ -664,10 +681,15 @@ def get_validation_run(run_id: str, db: Session = Depends(get_db)):
         agent_parallel_calls_default=setting.agent_parallel_calls_default,
         timeout_ms_default=setting.timeout_ms_default,
     ):
+        repo.mark_run_changed(run.id)
         run_changed = True
     if run_changed:
         db.commit()
-    return repo.build_run_payload(run)
+    payload = repo.build_run_payload(run)
+    not_modified = conditional_response(request, response, build_etag(payload))
+    if not_modified is not None:
+        return not_modified
+    return payload
 
 
 @router.patch("/validation-runs/{run_id}")
@@ -711,15 +733,55 @@ def delete_validation_run(run_id: str, db: Session = Depends(get_db)):
     return {"ok": True}
 
 
+@router.get("/validation-runs/{run_id}/events")
+def stream_validation_run_events(
+    run_id: str,
+    request: Request,
+    lastEventId: Optional[str] = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    repo = ValidationRunRepository(db)
+    if repo.get_run(run_id) is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    # The stream can stay open for minutes; do not hold the SQLite read transaction with it.
+    db.close()
+    last_event_id = parse_last_event_id(request.headers.get("last-event-id") or lastEventId)
+    return StreamingResponse(
+        stream_run_events(run_id, last_event_id=last_event_id, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/validation-runs/{run_id}/profile")
+def get_validation_run_profile(run_id: str, db: Session = Depends(get_db)):
+    repo = ValidationRunRepository(db)
+    if repo.get_run(run_id) is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    profiles = repo.get_run_profile(run_id)
+    return {
+        "runId": run_id,
+        "execute": profiles.get("execute"),
+        "evaluate": profiles.get("evaluate"),
+    }
+
+
 @router.get("/validation-runs/{run_id}/items")
-def list_validation_run_items(run_id: str, offset: int = 0, limit: int = 1000, db: Session = Depends(get_db)):
+def list_validation_run_items(
+    run_id: str,
+    request: Request,
+    response: Response,
+    offset: int = 0,
+    limit: int = 1000,
+    db: Session = Depends(get_db),
+):
     repo = ValidationRunRepository(db)
     run = repo.get_run(run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="Run not found")
     items = repo.list_items(run_id, offset=offset, limit=limit)
     llm_map = repo.get_llm_eval_map([row.id for row in items])
-    return {
+    payload = {
         "items": [
             {
                 "id": row.id,
@@ -739,6 +801,8 @@ def list_validation_run_items(run_id: str, offset: int = 0, limit: int = 1000, d
                 "executedAt": row.executed_at,
                 "responseTimeSec": row.latency_ms / 1000 if row.latency_ms is not None else None,
                 "latencyClass": _extract_item_latency_class(row.applied_criteria_json),
+                "evalState": row.eval_state.value if isinstance(row.eval_state, ItemEvalState) else str(row.eval_state),
+                "evalAttempts": row.eval_attempts,
                 "llmEvaluation": (
                     {
                         "status": llm_map[row.id].status,
@@ -759,6 +823,10 @@ def list_validation_run_items(run_id: str, offset: int = 0, limit: int = 1000, d
         ],
         "total": repo.count_items(run_id),
     }
+    not_modified = conditional_response(request, response, build_etag(payload))
+    if not_modified is not None:
+        return not_modified
+    return payload
 
 
 @router.post("/validation-runs/{run_id}/execute")
@@ -817,7 +885,7 @@ async def execute_run(run_id: str, body: RunSecretPayload, db: Session = Depends
     repo.set_status(run.id, RunStatus.RUNNING)
     repo.set_eval_status(run.id, EvalStatus.PENDING)
     db.commit()
-    runner.run(job_id, _job)
+    runner.run(job_id, _job, job_type="validation_execute")
     return {"jobId": job_id, "status": runner.jobs[job_id]}
 
 
@@ -888,18 +956,22 @@ async def evaluate_run(run_id: str, body: EvaluatePayload, db: Session = Depends
             body.maxChars,
             int(eval_parallel),
             target_item_ids or None,
+            max_input_tokens=body.maxInputTokens,
+            force=body.force,
         )
 
+    # Item states before this job claims anything: DONE items are reused, the rest are (re)judged.
+    item_eval_states = repo.count_items_by_eval_state(run.id)
     repo.clear_eval_cancel_request(run.id)
     repo.set_eval_status(run.id, EvalStatus.RUNNING)
     db.commit()
     try:
-        runner.run(job_id, _job, job_key=_evaluation_job_key(run.id))
+        runner.run(job_id, _job, job_key=_evaluation_job_key(run.id), job_type="validation_evaluate")
     except Exception as exc:
         repo.reset_eval_state_to_pending(run.id)
         db.commit()
         raise HTTPException(status_code=500, detail=f"Failed to schedule evaluation job: {exc}") from exc
-    return {"jobId": job_id, "status": runner.jobs[job_id]}
+    return {"jobId": job_id, "status": runner.jobs[job_id], "itemEvalStates": item_eval_states}
 
 
 @router.post("/validation-runs/{run_id}/evaluate/cancel")
@@ -1135,7 +1207,7 @@ async def bulk_update_run_expected_results(
     updated_count = repo.bulk_update_item_expected_results(run.id, analysis["plannedUpdates"])
     eval_reset = False
     if updated_count > 0:
-        repo.clear_llm_evaluations_for_run(run.id)
+        repo.clear_llm_evaluations_for_items(run.id, list(analysis["plannedUpdates"]))
         repo.clear_score_snapshots_for_run(run.id)
         repo.reset_eval_state_to_pending(run.id)
         eval_reset = True
@@ -1228,10 +1300,29 @@ def update_run_item_snapshot(run_id: str, item_id: str, body: UpdateRunItemSnaps
 
 
 @router.get("/validation-runs/{run_id}/compare")
-def compare_run(run_id: str, baseRunId: Optional[str] = Query(default=None), db: Session = Depends(get_db)):
+def compare_run(
+    run_id: str,
+    baseRunId: Optional[str] = Query(default=None),
+    mode: str = Query(default="exact"),
+    confidence: float = Query(default=SIGNIFICANCE_DEFAULT_CONFIDENCE, ge=0.5, lt=1.0),
+    resamples: int = Query(default=SIGNIFICANCE_DEFAULT_RESAMPLES, ge=100, le=20000),
+    minDelta: float = Query(default=0.0, ge=0.0),
+    db: Session = Depends(get_db),
+):
+    normalized_mode = (mode or "").strip().lower()
+    if normalized_mode not in COMPARE_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(COMPARE_MODES)}")
     repo = ValidationRunRepository(db)
     try:
-        return compare_validation_runs(repo, run_id, base_run_id=baseRunId)
+        return compare_validation_runs_cached(
+            repo,
+            run_id,
+            base_run_id=baseRunId,
+            mode=normalized_mode,
+            confidence=confidence,
+            resamples=resamples,
+            min_delta=minDelta,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except PermissionError as exc:
@@ -1246,12 +1337,18 @@ def group_dashboard(group_id: str, db: Session = Depends(get_db)):
 @router.get("/validation-dashboard/test-sets/{test_set_id}")
 def test_set_dashboard(
     test_set_id: str,
+    request: Request,
+    response: Response,
     runId: Optional[str] = Query(default=None),
     dateFrom: Optional[str] = Query(default=None),
     dateTo: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
 ):
     try:
-        return build_test_set_dashboard(db, test_set_id, run_id=runId, date_from=dateFrom, date_to=dateTo)
+        payload = build_test_set_dashboard_cached(db, test_set_id, run_id=runId, date_from=dateFrom, date_to=dateTo)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    not_modified = conditional_response(request, response, build_etag(payload))
+    if not_modified is not None:
+        return not_modified
+    return payload
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.db import get_db
+from app.core.enums import Environment
+from app.repositories.validation_runs import ValidationRunRepository
+from app.services.worker_latency import (
+    backfill_worker_latencies,
+    build_worker_latency_report,
+    compare_worker_latency,
+)
+
+router = APIRouter(tags=["validation-worker-latency"])
+
+
+class WorkerLatencyBackfillRequest(BaseModel):
+    runId: Optional[str] = None
+
+
+@router.get("/validation-analytics/worker-latency")
+def get_worker_latency(
+    groupBy: str = Query(default="none"),
+    environment: Optional[Environment] = Query(default=None),
+    runId: list[str] = Query(default_factory=list),
+    workerType: list[str] = Query(default_factory=list),
+    promptVersion: Optional[str] = Query(default=None),
+    dateFrom: Optional[str] = Query(default=None),
+    dateTo: Optional[str] = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    try:
+        return build_worker_latency_report(
+            db,
+            group_by=groupBy,
+            environment=environment,
+            run_ids=[run_id for run_id in runId if run_id.strip()],
+            worker_types=[worker_type for worker_type in workerType if worker_type.strip()],
+            prompt_version=promptVersion,
+            date_from=dateFrom,
+            date_to=dateTo,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/validation-analytics/worker-latency/compare")
+def compare_run_worker_latency(
+    baseRunId: str = Query(...),
+    runId: str = Query(...),
+    db: Session = Depends(get_db),
+):
+    repo = ValidationRunRepository(db)
+    for candidate in (baseRunId, runId):
+        if repo.get_run(candidate) is None:
+            raise HTTPException(status_code=404, detail=f"Run not found: {candidate}")
+    return compare_worker_latency(db, base_run_id=baseRunId, run_id=runId)
+
+
+@router.post("/validation-analytics/worker-latency/backfill")
+def backfill_worker_latency(body: WorkerLatencyBackfillRequest, db: Session = Depends(get_db)):
+    if body.runId and ValidationRunRepository(db).get_run(body.runId) is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    result = backfill_worker_latencies(db, run_id=body.runId)
+    db.commit()
+    return result
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from typing import Optional
+
+from app.lib.aqb_orchestrator_client import (
+    CIRCUIT_CLOSED,
+    CircuitBreaker,
+    circuit_breaker_for,
+)
+
+CIRCUIT_FAILURES_ENV = "BACKOFFICE_ATS_CIRCUIT_FAILURES"
+CIRCUIT_RESET_SEC_ENV = "BACKOFFICE_ATS_CIRCUIT_RESET_SEC"
+DEFAULT_CIRCUIT_FAILURES = 5
+DEFAULT_CIRCUIT_RESET_SEC = 30.0
+
+GATE_BLOCKED = "blocked"
+GATE_PASS = "pass"
+GATE_PROBE = "probe"
+
+
+def _env_number(key: str, default: float) -> float:
+    try:
+        value = float(os.getenv(key, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def get_environment_breaker(base_url: str) -> CircuitBreaker:
+    """Process-wide breaker for one ATS environment, shared by every job that calls it."""
+    return circuit_breaker_for(
+        base_url,
+        failure_threshold=int(_env_number(CIRCUIT_FAILURES_ENV, DEFAULT_CIRCUIT_FAILURES)),
+        reset_timeout_sec=_env_number(CIRCUIT_RESET_SEC_ENV, DEFAULT_CIRCUIT_RESET_SEC),
+    )
+
+
+def circuit_open_error(breaker: CircuitBreaker) -> str:
+    snapshot = breaker.snapshot()
+    return (
+        f"circuit open: ATS {snapshot['key']} unavailable after "
+        f"{snapshot['consecutiveFailures']} consecutive failures; item was not sent"
+    )
+
+
+class CircuitGate:
+    """Fails a job's items fast while its environment breaker is open.
+
+    Items are rejected without calling ATS until the breaker's cool-down has passed. Then
+    exactly one item is let through as the half-open probe, and the others keep failing fast
+    until its outcome closes (or re-opens) the breaker.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        *,
+        on_state_change: Optional[Callable[[str], None]] = None,
+    ):
+        self.breaker = breaker
+        self._on_state_change = on_state_change
+        self._probing = False
+        self._last_state = breaker.state
+
+    def _observe(self) -> str:
+        state = self.breaker.state
+        if state != self._last_state:
+            self._last_state = state
+            if self._on_state_change is not None:
+                self._on_state_change(state)
+        return state
+
+    def acquire(self) -> str:
+        if self._observe() == CIRCUIT_CLOSED:
+            return GATE_PASS
+        if self._probing or self.breaker.retry_in_sec() > 0:
+            return GATE_BLOCKED
+        self._probing = True
+        return GATE_PROBE
+
+    def release(self, ticket: str) -> None:
+        if ticket == GATE_PROBE:
+            self._probing = False
+        self._observe()
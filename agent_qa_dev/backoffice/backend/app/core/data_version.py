@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+QUERIES_SCOPE = "queries"
+
+_PENDING_SCOPES_KEY = "data_version_pending_scopes"
+
+
+def run_scope(run_id: str) -> str:
+    return f"run:{str(run_id or '').strip()}"
+
+
+def test_set_scope(test_set_id: str) -> str:
+    return f"test-set:{str(test_set_id or '').strip()}"
+
+
+class DataVersionRegistry:
+    """In-process version counters per data scope (run, test set, query catalog).
+
+    Repositories mark scopes on the session while writing; the counters are bumped
+    only after the transaction commits so readers never see a new stamp before the
+    data behind it is visible.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+        self._listeners: list[Callable[[set[str]], None]] = []
+
+    def get(self, scope: str) -> int:
+        with self._lock:
+            return self._versions.get(scope, 0)
+
+    def stamp(self, scopes: Iterable[str]) -> tuple[tuple[str, int], ...]:
+        with self._lock:
+            return tuple((scope, self._versions.get(scope, 0)) for scope in sorted(set(scopes)))
+
+    def bump(self, scopes: Iterable[str]) -> None:
+        changed = {scope for scope in scopes if scope}
+        if not changed:
+            return
+        with self._lock:
+            for scope in changed:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(changed)
+
+    def subscribe(self, listener: Callable[[set[str]], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+
+data_versions = DataVersionRegistry()
+
+
+def mark_changed(db: Session, *scopes: str) -> None:
+    pending = db.info.setdefault(_PENDING_SCOPES_KEY, set())
+    pending.update(scope for scope in scopes if scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_SCOPES_KEY, None)
+    if pending:
+        data_versions.bump(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_SCOPES_KEY, None)
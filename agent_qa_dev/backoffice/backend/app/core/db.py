@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import os
+import time
 from pathlib import Path
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+from app.core.metrics import DB_COMMIT_DURATION, DB_LOCK_ERRORS, DB_STATEMENTS
+
 _RESET_FLAG_ENV = "BACKOFFICE_ALLOW_DB_RESET"
 _SAFE_TEST_DB_SUFFIX = "_test"
 _BACKEND_ROOT = Path(__file__).resolve().parents[2]
@@ -57,6 +60,32 @@ _DB_PATH = _resolve_db_path(os.getenv("BACKOFFICE_DB_PATH"))
 _ENGINE = create_engine(_to_sqlite_engine_url(_DB_PATH), future=True)
 SessionLocal = sessionmaker(bind=_ENGINE, autoflush=False, autocommit=False, future=True)
 
+_COMMIT_STARTED_KEY = "metrics_commit_started"
+
+
+@event.listens_for(_ENGINE, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "EMPTY"
+    DB_STATEMENTS.inc(operation=operation)
+
+
+@event.listens_for(_ENGINE, "handle_error")
+def _count_lock_error(exception_context) -> None:
+    if "database is locked" in str(exception_context.original_exception):
+        DB_LOCK_ERRORS.inc()
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _start_commit_timer(session: Session) -> None:
+    session.info[_COMMIT_STARTED_KEY] = time.perf_counter()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _observe_commit(session: Session) -> None:
+    started = session.info.pop(_COMMIT_STARTED_KEY, None)
+    if started is not None:
+        DB_COMMIT_DURATION.observe(time.perf_counter() - started)
+
 
 class Base(DeclarativeBase):
     pass
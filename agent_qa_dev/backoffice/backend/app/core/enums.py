@@ -22,3 +22,10 @@ class EvalStatus(str, Enum):
     RUNNING = "RUNNING"
     DONE = "DONE"
     FAILED = "FAILED"
+
+
+class ItemEvalState(str, Enum):
+    PENDING = "PENDING"
+    IN_FLIGHT = "IN_FLIGHT"
+    DONE = "DONE"
+    FAILED = "FAILED"
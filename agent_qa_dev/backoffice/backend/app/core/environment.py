@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from urllib.parse import urlparse
 
 from app.lib.aqb_prompt_template import ENV_PRESETS
 
@@ -45,6 +46,23 @@ def get_cms_base_url(env: Environment) -> str:
     return _normalize_url(_CMS_BASE_URL_PRESETS[env])
 
 
+def get_ats_base_url(env: Environment) -> str:
+    override_key = f"BACKOFFICE_ATS_BASE_URL_{env.name}"
+    override_value = _normalize_url(os.getenv(override_key, ""))
+    if override_value:
+        return override_value
+    return str(ENV_PRESETS[to_ats_environment(env)].get("base_url", ""))
+
+
+def environment_label(base_url: str) -> str:
+    """Metric label for an ATS base URL: the environment code, or the host for custom targets."""
+    normalized = _normalize_url(base_url)
+    for env in Environment:
+        if _normalize_url(get_ats_base_url(env)) == normalized:
+            return env.value
+    return urlparse(normalized).netloc or "unknown"
+
+
 def to_ats_environment(env: Environment) -> str:
     return _ENV_MAP[env]
 
@@ -55,7 +73,7 @@ def get_env_config(env: Environment) -> EnvConfig:
     return EnvConfig(
         ui_code=env,
         ats_code=ats,
-        base_url=str(preset.get("base_url", "")),
+        base_url=get_ats_base_url(env),
         origin=str(preset.get("origin", "")),
         referer=str(preset.get("referer", "")),
         cms_base_url=get_cms_base_url(env),
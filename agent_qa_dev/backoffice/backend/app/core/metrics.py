@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans agent turns (sub-second to minutes) as well as SQLite commits.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = tuple[str, ...]
+
+_INF_LABEL = 'le="+Inf"'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        collect: Callable[[], dict[LabelValues, float]],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+
+    def _samples(self) -> list[str]:
+        items = sorted(self._collect().items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "total")
+
+    def __init__(self, size: int) -> None:
+        self.bucket_counts = [0] * size
+        self.count = 0
+        self.total = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            if index < len(self.buckets):
+                series.bucket_counts[index] += 1
+            series.count += 1
+            series.total += value
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series is not None else 0
+
+    def _samples(self) -> list[str]:
+        lines: list[str] = []
+        with self._lock:
+            items = sorted(
+                (key, list(series.bucket_counts), series.count, series.total) for key, series in self._series.items()
+            )
+        for key, bucket_counts, count, total in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, _INF_LABEL)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))  # type: ignore[return-value]
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        collect: Callable[[], dict[LabelValues, float]],
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, collect=collect))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "backoffice_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+JOB_ITEMS = REGISTRY.counter(
+    "backoffice_job_items_total",
+    "Items processed by background jobs; rate() gives items/sec.",
+    ("job", "outcome"),
+)
+JOB_SPAN_DURATION = REGISTRY.histogram(
+    "backoffice_job_span_duration_seconds",
+    "Hot-path span durations of job phases (semaphore_wait, db_lock_wait, ats_call, ...).",
+    ("phase", "span"),
+)
+AGENT_CALL_DURATION = REGISTRY.histogram(
+    "backoffice_agent_call_duration_seconds",
+    "ATS agent call latency including retries, by environment.",
+    ("environment",),
+)
+AGENT_CALL_ERRORS = REGISTRY.counter(
+    "backoffice_agent_call_errors_total",
+    "ATS agent calls that ended with an error, by environment and error kind.",
+    ("environment", "kind"),
+)
+OPENAI_CALL_DURATION = REGISTRY.histogram(
+    "backoffice_openai_call_duration_seconds",
+    "OpenAI judge call latency including retries, by model.",
+    ("model",),
+)
+OPENAI_CALL_ERRORS = REGISTRY.counter(
+    "backoffice_openai_call_errors_total",
+    "OpenAI judge calls that ended with an error, by model.",
+    ("model",),
+)
+OPENAI_TOKENS = REGISTRY.counter(
+    "backoffice_openai_tokens_total",
+    "OpenAI token usage by model and direction (input/output).",
+    ("model", "direction"),
+)
+DB_STATEMENTS = REGISTRY.counter(
+    "backoffice_db_statements_total",
+    "SQL statements executed, by leading keyword.",
+    ("operation",),
+)
+DB_COMMIT_DURATION = REGISTRY.histogram(
+    "backoffice_db_commit_duration_seconds",
+    "SQLite commit latency; long tails mean writers are queueing on the database lock.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_LOCK_ERRORS = REGISTRY.counter(
+    "backoffice_db_lock_errors_total",
+    "Statements that failed with 'database is locked' after the SQLite busy timeout.",
+)
+
+
+def record_agent_call(environment: str, elapsed_sec: float, error_kind: str = "") -> None:
+    AGENT_CALL_DURATION.observe(elapsed_sec, environment=environment)
+    if error_kind:
+        AGENT_CALL_ERRORS.inc(environment=environment, kind=error_kind)
+
+
+def record_openai_call(model: str, elapsed_sec: float, usage: dict[str, Any] | None, error: str = "") -> None:
+    OPENAI_CALL_DURATION.observe(elapsed_sec, model=model)
+    if error:
+        OPENAI_CALL_ERRORS.inc(model=model)
+    for direction in ("input", "output"):
+        tokens = (usage or {}).get(f"{direction}_tokens") or 0
+        if isinstance(tokens, (int, float)) and tokens > 0:
+            OPENAI_TOKENS.inc(float(tokens), model=model, direction=direction)
+
+
+def record_job_item(job: str, outcome: str) -> None:
+    JOB_ITEMS.inc(job=job, outcome=outcome)
+
+
+def record_job_span(phase: str, span: str, elapsed_sec: float) -> None:
+    JOB_SPAN_DURATION.observe(elapsed_sec, phase=phase, span=span)
+
+
+def render_latest() -> str:
+    return REGISTRY.render()
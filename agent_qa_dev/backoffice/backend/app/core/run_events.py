@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+RUN_EVENT_ITEM_DONE = "item_done"
+RUN_EVENT_ITEM_ERROR = "item_error"
+RUN_EVENT_EVAL_DONE = "eval_done"
+RUN_EVENT_STATUS = "status"
+RUN_EVENT_RESYNC = "resync"
+RUN_EVENT_CIRCUIT = "circuit"
+
+
+@dataclass(frozen=True)
+class RunEvent:
+    id: int
+    run_id: str
+    type: str
+    data: dict[str, Any]
+    created_at: str
+
+
+@dataclass
+class _Subscriber:
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue
+
+
+@dataclass
+class _RunChannel:
+    next_id: int = 1
+    history: deque = field(default_factory=deque)
+    subscribers: list[_Subscriber] = field(default_factory=list)
+
+
+class RunEventBus:
+    """In-process pub/sub for run progress with a bounded replay buffer per run.
+
+    Event ids increase per run so a reconnecting client can resume from
+    `Last-Event-ID`; when the requested id has already left the buffer the
+    subscriber gets a `resync` event and should refetch the run once.
+    """
+
+    def __init__(self, *, history_size: int = 500, max_runs: int = 200):
+        self._history_size = max(1, int(history_size))
+        self._max_runs = max(1, int(max_runs))
+        self._lock = threading.Lock()
+        self._channels: dict[str, _RunChannel] = {}
+
+    def _channel(self, run_id: str) -> _RunChannel:
+        channel = self._channels.get(run_id)
+        if channel is None:
+            channel = _RunChannel()
+            self._channels[run_id] = channel
+            self._evict_idle_channels()
+        return channel
+
+    def _evict_idle_channels(self) -> None:
+        if len(self._channels) <= self._max_runs:
+            return
+        for run_id in list(self._channels.keys()):
+            if len(self._channels) <= self._max_runs:
+                break
+            if not self._channels[run_id].subscribers:
+                self._channels.pop(run_id, None)
+
+    def publish(self, run_id: str, event_type: str, data: Optional[dict[str, Any]] = None) -> RunEvent:
+        normalized_run_id = str(run_id or "").strip()
+        with self._lock:
+            channel = self._channel(normalized_run_id)
+            event = RunEvent(
+                id=channel.next_id,
+                run_id=normalized_run_id,
+                type=event_type,
+                data=dict(data or {}),
+                created_at=dt.datetime.utcnow().isoformat(),
+            )
+            channel.next_id += 1
+            channel.history.append(event)
+            while len(channel.history) > self._history_size:
+                channel.history.popleft()
+            subscribers = list(channel.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.queue.put_nowait, event)
+            except RuntimeError:
+                # The subscriber's loop is gone; it is removed when its stream closes.
+                pass
+        return event
+
+    def subscribe(self, run_id: str, last_event_id: Optional[int] = None) -> tuple[_Subscriber, list[RunEvent]]:
+        """Register a subscriber on the running loop and return events it has missed."""
+        normalized_run_id = str(run_id or "").strip()
+        subscriber = _Subscriber(loop=asyncio.get_running_loop(), queue=asyncio.Queue())
+        with self._lock:
+            channel = self._channel(normalized_run_id)
+            channel.subscribers.append(subscriber)
+            if last_event_id is None:
+                return subscriber, []
+            latest_id = channel.next_id - 1
+            oldest_id = channel.history[0].id if channel.history else channel.next_id
+            if last_event_id > latest_id or last_event_id < oldest_id - 1:
+                resync = RunEvent(
+                    id=latest_id,
+                    run_id=normalized_run_id,
+                    type=RUN_EVENT_RESYNC,
+                    data={"lastEventId": last_event_id},
+                    created_at=dt.datetime.utcnow().isoformat(),
+                )
+                return subscriber, [resync]
+            return subscriber, [event for event in channel.history if event.id > last_event_id]
+
+    def unsubscribe(self, run_id: str, subscriber: _Subscriber) -> None:
+        normalized_run_id = str(run_id or "").strip()
+        with self._lock:
+            channel = self._channels.get(normalized_run_id)
+            if channel is None:
+                return
+            channel.subscribers = [row for row in channel.subscribers if row is not subscriber]
+
+    def last_event_id(self, run_id: str) -> int:
+        with self._lock:
+            channel = self._channels.get(str(run_id or "").strip())
+            return channel.next_id - 1 if channel else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._channels.clear()
+
+
+run_events = RunEventBus()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:  # optional speedup, see the "speedups" extra
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is missing
+    orjson = None
+
+__all__ = ["JSON_BACKEND", "canonical_dumps", "dumps", "dumps_bytes", "loads", "orjson"]
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    # datetime/dataclass values go through ``default`` so both backends agree on their text.
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    _ORJSON_SORTED_OPTIONS = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS
+
+
+def _orjson_default(default: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def _fallback(value: Any) -> Any:
+        # json writes float subclasses (numpy.float64, ...) as numbers; orjson would call default.
+        if isinstance(value, float):
+            return float(value)
+        if isinstance(value, int):
+            return int(value)
+        return default(value)
+
+    return _fallback
+
+
+def _json_dumps(value: Any, sort_keys: bool, default: Callable[[Any], Any]) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=default)
+
+
+def _orjson_dumps(value: Any, sort_keys: bool, default: Callable[[Any], Any]) -> bytes | None:
+    try:
+        return orjson.dumps(
+            value,
+            default=_orjson_default(default),
+            option=_ORJSON_SORTED_OPTIONS if sort_keys else _ORJSON_OPTIONS,
+        )
+    except TypeError:
+        return None
+
+
+def dumps_bytes(value: Any, *, sort_keys: bool = False, default: Callable[[Any], Any] = str) -> bytes:
+    if orjson is not None:
+        encoded = _orjson_dumps(value, sort_keys, default)
+        if encoded is not None:
+            return encoded
+    return _json_dumps(value, sort_keys, default).encode("utf-8")
+
+
+def dumps(value: Any, *, sort_keys: bool = False, default: Callable[[Any], Any] = str) -> str:
+    """Compact JSON text, like ``json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)``.
+
+    Both backends decode to the same values, but orjson spells some floats differently
+    (``1e-5`` vs ``1e-05``) and writes NaN/Infinity as ``null``, so text that gets hashed goes
+    through ``canonical_dumps`` instead. Anything orjson rejects (non-string keys, integers
+    beyond 64 bits) is encoded by the json module instead.
+    """
+    if orjson is not None:
+        encoded = _orjson_dumps(value, sort_keys, default)
+        if encoded is not None:
+            return encoded.decode("utf-8")
+    return _json_dumps(value, sort_keys, default)
+
+
+def canonical_dumps(value: Any, *, default: Callable[[Any], Any] = str) -> str:
+    """Key-sorted compact JSON from the json module alone, whether or not orjson is installed.
+
+    Used where the text is hashed and the hash is stored (evaluation ``input_hash``), so the
+    same input keeps the same hash across installs.
+    """
+    return _json_dumps(value, True, default)
+
+
+def loads(text: str | bytes) -> Any:
+    """Decodes JSON text; raises ``json.JSONDecodeError`` (a ``ValueError``) when it is invalid.
+
+    NaN/Infinity literals are accepted as with ``json.loads``. With orjson, integers beyond
+    64 bits may come back as floats.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+from app.core.data_version import DataVersionRegistry, data_versions
+
+T = TypeVar("T")
+
+
+class SingleFlightCache:
+    """Memoizes derived results keyed by inputs plus the data-version stamp of their scopes.
+
+    Concurrent callers with the same key share one computation; finished results are
+    kept until one of their scopes is bumped. Cached values are shared between callers
+    and must be treated as read-only.
+    """
+
+    def __init__(self, registry: DataVersionRegistry, *, max_entries: int = 256):
+        self._registry = registry
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[frozenset[str], Any]] = OrderedDict()
+        self._inflight: dict[Hashable, Future] = {}
+        registry.subscribe(self.invalidate)
+
+    def get_or_compute(self, key: Hashable, scopes: Iterable[str], compute: Callable[[], T]) -> T:
+        scope_set = frozenset(scope for scope in scopes if scope)
+        stamp = self._registry.stamp(scope_set)
+        entry_key = (key, stamp)
+
+        with self._lock:
+            cached = self._entries.get(entry_key)
+            if cached is not None:
+                self._entries.move_to_end(entry_key)
+                return cached[1]
+            future = self._inflight.get(entry_key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[entry_key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(entry_key, None)
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            self._inflight.pop(entry_key, None)
+            # A write committed mid-computation makes this result stale on arrival.
+            if self._registry.stamp(scope_set) == stamp:
+                self._entries[entry_key] = (scope_set, value)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, scopes: set[str]) -> None:
+        with self._lock:
+            stale_keys = [key for key, (entry_scopes, _) in self._entries.items() if entry_scopes & scopes]
+            for key in stale_keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+derived_results = SingleFlightCache(data_versions)
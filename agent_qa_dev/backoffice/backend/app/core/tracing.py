@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+import os
+import secrets
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from app.core.metrics import record_job_span
+
+try:  # opentelemetry-api is optional; without it spans only go to the profile and the trace file.
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - depends on the environment
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE_ENV = "BACKOFFICE_TRACE_FILE"
+SERVICE_NAME = "aqb-backoffice"
+
+_current_span_id: ContextVar[Optional[str]] = ContextVar("aqb_current_span_id", default=None)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _percentile_ms(sorted_ns: list[int], q: float) -> float:
+    index = min(len(sorted_ns) - 1, max(0, int(round(q * (len(sorted_ns) - 1)))))
+    return round(sorted_ns[index] / 1_000_000, 3)
+
+
+class _SpanStats:
+    __slots__ = ("count", "errors", "total_ns", "max_ns", "durations")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.durations: list[int] = []
+
+    def add(self, duration_ns: int, failed: bool) -> None:
+        self.count += 1
+        self.errors += int(failed)
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.durations.append(duration_ns)
+
+    def summary(self) -> dict[str, Any]:
+        ordered = sorted(self.durations)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "totalMs": round(self.total_ns / 1_000_000, 3),
+            "avgMs": round(self.total_ns / self.count / 1_000_000, 3),
+            "p50Ms": _percentile_ms(ordered, 0.50),
+            "p95Ms": _percentile_ms(ordered, 0.95),
+            "p99Ms": _percentile_ms(ordered, 0.99),
+            "maxMs": round(self.max_ns / 1_000_000, 3),
+        }
+
+
+class RunProfiler:
+    """Times the hot path of one job phase and aggregates it per span name.
+
+    Spans use the OpenTelemetry data model (trace/span ids, parent span, unix-nano start/end,
+    attributes). With ``BACKOFFICE_TRACE_FILE`` set they are appended to that file as OTLP-JSON
+    lines when the phase finishes; with opentelemetry-api installed they are also mirrored to the
+    configured tracer provider.
+    """
+
+    def __init__(self, run_id: str, phase: str, *, trace_file: Optional[str] = None):
+        self.run_id = run_id
+        self.phase = phase
+        self.trace_id = secrets.token_hex(16)
+        self.root_span_id = secrets.token_hex(8)
+        self._trace_file = trace_file if trace_file is not None else os.getenv(TRACE_FILE_ENV, "").strip()
+        self._stats: dict[str, _SpanStats] = {}
+        self._exported: list[dict[str, Any]] = []
+        self._started_unix_ns = time.time_ns()
+        self._started_perf_ns = time.perf_counter_ns()
+        self._otel_tracer = otel_trace.get_tracer(SERVICE_NAME) if otel_trace is not None else None
+        self._otel_root = None
+        if self._otel_tracer is not None:
+            self._otel_root = self._otel_tracer.start_span(
+                f"{phase}_run", start_time=self._started_unix_ns, attributes={"run.id": run_id}
+            )
+
+    def _span_record(
+        self,
+        name: str,
+        span_id: str,
+        parent_span_id: str,
+        start_unix_ns: int,
+        duration_ns: int,
+        failed: bool,
+        attributes: dict[str, Any],
+    ) -> dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": span_id,
+            "parentSpanId": parent_span_id,
+            "name": name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(start_unix_ns),
+            "endTimeUnixNano": str(start_unix_ns + duration_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+            "status": {"code": "STATUS_CODE_ERROR" if failed else "STATUS_CODE_OK"},
+        }
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[None]:
+        parent_span_id = _current_span_id.get() or self.root_span_id
+        span_id = secrets.token_hex(8)
+        token = _current_span_id.set(span_id)
+        start_unix_ns = time.time_ns()
+        start_perf_ns = time.perf_counter_ns()
+        otel_span = None
+        otel_scope = None
+        if self._otel_tracer is not None:
+            otel_span = self._otel_tracer.start_span(name, start_time=start_unix_ns, attributes=attributes or None)
+            otel_scope = otel_trace.use_span(otel_span, end_on_exit=False)
+            otel_scope.__enter__()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            duration_ns = time.perf_counter_ns() - start_perf_ns
+            _current_span_id.reset(token)
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _SpanStats()
+            stats.add(duration_ns, failed)
+            record_job_span(self.phase, name, duration_ns / 1e9)
+            if self._trace_file:
+                self._exported.append(
+                    self._span_record(name, span_id, parent_span_id, start_unix_ns, duration_ns, failed, {"run.id": self.run_id, **attributes})
+                )
+            if otel_span is not None:
+                otel_scope.__exit__(None, None, None)
+                otel_span.end(end_time=start_unix_ns + duration_ns)
+
+    def summary(self) -> dict[str, Any]:
+        wall_ns = time.perf_counter_ns() - self._started_perf_ns
+        return {
+            "phase": self.phase,
+            "traceId": self.trace_id,
+            "startedAt": dt.datetime.utcfromtimestamp(self._started_unix_ns / 1e9).isoformat(),
+            "wallMs": round(wall_ns / 1_000_000, 3),
+            "spans": {name: stats.summary() for name, stats in sorted(self._stats.items())},
+        }
+
+    def finish(self) -> dict[str, Any]:
+        """Closes the phase span, flushes the trace file and returns the aggregated breakdown."""
+        summary = self.summary()
+        wall_ns = int(summary["wallMs"] * 1_000_000)
+        if self._otel_root is not None:
+            self._otel_root.end(end_time=self._started_unix_ns + wall_ns)
+            self._otel_root = None
+        if self._trace_file:
+            root = self._span_record(
+                f"{self.phase}_run", self.root_span_id, "", self._started_unix_ns, wall_ns, False, {"run.id": self.run_id}
+            )
+            try:
+                with open(self._trace_file, "a", encoding="utf-8") as fp:
+                    for record in [root, *self._exported]:
+                        fp.write(json.dumps({"resource": {"service.name": SERVICE_NAME}, **record}, ensure_ascii=False))
+                        fp.write("\n")
+            except OSError as exc:
+                logger.warning("Failed to write trace file %s: %s", self._trace_file, exc)
+            self._exported = []
+        return summary
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import time
 from typing import Optional
 
 import aiohttp
 
 from app.adapters.openai_judge_adapter import OpenAIJudgeAdapter
+from app.core import serialization
 from app.core.db import SessionLocal
+from app.core.metrics import record_job_item
 from app.models.generic_run_row import GenericRunRow
-from app.services.logic_check import run_logic_check
+from app.services.logic_check import logic_check_workers, run_logic_checks_async
+from app.services.openai_usage import SOURCE_GENERIC_EVALUATE, OpenAIPriceTable, record_openai_usage
 
 
 async def evaluate_generic_run(
@@ -23,11 +26,12 @@ async def evaluate_generic_run(
     try:
         rows = list(db.query(GenericRunRow).filter(GenericRunRow.run_id == run_id).order_by(GenericRunRow.ordinal).all())
 
-        for row in rows:
-            if row.field_path and row.expected_value:
-                row.logic_result = run_logic_check(row.raw_json or "", row.field_path, row.expected_value)
-            else:
-                row.logic_result = "SKIPPED_NO_CRITERIA"
+        logic_results = await run_logic_checks_async(
+            [(row.raw_json or "", row.field_path, row.expected_value) for row in rows],
+            workers=logic_check_workers(),
+        )
+        for row, logic_result in zip(rows, logic_results):
+            row.logic_result = logic_result if row.field_path and row.expected_value else "SKIPPED_NO_CRITERIA"
         db.commit()
 
         targets = [r for r in rows if r.llm_criteria and not r.error]
@@ -45,6 +49,7 @@ async def evaluate_generic_run(
             return
 
         adapter = OpenAIJudgeAdapter()
+        prices = OpenAIPriceTable.from_env()
         sem = asyncio.Semaphore(max(1, max_parallel))
         timeout = aiohttp.ClientTimeout(total=120)
 
@@ -59,15 +64,32 @@ async def evaluate_generic_run(
                         "평가 결과를 JSON으로 출력하세요:\n"
                         '{"score": 0-5, "passed": true/false, "reason": "평가 사유"}'
                     )
+                    usage: dict = {}
+                    err = ""
+                    started_at = time.perf_counter()
                     try:
-                        result, _usage, err = await adapter.judge(session, openai_key, openai_model, prompt)
+                        result, usage, err = await adapter.judge(session, openai_key, openai_model, prompt)
                         if result is not None:
-                            target.llm_eval_json = json.dumps(result, ensure_ascii=False)
+                            target.llm_eval_json = serialization.dumps(result)
                             target.llm_eval_status = "DONE"
                         else:
                             target.llm_eval_status = f"FAILED:{err}"
                     except Exception as e:  # defensive: keep row-level progress for others
+                        err = str(e)
                         target.llm_eval_status = f"FAILED:{e}"
+                    # Generic runs use the inline prompt above, so there is no prompt version to record.
+                    record_openai_usage(
+                        db,
+                        source=SOURCE_GENERIC_EVALUATE,
+                        run_id=run_id,
+                        run_item_id=target.id,
+                        model=openai_model,
+                        usage=usage,
+                        latency_ms=max(0, int(round((time.perf_counter() - started_at) * 1000))),
+                        error="" if target.llm_eval_status == "DONE" else (err or "unknown"),
+                        prices=prices,
+                    )
+                    record_job_item("generic_evaluate", "ok" if target.llm_eval_status == "DONE" else "error")
 
             await asyncio.gather(*[_judge_one(r) for r in targets])
             db.commit()
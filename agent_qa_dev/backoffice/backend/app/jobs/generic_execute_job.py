@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from typing import Optional
 
 import aiohttp
 
 from app.adapters.agent_client_adapter import AgentClientAdapter
+from app.core import serialization
 from app.core.db import SessionLocal
 from app.core.enums import RunStatus
+from app.core.metrics import record_job_item
 from app.models.generic_run_row import GenericRunRow
 from app.repositories.generic_runs import GenericRunRepository
 
@@ -81,7 +82,7 @@ async def execute_generic_run(
                             for x in execs
                             if x.get("messageSummary")
                         )
-                        payload["raw_json"] = json.dumps(
+                        payload["raw_json"] = serialization.dumps(
                             {
                                 "assistantMessage": result.get("assistant_message"),
                                 "dataUIList": result.get("data_ui_list"),
@@ -92,13 +93,12 @@ async def execute_generic_run(
                                 "conversation_id": result.get("conversation_id"),
                                 "response_time_sec": result.get("response_time_sec"),
                                 "error": result.get("error", ""),
-                            },
-                            ensure_ascii=False,
-                            default=str,
+                            }
                         )
                 except Exception as e:
                     payload["error"] = f"parsing_error: {e}"
 
+                record_job_item("generic_execute", "error" if payload["error"] else "ok")
                 return row, payload
 
         async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
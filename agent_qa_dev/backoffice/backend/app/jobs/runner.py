@@ -4,12 +4,15 @@ import asyncio
 from collections.abc import Awaitable, Callable
 from typing import Any
 
+from app.core.metrics import REGISTRY
+
 
 class InMemoryRunner:
     def __init__(self):
         self.jobs: dict[str, str] = {}
         self._tasks_by_job_id: dict[str, asyncio.Task[Any]] = {}
         self._job_ids_by_key: dict[str, set[str]] = {}
+        self._job_types: dict[str, str] = {}
 
     def _normalize_key(self, job_key: str | None) -> str:
         return str(job_key or "").strip()
@@ -34,8 +37,10 @@ class InMemoryRunner:
         job_coro_factory: Callable[[], Awaitable[None]],
         *,
         job_key: str | None = None,
+        job_type: str = "other",
     ) -> None:
         self.jobs[job_id] = "RUNNING"
+        self._job_types[job_id] = job_type
         normalized_key = self._normalize_key(job_key)
 
         async def _wrap():
@@ -55,6 +60,7 @@ class InMemoryRunner:
 
         def _cleanup(done_task: asyncio.Task[Any]) -> None:
             self._tasks_by_job_id.pop(job_id, None)
+            self._job_types.pop(job_id, None)
             if normalized_key:
                 self._prune_key(normalized_key)
             try:
@@ -93,5 +99,21 @@ class InMemoryRunner:
             cancelled = True
         return cancelled
 
+    def active_jobs_by_type(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for job_id, task in list(self._tasks_by_job_id.items()):
+            if task.done():
+                continue
+            job_type = self._job_types.get(job_id, "other")
+            counts[job_type] = counts.get(job_type, 0) + 1
+        return counts
+
 
 runner = InMemoryRunner()
+
+REGISTRY.gauge(
+    "backoffice_active_jobs",
+    "Background jobs currently running in this process, by job type.",
+    ("type",),
+    collect=lambda: {(job_type,): float(count) for job_type, count in runner.active_jobs_by_type().items()},
+)
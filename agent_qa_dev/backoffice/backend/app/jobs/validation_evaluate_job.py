@@ -5,17 +5,23 @@ import hashlib
 import json
 import time
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
 import aiohttp
 
 from app.adapters.openai_judge_adapter import OpenAIJudgeAdapter
+from app.core import serialization
 from app.core.db import SessionLocal
-from app.core.enums import EvalStatus
+from app.core.enums import EvalStatus, ItemEvalState
+from app.core.metrics import record_job_item
+from app.core.run_events import RUN_EVENT_EVAL_DONE, RUN_EVENT_STATUS, run_events
+from app.core.tracing import RunProfiler
+from app.lib.aqb_prompt_assembly import PromptCacheStats, get_token_counter
 from app.repositories.validation_eval_prompt_configs import ValidationEvalPromptConfigRepository
 from app.repositories.validation_runs import ValidationRunRepository
+from app.services.openai_usage import SOURCE_VALIDATION_EVALUATE, OpenAIPriceTable, record_openai_usage
 from app.services.validation_scoring import average, extract_response_time_sec, parse_raw_payload
 
 METRIC_KEYS = ("intent", "accuracy", "consistency", "latencySingle", "latencyMulti", "stability")
@@ -57,7 +63,7 @@ def _parse_metric_scores(metric_scores_json: str) -> dict[str, float]:
     if not metric_scores_json:
         return {}
     try:
-        payload = json.loads(metric_scores_json)
+        payload = serialization.loads(metric_scores_json)
     except Exception:
         return {}
     if not isinstance(payload, dict):
@@ -90,10 +96,8 @@ def _load_schema() -> tuple[dict[str, Any], str, bool]:
 
 def _canonicalize_json_value(value: Any, *, max_text: int) -> Any:
     if isinstance(value, dict):
-        return {
-            str(key): _canonicalize_json_value(value[key], max_text=max_text)
-            for key in sorted(value.keys())
-        }
+        # Keys are ordered later by serialization.canonical_dumps.
+        return {str(key): _canonicalize_json_value(item, max_text=max_text) for key, item in value.items()}
     if isinstance(value, list):
         return [_canonicalize_json_value(item, max_text=max_text) for item in value[:20]]
     if isinstance(value, str):
@@ -126,6 +130,19 @@ class ItemEvalDraft:
     input_tokens: int | None
     output_tokens: int | None
     llm_latency_ms: int | None
+    llm_called: bool = False
+    llm_error: str = ""
+    usage: dict[str, Any] = field(default_factory=dict)
+    reused_total_score: float | None = None
+    reused: bool = False
+
+
+# LLM result statuses that count as a finished evaluation; DONE_WITH_LLM_ERROR is retried.
+_SUCCESS_STATUSES = ("DONE", "DONE_WITH_EXEC_ERROR")
+
+
+def _item_eval_state(status: str) -> ItemEvalState:
+    return ItemEvalState.DONE if status in _SUCCESS_STATUSES else ItemEvalState.FAILED
 
 
 def _build_total_score(metric_scores: dict[str, Any]) -> float | None:
@@ -217,6 +234,10 @@ def _build_score_snapshots(repo: ValidationRunRepository, run_id: str, run_items
         )
 
 
+def _publish_eval_status(run_id: str, eval_status: EvalStatus) -> None:
+    run_events.publish(run_id, RUN_EVENT_STATUS, {"evalStatus": eval_status.value})
+
+
 async def evaluate_validation_run(
     run_id: str,
     openai_key: Optional[str],
@@ -224,18 +245,38 @@ async def evaluate_validation_run(
     max_chars: int,
     max_parallel: int,
     item_ids: Optional[list[str]] = None,
+    max_input_tokens: Optional[int] = None,
+    force: bool = False,
 ):
+    """Judges run items with the scoring prompt.
+
+    Items move PENDING/FAILED -> IN_FLIGHT when the job starts and DONE/FAILED in the commit that
+    stores their result (``eval_attempts`` counts those outcomes); a cancelled or failed job puts
+    unfinished items back to PENDING, so the next request resumes them. An item whose stored
+    successful result has the same input hash, prompt version and model is not sent to OpenAI
+    again unless ``force`` is set.
+
+    The prompt template always comes first and the per-item input JSON last, so every request
+    shares the same prefix and OpenAI prompt caching applies. With ``max_input_tokens`` the input
+    JSON is cut to that token budget instead of ``max_chars`` characters. The evaluate profile
+    records the run's input/cached token totals under ``promptCache``, and every OpenAI call is
+    written to ``openai_usage_ledger`` in the same commit as the item's result.
+    """
     db = SessionLocal()
     repo = ValidationRunRepository(db)
     repo.clear_eval_cancel_request(run_id)
     repo.set_eval_status(run_id, EvalStatus.RUNNING)
     db.commit()
+    _publish_eval_status(run_id, EvalStatus.RUNNING)
+    profiler = RunProfiler(run_id, "evaluate")
+    cache_stats = PromptCacheStats()
 
     try:
         all_run_items = repo.list_items(run_id, limit=100000)
         if not all_run_items:
             repo.set_eval_status(run_id, EvalStatus.DONE)
             db.commit()
+            _publish_eval_status(run_id, EvalStatus.DONE)
             return
 
         target_item_ids = list(dict.fromkeys([str(item_id).strip() for item_id in (item_ids or []) if str(item_id).strip()]))
@@ -247,6 +288,7 @@ async def evaluate_validation_run(
         if not run_items:
             repo.set_eval_status(run_id, EvalStatus.DONE)
             db.commit()
+            _publish_eval_status(run_id, EvalStatus.DONE)
             return
 
         missing_expected = [item for item in run_items if not _safe_text(item.expected_result_snapshot)]
@@ -271,18 +313,35 @@ async def evaluate_validation_run(
         if not prompt_version:
             raise ValueError("validation_eval_prompt_configs.current_version_label is empty")
         response_schema, schema_name, strict_schema = _load_schema()
+        run = repo.get_run(run_id)
+        test_set_id = run.test_set_id if run is not None else None
+        prices = OpenAIPriceTable.from_env()
+        if force:
+            repo.reset_item_eval_states(run_id, target_item_ids or None)
+            prior_results: dict[str, tuple[str, str, str, str, float | None]] = {}
+        else:
+            prior_results = {
+                item_id: (row.status, row.input_hash, row.prompt_version, row.eval_model, row.total_score)
+                for item_id, row in repo.get_llm_eval_map([item.id for item in run_items]).items()
+                if row.status in _SUCCESS_STATUSES
+            }
+        repo.claim_items_for_eval(run_id, target_item_ids or None)
         db.commit()
+        prompt_prefix = f"{prompt_template}\n\n<evaluation_input_json>\n"
+        token_counter = get_token_counter()
+        cache_stats.prefix_tokens = token_counter.count(prompt_prefix)
 
         parsed_raw_map: dict[str, tuple[dict[str, Any], bool]] = {}
         response_sec_map: dict[str, float | None] = {}
         query_group_map: dict[str, list[Any]] = defaultdict(list)
 
-        for item in run_items:
-            raw_payload, raw_parse_ok = parse_raw_payload(item.raw_json or "")
-            parsed_raw_map[item.id] = (raw_payload, raw_parse_ok)
-            response_sec_map[item.id] = extract_response_time_sec(raw_payload, item.latency_ms)
-            if item.query_id:
-                query_group_map[str(item.query_id)].append(item)
+        with profiler.span("raw_json_parse", items=len(run_items)):
+            for item in run_items:
+                raw_payload, raw_parse_ok = parse_raw_payload(item.raw_json or "")
+                parsed_raw_map[item.id] = (raw_payload, raw_parse_ok)
+                response_sec_map[item.id] = extract_response_time_sec(raw_payload, item.latency_ms)
+                if item.query_id:
+                    query_group_map[str(item.query_id)].append(item)
 
         adapter = OpenAIJudgeAdapter()
         sem = asyncio.Semaphore(max(1, int(max_parallel or 1)))
@@ -334,48 +393,65 @@ async def evaluate_validation_run(
                         "peerExecutions": peer_rows,
                     }
 
-                    input_json_text = json.dumps(
-                        evaluation_input,
-                        ensure_ascii=False,
-                        sort_keys=True,
-                        separators=(",", ":"),
-                        default=str,
-                    )
-                    if len(input_json_text) > max_chars:
+                    with profiler.span("input_json_dumps"):
+                        input_json_text = serialization.canonical_dumps(evaluation_input)
+                    if max_input_tokens:
+                        input_json_text, _ = token_counter.truncate(input_json_text, max_input_tokens)
+                    elif len(input_json_text) > max_chars:
                         input_json_text = input_json_text[:max_chars]
 
-                    prompt = (
-                        f"{prompt_template}\n\n"
-                        "<evaluation_input_json>\n"
-                        f"{input_json_text}\n"
-                        "</evaluation_input_json>\n"
-                    )
+                    prompt = f"{prompt_prefix}{input_json_text}\n</evaluation_input_json>\n"
                     input_hash = hashlib.sha256(input_json_text.encode("utf-8")).hexdigest()
+                    prior = prior_results.get(item.id)
+                    if prior is not None and prior[1:4] == (input_hash, prompt_version, openai_model):
+                        return ItemEvalDraft(
+                            item_id=item.id,
+                            query_id=query_id_text,
+                            metric_scores=metric_scores,
+                            llm_comment="",
+                            status=prior[0],
+                            llm_output_json="",
+                            prompt_version=prompt_version,
+                            input_hash=input_hash,
+                            input_tokens=None,
+                            output_tokens=None,
+                            llm_latency_ms=None,
+                            reused_total_score=prior[4],
+                            reused=True,
+                        )
 
                     result_payload: dict[str, Any] | None = None
                     usage: dict[str, Any] = {}
                     llm_error = ""
                     llm_latency_ms: int | None = None
+                    llm_called = False
 
                     if not openai_key:
                         llm_error = "OpenAI API key is missing."
                     else:
                         try:
-                            async with sem:
-                                started_at = time.perf_counter()
-                                result_payload, usage, llm_error = await adapter.judge(
-                                    session,
-                                    openai_key,
-                                    openai_model,
-                                    prompt,
-                                    response_schema=response_schema,
-                                    schema_name=schema_name,
-                                    strict_schema=strict_schema,
-                                )
-                                llm_latency_ms = max(
-                                    0,
-                                    int(round((time.perf_counter() - started_at) * 1000)),
-                                )
+                            with profiler.span("semaphore_wait"):
+                                await sem.acquire()
+                            try:
+                                with profiler.span("openai_call", model=openai_model):
+                                    started_at = time.perf_counter()
+                                    llm_called = True
+                                    result_payload, usage, llm_error = await adapter.judge(
+                                        session,
+                                        openai_key,
+                                        openai_model,
+                                        prompt,
+                                        response_schema=response_schema,
+                                        schema_name=schema_name,
+                                        strict_schema=strict_schema,
+                                    )
+                                    llm_latency_ms = max(
+                                        0,
+                                        int(round((time.perf_counter() - started_at) * 1000)),
+                                    )
+                                    cache_stats.add(usage)
+                            finally:
+                                sem.release()
                         except Exception as exc:
                             llm_error = str(exc)
 
@@ -383,17 +459,18 @@ async def evaluate_validation_run(
                     llm_output_json = ""
                     status = "DONE_WITH_LLM_ERROR"
 
-                    if result_payload is not None and not llm_error:
-                        for key in METRIC_KEYS:
-                            metric_scores[key] = _clamp_score(result_payload.get(key))
+                    with profiler.span("response_parse"):
+                        if result_payload is not None and not llm_error:
+                            for key in METRIC_KEYS:
+                                metric_scores[key] = _clamp_score(result_payload.get(key))
 
-                        llm_comment = _safe_text(result_payload.get("reasoning")) or "OK"
-                        llm_output_json = json.dumps(result_payload, ensure_ascii=False)
-                        status = "DONE_WITH_EXEC_ERROR" if _safe_text(item.error) else "DONE"
-                    else:
-                        llm_comment = f"LLM_ERROR: {llm_error or 'unknown'}"
-                        llm_output_json = json.dumps({"error": llm_error or "unknown"}, ensure_ascii=False)
-                        status = "DONE_WITH_LLM_ERROR"
+                            llm_comment = _safe_text(result_payload.get("reasoning")) or "OK"
+                            llm_output_json = serialization.dumps(result_payload)
+                            status = "DONE_WITH_EXEC_ERROR" if _safe_text(item.error) else "DONE"
+                        else:
+                            llm_comment = f"LLM_ERROR: {llm_error or 'unknown'}"
+                            llm_output_json = serialization.dumps({"error": llm_error or "unknown"})
+                            status = "DONE_WITH_LLM_ERROR"
 
                     return ItemEvalDraft(
                         item_id=item.id,
@@ -407,6 +484,9 @@ async def evaluate_validation_run(
                         input_tokens=_to_optional_int(usage.get("input_tokens")),
                         output_tokens=_to_optional_int(usage.get("output_tokens")),
                         llm_latency_ms=llm_latency_ms,
+                        llm_called=llm_called,
+                        llm_error=llm_error,
+                        usage=usage or {},
                     )
                 except Exception as exc:
                     error_text = f"internal_exception:{type(exc).__name__}:{str(exc)[:200]}"
@@ -416,7 +496,7 @@ async def evaluate_validation_run(
                         metric_scores=metric_scores,
                         llm_comment=f"LLM_ERROR: {error_text}",
                         status="DONE_WITH_LLM_ERROR",
-                        llm_output_json=json.dumps({"error": error_text}, ensure_ascii=False),
+                        llm_output_json=serialization.dumps({"error": error_text}),
                         prompt_version=prompt_version,
                         input_hash=input_hash,
                         input_tokens=None,
@@ -424,39 +504,84 @@ async def evaluate_validation_run(
                         llm_latency_ms=None,
                     )
 
-            tasks = [asyncio.create_task(_evaluate_item(item)) for item in run_items]
+            async def _traced_item(item) -> ItemEvalDraft:
+                with profiler.span("item", itemId=str(item.id)):
+                    return await _evaluate_item(item)
+
+            tasks = [asyncio.create_task(_traced_item(item)) for item in run_items]
             for task in asyncio.as_completed(tasks):
                 draft = await task
+                if draft.reused:
+                    # Same input as the stored result: no OpenAI call, only the state catches up.
+                    if repo.get_item(draft.item_id).eval_state != ItemEvalState.DONE:
+                        repo.set_item_eval_state(draft.item_id, ItemEvalState.DONE)
+                        db.commit()
+                    record_job_item("validation_evaluate", "REUSED")
+                    run_events.publish(
+                        run_id,
+                        RUN_EVENT_EVAL_DONE,
+                        {"itemId": draft.item_id, "status": draft.status, "totalScore": draft.reused_total_score},
+                    )
+                    continue
                 total_score = _build_total_score(draft.metric_scores)
-                repo.upsert_llm_eval(
-                    draft.item_id,
-                    eval_model=openai_model,
-                    metric_scores=draft.metric_scores,
-                    total_score=total_score,
-                    llm_comment=draft.llm_comment,
-                    status=draft.status,
-                    llm_output=draft.llm_output_json,
-                    prompt_version=draft.prompt_version,
-                    input_hash=draft.input_hash,
-                    input_tokens=draft.input_tokens,
-                    output_tokens=draft.output_tokens,
-                    llm_latency_ms=draft.llm_latency_ms,
+                with profiler.span("db_commit"):
+                    repo.upsert_llm_eval(
+                        draft.item_id,
+                        eval_model=openai_model,
+                        metric_scores=draft.metric_scores,
+                        total_score=total_score,
+                        llm_comment=draft.llm_comment,
+                        status=draft.status,
+                        llm_output=draft.llm_output_json,
+                        prompt_version=draft.prompt_version,
+                        input_hash=draft.input_hash,
+                        input_tokens=draft.input_tokens,
+                        output_tokens=draft.output_tokens,
+                        llm_latency_ms=draft.llm_latency_ms,
+                    )
+                    if draft.llm_called:
+                        record_openai_usage(
+                            db,
+                            source=SOURCE_VALIDATION_EVALUATE,
+                            run_id=run_id,
+                            run_item_id=draft.item_id,
+                            test_set_id=test_set_id,
+                            model=openai_model,
+                            prompt_version=draft.prompt_version,
+                            usage=draft.usage,
+                            latency_ms=draft.llm_latency_ms,
+                            error=draft.llm_error,
+                            prices=prices,
+                        )
+                    repo.set_item_eval_state(draft.item_id, _item_eval_state(draft.status), attempted=True)
+                    db.commit()
+                record_job_item("validation_evaluate", draft.status)
+                run_events.publish(
+                    run_id,
+                    RUN_EVENT_EVAL_DONE,
+                    {"itemId": draft.item_id, "status": draft.status, "totalScore": total_score},
                 )
-                db.commit()
 
-        _build_score_snapshots(repo, run_id, all_run_items)
-        db.commit()
+        with profiler.span("score_snapshots"):
+            _build_score_snapshots(repo, run_id, all_run_items)
+            db.commit()
 
+        repo.save_run_profile(run_id, "evaluate", {**profiler.finish(), "promptCache": cache_stats.summary()})
         repo.set_eval_status(run_id, EvalStatus.DONE)
         db.commit()
+        _publish_eval_status(run_id, EvalStatus.DONE)
     except asyncio.CancelledError:
         repo.reset_eval_state_to_pending(run_id)
         repo.clear_eval_cancel_request(run_id)
         db.commit()
+        _publish_eval_status(run_id, EvalStatus.PENDING)
         raise
     except Exception:
+        repo.release_in_flight_items(run_id)
+        repo.save_run_profile(run_id, "evaluate", {**profiler.finish(), "promptCache": cache_stats.summary()})
         repo.set_eval_status(run_id, EvalStatus.FAILED)
         db.commit()
+        _publish_eval_status(run_id, EvalStatus.FAILED)
         raise
     finally:
         db.close()
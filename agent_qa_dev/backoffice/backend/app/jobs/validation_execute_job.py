@@ -2,16 +2,38 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
-import json
 from collections import defaultdict
 from typing import Any, Optional
 
 import aiohttp
 
 from app.adapters.agent_client_adapter import AgentClientAdapter
+from app.core import serialization
+from app.core.ats_circuit import GATE_BLOCKED, CircuitGate, circuit_open_error
 from app.core.db import SessionLocal
 from app.core.enums import EvalStatus, RunStatus
+from app.core.metrics import record_job_item
+from app.core.run_events import (
+    RUN_EVENT_CIRCUIT,
+    RUN_EVENT_ITEM_DONE,
+    RUN_EVENT_ITEM_ERROR,
+    RUN_EVENT_STATUS,
+    run_events,
+)
+from app.core.tracing import RunProfiler
+from app.lib.aqb_orchestrator_client import CIRCUIT_CLOSED, ERROR_CIRCUIT_OPEN, ERROR_DEADLINE, ERROR_TIMEOUT
 from app.repositories.validation_runs import ValidationRunRepository
+from app.repositories.validation_worker_latencies import ValidationWorkerLatencyRepository
+from app.services.worker_latency import extract_worker_latencies, load_prompt_versions
+
+CALL_TIMEOUT_GRACE_SEC = 1.0
+
+
+def _publish_status(run_id: str, status: RunStatus, eval_status: Optional[EvalStatus] = None) -> None:
+    data: dict[str, Any] = {"status": status.value}
+    if eval_status is not None:
+        data["evalStatus"] = eval_status.value
+    run_events.publish(run_id, RUN_EVENT_STATUS, data)
 
 
 async def execute_validation_run(
@@ -33,6 +55,8 @@ async def execute_validation_run(
     repo.set_status(run_id, RunStatus.RUNNING)
     repo.set_eval_status(run_id, EvalStatus.PENDING)
     db.commit()
+    _publish_status(run_id, RunStatus.RUNNING, EvalStatus.PENDING)
+    profiler = RunProfiler(run_id, "execute")
 
     try:
         target_item_ids = list(dict.fromkeys([str(item_id).strip() for item_id in (item_ids or []) if str(item_id).strip()]))
@@ -44,6 +68,7 @@ async def execute_validation_run(
         if not run_items:
             repo.set_status(run_id, RunStatus.DONE)
             db.commit()
+            _publish_status(run_id, RunStatus.DONE)
             return
 
         grouped_items: dict[int, dict[int, list[dict[str, Any]]]] = defaultdict(lambda: defaultdict(list))
@@ -61,6 +86,11 @@ async def execute_validation_run(
             for items in room_map.values():
                 items.sort(key=lambda x: int(x.get("ordinal") or 0))
 
+        run = repo.get_run(run_id)
+        run_environment = run.environment if run is not None else None
+        latency_repo = ValidationWorkerLatencyRepository(db)
+        prompt_versions = load_prompt_versions(db, run_environment) if run_environment is not None else {}
+
         adapter = AgentClientAdapter(
             base_url,
             bearer,
@@ -69,6 +99,7 @@ async def execute_validation_run(
             origin,
             referer,
             max_parallel=max_parallel,
+            timeout_ms=timeout_ms,
         )
         sem = asyncio.Semaphore(max(1, int(max_parallel or 1)))
         db_lock = asyncio.Lock()
@@ -76,6 +107,20 @@ async def execute_validation_run(
         timeout = aiohttp.ClientTimeout(total=max(call_timeout + 5.0, 5.0))
         connector = aiohttp.TCPConnector(limit=max(5, int(max_parallel or 1) * 4), ssl=False)
 
+        breaker = adapter.client.circuit_breaker
+
+        def _publish_circuit(state: str) -> None:
+            run_events.publish(
+                run_id,
+                RUN_EVENT_CIRCUIT,
+                {"state": state, "consecutiveFailures": breaker.snapshot()["consecutiveFailures"]},
+            )
+
+        # The breaker is shared per environment, so another job may already have opened it.
+        gate = CircuitGate(breaker, on_state_change=_publish_circuit)
+        if breaker.state != CIRCUIT_CLOSED:
+            _publish_circuit(breaker.state)
+
         async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
             async def _execute_item(item: dict[str, Any]) -> None:
                 error = ""
@@ -83,77 +128,129 @@ async def execute_validation_run(
                 item_context = default_context
                 item_target_assistant = (run_default_target_assistant or "").strip()
                 try:
-                    async with sem:
-                        result = await asyncio.wait_for(
-                            adapter.test_orchestrator_sync(
-                                session,
-                                str(item.get("query_text_snapshot") or ""),
-                                conversation_id=None,
-                                context=item_context,
-                                target_assistant=item_target_assistant,
-                            ),
-                            timeout=call_timeout,
-                        )
+                    with profiler.span("semaphore_wait"):
+                        await sem.acquire()
+                    try:
+                        # While the environment circuit is open items fail fast without calling ATS;
+                        # once its cool-down has passed a single item goes through as the half-open probe.
+                        ticket = gate.acquire()
+                        if ticket == GATE_BLOCKED:
+                            error = circuit_open_error(breaker)
+                        else:
+                            try:
+                                with profiler.span("ats_call"):
+                                    # The adapter already stops retrying at timeout_ms; this is only a safety net.
+                                    result = await asyncio.wait_for(
+                                        adapter.test_orchestrator_sync(
+                                            session,
+                                            str(item.get("query_text_snapshot") or ""),
+                                            conversation_id=None,
+                                            context=item_context,
+                                            target_assistant=item_target_assistant,
+                                        ),
+                                        timeout=call_timeout + CALL_TIMEOUT_GRACE_SEC,
+                                    )
+                            finally:
+                                gate.release(ticket)
+                            if result.get("error_kind") == ERROR_CIRCUIT_OPEN:
+                                # Another job holds the half-open probe for this environment.
+                                error = circuit_open_error(breaker)
+                                result = {}
+                    finally:
+                        sem.release()
                 except asyncio.TimeoutError:
                     error = f"timeout({int(call_timeout * 1000)}ms)"
                 except Exception as exc:
                     error = f"{type(exc).__name__}: {exc}"
 
-                if not error and result.get("error"):
-                    error = str(result.get("error"))
+                with profiler.span("response_parse"):
+                    if not error and result.get("error"):
+                        if result.get("error_kind") in (ERROR_TIMEOUT, ERROR_DEADLINE):
+                            error = f"timeout({int(call_timeout * 1000)}ms)"
+                        else:
+                            error = str(result.get("error"))
 
-                conversation_id = str(result.get("conversation_id", "") or "")
-                response_text = str(result.get("assistant_message", "") or "")
-                response_time_sec = result.get("response_time_sec")
-                latency_ms = None
-                if isinstance(response_time_sec, (int, float)):
-                    latency_ms = int(float(response_time_sec) * 1000)
+                    conversation_id = str(result.get("conversation_id", "") or "")
+                    response_text = str(result.get("assistant_message", "") or "")
+                    response_time_sec = result.get("response_time_sec")
+                    latency_ms = None
+                    if isinstance(response_time_sec, (int, float)):
+                        latency_ms = int(float(response_time_sec) * 1000)
+                    worker_latencies = extract_worker_latencies(result.get("worker_ms_map"))
 
                 raw_json = ""
                 try:
-                    raw_json = json.dumps(
-                        {
-                            "assistantMessage": result.get("assistant_message"),
-                            "dataUIList": result.get("data_ui_list"),
-                            "guideList": result.get("guide_list"),
-                            "executionProcesses": result.get("execution_processes", []),
-                            "worker": result.get("workers", []),
-                            "workerMsMap": result.get("worker_ms_map", {}),
-                            "conversationId": result.get("conversation_id", ""),
-                            "responseTimeSec": result.get("response_time_sec"),
-                            "error": error,
-                        },
-                        ensure_ascii=False,
-                        default=str,
-                    )
+                    with profiler.span("raw_json_dumps"):
+                        raw_json = serialization.dumps(
+                            {
+                                "assistantMessage": result.get("assistant_message"),
+                                "dataUIList": result.get("data_ui_list"),
+                                "guideList": result.get("guide_list"),
+                                "executionProcesses": result.get("execution_processes", []),
+                                "worker": result.get("workers", []),
+                                "workerMsMap": result.get("worker_ms_map", {}),
+                                "conversationId": result.get("conversation_id", ""),
+                                "responseTimeSec": result.get("response_time_sec"),
+                                "error": error,
+                            }
+                        )
                 except Exception:
                     raw_json = ""
 
-                async with db_lock:
-                    repo.update_item_execution(
-                        str(item.get("id") or ""),
-                        conversation_id=conversation_id,
-                        raw_response=response_text,
-                        latency_ms=latency_ms,
-                        error=error,
-                        raw_json=raw_json,
-                        executed_at=dt.datetime.utcnow(),
-                    )
-                    db.commit()
+                item_id = str(item.get("id") or "")
+                with profiler.span("db_lock_wait"):
+                    await db_lock.acquire()
+                try:
+                    with profiler.span("db_commit"):
+                        executed_at = dt.datetime.utcnow()
+                        repo.update_item_execution(
+                            item_id,
+                            conversation_id=conversation_id,
+                            raw_response=response_text,
+                            latency_ms=latency_ms,
+                            error=error,
+                            raw_json=raw_json,
+                            executed_at=executed_at,
+                        )
+                        if run_environment is not None:
+                            latency_repo.replace_for_item(
+                                item_id,
+                                run_id=run_id,
+                                environment=run_environment,
+                                workers=worker_latencies,
+                                prompt_versions=prompt_versions,
+                                executed_at=executed_at,
+                            )
+                        db.commit()
+                finally:
+                    db_lock.release()
+                record_job_item("validation_execute", "error" if error else "ok")
+                if error:
+                    run_events.publish(run_id, RUN_EVENT_ITEM_ERROR, {"itemId": item_id, "error": error})
+                else:
+                    run_events.publish(run_id, RUN_EVENT_ITEM_DONE, {"itemId": item_id, "latencyMs": latency_ms})
+
+            async def _traced_item(item: dict[str, Any]) -> None:
+                with profiler.span("item", itemId=str(item.get("id") or "")):
+                    await _execute_item(item)
 
             async def _execute_batch(items: list[dict[str, Any]]) -> None:
-                await asyncio.gather(*[_execute_item(item) for item in items])
+                await asyncio.gather(*[_traced_item(item) for item in items])
 
             for room_index in sorted(grouped_items.keys()):
                 room_map = grouped_items[room_index]
                 for repeat_index in sorted(room_map.keys()):
                     await _execute_batch(room_map[repeat_index])
 
+        repo.save_run_profile(run_id, "execute", profiler.finish())
         repo.set_status(run_id, RunStatus.DONE)
         db.commit()
+        _publish_status(run_id, RunStatus.DONE)
     except Exception:
+        repo.save_run_profile(run_id, "execute", profiler.finish())
         repo.set_status(run_id, RunStatus.FAILED)
         db.commit()
+        _publish_status(run_id, RunStatus.FAILED)
         raise
     finally:
         db.close()
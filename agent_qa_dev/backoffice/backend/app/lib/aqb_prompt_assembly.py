@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+try:  # tiktoken이 있으면 실제 토크나이저로 세고 자름. 없으면 근사 카운터 사용
+    import tiktoken
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    tiktoken = None
+
+# ============================================================
+# 평가 프롬프트 조립 레이어
+#  - 템플릿은 (템플릿, 키 목록) 단위로 한 번만 컴파일(정적 조각/자리표시자 목록)해서 재사용
+#    → 행마다 키 수만큼 str.replace로 전체 템플릿을 다시 훑지 않음
+#  - 자르기는 글자 수가 아니라 토큰 예산 기준 (tiktoken o200k_base, 없으면 근사)
+#  - layout="static_prefix": 템플릿 전체(자리표시자 그대로)를 앞에, 행별 값은 맨 뒤에 붙여
+#    행마다 앞부분이 바이트 단위로 같도록 함 → OpenAI 프롬프트 캐시(1024 토큰 이상 동일 접두부) 적중
+#  - PromptCacheStats: 실행 단위 input/cached 토큰 합계와 캐시 비율 (extract_usage_fields의 cached_tokens)
+#  - agent_qa/aqb_prompt_assembly.py 와 backoffice app/lib/aqb_prompt_assembly.py 가 같은 내용
+# ============================================================
+
+DEFAULT_ENCODING = "o200k_base"
+
+LAYOUT_INLINE = "inline"
+LAYOUT_STATIC_PREFIX = "static_prefix"
+PROMPT_LAYOUTS = (LAYOUT_INLINE, LAYOUT_STATIC_PREFIX)
+
+# 근사 카운터: 영숫자 묶음은 4자당 1토큰, 공백은 다음 조각에 흡수, 그 외(한글/기호)는 글자당 1토큰
+_APPROX_PIECE_RE = re.compile(r"[A-Za-z0-9]+|\s+|[^\sA-Za-z0-9]")
+_ALNUM_CHARS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """토큰 수 세기/토큰 예산 자르기. name은 'o200k_base' 같은 인코딩 이름 또는 'approx'."""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING):
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding_name)
+            except Exception:
+                # 인코딩 파일을 내려받지 못하는 오프라인 환경
+                self._encoding = None
+        self.name = encoding_name if self._encoding is not None else "approx"
+
+    def count(self, text: str) -> int:
+        s = str(text or "")
+        if not s:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(s, disallowed_special=()))
+        return sum(_approx_piece_tokens(piece) for piece in _APPROX_PIECE_RE.findall(s))
+
+    def truncate(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """앞에서부터 max_tokens 토큰까지 남긴 문자열과 원문 전체 토큰 수."""
+        s = str(text or "")
+        budget = max(0, int(max_tokens))
+        if self._encoding is not None:
+            tokens = self._encoding.encode(s, disallowed_special=())
+            if len(tokens) <= budget:
+                return s, len(tokens)
+            return self._encoding.decode(tokens[:budget]), len(tokens)
+
+        total = 0
+        cut: Optional[int] = None
+        for match in _APPROX_PIECE_RE.finditer(s):
+            piece_tokens = _approx_piece_tokens(match.group())
+            if cut is None and total + piece_tokens > budget:
+                remaining = budget - total
+                cut = match.start() + (remaining * _ALNUM_CHARS_PER_TOKEN if match.group()[0].isascii() else 0)
+            total += piece_tokens
+        return (s if cut is None else s[:cut]), total
+
+
+def _approx_piece_tokens(piece: str) -> int:
+    if piece[0].isspace():
+        return 0
+    if piece[0].isascii() and piece[0].isalnum():
+        return math.ceil(len(piece) / _ALNUM_CHARS_PER_TOKEN)
+    return 1
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(encoding_name: str = DEFAULT_ENCODING) -> TokenCounter:
+    return TokenCounter(encoding_name)
+
+
+def truncate_to_tokens(text: str, max_tokens: Optional[int], counter: Optional[TokenCounter] = None) -> str:
+    """토큰 예산 초과분을 자르고 원래 길이를 표시 (truncate_text의 토큰 버전). max_tokens가 없으면 그대로."""
+    s = str(text or "")
+    if not s or max_tokens is None:
+        return s
+    counter = counter or get_token_counter()
+    kept, total = counter.truncate(s, max_tokens)
+    if len(kept) == len(s):
+        return s
+    return kept + f"\n...(truncated, {total} tokens total)"
+
+
+class CompiledPromptTemplate:
+    """
+    자리표시자({key})를 기준으로 미리 쪼개 둔 템플릿.
+    - render(): safe_fill_template과 같은 치환 (값 안의 '{key}'는 다시 치환하지 않음)
+    - render(layout="static_prefix"): 템플릿 원문 + 맨 뒤 '입력 값' 블록
+    """
+
+    def __init__(self, template: str, keys: Sequence[str], values_heading: str = "## 평가 입력 값"):
+        self.template = str(template or "")
+        self.keys = tuple(dict.fromkeys(str(k) for k in keys))
+        self.values_heading = values_heading
+        self._parts: List[Union[str, Tuple[str]]] = []
+        if self.keys:
+            pattern = re.compile("|".join(re.escape("{" + k + "}") for k in sorted(self.keys, key=len, reverse=True)))
+            pos = 0
+            for match in pattern.finditer(self.template):
+                self._parts.append(self.template[pos : match.start()])
+                self._parts.append((match.group()[1:-1],))
+                pos = match.end()
+            self._parts.append(self.template[pos:])
+        else:
+            self._parts.append(self.template)
+        self.used_keys = tuple(dict.fromkeys(part[0] for part in self._parts if isinstance(part, tuple)))
+        first = self._parts[0]
+        self.static_prefix = first if isinstance(first, str) else ""
+
+    def render(self, mapping: Mapping[str, Any], layout: str = LAYOUT_INLINE) -> str:
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"layout must be one of {', '.join(PROMPT_LAYOUTS)}")
+        if layout == LAYOUT_STATIC_PREFIX:
+            return self.template + self._values_block(mapping)
+        out: List[str] = []
+        for part in self._parts:
+            if isinstance(part, tuple):
+                key = part[0]
+                out.append(str(mapping[key]) if key in mapping else "{" + key + "}")
+            else:
+                out.append(part)
+        return "".join(out)
+
+    def cacheable_prefix(self, layout: str = LAYOUT_INLINE) -> str:
+        """행이 바뀌어도 변하지 않는 앞부분 (프롬프트 캐시 대상)."""
+        return self.template if layout == LAYOUT_STATIC_PREFIX else self.static_prefix
+
+    def _values_block(self, mapping: Mapping[str, Any]) -> str:
+        lines = ["", "", "---", "", f"{self.values_heading} (위 템플릿의 {{키}} 자리에 들어갈 값)", ""]
+        for key in self.used_keys:
+            lines.append(f"{{{key}}}:")
+            lines.append(str(mapping.get(key, "")))
+            lines.append("")
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=32)
+def compile_template(template: str, keys: Tuple[str, ...]) -> CompiledPromptTemplate:
+    return CompiledPromptTemplate(template, keys)
+
+
+class PromptCacheStats:
+    """실행 1회 동안의 OpenAI 호출 usage 합계 (cached_tokens / input_tokens)."""
+
+    def __init__(self, prefix_tokens: int = 0):
+        self.prefix_tokens = int(prefix_tokens)
+        self.calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+    def add(self, usage: Optional[Mapping[str, Any]]) -> None:
+        if not usage:
+            return
+        self.calls += 1
+        self.input_tokens += _to_int(usage.get("input_tokens"))
+        self.cached_tokens += _to_int(usage.get("cached_tokens"))
+
+    @property
+    def cached_ratio(self) -> Optional[float]:
+        if self.input_tokens <= 0:
+            return None
+        return round(self.cached_tokens / self.input_tokens, 4)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "inputTokens": self.input_tokens,
+            "cachedTokens": self.cached_tokens,
+            "cachedRatio": self.cached_ratio,
+            "prefixTokens": self.prefix_tokens,
+        }
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
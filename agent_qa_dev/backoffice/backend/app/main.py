@@ -4,6 +4,7 @@ import logging
 import os
 import ipaddress
 import socket
+import time
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -74,12 +75,15 @@ def _log_openai_key_status() -> None:
 
 _load_dotenv_file()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from sqlalchemy import text
 
+from app.api.responses import FastJSONResponse
 from app.api.routes.auth import router as auth_router
 from app.api.routes.generic_runs import router as generic_runs_router
+from app.api.routes.openai_usage import router as openai_usage_router
 from app.api.routes.prompts import router as prompts_router
 from app.api.routes.queries import router as queries_router
 from app.api.routes.query_groups import router as query_groups_router
@@ -89,11 +93,13 @@ from app.api.routes.validation_run_activity import router as validation_run_acti
 from app.api.routes.validation_runs import router as validation_runs_router
 from app.api.routes.validation_settings import router as validation_settings_router
 from app.api.routes.validation_test_sets import router as validation_test_sets_router
+from app.api.routes.validation_worker_latency import router as validation_worker_latency_router
 from app.core.db import Base, _ENGINE, get_db_path
+from app.core.metrics import CONTENT_TYPE_LATEST, HTTP_REQUEST_DURATION, render_latest
 from app.models.validation_eval_prompt_audit_log import ValidationEvalPromptAuditLog
 from app.models.validation_eval_prompt_config import ValidationEvalPromptConfig
 
-app = FastAPI(title="AQB Backoffice API", version="0.2.0")
+app = FastAPI(title="AQB Backoffice API", version="0.2.0", default_response_class=FastJSONResponse)
 APP_VERSION = os.getenv("BACKOFFICE_VERSION", "0.2.0")
 
 
@@ -181,6 +187,8 @@ def startup() -> None:
     )
     _ensure_sqlite_column("validation_run_items", "context_json_snapshot", "context_json_snapshot TEXT NOT NULL DEFAULT ''")
     _ensure_sqlite_column("validation_run_items", "target_assistant_snapshot", "target_assistant_snapshot TEXT NOT NULL DEFAULT ''")
+    _ensure_sqlite_column("validation_run_items", "eval_state", "eval_state VARCHAR(9) NOT NULL DEFAULT 'PENDING'")
+    _ensure_sqlite_column("validation_run_items", "eval_attempts", "eval_attempts INTEGER NOT NULL DEFAULT 0")
     _ensure_sqlite_column("validation_runs", "test_set_id", "test_set_id TEXT")
     _ensure_sqlite_column("validation_runs", "name", "name TEXT NOT NULL DEFAULT ''")
     _ensure_sqlite_column("validation_runs", "eval_status", "eval_status TEXT NOT NULL DEFAULT 'PENDING'")
@@ -188,6 +196,7 @@ def startup() -> None:
     _ensure_sqlite_column("validation_runs", "eval_finished_at", "eval_finished_at DATETIME")
     _ensure_sqlite_column("validation_runs", "eval_cancel_requested", "eval_cancel_requested INTEGER NOT NULL DEFAULT 0")
     _ensure_sqlite_column("validation_runs", "eval_cancel_requested_at", "eval_cancel_requested_at DATETIME")
+    _ensure_sqlite_column("validation_runs", "profile_json", "profile_json TEXT NOT NULL DEFAULT '{}'")
     _ensure_sqlite_column(
         "validation_llm_evaluations",
         "llm_output_json",
@@ -225,11 +234,35 @@ def startup() -> None:
     )
 
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route templates keep the label set bounded; unmatched paths share one series.
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        )
+
+
 @app.get("/healthz")
 def healthz():
     return {"ok": True}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/api/v1/version")
 def version():
     return {"version": APP_VERSION}
@@ -246,3 +279,5 @@ app.include_router(validation_runs_router, prefix="/api/v1")
 app.include_router(validation_run_activity_router, prefix="/api/v1")
 app.include_router(validation_test_sets_router, prefix="/api/v1")
 app.include_router(validation_agents_router, prefix="/api/v1")
+app.include_router(validation_worker_latency_router, prefix="/api/v1")
+app.include_router(openai_usage_router, prefix="/api/v1")
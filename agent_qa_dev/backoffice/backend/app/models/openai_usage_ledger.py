@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class OpenAIUsageLedger(Base):
+    """One row per OpenAI call made by an evaluate job, priced when it was recorded.
+
+    ``run_id``/``run_item_id`` point at a validation run/item or a generic run/row depending on
+    ``source``, so they are logical references without foreign keys.
+    """
+
+    __tablename__ = "openai_usage_ledger"
+    __table_args__ = (Index("ix_openai_usage_ledger_source_run_id", "source", "run_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source: Mapped[str] = mapped_column(String(40), nullable=False)
+    run_id: Mapped[str] = mapped_column(String(36), nullable=False, default="")
+    run_item_id: Mapped[str] = mapped_column(String(36), nullable=False, default="")
+    test_set_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
+    model: Mapped[str] = mapped_column(String(120), nullable=False, default="")
+    prompt_version: Mapped[str] = mapped_column(String(80), nullable=False, default="")
+    input_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cached_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reasoning_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    error: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime, nullable=False, default=dt.datetime.utcnow, index=True)
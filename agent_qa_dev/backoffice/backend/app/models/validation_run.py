@@ -36,3 +36,4 @@ class ValidationRun(Base):
     eval_finished_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
     eval_cancel_requested: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     eval_cancel_requested_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
+    profile_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
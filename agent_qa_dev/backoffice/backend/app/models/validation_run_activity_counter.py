@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+
+from sqlalchemy import DateTime, Enum, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+from app.core.enums import Environment
+
+
+class ValidationRunActivityCounter(Base):
+    __tablename__ = "validation_run_activity_counters"
+    __table_args__ = (
+        UniqueConstraint(
+            "actor_key",
+            "environment",
+            name="uq_validation_run_activity_counters_actor_environment",
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+    )
+    actor_key: Mapped[str] = mapped_column(String(128), nullable=False)
+    environment: Mapped[Environment] = mapped_column(Enum(Environment), nullable=False)
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_event_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[dt.datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=dt.datetime.utcnow,
+    )
+    updated_at: Mapped[dt.datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=dt.datetime.utcnow,
+        onupdate=dt.datetime.utcnow,
+    )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+from app.core.enums import Environment
+
+
+class ValidationRunActivityEvent(Base):
+    __tablename__ = "validation_run_activity_events"
+    __table_args__ = (
+        Index(
+            "ix_validation_run_activity_events_environment_seq",
+            "environment",
+            "seq",
+        ),
+    )
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("validation_runs.id"),
+        nullable=False,
+        index=True,
+    )
+    environment: Mapped[Environment] = mapped_column(Enum(Environment), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    created_at: Mapped[dt.datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=dt.datetime.utcnow,
+    )
@@ -4,10 +4,11 @@ import datetime as dt
 import uuid
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
+from app.core.enums import ItemEvalState
 
 
 class ValidationRunItem(Base):
@@ -33,3 +34,5 @@ class ValidationRunItem(Base):
     error: Mapped[str] = mapped_column(Text, nullable=False, default="")
     raw_json: Mapped[str] = mapped_column(Text, nullable=False, default="")
     executed_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
+    eval_state: Mapped[ItemEvalState] = mapped_column(Enum(ItemEvalState), nullable=False, default=ItemEvalState.PENDING)
+    eval_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+from app.core.enums import Environment
+
+
+class ValidationWorkerLatency(Base):
+    """One row per worker invocation, pre-extracted from a run item's workerMsMap."""
+
+    __tablename__ = "validation_worker_latencies"
+    __table_args__ = (
+        Index("ix_validation_worker_latencies_worker_type_environment", "worker_type", "environment"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(String(36), ForeignKey("validation_runs.id"), nullable=False, index=True)
+    run_item_id: Mapped[str] = mapped_column(String(36), ForeignKey("validation_run_items.id"), nullable=False, index=True)
+    environment: Mapped[Environment] = mapped_column(Enum(Environment), nullable=False)
+    worker_type: Mapped[str] = mapped_column(String(120), nullable=False)
+    worker_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    prompt_version: Mapped[str] = mapped_column(String(40), nullable=False, default="")
+    executed_at: Mapped[dt.datetime] = mapped_column(DateTime, nullable=False, default=dt.datetime.utcnow, index=True)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any, Optional
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session
+
+from app.models.openai_usage_ledger import OpenAIUsageLedger
+
+GROUP_COLUMNS = {
+    "run": OpenAIUsageLedger.run_id,
+    "testSet": OpenAIUsageLedger.test_set_id,
+    "day": func.date(OpenAIUsageLedger.created_at),
+    "model": OpenAIUsageLedger.model,
+    "promptVersion": OpenAIUsageLedger.prompt_version,
+}
+
+
+class OpenAIUsageLedgerRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, **values: Any) -> None:
+        self.db.execute(insert(OpenAIUsageLedger), [values])
+
+    def aggregate(
+        self,
+        *,
+        group_by: str,
+        source: Optional[str] = None,
+        run_id: Optional[str] = None,
+        test_set_id: Optional[str] = None,
+        date_from: Optional[dt.datetime] = None,
+        date_to: Optional[dt.datetime] = None,
+    ) -> list[dict[str, Any]]:
+        """Token/cost sums per (group, model); model is kept so cache savings can be priced per model."""
+        ledger = OpenAIUsageLedger
+        group_column = GROUP_COLUMNS[group_by].label("group_key")
+        query = self.db.query(
+            group_column,
+            ledger.model,
+            func.count(ledger.id),
+            func.sum(case((ledger.error != "", 1), else_=0)),
+            func.sum(ledger.input_tokens),
+            func.sum(ledger.cached_tokens),
+            func.sum(ledger.output_tokens),
+            func.sum(ledger.reasoning_tokens),
+            func.sum(ledger.total_tokens),
+            func.sum(ledger.cost_usd),
+            func.sum(ledger.latency_ms),
+            func.count(ledger.latency_ms),
+        )
+        if source:
+            query = query.filter(ledger.source == source)
+        if run_id:
+            query = query.filter(ledger.run_id == run_id)
+        if test_set_id:
+            query = query.filter(ledger.test_set_id == test_set_id)
+        if date_from is not None:
+            query = query.filter(ledger.created_at >= date_from)
+        if date_to is not None:
+            query = query.filter(ledger.created_at < date_to)
+        rows = query.group_by(group_column, ledger.model).all()
+        return [
+            {
+                "group": "" if group_key is None else str(group_key),
+                "model": model or "",
+                "calls": int(calls or 0),
+                "errorCalls": int(error_calls or 0),
+                "inputTokens": int(input_tokens or 0),
+                "cachedTokens": int(cached_tokens or 0),
+                "outputTokens": int(output_tokens or 0),
+                "reasoningTokens": int(reasoning_tokens or 0),
+                "totalTokens": int(total_tokens or 0),
+                "costUsd": float(cost_usd or 0.0),
+                "latencyMsSum": int(latency_sum or 0),
+                "latencyCount": int(latency_count or 0),
+            }
+            for (
+                group_key,
+                model,
+                calls,
+                error_calls,
+                input_tokens,
+                cached_tokens,
+                output_tokens,
+                reasoning_tokens,
+                total_tokens,
+                cost_usd,
+                latency_sum,
+                latency_count,
+            ) in rows
+        ]
@@ -7,6 +7,7 @@ from typing import Any, Optional
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.data_version import QUERIES_SCOPE, mark_changed
 from app.models.validation_llm_evaluation import ValidationLlmEvaluation
 from app.models.validation_query import ValidationQuery
 from app.models.validation_run_item import ValidationRunItem
@@ -152,6 +153,7 @@ class ValidationQueryRepository:
         )
         self.db.add(query)
         self.db.flush()
+        mark_changed(self.db, QUERIES_SCOPE)
         return query
 
     def bulk_create(self, rows: list[dict[str, Any]], *, created_by: str = "unknown") -> list[str]:
@@ -192,6 +194,7 @@ class ValidationQueryRepository:
             query.group_id = group_id or ""
         query.updated_at = dt.datetime.utcnow()
         self.db.flush()
+        mark_changed(self.db, QUERIES_SCOPE)
         return query
 
     def delete(self, query_id: str) -> bool:
@@ -200,6 +203,7 @@ class ValidationQueryRepository:
             return False
         self.db.delete(query)
         self.db.flush()
+        mark_changed(self.db, QUERIES_SCOPE)
         return True
 
     def get_latest_run_summary(self, query_ids: list[str]) -> dict[str, dict[str, Any]]:
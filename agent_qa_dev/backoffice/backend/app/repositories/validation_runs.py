@@ -5,17 +5,24 @@ import json
 import uuid
 from typing import Any, Optional
 
-from sqlalchemy import and_, delete, func, or_
+from sqlalchemy import and_, delete, func, or_, update
 from sqlalchemy.orm import Session
 
-from app.core.enums import Environment, EvalStatus, RunStatus
+from app.core.data_version import mark_changed, run_scope, test_set_scope
+from app.core.enums import Environment, EvalStatus, ItemEvalState, RunStatus
 from app.models.validation_llm_evaluation import ValidationLlmEvaluation
 from app.models.validation_logic_evaluation import ValidationLogicEvaluation
 from app.models.validation_query import ValidationQuery
+from app.models.validation_run_activity_counter import ValidationRunActivityCounter
+from app.models.validation_run_activity_event import ValidationRunActivityEvent
 from app.models.validation_run_activity_read import ValidationRunActivityRead
 from app.models.validation_run import ValidationRun
 from app.models.validation_run_item import ValidationRunItem
 from app.models.validation_score_snapshot import ValidationScoreSnapshot
+from app.models.validation_worker_latency import ValidationWorkerLatency
+
+RUN_ACTIVITY_EVENT_RUN_STARTED = "RUN_STARTED"
+RUN_ACTIVITY_EVENT_EVAL_STARTED = "EVAL_STARTED"
 
 
 def _normalize_evaluation_status_filter(value: Optional[str]) -> Optional[str]:
@@ -145,6 +152,12 @@ class ValidationRunRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def mark_run_changed(self, run_id: str, *, test_set_id: Optional[str] = None) -> None:
+        if test_set_id is None:
+            run = self.get_run(run_id)
+            test_set_id = run.test_set_id if run is not None else None
+        mark_changed(self.db, run_scope(run_id), test_set_scope(test_set_id) if test_set_id else "")
+
     def create_run(
         self,
         *,
@@ -178,6 +191,7 @@ class ValidationRunRepository:
         )
         self.db.add(run)
         self.db.flush()
+        self.mark_run_changed(run.id, test_set_id=test_set_id or "")
         return run
 
     def get_run(self, run_id: str) -> Optional[ValidationRun]:
@@ -230,6 +244,7 @@ class ValidationRunRepository:
             run.options_json = json.dumps(options, ensure_ascii=False)
 
         self.db.flush()
+        self.mark_run_changed(run.id)
         return run
 
     def list_runs(
@@ -349,6 +364,7 @@ class ValidationRunRepository:
         existing_by_run_id = {row.run_id: row for row in existing_rows}
         now = dt.datetime.utcnow()
         touched = 0
+        flipped_run_ids: list[str] = []
 
         for run_id in unique_run_ids:
             existing = existing_by_run_id.get(run_id)
@@ -361,26 +377,46 @@ class ValidationRunRepository:
                     )
                 )
             else:
+                if existing.read_at is None:
+                    flipped_run_ids.append(run_id)
                 existing.read_at = now
             touched += 1
 
         self.db.flush()
+        if flipped_run_ids:
+            env_rows = (
+                self.db.query(ValidationRun.environment, func.count(ValidationRun.id))
+                .filter(ValidationRun.id.in_(flipped_run_ids))
+                .group_by(ValidationRun.environment)
+                .all()
+            )
+            for environment, flipped_count in env_rows:
+                self._adjust_run_activity_counter(
+                    actor_key=normalized_actor_key,
+                    environment=environment,
+                    delta=-int(flipped_count or 0),
+                )
         return touched
 
     def set_status(self, run_id: str, status: RunStatus) -> None:
         run = self.get_run(run_id)
         if run is None:
             return
+        if status == RunStatus.RUNNING and run.status != RunStatus.RUNNING:
+            self._append_run_activity_event(run, RUN_ACTIVITY_EVENT_RUN_STARTED)
         run.status = status
         if status == RunStatus.RUNNING:
             run.started_at = dt.datetime.utcnow()
         if status in (RunStatus.DONE, RunStatus.FAILED):
             run.finished_at = dt.datetime.utcnow()
+        self.mark_run_changed(run.id)
 
     def set_eval_status(self, run_id: str, status: EvalStatus) -> None:
         run = self.get_run(run_id)
         if run is None:
             return
+        if status == EvalStatus.RUNNING and run.eval_status != EvalStatus.RUNNING:
+            self._append_run_activity_event(run, RUN_ACTIVITY_EVENT_EVAL_STARTED)
         run.eval_status = status
         if status == EvalStatus.RUNNING:
             run.eval_started_at = dt.datetime.utcnow()
@@ -391,6 +427,22 @@ class ValidationRunRepository:
             run.eval_finished_at = dt.datetime.utcnow()
             run.eval_cancel_requested = 0
             run.eval_cancel_requested_at = None
+        self.mark_run_changed(run.id)
+
+    def save_run_profile(self, run_id: str, phase: str, profile: dict[str, Any]) -> None:
+        run = self.get_run(run_id)
+        if run is None:
+            return
+        profiles = _to_object_payload(run.profile_json)
+        profiles[phase] = profile
+        run.profile_json = json.dumps(profiles, ensure_ascii=False)
+        self.db.flush()
+
+    def get_run_profile(self, run_id: str) -> dict[str, Any]:
+        run = self.get_run(run_id)
+        if run is None:
+            return {}
+        return _to_object_payload(run.profile_json)
 
     def request_eval_cancel(self, run_id: str) -> bool:
         run = self.get_run(run_id)
@@ -401,6 +453,7 @@ class ValidationRunRepository:
         run.eval_cancel_requested = 1
         run.eval_cancel_requested_at = dt.datetime.utcnow()
         self.db.flush()
+        self.mark_run_changed(run.id)
         return True
 
     def clear_eval_cancel_request(self, run_id: str) -> bool:
@@ -411,6 +464,8 @@ class ValidationRunRepository:
         run.eval_cancel_requested = 0
         run.eval_cancel_requested_at = None
         self.db.flush()
+        if was_requested:
+            self.mark_run_changed(run.id)
         return was_requested
 
     def is_eval_cancel_requested(self, run_id: str) -> bool:
@@ -438,6 +493,8 @@ class ValidationRunRepository:
             self.db.add(item)
             self.db.flush()
             row_ids.append(item.id)
+        if row_ids:
+            self.mark_run_changed(run_id)
         return row_ids
 
     def list_items(self, run_id: str, *, offset: int = 0, limit: int = 1000) -> list[ValidationRunItem]:
@@ -476,6 +533,11 @@ class ValidationRunRepository:
                 ValidationLlmEvaluation.run_item_id.in_(target_ids),
             ),
         )
+        self.db.execute(
+            delete(ValidationWorkerLatency).where(
+                ValidationWorkerLatency.run_item_id.in_(target_ids),
+            ),
+        )
 
         for row in rows:
             row.conversation_id = ""
@@ -484,8 +546,11 @@ class ValidationRunRepository:
             row.error = ""
             row.raw_json = ""
             row.executed_at = None
+            row.eval_state = ItemEvalState.PENDING
+            row.eval_attempts = 0
 
         self.db.flush()
+        self.mark_run_changed(run_id)
         return len(rows)
 
     def get_item(self, item_id: str) -> Optional[ValidationRunItem]:
@@ -522,6 +587,7 @@ class ValidationRunRepository:
                 next_payload.pop("meta", None)
             item.applied_criteria_json = _to_json_text(next_payload if next_payload else None)
         self.db.flush()
+        self.mark_run_changed(item.run_id)
         return item
 
     def bulk_update_item_expected_results(self, run_id: str, updates: dict[str, str]) -> int:
@@ -536,19 +602,87 @@ class ValidationRunRepository:
             row.expected_result_snapshot = next_expected_result
             updated_count += 1
         self.db.flush()
+        if updated_count:
+            self.mark_run_changed(run_id)
         return updated_count
 
     def clear_llm_evaluations_for_run(self, run_id: str) -> None:
         item_rows = self.db.query(ValidationRunItem.id).filter(ValidationRunItem.run_id == run_id).all()
         item_ids = [row[0] if not isinstance(row, str) else row for row in item_rows]
-        item_ids = [item_id for item_id in item_ids if item_id is not None]
+        self.clear_llm_evaluations_for_items(run_id, [item_id for item_id in item_ids if item_id is not None])
+
+    def clear_llm_evaluations_for_items(self, run_id: str, item_ids: list[str]) -> None:
+        """Deletes the LLM results of `item_ids` and puts them back to PENDING; other items keep theirs."""
         if item_ids:
             self.db.execute(
                 delete(ValidationLlmEvaluation).where(
                     ValidationLlmEvaluation.run_item_id.in_(item_ids)
                 )
             )
+            self.reset_item_eval_states(run_id, item_ids)
+        self.db.flush()
+        self.mark_run_changed(run_id)
+
+    def reset_item_eval_states(self, run_id: str, item_ids: Optional[list[str]] = None) -> int:
+        """Marks items PENDING so the next evaluation judges them again; attempt counts are kept."""
+        query = update(ValidationRunItem).where(ValidationRunItem.run_id == run_id)
+        if item_ids is not None:
+            query = query.where(ValidationRunItem.id.in_(item_ids))
+        result = self.db.execute(
+            query.values(eval_state=ItemEvalState.PENDING).execution_options(synchronize_session="fetch")
+        )
+        self.db.flush()
+        return int(result.rowcount or 0)
+
+    def claim_items_for_eval(self, run_id: str, item_ids: Optional[list[str]] = None) -> int:
+        """Moves the PENDING/FAILED (or stale IN_FLIGHT) items among `item_ids` (default: whole run) to IN_FLIGHT.
+
+        DONE items are left alone: the evaluate job re-checks them against their stored input hash.
+        """
+        query = update(ValidationRunItem).where(
+            ValidationRunItem.run_id == run_id,
+            ValidationRunItem.eval_state != ItemEvalState.DONE,
+        )
+        if item_ids is not None:
+            query = query.where(ValidationRunItem.id.in_(item_ids))
+        result = self.db.execute(
+            query.values(eval_state=ItemEvalState.IN_FLIGHT).execution_options(synchronize_session="fetch")
+        )
+        self.db.flush()
+        self.mark_run_changed(run_id)
+        return int(result.rowcount or 0)
+
+    def release_in_flight_items(self, run_id: str) -> int:
+        """Returns IN_FLIGHT items of an interrupted evaluation to PENDING, keeping finished results."""
+        result = self.db.execute(
+            update(ValidationRunItem)
+            .where(ValidationRunItem.run_id == run_id, ValidationRunItem.eval_state == ItemEvalState.IN_FLIGHT)
+            .values(eval_state=ItemEvalState.PENDING)
+            .execution_options(synchronize_session="fetch")
+        )
         self.db.flush()
+        return int(result.rowcount or 0)
+
+    def set_item_eval_state(self, item_id: str, state: ItemEvalState, *, attempted: bool = False) -> None:
+        item = self.get_item(item_id)
+        if item is None:
+            return
+        item.eval_state = state
+        if attempted:
+            item.eval_attempts = int(item.eval_attempts or 0) + 1
+        self.db.flush()
+
+    def count_items_by_eval_state(self, run_id: str) -> dict[str, int]:
+        rows = (
+            self.db.query(ValidationRunItem.eval_state, func.count(ValidationRunItem.id))
+            .filter(ValidationRunItem.run_id == run_id)
+            .group_by(ValidationRunItem.eval_state)
+            .all()
+        )
+        counts = {state.value: 0 for state in ItemEvalState}
+        for state, count in rows:
+            counts[state.value if isinstance(state, ItemEvalState) else str(state)] = int(count or 0)
+        return counts
 
     def reset_eval_state_to_pending(self, run_id: str) -> None:
         run = self.get_run(run_id)
@@ -559,7 +693,9 @@ class ValidationRunRepository:
         run.eval_finished_at = None
         run.eval_cancel_requested = 0
         run.eval_cancel_requested_at = None
+        self.release_in_flight_items(run.id)
         self.db.flush()
+        self.mark_run_changed(run.id)
 
     def update_item_execution(
         self,
@@ -583,6 +719,7 @@ class ValidationRunRepository:
         item.raw_json = raw_json or ""
         item.executed_at = executed_at or dt.datetime.utcnow()
         self.db.flush()
+        self.mark_run_changed(item.run_id)
         return item
 
     def upsert_logic_eval(
@@ -602,6 +739,7 @@ class ValidationRunRepository:
         entity.fail_reason = fail_reason or ""
         entity.evaluated_at = dt.datetime.utcnow()
         self.db.flush()
+        self._mark_item_changed(run_item_id)
         return entity
 
     def upsert_llm_eval(
@@ -637,8 +775,14 @@ class ValidationRunRepository:
         entity.status = status
         entity.evaluated_at = dt.datetime.utcnow()
         self.db.flush()
+        self._mark_item_changed(run_item_id)
         return entity
 
+    def _mark_item_changed(self, run_item_id: str) -> None:
+        item = self.get_item(run_item_id)
+        if item is not None:
+            self.mark_run_changed(item.run_id)
+
     def get_logic_eval_map(self, item_ids: list[str]) -> dict[str, ValidationLogicEvaluation]:
         if not item_ids:
             return {}
@@ -767,6 +911,7 @@ class ValidationRunRepository:
             delete(ValidationScoreSnapshot).where(ValidationScoreSnapshot.run_id == run_id)
         )
         self.db.flush()
+        self.mark_run_changed(run_id)
 
     def delete_run(self, run_id: str) -> bool:
         run = self.get_run(run_id)
@@ -808,6 +953,8 @@ class ValidationRunRepository:
                 delete(ValidationRunItem).where(ValidationRunItem.id.in_(item_ids))
             )
 
+        self._delete_run_activity(run)
+        self.mark_run_changed(run.id, test_set_id=run.test_set_id or "")
         self.db.execute(delete(ValidationRun).where(ValidationRun.id == run.id))
         self.db.flush()
         return True
@@ -846,6 +993,7 @@ class ValidationRunRepository:
         entity.llm_total_score_avg = llm_total_score_avg
         entity.evaluated_at = dt.datetime.utcnow()
         self.db.flush()
+        self.mark_run_changed(run_id, test_set_id=test_set_id or "")
         return entity
 
     def list_query_group_ids_by_query_ids(self, query_ids: list[str]) -> dict[str, str]:
@@ -854,6 +1002,136 @@ class ValidationRunRepository:
         rows = self.db.query(ValidationQuery.id, ValidationQuery.group_id).filter(ValidationQuery.id.in_(query_ids)).all()
         return {str(query_id): str(group_id) for query_id, group_id in rows if query_id and group_id}
 
+    def _append_run_activity_event(self, run: ValidationRun, event_type: str) -> None:
+        self.db.add(
+            ValidationRunActivityEvent(
+                run_id=run.id,
+                environment=run.environment,
+                event_type=event_type,
+            )
+        )
+
+    def _get_run_activity_counter(
+        self,
+        *,
+        actor_key: str,
+        environment: Environment,
+    ) -> Optional[ValidationRunActivityCounter]:
+        return (
+            self.db.query(ValidationRunActivityCounter)
+            .filter(
+                ValidationRunActivityCounter.actor_key == actor_key,
+                ValidationRunActivityCounter.environment == environment,
+            )
+            .first()
+        )
+
+    def _adjust_run_activity_counter(self, *, actor_key: str, environment: Environment, delta: int) -> None:
+        counter = self._get_run_activity_counter(actor_key=actor_key, environment=environment)
+        if counter is None or not delta:
+            return
+        counter.unread_count = max(0, int(counter.unread_count or 0) + int(delta))
+        self.db.flush()
+
+    def _delete_run_activity(self, run: ValidationRun) -> None:
+        unread_rows = (
+            self.db.query(ValidationRunActivityRead.actor_key)
+            .filter(
+                ValidationRunActivityRead.run_id == run.id,
+                ValidationRunActivityRead.read_at.is_(None),
+            )
+            .all()
+        )
+        for (actor_key,) in unread_rows:
+            self._adjust_run_activity_counter(actor_key=actor_key, environment=run.environment, delta=-1)
+        self.db.execute(delete(ValidationRunActivityRead).where(ValidationRunActivityRead.run_id == run.id))
+        self.db.execute(delete(ValidationRunActivityEvent).where(ValidationRunActivityEvent.run_id == run.id))
+
+    def get_run_activity_event_head(self, *, environment: Environment) -> int:
+        head = (
+            self.db.query(func.max(ValidationRunActivityEvent.seq))
+            .filter(ValidationRunActivityEvent.environment == environment)
+            .scalar()
+        )
+        return int(head or 0)
+
+    def sync_run_activity_counter(
+        self,
+        *,
+        environment: Environment,
+        actor_key: str,
+    ) -> Optional[ValidationRunActivityCounter]:
+        """Fold activity events newer than the actor's cursor into its unread counter.
+
+        The first call for an actor seeds the counter from the currently active runs;
+        afterwards a poll with no new events is a single indexed lookup.
+        """
+        normalized_actor_key = str(actor_key or "").strip()
+        if not normalized_actor_key:
+            return None
+
+        head = self.get_run_activity_event_head(environment=environment)
+        counter = self._get_run_activity_counter(actor_key=normalized_actor_key, environment=environment)
+        if counter is None:
+            self.ensure_run_activity_rows(environment=environment, actor_key=normalized_actor_key, limit=1000)
+            counter = ValidationRunActivityCounter(
+                actor_key=normalized_actor_key,
+                environment=environment,
+                unread_count=self.count_unread_run_activity_items(
+                    environment=environment,
+                    actor_key=normalized_actor_key,
+                ),
+                last_event_seq=head,
+            )
+            self.db.add(counter)
+            self.db.flush()
+            return counter
+        if head <= int(counter.last_event_seq or 0):
+            return counter
+
+        event_rows = (
+            self.db.query(ValidationRunActivityEvent.run_id)
+            .filter(
+                ValidationRunActivityEvent.environment == environment,
+                ValidationRunActivityEvent.seq > int(counter.last_event_seq or 0),
+                ValidationRunActivityEvent.seq <= head,
+            )
+            .order_by(ValidationRunActivityEvent.seq.asc())
+            .all()
+        )
+        run_ids = list(dict.fromkeys(str(row[0]) for row in event_rows if row and row[0]))
+        existing_rows = (
+            self.db.query(ValidationRunActivityRead.run_id)
+            .filter(
+                ValidationRunActivityRead.actor_key == normalized_actor_key,
+                ValidationRunActivityRead.run_id.in_(run_ids),
+            )
+            .all()
+            if run_ids
+            else []
+        )
+        existing_run_ids = {str(row[0]) for row in existing_rows if row and row[0]}
+        now = dt.datetime.utcnow()
+        inserted = 0
+        for run_id in run_ids:
+            if run_id in existing_run_ids:
+                continue
+            self.db.add(
+                ValidationRunActivityRead(
+                    id=str(uuid.uuid4()),
+                    run_id=run_id,
+                    actor_key=normalized_actor_key,
+                    read_at=None,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            inserted += 1
+        counter.unread_count = int(counter.unread_count or 0) + inserted
+        counter.last_event_seq = head
+        self.db.flush()
+        return counter
+
     def ensure_run_activity_rows(
         self,
         *,
@@ -972,6 +1250,11 @@ class ValidationRunRepository:
             row.read_at = now
             row.updated_at = now
         self.db.flush()
+        self._adjust_run_activity_counter(
+            actor_key=normalized_actor_key,
+            environment=environment,
+            delta=-len(rows),
+        )
         return len(rows)
 
     def build_run_payload(self, run: ValidationRun) -> dict[str, Any]:
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Iterable
+from typing import Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.core.enums import Environment
+from app.models.validation_run import ValidationRun
+from app.models.validation_run_item import ValidationRunItem
+from app.models.validation_worker_latency import ValidationWorkerLatency
+
+GROUP_COLUMNS = {
+    "run": ValidationWorkerLatency.run_id,
+    "environment": ValidationWorkerLatency.environment,
+    "promptVersion": ValidationWorkerLatency.prompt_version,
+}
+
+
+class ValidationWorkerLatencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def replace_for_item(
+        self,
+        run_item_id: str,
+        *,
+        run_id: str,
+        environment: Environment,
+        workers: Iterable[tuple[str, int, float]],
+        prompt_versions: dict[str, str],
+        executed_at: Optional[dt.datetime] = None,
+    ) -> int:
+        self.db.execute(delete(ValidationWorkerLatency).where(ValidationWorkerLatency.run_item_id == run_item_id))
+        executed = executed_at or dt.datetime.utcnow()
+        rows = [
+            {
+                "run_id": run_id,
+                "run_item_id": run_item_id,
+                "environment": environment,
+                "worker_type": worker_type,
+                "worker_index": worker_index,
+                "latency_ms": latency_ms,
+                "prompt_version": prompt_versions.get(worker_type, ""),
+                "executed_at": executed,
+            }
+            for worker_type, worker_index, latency_ms in workers
+        ]
+        if rows:
+            self.db.execute(insert(ValidationWorkerLatency), rows)
+        return len(rows)
+
+    def delete_for_items(self, run_item_ids: list[str]) -> None:
+        if run_item_ids:
+            self.db.execute(
+                delete(ValidationWorkerLatency).where(ValidationWorkerLatency.run_item_id.in_(run_item_ids))
+            )
+
+    def list_executed_items(self, run_id: Optional[str] = None) -> list[tuple[ValidationRunItem, ValidationRun]]:
+        query = (
+            self.db.query(ValidationRunItem, ValidationRun)
+            .join(ValidationRun, ValidationRun.id == ValidationRunItem.run_id)
+            .filter(ValidationRunItem.executed_at.is_not(None), ValidationRunItem.raw_json != "")
+        )
+        if run_id:
+            query = query.filter(ValidationRunItem.run_id == run_id)
+        return list(query.order_by(ValidationRunItem.run_id, ValidationRunItem.ordinal).all())
+
+    def fetch_latency_columns(
+        self,
+        *,
+        group_by: Optional[str] = None,
+        environment: Optional[Environment] = None,
+        run_ids: Optional[list[str]] = None,
+        worker_types: Optional[list[str]] = None,
+        prompt_version: Optional[str] = None,
+        date_from: Optional[dt.datetime] = None,
+        date_to: Optional[dt.datetime] = None,
+    ) -> list[tuple[str, str, float]]:
+        """Returns (worker_type, group_key, latency_ms) tuples; only the three columns are read."""
+        group_column = GROUP_COLUMNS.get(group_by or "")
+        columns = [ValidationWorkerLatency.worker_type]
+        columns.append(group_column if group_column is not None else ValidationWorkerLatency.worker_type)
+        columns.append(ValidationWorkerLatency.latency_ms)
+        query = self.db.query(*columns)
+        if environment is not None:
+            query = query.filter(ValidationWorkerLatency.environment == environment)
+        if run_ids:
+            query = query.filter(ValidationWorkerLatency.run_id.in_(run_ids))
+        if worker_types:
+            query = query.filter(ValidationWorkerLatency.worker_type.in_(worker_types))
+        if prompt_version is not None:
+            query = query.filter(ValidationWorkerLatency.prompt_version == prompt_version)
+        if date_from is not None:
+            query = query.filter(ValidationWorkerLatency.executed_at >= date_from)
+        if date_to is not None:
+            query = query.filter(ValidationWorkerLatency.executed_at < date_to)
+        rows = query.all()
+        if group_column is None:
+            return [(worker_type, "", float(latency_ms)) for worker_type, _unused, latency_ms in rows]
+        return [
+            (worker_type, getattr(group_key, "value", group_key) or "", float(latency_ms))
+            for worker_type, group_key, latency_ms in rows
+        ]
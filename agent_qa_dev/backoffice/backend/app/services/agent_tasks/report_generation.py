@@ -4,11 +4,21 @@ from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 
-from app.services.validation_dashboard import build_test_set_dashboard
+from app.core.data_version import test_set_scope
+from app.core.singleflight import derived_results
+from app.services.validation_dashboard import build_test_set_dashboard_cached
 
 
 def build_validation_report(db: Session, test_set_id: str, *, run_id: Optional[str] = None) -> dict[str, Any]:
-    dashboard = build_test_set_dashboard(db, test_set_id, run_id=run_id)
+    return derived_results.get_or_compute(
+        ("validation-report", test_set_id, run_id or ""),
+        [test_set_scope(test_set_id)],
+        lambda: _build_validation_report(db, test_set_id, run_id=run_id),
+    )
+
+
+def _build_validation_report(db: Session, test_set_id: str, *, run_id: Optional[str] = None) -> dict[str, Any]:
+    dashboard = build_test_set_dashboard_cached(db, test_set_id, run_id=run_id)
     run_count = int(dashboard.get("runCount") or 0)
     total_items = int(dashboard.get("totalItems") or 0)
     error_items = int(dashboard.get("errorItems") or 0)
@@ -1,3 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+from collections import defaultdict
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable
+
+from app.core.serialization import orjson
 from app.lib.aqb_common_utils import run_logic_check
 
-__all__ = ["run_logic_check"]
+__all__ = [
+    "LOGIC_CHECK_WORKERS_ENV",
+    "logic_check_workers",
+    "run_logic_check",
+    "run_logic_checks",
+    "run_logic_checks_async",
+]
+
+LOGIC_CHECK_WORKERS_ENV = "BACKOFFICE_LOGIC_CHECK_WORKERS"
+# Below this many rows a process pool costs more to start than it saves.
+LOGIC_CHECK_PARALLEL_MIN_ROWS = 5000
+
+_PARSE_FAILED = object()
+
+
+def logic_check_workers() -> int:
+    try:
+        value = int(os.getenv(LOGIC_CHECK_WORKERS_ENV, "") or 0)
+    except ValueError:
+        return 0
+    return max(0, value)
+
+
+def _loads(raw_json: Any) -> tuple[Any, bool]:
+    """Parses ``raw_json``; the flag tells whether orjson produced the value."""
+    if orjson is not None and isinstance(raw_json, str):
+        try:
+            return orjson.loads(raw_json), True
+        except orjson.JSONDecodeError:
+            # NaN/Infinity literals, lone surrogates: let json decide.
+            pass
+    try:
+        return json.loads(raw_json), False
+    except (json.JSONDecodeError, TypeError):
+        return _PARSE_FAILED, False
+
+
+def _contains_float(value: Any) -> bool:
+    if isinstance(value, float):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_float(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_contains_float(item) for item in value)
+    return False
+
+
+@lru_cache(maxsize=1024)
+def _compile_field_path(path: str) -> Callable[[Any], Any]:
+    """Tokenizes ``path`` once into a resolver with the same rules as ``resolve_field_path``."""
+    try:
+        tokens: list[tuple[bool, Any]] = []
+        for part in path.split("."):
+            while "[" in part:
+                before, rest = part.split("[", 1)
+                if before:
+                    tokens.append((False, before))
+                idx_str, part = rest.split("]", 1)
+                tokens.append((True, idx_str))
+                if part.startswith("."):
+                    part = part[1:]
+            if part:
+                tokens.append((False, part))
+    except ValueError as exc:
+        # resolve_field_path raises the same error for an unclosed "[" once it has data to walk.
+        error = exc
+
+        def _raise(data: Any) -> Any:
+            if data is None:
+                return None
+            raise error
+
+        return _raise
+    steps = tuple(tokens)
+
+    def _resolve(data: Any) -> Any:
+        cur = data
+        if cur is None:
+            return None
+        for is_index, token in steps:
+            if is_index:
+                try:
+                    cur = cur[int(token)]
+                except (IndexError, TypeError, ValueError, KeyError):
+                    return None
+            else:
+                if not isinstance(cur, dict):
+                    return None
+                cur = cur.get(token)
+            if cur is None:
+                return None
+        return cur
+
+    return _resolve
+
+
+def _check_path_group(field_path: str, rows: list[tuple[int, str, str]]) -> list[tuple[int, str]]:
+    resolve = _compile_field_path(field_path)
+    results: list[tuple[int, str]] = []
+    for index, raw_json, expected_value in rows:
+        data, via_orjson = _loads(raw_json)
+        if data is _PARSE_FAILED:
+            results.append((index, "FAIL: raw JSON 파싱 실패"))
+            continue
+        actual = resolve(data)
+        if via_orjson and _contains_float(actual):
+            # orjson may widen integers beyond 64 bits to floats; json keeps them exact.
+            actual = resolve(json.loads(raw_json))
+        if actual is None:
+            results.append((index, f"FAIL: 필드 '{field_path}' 를 찾을 수 없음"))
+            continue
+        actual_str = str(actual)
+        if expected_value in actual_str:
+            results.append((index, f"PASS: '{expected_value}' 포함 확인 (실제값: {actual_str[:200]})"))
+        else:
+            results.append((index, f"FAIL: '{expected_value}' 미포함 (실제값: {actual_str[:200]})"))
+    return results
+
+
+def _check_shard(groups: list[tuple[str, list[tuple[int, str, str]]]]) -> list[tuple[int, str]]:
+    return [result for field_path, rows in groups for result in _check_path_group(field_path, rows)]
+
+
+def run_logic_checks(
+    rows: Sequence[tuple[str, str, str]],
+    *,
+    workers: int = 0,
+    min_rows: int = LOGIC_CHECK_PARALLEL_MIN_ROWS,
+) -> list[str]:
+    """Batch ``run_logic_check`` over ``(raw_json, field_path, expected_value)`` rows, in input order.
+
+    Rows are grouped by field path so each path is tokenized once, and raw JSON is parsed with
+    orjson when it is installed. With ``workers >= 2`` and at least ``min_rows`` rows the path
+    groups are sharded across a spawn process pool; only the raw JSON strings cross the boundary.
+    """
+    results = [""] * len(rows)
+    groups: dict[str, list[tuple[int, str, str]]] = defaultdict(list)
+    for index, (raw_json, field_path, expected_value) in enumerate(rows):
+        if field_path and expected_value:
+            groups[field_path].append((index, raw_json, expected_value))
+    if not groups:
+        return results
+
+    if workers < 2 or len(rows) < max(2, min_rows):
+        shard_results = _check_shard(list(groups.items()))
+    else:
+        # Split large path groups so one hot path still spreads over every worker.
+        step = math.ceil(len(rows) / (workers * 4))
+        pieces = [
+            [(field_path, group_rows[start : start + step])]
+            for field_path, group_rows in groups.items()
+            for start in range(0, len(group_rows), step)
+        ]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            shard_results = [result for shard in pool.map(_check_shard, pieces) for result in shard]
+
+    for index, message in shard_results:
+        results[index] = message
+    return results
+
+
+async def run_logic_checks_async(
+    rows: Sequence[tuple[str, str, str]],
+    *,
+    workers: int = 0,
+    min_rows: int = LOGIC_CHECK_PARALLEL_MIN_ROWS,
+) -> list[str]:
+    """``run_logic_checks`` off the event loop, so API requests keep being served."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(run_logic_checks, rows, workers=workers, min_rows=min_rows))
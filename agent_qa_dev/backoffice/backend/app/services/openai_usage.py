@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from sqlalchemy.orm import Session
+
+from app.lib.aqb_openai_judge import token_cost_usd
+from app.repositories.openai_usage_ledger import GROUP_COLUMNS, OpenAIUsageLedgerRepository
+
+SOURCE_VALIDATION_EVALUATE = "validation_evaluate"
+SOURCE_GENERIC_EVALUATE = "generic_evaluate"
+
+GROUP_BY_VALUES = tuple(GROUP_COLUMNS)
+
+PRICES_ENV = "BACKOFFICE_OPENAI_PRICES"
+_FLAT_PRICE_ENV = {
+    "input": ("BACKOFFICE_OPENAI_PRICE_INPUT_PER_1M", "OPENAI_PRICE_INPUT_PER_1M"),
+    "cachedInput": ("BACKOFFICE_OPENAI_PRICE_CACHED_INPUT_PER_1M", "OPENAI_PRICE_CACHED_INPUT_PER_1M"),
+    "output": ("BACKOFFICE_OPENAI_PRICE_OUTPUT_PER_1M", "OPENAI_PRICE_OUTPUT_PER_1M"),
+}
+_USAGE_KEYS = ("input_tokens", "cached_tokens", "output_tokens", "reasoning_tokens", "total_tokens")
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per 1M tokens."""
+
+    input: float = 0.0
+    cached_input: float = 0.0
+    output: float = 0.0
+
+    def cost_usd(self, input_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+        return token_cost_usd(
+            input_tokens,
+            cached_tokens,
+            output_tokens,
+            price_input_per_1m=self.input,
+            price_output_per_1m=self.output,
+            price_cached_input_per_1m=self.cached_input,
+        )
+
+
+def _to_price(value: Any) -> float:
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return price if price > 0 else 0.0
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
+
+class OpenAIPriceTable:
+    """Per-model prices from ``BACKOFFICE_OPENAI_PRICES``, falling back to the flat price env vars.
+
+    ``BACKOFFICE_OPENAI_PRICES`` is a JSON object such as
+    ``{"gpt-5.2": {"input": 1.75, "cachedInput": 0.175, "output": 14}}``. A dated model name
+    (``gpt-5.2-2025-12-11``) uses the longest configured prefix; ``"*"`` sets the default.
+    """
+
+    def __init__(self, prices: Mapping[str, ModelPrice], default: ModelPrice):
+        self.prices = dict(prices)
+        self.default = default
+
+    @classmethod
+    def from_env(cls) -> "OpenAIPriceTable":
+        def _flat(name: str) -> float:
+            return next((_to_price(os.getenv(key)) for key in _FLAT_PRICE_ENV[name] if os.getenv(key)), 0.0)
+
+        default = ModelPrice(input=_flat("input"), cached_input=_flat("cachedInput"), output=_flat("output"))
+        try:
+            payload = json.loads(os.getenv(PRICES_ENV, "") or "{}")
+        except ValueError:
+            payload = {}
+        prices: dict[str, ModelPrice] = {}
+        for model, entry in (payload.items() if isinstance(payload, dict) else ()):
+            if not isinstance(entry, dict):
+                continue
+            prices[str(model)] = ModelPrice(
+                input=_to_price(entry.get("input")),
+                cached_input=_to_price(entry.get("cachedInput")),
+                output=_to_price(entry.get("output")),
+            )
+        return cls(prices, prices.pop("*", default))
+
+    def for_model(self, model: str) -> ModelPrice:
+        name = str(model or "")
+        if name in self.prices:
+            return self.prices[name]
+        matches = [key for key in self.prices if name.startswith(key)]
+        return self.prices[max(matches, key=len)] if matches else self.default
+
+
+def record_openai_usage(
+    db: Session,
+    *,
+    source: str,
+    run_id: str,
+    model: str,
+    usage: Optional[Mapping[str, Any]],
+    run_item_id: str = "",
+    test_set_id: Optional[str] = None,
+    prompt_version: str = "",
+    latency_ms: Optional[int] = None,
+    error: str = "",
+    prices: Optional[OpenAIPriceTable] = None,
+    created_at: Optional[dt.datetime] = None,
+) -> None:
+    """Adds one ledger row for an OpenAI call; the caller commits it with the call's result."""
+    tokens = {key: _to_int((usage or {}).get(key)) for key in _USAGE_KEYS}
+    if not tokens["total_tokens"]:
+        tokens["total_tokens"] = tokens["input_tokens"] + tokens["output_tokens"]
+    price = (prices or OpenAIPriceTable.from_env()).for_model(model)
+    OpenAIUsageLedgerRepository(db).add(
+        source=source,
+        run_id=run_id,
+        run_item_id=run_item_id or "",
+        test_set_id=test_set_id,
+        model=model or "",
+        prompt_version=prompt_version or "",
+        **tokens,
+        latency_ms=latency_ms,
+        cost_usd=price.cost_usd(tokens["input_tokens"], tokens["cached_tokens"], tokens["output_tokens"]),
+        error=str(error or "")[:2000],
+        created_at=created_at or dt.datetime.utcnow(),
+    )
+
+
+def _parse_date(value: Optional[str], *, name: str) -> Optional[dt.date]:
+    text = (value or "").strip()
+    if not text:
+        return None
+    try:
+        return dt.date.fromisoformat(text)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be YYYY-MM-DD") from exc
+
+
+_SUM_KEYS = ("calls", "errorCalls", "inputTokens", "cachedTokens", "outputTokens", "reasoningTokens", "totalTokens")
+
+
+def _finish_row(acc: dict[str, Any]) -> dict[str, Any]:
+    latency_count = acc.pop("latencyCount")
+    latency_sum = acc.pop("latencyMsSum")
+    acc["costUsd"] = round(acc["costUsd"], 6)
+    acc["avgLatencyMs"] = round(latency_sum / latency_count, 1) if latency_count else None
+    acc["cachedRatio"] = round(acc["cachedTokens"] / acc["inputTokens"], 4) if acc["inputTokens"] else None
+    acc["maxCacheSavingsUsd"] = round(acc["maxCacheSavingsUsd"], 6)
+    return acc
+
+
+def build_usage_report(
+    db: Session,
+    *,
+    group_by: str = "run",
+    source: Optional[str] = None,
+    run_id: Optional[str] = None,
+    test_set_id: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    prices: Optional[OpenAIPriceTable] = None,
+) -> dict[str, Any]:
+    """Token and cost totals per group, most expensive first.
+
+    ``maxCacheSavingsUsd`` is what the group's uncached input tokens would have saved at the
+    cached-input price (current prices), i.e. the upper bound prompt caching could still recover.
+    """
+    if group_by not in GROUP_BY_VALUES:
+        raise ValueError(f"groupBy must be one of {', '.join(GROUP_BY_VALUES)}")
+    start = _parse_date(date_from, name="dateFrom")
+    end = _parse_date(date_to, name="dateTo")
+    price_table = prices or OpenAIPriceTable.from_env()
+    aggregates = OpenAIUsageLedgerRepository(db).aggregate(
+        group_by=group_by,
+        source=source,
+        run_id=run_id,
+        test_set_id=test_set_id,
+        date_from=dt.datetime.combine(start, dt.time.min) if start else None,
+        date_to=dt.datetime.combine(end + dt.timedelta(days=1), dt.time.min) if end else None,
+    )
+
+    def _empty() -> dict[str, Any]:
+        acc: dict[str, Any] = {key: 0 for key in _SUM_KEYS}
+        acc.update({"models": [], "costUsd": 0.0, "maxCacheSavingsUsd": 0.0, "latencyMsSum": 0, "latencyCount": 0})
+        return acc
+
+    grouped: dict[str, dict[str, Any]] = defaultdict(_empty)
+    totals = _empty()
+    for row in aggregates:
+        price = price_table.for_model(row["model"])
+        uncached = max(0, row["inputTokens"] - row["cachedTokens"])
+        savings = max(0.0, price.cost_usd(uncached, 0, 0) - price.cost_usd(uncached, uncached, 0))
+        for acc in (grouped[row["group"]], totals):
+            for key in (*_SUM_KEYS, "latencyMsSum", "latencyCount"):
+                acc[key] += row[key]
+            acc["costUsd"] += row["costUsd"]
+            acc["maxCacheSavingsUsd"] += savings
+            if row["model"] and row["model"] not in acc["models"]:
+                acc["models"].append(row["model"])
+
+    rows = [{"group": group_key, **_finish_row(acc)} for group_key, acc in grouped.items()]
+    rows.sort(key=lambda row: (-row["costUsd"], -row["totalTokens"], row["group"]))
+    for row in rows:
+        row["models"].sort()
+    totals = _finish_row(totals)
+    totals["models"].sort()
+    return {"groupBy": group_by, "rows": rows, "totals": totals}
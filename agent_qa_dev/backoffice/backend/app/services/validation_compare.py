@@ -1,16 +1,35 @@
 from __future__ import annotations
 
 import json
-from typing import Optional
+from collections import defaultdict
+from typing import Any, Optional
 
+import numpy as np
+
+from app.core.data_version import QUERIES_SCOPE, run_scope
+from app.core.singleflight import derived_results
 from app.repositories.validation_runs import ValidationRunRepository
 
+COMPARE_MODE_EXACT = "exact"
+COMPARE_MODE_SIGNIFICANCE = "significance"
+COMPARE_MODES = (COMPARE_MODE_EXACT, COMPARE_MODE_SIGNIFICANCE)
+
+SIGNIFICANCE_DEFAULT_CONFIDENCE = 0.95
+SIGNIFICANCE_DEFAULT_RESAMPLES = 2000
+SIGNIFICANCE_MIN_SAMPLES = 2
+# Upper bound of resampled values drawn at once (rows x resamples x samples).
+_BOOTSTRAP_CHUNK_ELEMENTS = 2_000_000
+
 
 def _build_key(item) -> str:
     return f"{item.conversation_room_index}:{item.repeat_index}:{item.query_text_snapshot}"
 
 
-def compare_validation_runs(repo: ValidationRunRepository, run_id: str, base_run_id: Optional[str] = None) -> dict:
+def _build_query_key(item) -> str:
+    return str(item.query_id or item.query_text_snapshot or "")
+
+
+def _resolve_compare_runs(repo: ValidationRunRepository, run_id: str, base_run_id: Optional[str]):
     run = repo.get_run(run_id)
     if run is None:
         raise ValueError("Run not found")
@@ -20,12 +39,16 @@ def compare_validation_runs(repo: ValidationRunRepository, run_id: str, base_run
     else:
         base_run = repo.latest_done_run_for_env(run.environment, exclude_run_id=run_id)
 
+    if base_run is not None and base_run.environment != run.environment:
+        raise PermissionError("Cross-environment comparison is not allowed")
+    return run, base_run
+
+
+def compare_validation_runs(repo: ValidationRunRepository, run_id: str, base_run_id: Optional[str] = None) -> dict:
+    run, base_run = _resolve_compare_runs(repo, run_id, base_run_id)
     if base_run is None:
         return {"baseRunId": None, "delta": {}, "changedRows": []}
 
-    if base_run.environment != run.environment:
-        raise PermissionError("Cross-environment comparison is not allowed")
-
     run_items = repo.list_items(run.id, limit=100000)
     base_items = repo.list_items(base_run.id, limit=100000)
     run_llm = repo.get_llm_eval_map([x.id for x in run_items])
@@ -84,6 +107,201 @@ def compare_validation_runs(repo: ValidationRunRepository, run_id: str, base_run
     }
 
 
+def _collect_score_samples(items: list[Any], llm_map: dict[str, Any]) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = defaultdict(list)
+    for item in items:
+        llm = llm_map.get(item.id)
+        if llm is None or not str(llm.status or "").upper().startswith("DONE"):
+            continue
+        if not isinstance(llm.total_score, (int, float)):
+            continue
+        query_key = _build_query_key(item)
+        if query_key:
+            samples[query_key].append(float(llm.total_score))
+    return samples
+
+
+def _bootstrap_means(samples_by_key: dict[str, list[float]], keys: list[str], resamples: int, rng) -> np.ndarray:
+    """Return a (len(keys), resamples) matrix of bootstrap sample means.
+
+    Keys sharing the same sample count are stacked and resampled together so each
+    bucket is one fancy-indexing pass instead of a Python loop per resample.
+    """
+    out = np.empty((len(keys), resamples), dtype=np.float64)
+    rows_by_size: dict[int, list[int]] = defaultdict(list)
+    for row_index, key in enumerate(keys):
+        rows_by_size[len(samples_by_key[key])].append(row_index)
+
+    for size, row_indexes in rows_by_size.items():
+        values = np.asarray([samples_by_key[keys[index]] for index in row_indexes], dtype=np.float64)
+        chunk = max(1, _BOOTSTRAP_CHUNK_ELEMENTS // max(1, resamples * size))
+        for start in range(0, len(row_indexes), chunk):
+            block = values[start : start + chunk]
+            picks = rng.integers(0, size, size=(block.shape[0], resamples, size))
+            resampled = block[np.arange(block.shape[0])[:, None, None], picks]
+            out[row_indexes[start : start + chunk]] = resampled.mean(axis=2)
+    return out
+
+
+def _summarize_delta(observed: float, deltas: np.ndarray, alpha: float) -> dict[str, float]:
+    ci_low, ci_high = np.quantile(deltas, [alpha / 2.0, 1.0 - alpha / 2.0])
+    return {
+        "delta": round(float(observed), 4),
+        "ciLow": round(float(ci_low), 4),
+        "ciHigh": round(float(ci_high), 4),
+        # One-sided bootstrap p-value for "current is not worse than base".
+        "pValue": round(float(np.mean(deltas >= 0.0)), 4),
+    }
+
+
+def compare_validation_runs_significance(
+    repo: ValidationRunRepository,
+    run_id: str,
+    base_run_id: Optional[str] = None,
+    *,
+    confidence: float = SIGNIFICANCE_DEFAULT_CONFIDENCE,
+    resamples: int = SIGNIFICANCE_DEFAULT_RESAMPLES,
+    min_delta: float = 0.0,
+    seed: int = 0,
+) -> dict:
+    if not 0.5 <= float(confidence) < 1.0:
+        raise ValueError("confidence must be in [0.5, 1.0)")
+    resamples = max(100, int(resamples))
+    run, base_run = _resolve_compare_runs(repo, run_id, base_run_id)
+    if base_run is None:
+        return {
+            "baseRunId": None,
+            "mode": COMPARE_MODE_SIGNIFICANCE,
+            "delta": {},
+            "changedRows": [],
+            "groupRegressions": [],
+        }
+
+    run_items = repo.list_items(run.id, limit=100000)
+    base_items = repo.list_items(base_run.id, limit=100000)
+    current_samples = _collect_score_samples(run_items, repo.get_llm_eval_map([x.id for x in run_items]))
+    base_samples = _collect_score_samples(base_items, repo.get_llm_eval_map([x.id for x in base_items]))
+
+    query_text_by_key: dict[str, str] = {}
+    query_id_by_key: dict[str, Optional[str]] = {}
+    for item in run_items:
+        query_key = _build_query_key(item)
+        query_text_by_key.setdefault(query_key, item.query_text_snapshot)
+        query_id_by_key.setdefault(query_key, item.query_id)
+
+    eligible_keys = [
+        key
+        for key in current_samples
+        if len(current_samples[key]) >= SIGNIFICANCE_MIN_SAMPLES
+        and len(base_samples.get(key, [])) >= SIGNIFICANCE_MIN_SAMPLES
+    ]
+    insufficient_count = len(set(current_samples) | set(base_samples)) - len(eligible_keys)
+    alpha = 1.0 - float(confidence)
+
+    changed_rows: list[dict[str, Any]] = []
+    group_regressions: list[dict[str, Any]] = []
+    significant_improvements = 0
+    if eligible_keys:
+        rng = np.random.default_rng(seed)
+        current_means = np.asarray([np.mean(current_samples[key]) for key in eligible_keys])
+        base_means = np.asarray([np.mean(base_samples[key]) for key in eligible_keys])
+        observed = current_means - base_means
+        deltas = _bootstrap_means(current_samples, eligible_keys, resamples, rng) - _bootstrap_means(
+            base_samples, eligible_keys, resamples, rng
+        )
+        bounds = np.quantile(deltas, [alpha / 2.0, 1.0 - alpha / 2.0], axis=1)
+        significant_improvements = int(np.sum(bounds[0] > 0.0))
+
+        for row_index, key in enumerate(eligible_keys):
+            if not (bounds[1][row_index] < 0.0 and observed[row_index] <= -float(min_delta)):
+                continue
+            changed_rows.append(
+                {
+                    "key": key,
+                    "type": "REGRESSION",
+                    "queryId": query_id_by_key.get(key),
+                    "queryText": query_text_by_key.get(key, key),
+                    "current": {"mean": round(float(current_means[row_index]), 4), "sampleCount": len(current_samples[key])},
+                    "base": {"mean": round(float(base_means[row_index]), 4), "sampleCount": len(base_samples[key])},
+                    **_summarize_delta(observed[row_index], deltas[row_index], alpha),
+                }
+            )
+
+        query_ids = [query_id for key in eligible_keys if (query_id := query_id_by_key.get(key))]
+        query_to_group = repo.list_query_group_ids_by_query_ids(query_ids)
+        rows_by_group: dict[str, list[int]] = defaultdict(list)
+        for row_index, key in enumerate(eligible_keys):
+            group_id = query_to_group.get(str(query_id_by_key.get(key) or ""))
+            if group_id:
+                rows_by_group[group_id].append(row_index)
+        for group_id, row_indexes in rows_by_group.items():
+            # Stratified bootstrap: the group delta is the mean of per-query deltas.
+            group_deltas = deltas[row_indexes].mean(axis=0)
+            group_observed = float(observed[row_indexes].mean())
+            summary = _summarize_delta(group_observed, group_deltas, alpha)
+            if summary["ciHigh"] < 0.0 and group_observed <= -float(min_delta):
+                group_regressions.append({"groupId": group_id, "queryCount": len(row_indexes), **summary})
+
+    changed_rows.sort(key=lambda row: row["delta"])
+    group_regressions.sort(key=lambda row: row["delta"])
+    return {
+        "baseRunId": base_run.id,
+        "mode": COMPARE_MODE_SIGNIFICANCE,
+        "confidence": float(confidence),
+        "resamples": resamples,
+        "delta": {
+            "comparedQueries": len(eligible_keys),
+            "insufficientSampleQueries": insufficient_count,
+            "significantRegressions": len(changed_rows),
+            "significantImprovements": significant_improvements,
+        },
+        "changedRows": changed_rows,
+        "groupRegressions": group_regressions,
+    }
+
+
+def compare_validation_runs_cached(
+    repo: ValidationRunRepository,
+    run_id: str,
+    base_run_id: Optional[str] = None,
+    *,
+    mode: str = COMPARE_MODE_EXACT,
+    confidence: float = SIGNIFICANCE_DEFAULT_CONFIDENCE,
+    resamples: int = SIGNIFICANCE_DEFAULT_RESAMPLES,
+    min_delta: float = 0.0,
+) -> dict:
+    if mode not in COMPARE_MODES:
+        raise ValueError(f"Unsupported compare mode: {mode}")
+    run, base_run = _resolve_compare_runs(repo, run_id, base_run_id)
+    if base_run is None:
+        # Nothing to key on yet; a later DONE run in the environment becomes the base.
+        if mode == COMPARE_MODE_SIGNIFICANCE:
+            return compare_validation_runs_significance(repo, run.id, confidence=confidence, resamples=resamples, min_delta=min_delta)
+        return compare_validation_runs(repo, run.id)
+
+    scopes = [run_scope(run.id), run_scope(base_run.id)]
+    if mode == COMPARE_MODE_SIGNIFICANCE:
+        scopes.append(QUERIES_SCOPE)
+        key = ("validation-compare", mode, run.id, base_run.id, float(confidence), int(resamples), float(min_delta))
+        return derived_results.get_or_compute(
+            key,
+            scopes,
+            lambda: compare_validation_runs_significance(
+                repo,
+                run.id,
+                base_run_id=base_run.id,
+                confidence=confidence,
+                resamples=resamples,
+                min_delta=min_delta,
+            ),
+        )
+    return derived_results.get_or_compute(
+        ("validation-compare", mode, run.id, base_run.id),
+        scopes,
+        lambda: compare_validation_runs(repo, run.id, base_run_id=base_run.id),
+    )
+
+
 def parse_metric_scores(value: str) -> dict[str, float]:
     if not value:
         return {}
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import datetime as dt
-import json
 from collections import defaultdict
 from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core import serialization
+from app.core.data_version import test_set_scope
+from app.core.singleflight import derived_results
 from app.models.validation_query import ValidationQuery
 from app.models.validation_run import ValidationRun
 from app.models.validation_run_item import ValidationRunItem
@@ -25,7 +27,7 @@ def _metric_scores(metric_scores_json: str) -> dict[str, float]:
     if not metric_scores_json:
         return {}
     try:
-        payload = json.loads(metric_scores_json)
+        payload = serialization.loads(metric_scores_json)
     except Exception:
         return {}
 
@@ -369,3 +371,18 @@ def build_test_set_dashboard(
         "scoring": scoring,
         "distributions": distributions,
     }
+
+
+def build_test_set_dashboard_cached(
+    db: Session,
+    test_set_id: str,
+    *,
+    run_id: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> dict[str, Any]:
+    return derived_results.get_or_compute(
+        ("test-set-dashboard", test_set_id, run_id or "", date_from or "", date_to or ""),
+        [test_set_scope(test_set_id)],
+        lambda: build_test_set_dashboard(db, test_set_id, run_id=run_id, date_from=date_from, date_to=date_to),
+    )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Optional
+
+from app.core import serialization
+from app.core.run_events import RunEvent, RunEventBus, run_events
+
+SSE_HEARTBEAT_SEC = 15.0
+SSE_RETRY_MS = 3000
+
+
+def parse_last_event_id(raw_value: Optional[str]) -> Optional[int]:
+    text = str(raw_value or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = int(text)
+    except ValueError:
+        return None
+    return parsed if parsed >= 0 else None
+
+
+def format_sse_event(event: RunEvent) -> str:
+    payload = serialization.dumps({"runId": event.run_id, "type": event.type, "createdAt": event.created_at, **event.data})
+    return f"id: {event.id}\nevent: {event.type}\ndata: {payload}\n\n"
+
+
+async def stream_run_events(
+    run_id: str,
+    *,
+    last_event_id: Optional[int] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    bus: RunEventBus = run_events,
+    heartbeat_sec: float = SSE_HEARTBEAT_SEC,
+) -> AsyncIterator[str]:
+    subscriber, backlog = bus.subscribe(run_id, last_event_id)
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        for event in backlog:
+            yield format_sse_event(event)
+        while True:
+            if is_disconnected is not None and await is_disconnected():
+                return
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat_sec)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse_event(event)
+    finally:
+        bus.unsubscribe(run_id, subscriber)
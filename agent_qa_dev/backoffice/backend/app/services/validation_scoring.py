@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import json
 import math
 import re
 from collections import defaultdict
+from collections.abc import Callable, Sequence
+from functools import lru_cache
 from typing import Any, Optional
 
+from app.core import serialization
+from app.lib.aqb_consistency import ConsistencyEngine
 
 AQB_SCHEMA_VERSION = "aqb.v1"
 AQB_RUBRIC_VERSION = "2026-02-24.v1"
@@ -29,7 +32,7 @@ def _parse_json_like(value: Any) -> Any:
     if not text:
         return None
     try:
-        return json.loads(text)
+        return serialization.loads(text)
     except Exception:
         return None
 
@@ -266,7 +269,7 @@ def parse_raw_payload(raw_json: str) -> tuple[dict[str, Any], bool]:
     if not text:
         return {}, False
     try:
-        payload = json.loads(text)
+        payload = serialization.loads(text)
     except Exception:
         return {}, False
     if not isinstance(payload, dict):
@@ -359,7 +362,8 @@ def ratio_to_score(ratio: float) -> float:
     return 0.0
 
 
-def _path_tokens(path: str) -> list[str]:
+@lru_cache(maxsize=4096)
+def _path_tokens(path: str) -> tuple[str, ...]:
     tokens: list[str] = []
     for segment in str(path or "").split("."):
         for match in _PATH_TOKEN_PATTERN.finditer(segment):
@@ -367,7 +371,28 @@ def _path_tokens(path: str) -> list[str]:
             if token is None:
                 continue
             tokens.append(token)
-    return tokens
+    return tuple(tokens)
+
+
+def _path_step(values: list[Any], token: str) -> list[Any]:
+    next_values: list[Any] = []
+    if token == "*":
+        for value in values:
+            if isinstance(value, list):
+                next_values.extend(value)
+        return next_values
+
+    if token.isdigit():
+        index = int(token)
+        for value in values:
+            if isinstance(value, list) and 0 <= index < len(value):
+                next_values.append(value[index])
+        return next_values
+
+    for value in values:
+        if isinstance(value, dict) and token in value:
+            next_values.append(value[token])
+    return next_values
 
 
 def extract_path_values(payload: Any, path: str) -> list[Any]:
@@ -376,26 +401,7 @@ def extract_path_values(payload: Any, path: str) -> list[Any]:
         return []
     current: list[Any] = [payload]
     for token in tokens:
-        next_values: list[Any] = []
-        if token == "*":
-            for value in current:
-                if isinstance(value, list):
-                    next_values.extend(value)
-            current = next_values
-            continue
-
-        if token.isdigit():
-            index = int(token)
-            for value in current:
-                if isinstance(value, list) and 0 <= index < len(value):
-                    next_values.append(value[index])
-            current = next_values
-            continue
-
-        for value in current:
-            if isinstance(value, dict) and token in value:
-                next_values.append(value[token])
-        current = next_values
+        current = _path_step(current, token)
     return current
 
 
@@ -428,89 +434,181 @@ def _in(actual: Any, expected: Any) -> bool:
     return any(_equals(actual, item) for item in expected)
 
 
-def _regex(actual: Any, expected: Any) -> bool:
-    pattern = _safe_text(expected)
-    if not pattern:
-        return False
+@lru_cache(maxsize=1024)
+def _compile_regex(pattern: str) -> Optional[re.Pattern[str]]:
     try:
-        return re.search(pattern, _safe_text(actual)) is not None
+        return re.compile(pattern)
     except re.error:
-        return False
-
-
-def evaluate_accuracy_checks(raw_payload: dict[str, Any], checks: list[Any]) -> dict[str, Any]:
-    valid_checks: list[dict[str, Any]] = []
-    for check in checks:
-        if not isinstance(check, dict):
-            continue
-        path = _safe_text(check.get("path"))
-        op = _safe_text(check.get("op")).lower()
-        if not path or not op:
-            continue
-        weight = _normalize_number(check.get("weight"))
-        valid_checks.append(
-            {
-                "path": path,
-                "op": op,
-                "value": check.get("value"),
-                "weight": weight if weight is not None and weight > 0 else 1.0,
-            }
-        )
+        return None
 
-    if not valid_checks:
-        return {
-            "hasChecks": False,
-            "score": None,
-            "passRatio": None,
-            "passedWeight": 0.0,
-            "totalWeight": 0.0,
-            "failedChecks": [],
-        }
 
-    passed_weight = 0.0
-    total_weight = 0.0
-    failed_checks: list[dict[str, Any]] = []
-
-    for check in valid_checks:
-        path = check["path"]
-        op = check["op"]
-        expected_value = check.get("value")
-        weight = float(check["weight"])
-        values = extract_path_values(raw_payload, path)
-        total_weight += weight
-
-        passed = False
-        if op == "exists":
-            passed = any(value is not None and (_safe_text(value) != "" or isinstance(value, (dict, list))) for value in values)
-        elif op == "eq":
-            passed = any(_equals(value, expected_value) for value in values)
-        elif op == "contains":
-            passed = any(_contains(value, expected_value) for value in values)
-        elif op == "in":
-            passed = any(_in(value, expected_value) for value in values)
-        elif op == "regex":
-            passed = any(_regex(value, expected_value) for value in values)
-
-        if passed:
-            passed_weight += weight
-        else:
-            failed_checks.append(
+def _regex(actual: Any, expected: Any) -> bool:
+    pattern = _safe_text(expected)
+    if not pattern:
+        return False
+    compiled = _compile_regex(pattern)
+    return compiled is not None and compiled.search(_safe_text(actual)) is not None
+
+
+class _ExpectedValue:
+    """An ``eq`` operand normalized once, so ``matches`` only normalizes the actual value."""
+
+    __slots__ = ("number", "flag", "text")
+
+    def __init__(self, expected: Any):
+        self.number = _normalize_number(expected)
+        self.flag = _normalize_bool(expected)
+        self.text = _safe_text(expected)
+
+    def matches(self, actual: Any) -> bool:
+        if self.number is not None:
+            actual_number = _normalize_number(actual)
+            if actual_number is not None:
+                return abs(actual_number - self.number) < 1e-9
+        if self.flag is not None:
+            actual_bool = _normalize_bool(actual)
+            if actual_bool is not None:
+                return actual_bool == self.flag
+        return _safe_text(actual) == self.text
+
+
+def _compile_predicate(op: str, expected: Any) -> Callable[[Any], bool]:
+    """Same semantics as the ``_equals``/``_contains``/``_in``/``_regex`` helpers for one value."""
+    if op == "exists":
+        return lambda value: value is not None and (_safe_text(value) != "" or isinstance(value, (dict, list)))
+    if op == "eq":
+        return _ExpectedValue(expected).matches
+    if op == "contains":
+        expected_text = _safe_text(expected)
+        if not expected_text:
+            return lambda value: False
+        item_matches = _ExpectedValue(expected).matches
+
+        def _contains_value(value: Any) -> bool:
+            if isinstance(value, list):
+                return any(item_matches(item) for item in value)
+            return expected_text in _safe_text(value)
+
+        return _contains_value
+    if op == "in":
+        if not isinstance(expected, list):
+            return lambda value: False
+        options = [_ExpectedValue(item) for item in expected]
+        return lambda value: any(option.matches(value) for option in options)
+    if op == "regex":
+        pattern = _safe_text(expected)
+        compiled = _compile_regex(pattern) if pattern else None
+        if compiled is None:
+            return lambda value: False
+        return lambda value: compiled.search(_safe_text(value)) is not None
+    return lambda value: False
+
+
+class _PathNode:
+    __slots__ = ("children", "check_indexes")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _PathNode] = {}
+        self.check_indexes: list[int] = []
+
+
+class CompiledAccuracyChecks:
+    """A query group's ``accuracyChecks`` compiled once and reused for every item.
+
+    Paths are tokenized once into a prefix tree, so checks sharing a prefix (``dataUIList[*].uiValue``)
+    walk it once per payload; operands are normalized and regexes compiled at compile time.
+    ``evaluate`` returns the same result as the interpreted ``evaluate_accuracy_checks`` did.
+    """
+
+    def __init__(self, checks: Sequence[Any]):
+        self.checks: list[dict[str, Any]] = []
+        self._predicates: list[Callable[[Any], bool]] = []
+        self._root = _PathNode()
+        for check in checks:
+            if not isinstance(check, dict):
+                continue
+            path = _safe_text(check.get("path"))
+            op = _safe_text(check.get("op")).lower()
+            if not path or not op:
+                continue
+            weight = _normalize_number(check.get("weight"))
+            index = len(self.checks)
+            self.checks.append(
                 {
                     "path": path,
                     "op": op,
-                    "value": expected_value,
+                    "value": check.get("value"),
+                    "weight": weight if weight is not None and weight > 0 else 1.0,
                 }
             )
+            self._predicates.append(_compile_predicate(op, check.get("value")))
+            tokens = _path_tokens(path)
+            if not tokens:
+                # Matches nothing, like extract_path_values on a path without tokens.
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.children.setdefault(token, _PathNode())
+            node.check_indexes.append(index)
+        self.total_weight = sum(float(check["weight"]) for check in self.checks)
+
+    @property
+    def has_checks(self) -> bool:
+        return bool(self.checks)
+
+    def _walk(self, node: _PathNode, values: list[Any], out: list[list[Any]]) -> None:
+        for token, child in node.children.items():
+            next_values = _path_step(values, token)
+            if not next_values:
+                continue
+            for index in child.check_indexes:
+                out[index] = next_values
+            if child.children:
+                self._walk(child, next_values, out)
+
+    def evaluate(self, raw_payload: Any) -> dict[str, Any]:
+        if not self.checks:
+            return {
+                "hasChecks": False,
+                "score": None,
+                "passRatio": None,
+                "passedWeight": 0.0,
+                "totalWeight": 0.0,
+                "failedChecks": [],
+            }
 
-    ratio = (passed_weight / total_weight) if total_weight > 0 else 0.0
-    return {
-        "hasChecks": True,
-        "score": ratio_to_score(ratio),
-        "passRatio": ratio,
-        "passedWeight": passed_weight,
-        "totalWeight": total_weight,
-        "failedChecks": failed_checks,
-    }
+        values_by_check: list[list[Any]] = [[] for _ in self.checks]
+        self._walk(self._root, [raw_payload], values_by_check)
+
+        passed_weight = 0.0
+        total_weight = 0.0
+        failed_checks: list[dict[str, Any]] = []
+        for check, predicate, values in zip(self.checks, self._predicates, values_by_check):
+            weight = float(check["weight"])
+            total_weight += weight
+            if any(predicate(value) for value in values):
+                passed_weight += weight
+            else:
+                failed_checks.append({"path": check["path"], "op": check["op"], "value": check["value"]})
+
+        ratio = (passed_weight / total_weight) if total_weight > 0 else 0.0
+        return {
+            "hasChecks": True,
+            "score": ratio_to_score(ratio),
+            "passRatio": ratio,
+            "passedWeight": passed_weight,
+            "totalWeight": total_weight,
+            "failedChecks": failed_checks,
+        }
+
+
+def compile_accuracy_checks(checks: Sequence[Any]) -> CompiledAccuracyChecks:
+    return CompiledAccuracyChecks(checks)
+
+
+def evaluate_accuracy_checks(raw_payload: dict[str, Any], checks: list[Any]) -> dict[str, Any]:
+    """Scores one payload; compile with ``compile_accuracy_checks`` once when scoring many items."""
+    return CompiledAccuracyChecks(checks).evaluate(raw_payload)
 
 
 def metric_value(metric_scores: dict[str, Any], metric_name: str) -> Optional[float]:
@@ -542,7 +640,27 @@ def score_bucket(score: Optional[float]) -> Optional[str]:
     return str(int(max(0, min(5, round(score)))))
 
 
-def build_consistency_summary(records: list[dict[str, Any]]) -> dict[str, Any]:
+def _build_response_consistency(
+    grouped: dict[str, list[dict[str, Any]]],
+    engine: Optional[ConsistencyEngine],
+) -> dict[str, Any]:
+    """Scores repeated responses of each query with the shared consistency engine (tokenized once per text)."""
+    engine = engine or ConsistencyEngine()
+    scores: list[float] = []
+    for rows in grouped.values():
+        summary = engine.summarize([_safe_text(row.get("responseText")) for row in rows])
+        if summary is not None:
+            scores.append(float(summary["score"]))
+    if not scores:
+        return {"status": "PENDING", "score": None, "eligibleQueryCount": 0}
+    return {"status": "READY", "score": round(sum(scores) / len(scores), 4), "eligibleQueryCount": len(scores)}
+
+
+def build_consistency_summary(
+    records: list[dict[str, Any]],
+    *,
+    engine: Optional[ConsistencyEngine] = None,
+) -> dict[str, Any]:
     grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
     for record in records:
         query_key = _safe_text(record.get("queryKey"))
@@ -566,12 +684,14 @@ def build_consistency_summary(records: list[dict[str, Any]]) -> dict[str, Any]:
         if all(pass_flags) or not any(pass_flags):
             consistent_count += 1
 
+    response_consistency = _build_response_consistency(grouped, engine)
     if eligible_count == 0:
         return {
             "status": "PENDING",
             "score": None,
             "eligibleQueryCount": 0,
             "consistentQueryCount": 0,
+            "responseConsistency": response_consistency,
         }
 
     score = 5.0 * (consistent_count / eligible_count)
@@ -580,4 +700,5 @@ def build_consistency_summary(records: list[dict[str, Any]]) -> dict[str, Any]:
         "score": round(score, 4),
         "eligibleQueryCount": eligible_count,
         "consistentQueryCount": consistent_count,
+        "responseConsistency": response_consistency,
     }
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+from collections import defaultdict
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.enums import Environment
+from app.models.prompt_snapshot import PromptSnapshot
+from app.repositories.validation_worker_latencies import GROUP_COLUMNS, ValidationWorkerLatencyRepository
+from app.services.validation_scoring import parse_raw_payload
+
+GROUP_BY_VALUES = ("none", *GROUP_COLUMNS)
+
+
+def _to_ms(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        ms = float(value)
+    except (TypeError, ValueError):
+        return None
+    return ms if ms >= 0 else None
+
+
+def extract_worker_latencies(worker_ms_map: Any) -> list[tuple[str, int, float]]:
+    """Splits workerMsMap keys (``TYPE#index``) into (worker_type, index, ms) rows."""
+    if not isinstance(worker_ms_map, dict):
+        return []
+    rows: list[tuple[str, int, float]] = []
+    for key, value in worker_ms_map.items():
+        ms = _to_ms(value)
+        worker_type, separator, index_text = str(key).rpartition("#")
+        if not separator:
+            worker_type, index_text = str(key), "0"
+        worker_type = worker_type.strip()
+        if ms is None or not worker_type:
+            continue
+        try:
+            worker_index = int(index_text)
+        except ValueError:
+            worker_index = 0
+        rows.append((worker_type, worker_index, ms))
+    return rows
+
+
+def extract_worker_latencies_from_raw_json(raw_json: str) -> list[tuple[str, int, float]]:
+    payload, ok = parse_raw_payload(raw_json)
+    if not ok:
+        return []
+    rows = extract_worker_latencies(payload.get("workerMsMap"))
+    if rows or not isinstance(payload.get("worker"), list):
+        return rows
+    # Older rows only kept the raw worker list; rebuild the same TYPE#index numbering from it.
+    seen: dict[str, int] = defaultdict(int)
+    for worker in payload["worker"]:
+        if not isinstance(worker, dict):
+            continue
+        worker_type = str(worker.get("type") or "").strip()
+        ms = _to_ms(worker.get("ms") or 0)
+        if not worker_type or ms is None:
+            continue
+        rows.append((worker_type, seen[worker_type], ms))
+        seen[worker_type] += 1
+    return rows
+
+
+def prompt_version_label(prompt: str) -> str:
+    text = str(prompt or "")
+    if not text.strip():
+        return ""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+def load_prompt_versions(db: Session, environment: Environment) -> dict[str, str]:
+    """Short hash of each worker's current prompt snapshot, used as its prompt version."""
+    rows = (
+        db.query(PromptSnapshot.worker_type, PromptSnapshot.current_prompt)
+        .filter(PromptSnapshot.environment == environment)
+        .all()
+    )
+    return {str(worker_type): prompt_version_label(prompt) for worker_type, prompt in rows}
+
+
+def backfill_worker_latencies(db: Session, *, run_id: Optional[str] = None) -> dict[str, int]:
+    """Re-extracts worker rows from stored raw_json for items executed before the table existed.
+
+    The prompt version active at execution time is unknown for those rows, so it stays empty.
+    """
+    repo = ValidationWorkerLatencyRepository(db)
+    run_ids: set[str] = set()
+    item_count = 0
+    row_count = 0
+    for item, run in repo.list_executed_items(run_id):
+        rows = extract_worker_latencies_from_raw_json(item.raw_json)
+        row_count += repo.replace_for_item(
+            item.id,
+            run_id=run.id,
+            environment=run.environment,
+            workers=rows,
+            prompt_versions={},
+            executed_at=item.executed_at,
+        )
+        run_ids.add(run.id)
+        item_count += 1
+    return {"runs": len(run_ids), "items": item_count, "rows": row_count}
+
+
+def _parse_date(value: Optional[str], *, name: str) -> Optional[dt.date]:
+    text = (value or "").strip()
+    if not text:
+        return None
+    try:
+        return dt.date.fromisoformat(text)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be YYYY-MM-DD") from exc
+
+
+def _latency_stats(values: list[float]) -> dict[str, Any]:
+    ordered = sorted(values)
+    last = len(ordered) - 1
+
+    def _at(q: float) -> float:
+        return round(ordered[int(round(last * q))], 3)
+
+    return {
+        "count": len(ordered),
+        "avgMs": round(sum(ordered) / len(ordered), 3),
+        "p50Ms": _at(0.50),
+        "p95Ms": _at(0.95),
+        "p99Ms": _at(0.99),
+        "maxMs": round(ordered[-1], 3),
+    }
+
+
+def build_worker_latency_report(
+    db: Session,
+    *,
+    group_by: str = "none",
+    environment: Optional[Environment] = None,
+    run_ids: Optional[list[str]] = None,
+    worker_types: Optional[list[str]] = None,
+    prompt_version: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> dict[str, Any]:
+    if group_by not in GROUP_BY_VALUES:
+        raise ValueError(f"groupBy must be one of {', '.join(GROUP_BY_VALUES)}")
+    start = _parse_date(date_from, name="dateFrom")
+    end = _parse_date(date_to, name="dateTo")
+    samples = ValidationWorkerLatencyRepository(db).fetch_latency_columns(
+        group_by=None if group_by == "none" else group_by,
+        environment=environment,
+        run_ids=run_ids,
+        worker_types=worker_types,
+        prompt_version=prompt_version,
+        date_from=dt.datetime.combine(start, dt.time.min) if start else None,
+        date_to=dt.datetime.combine(end + dt.timedelta(days=1), dt.time.min) if end else None,
+    )
+
+    grouped: dict[tuple[str, str], list[float]] = defaultdict(list)
+    for worker_type, group_key, latency_ms in samples:
+        grouped[(worker_type, str(group_key))].append(latency_ms)
+
+    rows = []
+    for (worker_type, group_key), values in sorted(grouped.items()):
+        row: dict[str, Any] = {"workerType": worker_type}
+        if group_by != "none":
+            row["group"] = group_key
+        row.update(_latency_stats(values))
+        rows.append(row)
+    return {"groupBy": group_by, "sampleCount": len(samples), "rows": rows}
+
+
+def compare_worker_latency(db: Session, *, base_run_id: str, run_id: str) -> dict[str, Any]:
+    """Per-worker p50/p95/p99 of two runs, largest p95 regression first."""
+    samples = ValidationWorkerLatencyRepository(db).fetch_latency_columns(group_by="run", run_ids=[base_run_id, run_id])
+    by_worker: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    for worker_type, sample_run_id, latency_ms in samples:
+        by_worker[worker_type][sample_run_id].append(latency_ms)
+
+    rows = []
+    for worker_type, runs in by_worker.items():
+        base = _latency_stats(runs[base_run_id]) if runs.get(base_run_id) else None
+        current = _latency_stats(runs[run_id]) if runs.get(run_id) else None
+        row: dict[str, Any] = {"workerType": worker_type, "base": base, "current": current}
+        for key in ("p50Ms", "p95Ms", "p99Ms"):
+            delta_key = "delta" + key[0].upper() + key[1:]
+            row[delta_key] = round(current[key] - base[key], 3) if base and current else None
+        rows.append(row)
+    rows.sort(key=lambda row: (row["deltaP95Ms"] is None, -(row["deltaP95Ms"] or 0.0), row["workerType"]))
+    return {"baseRunId": base_run_id, "runId": run_id, "rows": rows}
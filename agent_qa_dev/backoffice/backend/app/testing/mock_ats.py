@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from aiohttp import web
+
+from app.lib.aqb_orchestrator_client import QUERY_PATH, SSE_SUBSCRIBE_PATH, SYNC_TEST_PATH
+
+STATS_PATH = "/__mock/stats"
+
+DEFAULT_WORKERS = ("ORCHESTRATOR_WORKER_V3", "RESUME_WORKER_V3")
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Latency in milliseconds: ``fixed:200``, ``uniform:100-400`` or ``lognormal:300,1500`` (median, p99)."""
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        text = str(spec or "").strip()
+        kind, _, args = text.partition(":")
+        kind = kind.strip().lower()
+        try:
+            if kind == "fixed":
+                return cls("fixed", float(args))
+            if kind == "uniform":
+                low, _, high = args.partition("-")
+                return cls("uniform", float(low), float(high))
+            if kind == "lognormal":
+                median, _, p99 = args.partition(",")
+                return cls("lognormal", float(median), float(p99 or median))
+        except ValueError as exc:
+            raise ValueError(f"invalid latency spec: {text}") from exc
+        raise ValueError(f"invalid latency spec: {text}")
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(min(self.a, self.b), max(self.a, self.b))
+        if self.kind == "lognormal":
+            median = max(self.a, 0.001)
+            # p99 = median * exp(2.326 * sigma)
+            sigma = max(0.0, math.log(max(self.b, median) / median) / 2.326)
+            return rng.lognormvariate(math.log(median), sigma)
+        return max(0.0, self.a)
+
+
+@dataclass
+class MockAtsConfig:
+    """Behaviour of the stand-in ATS orchestrator. Every random choice is derived from ``seed``
+    and the user message, so a run is reproducible regardless of request arrival order."""
+
+    seed: int = 0
+    workers: tuple[str, ...] = DEFAULT_WORKERS
+    worker_latency: LatencyDistribution = field(default_factory=lambda: LatencyDistribution("fixed", 50.0))
+    worker_latency_by_type: dict[str, LatencyDistribution] = field(default_factory=dict)
+    query_latency: LatencyDistribution = field(default_factory=lambda: LatencyDistribution("fixed", 10.0))
+    error_rate: float = 0.0
+    error_status: int = 503
+    hang_rate: float = 0.0
+    hang_sec: float = 300.0
+    heartbeat_interval_sec: float = 5.0
+    heartbeat_stall_rate: float = 0.0
+    sse_drop_rate: float = 0.0
+    ui_rows: int = 3
+    # Multiplies every simulated delay; 0 serves as fast as possible while still reporting worker ms.
+    time_scale: float = 1.0
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.requests: dict[str, int] = defaultdict(int)
+        self.injected: dict[str, int] = defaultdict(int)
+        self.open_streams = 0
+        self.max_open_streams = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": dict(self.requests),
+            "injected": dict(self.injected),
+            "openStreams": self.open_streams,
+            "maxOpenStreams": self.max_open_streams,
+            "inFlight": self.in_flight,
+            "maxInFlight": self.max_in_flight,
+        }
+
+
+class MockAtsBehaviour:
+    """Payload builders and fault injection shared by the HTTP handlers."""
+
+    def __init__(self, config: MockAtsConfig):
+        self.config = config
+        self.stats = _Stats()
+        self._message_counts: dict[str, int] = defaultdict(int)
+        self._conversations: dict[str, asyncio.Queue] = {}
+
+    def rng_for(self, message: str) -> random.Random:
+        self._message_counts[message] += 1
+        return random.Random(f"{self.config.seed}:{message}:{self._message_counts[message]}")
+
+    async def sleep_ms(self, ms: float) -> None:
+        scaled = ms * self.config.time_scale / 1000.0
+        if scaled > 0:
+            await asyncio.sleep(scaled)
+
+    def conversation_queue(self, conversation_id: str) -> asyncio.Queue:
+        queue = self._conversations.get(conversation_id)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._conversations[conversation_id] = queue
+        return queue
+
+    def fault(self, rng: random.Random) -> str:
+        """Returns "error", "hang" or "" for one request."""
+        roll = rng.random()
+        if roll < self.config.error_rate:
+            return "error"
+        if roll < self.config.error_rate + self.config.hang_rate:
+            return "hang"
+        return ""
+
+    def build_workers(self, message: str, rng: random.Random) -> list[dict[str, Any]]:
+        workers = list(self.config.workers) or list(DEFAULT_WORKERS)
+        rows: list[dict[str, Any]] = []
+        for index, worker_type in enumerate(workers):
+            distribution = self.config.worker_latency_by_type.get(worker_type, self.config.worker_latency)
+            ms = round(distribution.sample_ms(rng), 1)
+            if index + 1 < len(workers):
+                output: dict[str, Any] = {"subWorker": workers[index + 1]}
+            else:
+                output = self.build_assistant(message)
+            rows.append({"type": worker_type, "ms": ms, "output": output})
+        return rows
+
+    def build_assistant(self, message: str) -> dict[str, Any]:
+        return {
+            "assistantMessage": f"[mock] {message}",
+            "dataUIList": [
+                {"uiType": "TABLE", "uiValue": {"row": row, "name": f"지원자{row}", "buttonUrl": f"/mock/{row}"}}
+                for row in range(max(0, int(self.config.ui_rows)))
+            ],
+            "guideList": [],
+        }
+
+    def enter(self) -> None:
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+
+    def leave(self) -> None:
+        self.stats.in_flight -= 1
+
+
+BEHAVIOUR_KEY = web.AppKey("behaviour", MockAtsBehaviour)
+TURN_TASKS_KEY = web.AppKey("turn_tasks", set)
+
+
+def _sse(event: str, data: Any = None) -> bytes:
+    if data is None:
+        return f"event:{event}\n\n".encode("utf-8")
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+    return f"event:{event}\ndata:{payload}\n\n".encode("utf-8")
+
+
+async def _read_payload(request: web.Request) -> dict[str, Any]:
+    try:
+        payload = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+async def _injected_failure(behaviour: MockAtsBehaviour, fault: str) -> Optional[web.Response]:
+    if fault == "error":
+        behaviour.stats.injected["error"] += 1
+        return web.json_response({"message": "mock injected error"}, status=behaviour.config.error_status)
+    if fault == "hang":
+        behaviour.stats.injected["hang"] += 1
+        await asyncio.sleep(behaviour.config.hang_sec)
+        return web.json_response({"message": "mock hang finished"}, status=504)
+    return None
+
+
+async def _handle_sync(request: web.Request) -> web.Response:
+    behaviour: MockAtsBehaviour = request.app[BEHAVIOUR_KEY]
+    behaviour.stats.requests["sync"] += 1
+    payload = await _read_payload(request)
+    message = str(payload.get("userMessage") or "")
+    rng = behaviour.rng_for(message)
+    behaviour.enter()
+    try:
+        failure = await _injected_failure(behaviour, behaviour.fault(rng))
+        if failure is not None:
+            return failure
+        workers = behaviour.build_workers(message, rng)
+        await behaviour.sleep_ms(sum(float(row["ms"]) for row in workers))
+        conversation_id = str(payload.get("conversationId") or "") or str(uuid.uuid4())
+        return web.json_response({"conversationId": conversation_id, "worker": workers})
+    finally:
+        behaviour.leave()
+
+
+async def _produce_turn(behaviour: MockAtsBehaviour, conversation_id: str, message: str, rng: random.Random) -> None:
+    queue = behaviour.conversation_queue(conversation_id)
+    workers = behaviour.build_workers(message, rng)
+    for row in workers:
+        await behaviour.sleep_ms(float(row["ms"]))
+        await queue.put(("CHAT_EXECUTION_PROCESS", {"messageSummary": row["type"], "workerType": row["type"], "ms": row["ms"]}))
+    drop = rng.random() < behaviour.config.sse_drop_rate
+    stall = not drop and rng.random() < behaviour.config.heartbeat_stall_rate
+    if drop:
+        behaviour.stats.injected["sse_drop"] += 1
+        await queue.put(("__close__", None))
+        return
+    if stall:
+        behaviour.stats.injected["heartbeat_stall"] += 1
+        await queue.put(("__stall__", None))
+        return
+    assistant = {
+        "messageType": "ASSISTANT",
+        "chatId": str(uuid.UUID(int=rng.getrandbits(128))),
+        "conversationId": conversation_id,
+        "assistant": workers[-1]["output"],
+    }
+    await queue.put(("CHAT", assistant))
+
+
+async def _handle_query(request: web.Request) -> web.Response:
+    behaviour: MockAtsBehaviour = request.app[BEHAVIOUR_KEY]
+    behaviour.stats.requests["query"] += 1
+    payload = await _read_payload(request)
+    message = str(payload.get("userMessage") or "")
+    rng = behaviour.rng_for(message)
+    behaviour.enter()
+    try:
+        failure = await _injected_failure(behaviour, behaviour.fault(rng))
+        if failure is not None:
+            return failure
+        await behaviour.sleep_ms(behaviour.config.query_latency.sample_ms(rng))
+        conversation_id = str(payload.get("conversationId") or "") or str(uuid.uuid4())
+        behaviour.conversation_queue(conversation_id)
+        task = asyncio.get_running_loop().create_task(_produce_turn(behaviour, conversation_id, message, rng))
+        request.app[TURN_TASKS_KEY].add(task)
+        task.add_done_callback(request.app[TURN_TASKS_KEY].discard)
+        return web.json_response({"conversationId": conversation_id})
+    finally:
+        behaviour.leave()
+
+
+async def _handle_subscribe(request: web.Request) -> web.StreamResponse:
+    behaviour: MockAtsBehaviour = request.app[BEHAVIOUR_KEY]
+    behaviour.stats.requests["subscribe"] += 1
+    conversation_id = str(request.query.get("conversationId") or "")
+    if not conversation_id:
+        return web.json_response({"message": "conversationId required"}, status=400)
+
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+    await response.prepare(request)
+    queue = behaviour.conversation_queue(conversation_id)
+    interval = max(0.01, behaviour.config.heartbeat_interval_sec * max(behaviour.config.time_scale, 0.001))
+    behaviour.stats.open_streams += 1
+    behaviour.stats.max_open_streams = max(behaviour.stats.max_open_streams, behaviour.stats.open_streams)
+    try:
+        await response.write(_sse("CONNECT", "connected"))
+        while True:
+            try:
+                name, data = await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                await response.write(_sse("HEARTBEAT"))
+                continue
+            if name == "__close__":
+                break
+            if name == "__stall__":
+                # Keep the socket open but silent so the client's heartbeat timeout fires.
+                await asyncio.sleep(behaviour.config.hang_sec)
+                break
+            await response.write(_sse(name, data))
+    except (ConnectionResetError, asyncio.CancelledError):
+        pass
+    finally:
+        behaviour.stats.open_streams -= 1
+    return response
+
+
+async def _handle_stats(request: web.Request) -> web.Response:
+    behaviour: MockAtsBehaviour = request.app[BEHAVIOUR_KEY]
+    return web.json_response(behaviour.stats.snapshot())
+
+
+async def _cancel_turn_tasks(app: web.Application) -> None:
+    for task in list(app[TURN_TASKS_KEY]):
+        task.cancel()
+
+
+def create_mock_ats_app(config: Optional[MockAtsConfig] = None) -> web.Application:
+    app = web.Application()
+    app[BEHAVIOUR_KEY] = MockAtsBehaviour(config or MockAtsConfig())
+    app[TURN_TASKS_KEY] = set()
+    app.router.add_post(SYNC_TEST_PATH, _handle_sync)
+    app.router.add_post(QUERY_PATH, _handle_query)
+    app.router.add_get(SSE_SUBSCRIBE_PATH, _handle_subscribe)
+    app.router.add_get(STATS_PATH, _handle_stats)
+    app.on_shutdown.append(_cancel_turn_tasks)
+    return app
+
+
+class MockAtsServer:
+    """Runs the mock on the current event loop; ``port=0`` picks a free port.
+
+    async with MockAtsServer(MockAtsConfig(seed=1)) as server:
+        client = ApplicantAgentClient(server.base_url, ...)
+    """
+
+    def __init__(self, config: Optional[MockAtsConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.app = create_mock_ats_app(config)
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return self.app[BEHAVIOUR_KEY].stats.snapshot()
+
+    async def start(self) -> "MockAtsServer":
+        self._runner = web.AppRunner(self.app, shutdown_timeout=0.5)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        sockets = getattr(site._server, "sockets", None) or []
+        if sockets:
+            self.port = int(sockets[0].getsockname()[1])
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockAtsServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
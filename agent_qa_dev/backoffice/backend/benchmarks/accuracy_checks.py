@@ -0,0 +1,211 @@
+"""
+Accuracy-check benchmark: interpreted walk per check vs. the compiled matcher.
+
+The interpreted reference below is the pre-compilation ``evaluate_accuracy_checks`` (path
+re-tokenized and payload walked once per check, regex compiled per call). Every result is
+asserted equal before timings are reported.
+
+    python benchmarks/accuracy_checks.py
+    python benchmarks/accuracy_checks.py --items 10000 --checks 20 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.validation_scoring import (  # noqa: E402
+    _PATH_TOKEN_PATTERN,
+    _contains,
+    _equals,
+    _in,
+    _normalize_number,
+    _safe_text,
+    compile_accuracy_checks,
+    ratio_to_score,
+)
+
+_CHECK_TEMPLATES = [
+    ("dataUIList[*].uiValue.formType", "eq", "APPLICANT_FILTER"),
+    ("dataUIList[*].uiValue.actionType", "eq", "OPEN"),
+    ("dataUIList[*].uiValue.value.dataKey", "eq", "applicant.list"),
+    ("dataUIList[*].uiValue.value.buttonKey", "in", ["list", "detail"]),
+    ("dataUIList[*].uiValue.buttonUrl", "contains", "dataKey="),
+    ("dataUIList[*].uiValue.multiSelectAllowYn", "eq", True),
+    ("dataUIList[0].uiValue.value.count", "eq", 12),
+    ("dataUIList[*].uiValue.value.filters[*].name", "contains", "경력"),
+    ("assistantMessage", "regex", r"\d+명"),
+    ("assistantMessage", "contains", "지원자"),
+    ("setting.filters", "contains", "서울"),
+    ("setting.period", "exists", None),
+    ("filterType", "in", ["AND", "OR"]),
+]
+
+
+def _legacy_path_tokens(path: str) -> list[str]:
+    tokens: list[str] = []
+    for segment in str(path or "").split("."):
+        for match in _PATH_TOKEN_PATTERN.finditer(segment):
+            token = match.group(1) if match.group(1) is not None else match.group(2)
+            if token is not None:
+                tokens.append(token)
+    return tokens
+
+
+def _legacy_extract(payload: Any, path: str) -> list[Any]:
+    tokens = _legacy_path_tokens(path)
+    if not tokens:
+        return []
+    current: list[Any] = [payload]
+    for token in tokens:
+        next_values: list[Any] = []
+        if token == "*":
+            for value in current:
+                if isinstance(value, list):
+                    next_values.extend(value)
+        elif token.isdigit():
+            index = int(token)
+            next_values = [v[index] for v in current if isinstance(v, list) and 0 <= index < len(v)]
+        else:
+            next_values = [v[token] for v in current if isinstance(v, dict) and token in v]
+        current = next_values
+    return current
+
+
+def _legacy_regex(actual: Any, expected: Any) -> bool:
+    pattern = _safe_text(expected)
+    if not pattern:
+        return False
+    try:
+        return re.search(pattern, _safe_text(actual)) is not None
+    except re.error:
+        return False
+
+
+def legacy_evaluate(raw_payload: dict[str, Any], checks: list[Any]) -> dict[str, Any]:
+    valid = []
+    for check in checks:
+        if not isinstance(check, dict):
+            continue
+        path = _safe_text(check.get("path"))
+        op = _safe_text(check.get("op")).lower()
+        if not path or not op:
+            continue
+        weight = _normalize_number(check.get("weight"))
+        weight = weight if weight is not None and weight > 0 else 1.0
+        valid.append({"path": path, "op": op, "value": check.get("value"), "weight": weight})
+    if not valid:
+        return {
+            "hasChecks": False,
+            "score": None,
+            "passRatio": None,
+            "passedWeight": 0.0,
+            "totalWeight": 0.0,
+            "failedChecks": [],
+        }
+    passed_weight = total_weight = 0.0
+    failed = []
+    for check in valid:
+        values = _legacy_extract(raw_payload, check["path"])
+        total_weight += check["weight"]
+        op, expected = check["op"], check["value"]
+        if op == "exists":
+            passed = any(v is not None and (_safe_text(v) != "" or isinstance(v, (dict, list))) for v in values)
+        else:
+            helper = {"eq": _equals, "contains": _contains, "in": _in, "regex": _legacy_regex}.get(op)
+            passed = helper is not None and any(helper(v, expected) for v in values)
+        if passed:
+            passed_weight += check["weight"]
+        else:
+            failed.append({"path": check["path"], "op": op, "value": expected})
+    ratio = passed_weight / total_weight if total_weight > 0 else 0.0
+    return {
+        "hasChecks": True,
+        "score": ratio_to_score(ratio),
+        "passRatio": ratio,
+        "passedWeight": passed_weight,
+        "totalWeight": total_weight,
+        "failedChecks": failed,
+    }
+
+
+def build_checks(count: int, rng: random.Random) -> list[dict[str, Any]]:
+    checks = []
+    for index in range(count):
+        path, op, value = _CHECK_TEMPLATES[index % len(_CHECK_TEMPLATES)]
+        if index >= len(_CHECK_TEMPLATES) and op == "eq" and isinstance(value, str):
+            value = f"{value}_{rng.randint(0, 3)}"
+        checks.append({"path": path, "op": op, "value": value, "weight": rng.choice([1, 1, 2])})
+    return checks
+
+
+def build_payload(rng: random.Random) -> dict[str, Any]:
+    return {
+        "assistantMessage": f"조건에 맞는 지원자는 {rng.randint(0, 300)}명입니다." if rng.random() < 0.8 else "오류",
+        "filterType": rng.choice(["AND", "OR", ""]),
+        "setting": {"filters": rng.sample(["서울", "경력 3년", "백엔드", "Java"], 2), "period": rng.choice(["3m", ""])},
+        "dataUIList": [
+            {
+                "uiValue": {
+                    "formType": rng.choice(["APPLICANT_FILTER", "APPLICANT_FILTER_1", "CHART"]),
+                    "actionType": rng.choice(["OPEN", "MOVE"]),
+                    "multiSelectAllowYn": rng.choice([True, False, "Y"]),
+                    "buttonUrl": f"/applicants?dataKey=applicant.list&page={rng.randint(1, 9)}",
+                    "value": {
+                        "dataKey": rng.choice(["applicant.list", "applicant.detail"]),
+                        "buttonKey": rng.choice(["list", "detail", "none"]),
+                        "count": rng.choice([12, 7, "12"]),
+                        "filters": [{"name": rng.choice(["경력", "지역", "학력"])} for _ in range(3)],
+                    },
+                }
+            }
+            for _ in range(rng.randint(1, 4))
+        ],
+    }
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Interpreted vs compiled accuracy checks.")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--checks", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    checks = build_checks(args.checks, rng)
+    payloads = [build_payload(rng) for _ in range(args.items)]
+
+    legacy_sec, expected = _best_of(lambda: [legacy_evaluate(p, checks) for p in payloads], args.repeat)
+    compile_sec, matcher = _best_of(lambda: compile_accuracy_checks(checks), args.repeat)
+    compiled_sec, actual = _best_of(lambda: [matcher.evaluate(p) for p in payloads], args.repeat)
+    assert actual == expected
+
+    print(f"items={args.items} checks={args.checks}")
+    print(f"{'mode':>22} {'total(ms)':>10} {'us/item':>9}")
+    print(f"{'interpreted':>22} {legacy_sec * 1000:>10.1f} {legacy_sec / args.items * 1e6:>9.1f}")
+    print(f"{'compiled (walk only)':>22} {compiled_sec * 1000:>10.1f} {compiled_sec / args.items * 1e6:>9.1f}")
+    print(f"compile once: {compile_sec * 1000:.3f} ms, speedup {legacy_sec / compiled_sec:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
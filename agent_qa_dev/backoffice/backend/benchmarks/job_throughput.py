@@ -0,0 +1,417 @@
+"""
+End-to-end throughput benchmark for the execute/evaluate jobs.
+
+Each (job, size) scenario runs in a fresh subprocess against its own SQLite test DB so that
+peak RSS and DB counters belong to that scenario only. ATS calls go to the local mock ATS
+server (app.testing.mock_ats) over HTTP; OpenAI judge calls are answered in-process.
+
+    python benchmarks/job_throughput.py --sizes 100,1000,10000 --output bench.json
+    python benchmarks/job_throughput.py --output after.json --compare bench.json
+
+Recorded per scenario:
+- itemsPerSec: items / wall time of the job coroutine
+- itemOverheadMs p50/p99: time from the stub returning an item's result until the DB commit
+  that persists it
+- dbCommits / dbStatements: session commits and SQL statements issued by the job
+- peakRssMb: peak resident set size of the scenario process
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+SCENARIOS = ("execute_validation", "evaluate_validation", "execute_generic", "evaluate_generic")
+DEFAULT_SIZES = (100, 1000, 10000)
+RESULT_FORMAT_VERSION = 1
+
+_JUDGE_RESULT = {
+    "intent_verdict": "GOOD",
+    "intent": 4,
+    "accuracy": 4,
+    "consistency": 5,
+    "latencySingle": 4,
+    "latencyMulti": 4,
+    "stability": 5,
+    "reasoning": "bench",
+}
+
+
+def _percentile(values: list[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return round(ordered[index], 3)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class _Recorder:
+    """Counts commits/statements and pairs stub returns with the commit that persisted them."""
+
+    def __init__(self) -> None:
+        self.commit_times: list[float] = []
+        self.statements = 0
+        self.stub_returns: list[float] = []
+
+    def on_commit(self, _session) -> None:
+        self.commit_times.append(time.perf_counter())
+
+    def on_statement(self, *_args) -> None:
+        self.statements += 1
+
+    def overheads_ms(self) -> list[float]:
+        commits = sorted(self.commit_times)
+        values: list[float] = []
+        for returned_at in self.stub_returns:
+            index = bisect.bisect_left(commits, returned_at)
+            if index < len(commits):
+                values.append((commits[index] - returned_at) * 1000.0)
+        return values
+
+
+def _seed_validation_run(items: int, *, executed: bool) -> str:
+    from app.core.db import SessionLocal
+    from app.core.enums import Environment
+    from app.repositories.validation_runs import ValidationRunRepository
+
+    db = SessionLocal()
+    try:
+        repo = ValidationRunRepository(db)
+        run = repo.create_run(
+            environment=Environment.DEV,
+            agent_id="ORCHESTRATOR_ASSISTANT",
+            test_model="bench",
+            eval_model="bench",
+            repeat_in_conversation=1,
+            conversation_room_count=1,
+            agent_parallel_calls=3,
+            timeout_ms=60000,
+        )
+        item_ids = repo.add_items(
+            run.id,
+            [
+                {
+                    "ordinal": index,
+                    "query_id": f"bench-q-{index % 50}",
+                    "query_text_snapshot": f"bench query {index}",
+                    "expected_result_snapshot": "지원자 목록이 조회되어야 함",
+                }
+                for index in range(1, items + 1)
+            ],
+        )
+        if executed:
+            raw_json = json.dumps(
+                {"assistantMessage": "[mock] ok", "dataUIList": [], "responseTimeSec": 1.2, "error": ""},
+                ensure_ascii=False,
+            )
+            for item_id in item_ids:
+                repo.update_item_execution(
+                    item_id, conversation_id="bench", raw_response="[mock] ok", latency_ms=1200, error="", raw_json=raw_json
+                )
+        db.commit()
+        return str(run.id)
+    finally:
+        db.close()
+
+
+def _seed_generic_run(items: int, *, executed: bool) -> str:
+    from app.core.db import SessionLocal
+    from app.core.enums import Environment
+    from app.models.generic_run_row import GenericRunRow
+    from app.repositories.generic_runs import GenericRunRepository
+
+    db = SessionLocal()
+    try:
+        repo = GenericRunRepository(db)
+        run = repo.create_run(Environment.DEV, {})
+        repo.add_rows(
+            run.id,
+            [
+                {
+                    "ID": f"Q-{index}",
+                    "질의": f"bench query {index}",
+                    "LLM 평가기준": "지원자 목록을 정확히 보여줘야 함",
+                    "검증 필드": "assistantMessage",
+                    "기대값": "[mock]",
+                }
+                for index in range(1, items + 1)
+            ],
+        )
+        db.flush()
+        if executed:
+            raw_json = json.dumps({"assistantMessage": "[mock] ok", "dataUIList": []}, ensure_ascii=False)
+            for row in db.query(GenericRunRow).filter(GenericRunRow.run_id == run.id):
+                row.raw_json = raw_json
+                row.response_text = "[mock] ok"
+        db.commit()
+        return str(run.id)
+    finally:
+        db.close()
+
+
+async def _run_job(scenario: str, run_id: str, base_url: str, parallel: int) -> None:
+    ats = dict(origin=base_url, referer=base_url, bearer="bench", cms="bench", mrs="bench")
+    if scenario == "execute_validation":
+        from app.jobs.validation_execute_job import execute_validation_run
+
+        await execute_validation_run(
+            run_id=run_id,
+            base_url=base_url,
+            default_context=None,
+            run_default_target_assistant=None,
+            max_parallel=parallel,
+            timeout_ms=60000,
+            **ats,
+        )
+    elif scenario == "evaluate_validation":
+        from app.jobs.validation_evaluate_job import evaluate_validation_run
+
+        await evaluate_validation_run(run_id, "bench", "bench-model", max_chars=15000, max_parallel=parallel)
+    elif scenario == "execute_generic":
+        from app.jobs.generic_execute_job import execute_generic_run
+
+        await execute_generic_run(
+            run_id=run_id, base_url=base_url, context=None, target_assistant=None, max_parallel=parallel, **ats
+        )
+    elif scenario == "evaluate_generic":
+        from app.jobs.generic_evaluate_job import evaluate_generic_run
+
+        await evaluate_generic_run(run_id, "bench", "bench-model", max_chars=15000, max_parallel=parallel)
+    else:
+        raise ValueError(f"unknown scenario: {scenario}")
+
+
+def run_scenario(
+    scenario: str,
+    items: int,
+    *,
+    parallel: int = 10,
+    ats_time_scale: float = 0.0,
+    judge_latency_ms: float = 0.0,
+) -> dict[str, Any]:
+    """Seeds one run in the current DB, executes the job and returns its measurements."""
+    from sqlalchemy import event
+
+    from app.adapters.agent_client_adapter import AgentClientAdapter
+    from app.adapters.openai_judge_adapter import OpenAIJudgeAdapter
+    from app.core.db import _ENGINE, SessionLocal
+    from app.testing.mock_ats import LatencyDistribution, MockAtsConfig, MockAtsServer
+
+    if scenario not in SCENARIOS:
+        raise ValueError(f"unknown scenario: {scenario}")
+    evaluate = scenario.startswith("evaluate_")
+    if scenario.endswith("_validation"):
+        run_id = _seed_validation_run(items, executed=evaluate)
+    else:
+        run_id = _seed_generic_run(items, executed=evaluate)
+
+    recorder = _Recorder()
+    original_sync = AgentClientAdapter.test_orchestrator_sync
+    original_judge = OpenAIJudgeAdapter.judge
+
+    async def timed_sync(self, *args, **kwargs):
+        result = await original_sync(self, *args, **kwargs)
+        recorder.stub_returns.append(time.perf_counter())
+        return result
+
+    async def stub_judge(self, session, api_key, model, prompt, **_kwargs):
+        if judge_latency_ms > 0:
+            await asyncio.sleep(judge_latency_ms / 1000.0)
+        recorder.stub_returns.append(time.perf_counter())
+        return dict(_JUDGE_RESULT), {"input_tokens": len(prompt) // 4, "output_tokens": 60}, ""
+
+    async def _main() -> float:
+        config = MockAtsConfig(seed=7, worker_latency=LatencyDistribution("fixed", 200.0), time_scale=ats_time_scale)
+        async with MockAtsServer(config) as server:
+            started = time.perf_counter()
+            await _run_job(scenario, run_id, server.base_url, parallel)
+            return time.perf_counter() - started
+
+    AgentClientAdapter.test_orchestrator_sync = timed_sync
+    OpenAIJudgeAdapter.judge = stub_judge
+    event.listen(SessionLocal, "after_commit", recorder.on_commit)
+    event.listen(_ENGINE, "before_cursor_execute", recorder.on_statement)
+    try:
+        wall_sec = asyncio.run(_main())
+    finally:
+        event.remove(_ENGINE, "before_cursor_execute", recorder.on_statement)
+        event.remove(SessionLocal, "after_commit", recorder.on_commit)
+        AgentClientAdapter.test_orchestrator_sync = original_sync
+        OpenAIJudgeAdapter.judge = original_judge
+
+    overheads = recorder.overheads_ms()
+    return {
+        "scenario": scenario,
+        "items": items,
+        "parallel": parallel,
+        "wallSec": round(wall_sec, 3),
+        "itemsPerSec": round(items / wall_sec, 1) if wall_sec > 0 else None,
+        "stubCalls": len(recorder.stub_returns),
+        "itemOverheadMs": {"p50": _percentile(overheads, 0.50), "p99": _percentile(overheads, 0.99)},
+        "dbCommits": len(recorder.commit_times),
+        "dbStatements": recorder.statements,
+        "peakRssMb": _peak_rss_mb(),
+    }
+
+
+def _run_child(args: argparse.Namespace) -> None:
+    # The DB path must be fixed before app.core.db is imported.
+    os.environ["BACKOFFICE_DB_PATH"] = args.db_path
+    from app.core.db import Base, _ENGINE, assert_safe_db_reset
+    from app.main import app as _app  # noqa: F401  # Ensure all ORM models are registered.
+
+    os.environ["BACKOFFICE_ALLOW_DB_RESET"] = "1"
+    assert_safe_db_reset()
+    Base.metadata.drop_all(_ENGINE)
+    Base.metadata.create_all(_ENGINE)
+    result = run_scenario(
+        args.scenario,
+        args.items,
+        parallel=args.parallel,
+        ats_time_scale=args.ats_time_scale,
+        judge_latency_ms=args.judge_latency_ms,
+    )
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def _git_commit() -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return completed.stdout.strip() if completed.returncode == 0 else ""
+
+
+def _spawn(scenario: str, items: int, args: argparse.Namespace, workdir: str) -> dict[str, Any]:
+    db_path = os.path.join(workdir, f"bench_{scenario}_{items}_test.db")
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--child",
+        "--scenario", scenario,
+        "--items", str(items),
+        "--parallel", str(args.parallel),
+        "--ats-time-scale", str(args.ats_time_scale),
+        "--judge-latency-ms", str(args.judge_latency_ms),
+        "--db-path", db_path,
+    ]
+    completed = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise SystemExit(f"[error] {scenario}/{items} failed:\n{completed.stderr[-4000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any], max_regression: float) -> list[str]:
+    """Returns regression messages where items/sec dropped by more than ``max_regression``."""
+    previous = {(row["scenario"], row["items"]): row for row in baseline.get("results", [])}
+    regressions: list[str] = []
+    for row in current.get("results", []):
+        before = previous.get((row["scenario"], row["items"]))
+        if not before or not before.get("itemsPerSec") or not row.get("itemsPerSec"):
+            continue
+        change = row["itemsPerSec"] / before["itemsPerSec"] - 1.0
+        print(
+            f"{row['scenario']:<20} {row['items']:>6}  items/s {before['itemsPerSec']:>9} -> {row['itemsPerSec']:>9}"
+            f" ({change:+.1%})  p99 {before['itemOverheadMs']['p99']} -> {row['itemOverheadMs']['p99']} ms"
+            f"  commits {before['dbCommits']} -> {row['dbCommits']}  rss {before['peakRssMb']} -> {row['peakRssMb']} MB"
+        )
+        if change < -max_regression:
+            regressions.append(f"{row['scenario']}/{row['items']}: items/sec {change:+.1%}")
+    return regressions
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Throughput benchmark for execute/evaluate jobs against local stubs.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument("--parallel", type=int, default=10)
+    parser.add_argument("--ats-time-scale", type=float, default=0.0, help="Mock ATS delay multiplier (0 = no waiting).")
+    parser.add_argument("--judge-latency-ms", type=float, default=0.0)
+    parser.add_argument("--output", default="", help="Write results JSON here (default: stdout).")
+    parser.add_argument("--compare", default="", help="Baseline results JSON to compare against.")
+    parser.add_argument("--max-regression", type=float, default=0.15, help="Allowed items/sec drop before exit code 1.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--scenario", default="", help=argparse.SUPPRESS)
+    parser.add_argument("--items", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--db-path", default="", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.child:
+        _run_child(args)
+        return
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="aqb_bench_") as workdir:
+        for scenario in scenarios:
+            for items in sizes:
+                row = _spawn(scenario, items, args, workdir)
+                print(
+                    f"[bench] {scenario}/{items}: {row['itemsPerSec']} items/s, "
+                    f"p99 overhead {row['itemOverheadMs']['p99']} ms, {row['dbCommits']} commits",
+                    file=sys.stderr,
+                )
+                results.append(row)
+
+    report = {
+        "formatVersion": RESULT_FORMAT_VERSION,
+        "gitCommit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {
+            "parallel": args.parallel,
+            "atsTimeScale": args.ats_time_scale,
+            "judgeLatencyMs": args.judge_latency_ms,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_results(baseline, report, args.max_regression)
+        if regressions:
+            raise SystemExit("[regression] " + "; ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
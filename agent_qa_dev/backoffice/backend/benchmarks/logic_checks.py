@@ -0,0 +1,106 @@
+"""
+Logic-check benchmark: ``run_logic_check`` row by row vs. the batch ``run_logic_checks``.
+
+Rows mimic a generic run: a handful of field paths shared by many rows, Korean values, some
+rows without criteria and a few unparsable payloads. Results are asserted equal before timings
+are reported.
+
+    python benchmarks/logic_checks.py
+    python benchmarks/logic_checks.py --rows 50000 --repeat 3 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services import logic_check  # noqa: E402
+from app.services.logic_check import run_logic_check, run_logic_checks  # noqa: E402
+
+_FIELD_PATHS = [
+    ("data.applicants[0].name", "김"),
+    ("data.applicants[1].status", "합격"),
+    ("data.summary.total", "12"),
+    ("assistantMessage", "지원자"),
+    ("data.filters", "서울"),
+]
+
+
+def build_rows(count: int, rng: random.Random) -> list[tuple[str, str, str]]:
+    rows = []
+    for _ in range(count):
+        payload = {
+            "assistantMessage": f"조건에 맞는 지원자는 {rng.randint(0, 300)}명입니다.",
+            "data": {
+                "applicants": [
+                    {"name": rng.choice(["김철수", "이영희", "박민수"]), "status": rng.choice(["합격", "보류", "불합격"])}
+                    for _ in range(rng.randint(1, 6))
+                ],
+                "summary": {"total": rng.choice([12, 7, 120]), "page": 1},
+                "filters": rng.sample(["서울", "경력 3년", "백엔드", "Java"], 2),
+            },
+        }
+        raw = json.dumps(payload, ensure_ascii=False) if rng.random() > 0.02 else "{broken"
+        field_path, expected = rng.choice(_FIELD_PATHS) if rng.random() > 0.1 else ("", "")
+        rows.append((raw, field_path, expected))
+    return rows
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _row_by_row(rows: list[tuple[str, str, str]]) -> list[str]:
+    return [run_logic_check(raw, path, value) if path and value else "" for raw, path, value in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Row-by-row vs batch logic checks.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="also time run_logic_checks with N processes")
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows, random.Random(23))
+    legacy_sec, expected = _best_of(lambda: _row_by_row(rows), args.repeat)
+    batch_sec, actual = _best_of(lambda: run_logic_checks(rows), args.repeat)
+    assert actual == expected
+
+    print(f"rows={args.rows} orjson={'yes' if logic_check.orjson is not None else 'no'}")
+    print(f"{'mode':>22} {'total(ms)':>10} {'us/row':>9}")
+    print(f"{'row by row':>22} {legacy_sec * 1000:>10.1f} {legacy_sec / args.rows * 1e6:>9.1f}")
+    print(f"{'batch':>22} {batch_sec * 1000:>10.1f} {batch_sec / args.rows * 1e6:>9.1f}")
+
+    if logic_check.orjson is not None:
+        saved, logic_check.orjson = logic_check.orjson, None
+        try:
+            stdlib_sec, stdlib = _best_of(lambda: run_logic_checks(rows), args.repeat)
+        finally:
+            logic_check.orjson = saved
+        assert stdlib == expected
+        print(f"{'batch (json module)':>22} {stdlib_sec * 1000:>10.1f} {stdlib_sec / args.rows * 1e6:>9.1f}")
+    print(f"speedup {legacy_sec / batch_sec:.1f}x")
+
+    if args.workers >= 2:
+        pool_sec, pooled = _best_of(lambda: run_logic_checks(rows, workers=args.workers, min_rows=1), 1)
+        assert pooled == expected
+        print(f"{f'batch x{args.workers} processes':>22} {pool_sec * 1000:>10.1f} {pool_sec / args.rows * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
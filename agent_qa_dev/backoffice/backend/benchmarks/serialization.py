@@ -0,0 +1,128 @@
+"""
+JSON hot-path benchmark: the json module (previous call sites) vs. app.core.serialization.
+
+Payloads follow the job hot paths: an agent result dumped to ``raw_json`` in the execute jobs,
+the canonical (sorted-key) evaluation input in the evaluate job, ``metricScores`` parsed by the
+dashboards and a run-items page rendered as an API response. Decoded results are asserted equal
+before timings are reported.
+
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --items 20000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core import serialization  # noqa: E402
+
+
+def build_agent_result(rng: random.Random) -> dict[str, Any]:
+    return {
+        "assistantMessage": f"조건에 맞는 지원자는 {rng.randint(0, 300)}명입니다. " * rng.randint(1, 4),
+        "dataUIList": [
+            {
+                "uiValue": {
+                    "formType": rng.choice(["APPLICANT_FILTER", "CHART"]),
+                    "value": {"dataKey": "applicant.list", "count": rng.randint(0, 50)},
+                    "filters": [{"name": rng.choice(["경력", "지역", "학력"]), "selected": True} for _ in range(4)],
+                }
+            }
+            for _ in range(rng.randint(1, 4))
+        ],
+        "guideList": ["다음 단계로 이동하세요"],
+        "executionProcesses": [{"messageSummary": f"step {i}", "ms": rng.uniform(5, 900)} for i in range(6)],
+        "worker": ["planner", "search", "writer"],
+        "workerMsMap": {"planner": rng.uniform(10, 500), "search": rng.uniform(10, 900)},
+        "conversationId": f"conv-{rng.randint(0, 10**9)}",
+        "responseTimeSec": rng.uniform(0.5, 12),
+        "error": "",
+    }
+
+
+def build_metric_scores(rng: random.Random) -> str:
+    keys = ("intent", "accuracy", "consistency", "latencySingle", "latencyMulti", "stability")
+    return json.dumps({key: round(rng.uniform(0, 5), 2) for key in keys})
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="json module vs app.core.serialization on hot-path payloads.")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(29)
+    results = [build_agent_result(rng) for _ in range(args.items)]
+    raw_texts = [json.dumps(result, ensure_ascii=False) for result in results]
+    metric_texts = [build_metric_scores(rng) for _ in range(args.items)]
+    page = {"items": [{"id": f"item-{i}", "rawPayload": results[i]} for i in range(min(500, args.items))]}
+
+    cases = [
+        (
+            "raw_json dumps",
+            lambda: [json.dumps(r, ensure_ascii=False, default=str) for r in results],
+            lambda: [serialization.dumps(r) for r in results],
+            lambda out: [json.loads(text) for text in out],
+        ),
+        (
+            "canonical dumps",
+            lambda: [
+                json.dumps(r, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str) for r in results
+            ],
+            lambda: [serialization.dumps(r, sort_keys=True) for r in results],
+            lambda out: [json.loads(text) for text in out],
+        ),
+        (
+            "raw_json loads",
+            lambda: [json.loads(text) for text in raw_texts],
+            lambda: [serialization.loads(text) for text in raw_texts],
+            lambda out: out,
+        ),
+        (
+            "metricScores loads",
+            lambda: [json.loads(text) for text in metric_texts],
+            lambda: [serialization.loads(text) for text in metric_texts],
+            lambda out: out,
+        ),
+        (
+            "response x500 items",
+            lambda: [
+                json.dumps(page, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+                for _ in range(20)
+            ],
+            lambda: [serialization.dumps_bytes(page) for _ in range(20)],
+            lambda out: [json.loads(body) for body in out],
+        ),
+    ]
+
+    print(f"items={args.items} backend={serialization.JSON_BACKEND}")
+    print(f"{'path':>20} {'json(ms)':>10} {'new(ms)':>10} {'speedup':>8}")
+    for name, before, after, decode in cases:
+        before_sec, before_out = _best_of(before, args.repeat)
+        after_sec, after_out = _best_of(after, args.repeat)
+        assert decode(after_out) == decode(before_out), name
+        print(f"{name:>20} {before_sec * 1000:>10.1f} {after_sec * 1000:>10.1f} {before_sec / after_sec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.testing.mock_ats import DEFAULT_WORKERS, LatencyDistribution, MockAtsConfig, MockAtsServer
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local stand-in for the ATS orchestrator (sync, query, chat-room SSE).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", default=",".join(DEFAULT_WORKERS), help="Comma separated worker types in call order.")
+    parser.add_argument("--worker-latency", default="lognormal:400,2500", help="fixed:MS | uniform:LOW-HIGH | lognormal:MEDIAN,P99")
+    parser.add_argument(
+        "--worker-latency-for",
+        action="append",
+        default=[],
+        metavar="TYPE=SPEC",
+        help="Per worker type latency, e.g. RESUME_WORKER_V3=lognormal:1200,6000",
+    )
+    parser.add_argument("--query-latency", default="fixed:30")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-sec", type=float, default=300.0)
+    parser.add_argument("--heartbeat-interval-sec", type=float, default=5.0)
+    parser.add_argument("--heartbeat-stall-rate", type=float, default=0.0)
+    parser.add_argument("--sse-drop-rate", type=float, default=0.0)
+    parser.add_argument("--ui-rows", type=int, default=3)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    return parser.parse_args()
+
+
+def _build_config(args: argparse.Namespace) -> MockAtsConfig:
+    by_type = {}
+    for raw in args.worker_latency_for:
+        worker_type, _, spec = str(raw).partition("=")
+        if not spec:
+            raise SystemExit(f"--worker-latency-for expects TYPE=SPEC: {raw}")
+        by_type[worker_type.strip()] = LatencyDistribution.parse(spec)
+    return MockAtsConfig(
+        seed=args.seed,
+        workers=tuple(w.strip() for w in str(args.workers).split(",") if w.strip()),
+        worker_latency=LatencyDistribution.parse(args.worker_latency),
+        worker_latency_by_type=by_type,
+        query_latency=LatencyDistribution.parse(args.query_latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        hang_rate=args.hang_rate,
+        hang_sec=args.hang_sec,
+        heartbeat_interval_sec=args.heartbeat_interval_sec,
+        heartbeat_stall_rate=args.heartbeat_stall_rate,
+        sse_drop_rate=args.sse_drop_rate,
+        ui_rows=args.ui_rows,
+        time_scale=args.time_scale,
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    async with MockAtsServer(_build_config(args), host=args.host, port=args.port) as server:
+        print(f"Mock ATS listening on {server.base_url} (stats: {server.base_url}/__mock/stats)")
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
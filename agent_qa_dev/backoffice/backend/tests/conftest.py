@@ -11,6 +11,9 @@ os.environ.setdefault(
 )
 
 from app.core.db import Base, _ENGINE, assert_safe_db_reset
+from app.core.run_events import run_events
+from app.core.singleflight import derived_results
+from app.lib.aqb_orchestrator_client import reset_circuit_breakers
 
 
 @pytest.fixture(autouse=True)
@@ -18,4 +21,7 @@ def reset_db():
     assert_safe_db_reset()
     Base.metadata.drop_all(_ENGINE)
     Base.metadata.create_all(_ENGINE)
+    derived_results.clear()
+    run_events.clear()
+    reset_circuit_breakers()
     yield
@@ -49,7 +49,7 @@ def test_acceptance_template_and_direct_query_flow(monkeypatch):
     monkeypatch.setattr(
         generic_routes.runner,
         'run',
-        lambda job_id, job_coro_factory: generic_routes.runner.jobs.update({job_id: 'DONE'}),
+        lambda job_id, job_coro_factory, **kwargs: generic_routes.runner.jobs.update({job_id: 'DONE'}),
     )
 
     direct_resp = client.post(
@@ -0,0 +1,118 @@
+import json
+import random
+
+from app.services.validation_scoring import (
+    _contains,
+    _equals,
+    _in,
+    _regex,
+    compile_accuracy_checks,
+    evaluate_accuracy_checks,
+    extract_path_values,
+    ratio_to_score,
+)
+
+CHECKS = [
+    {"path": "dataUIList[*].count", "op": "eq", "value": 12},
+    {"path": "assistantMessage", "op": "regex", "value": r"\d+명"},
+    {"path": "setting.filters", "op": "contains", "value": "서울", "weight": 2},
+]
+
+
+def _items(count: int) -> list[tuple[str, list]]:
+    items = []
+    for index in range(count):
+        payload = {
+            "assistantMessage": f"지원자는 {index}명입니다" if index % 3 else "결과 없음",
+            "dataUIList": [{"count": 12 if index % 2 else 7}],
+            "setting": {"filters": ["서울", "경력"] if index % 4 else ["부산"]},
+        }
+        items.append((json.dumps(payload, ensure_ascii=False), CHECKS))
+    items.append(("not json", CHECKS))
+    return items
+
+
+def test_accuracy_checks_score_each_payload():
+    results = [evaluate_accuracy_checks(json.loads(raw) if raw != "not json" else {}, checks) for raw, checks in _items(40)]
+
+    assert results[1]["passRatio"] == 1.0 and results[-1]["passRatio"] == 0.0
+    assert results[0]["failedChecks"]
+
+
+def _interpreted(payload, checks):
+    """Reference: one extract_path_values walk per check, as before compilation."""
+    passed_weight = total_weight = 0.0
+    failed = []
+    valid = [
+        c for c in checks if isinstance(c, dict) and str(c.get("path") or "").strip() and str(c.get("op") or "").strip()
+    ]
+    if not valid:
+        return None
+    for check in valid:
+        op = str(check["op"]).strip().lower()
+        expected = check.get("value")
+        weight = check.get("weight")
+        weight = float(weight) if isinstance(weight, (int, float)) and weight > 0 else 1.0
+        values = extract_path_values(payload, str(check["path"]).strip())
+        total_weight += weight
+        if op == "exists":
+            passed = any(v is not None and (str(v or "").strip() != "" or isinstance(v, (dict, list))) for v in values)
+        else:
+            helper = {"eq": _equals, "contains": _contains, "in": _in, "regex": _regex}.get(op)
+            passed = helper is not None and any(helper(v, expected) for v in values)
+        if passed:
+            passed_weight += weight
+        else:
+            failed.append({"path": str(check["path"]).strip(), "op": op, "value": expected})
+    ratio = passed_weight / total_weight
+    return ratio_to_score(ratio), ratio, failed
+
+
+def test_compiled_checks_match_interpreted_walk_on_random_payloads():
+    rng = random.Random(5)
+    paths = [
+        "dataUIList[*].uiValue.formType",
+        "dataUIList[*].uiValue.value.dataKey",
+        "dataUIList[0].uiValue.multiSelectAllowYn",
+        "dataUIList[*].uiValue.tags",
+        "dataUIList.1.count",
+        "assistantMessage",
+        "setting.filters",
+        "setting.filters[*]",
+        "missing.path",
+        ".",
+    ]
+    scalars = ["FORM", "form", "1", 1, 1.0, True, "true", "no", 0, None, "", "서울", ["서울", 1], {"a": 1}]
+    ops = ["eq", "contains", "in", "regex", "exists", "EQ", "bogus"]
+
+    def _value():
+        return rng.choice(scalars + [[rng.choice(scalars[:8]) for _ in range(2)], "(", r"^F\w+"])
+
+    for _ in range(300):
+        payload = {
+            "assistantMessage": rng.choice(["지원자 12명", "", None, "FORM 오류"]),
+            "dataUIList": [
+                {
+                    "count": rng.choice([1, "1", 12]),
+                    "uiValue": {
+                        "formType": rng.choice(scalars),
+                        "tags": [_value(), _value()],
+                        "multiSelectAllowYn": rng.choice(scalars),
+                        "value": {"dataKey": rng.choice(["applicant.list", 1, None])},
+                    },
+                }
+                for _ in range(rng.randint(0, 3))
+            ],
+            "setting": {"filters": rng.choice([["서울", "경력"], "서울,부산", [], None])},
+        }
+        checks = [
+            {
+                "path": rng.choice(paths),
+                "op": rng.choice(ops),
+                "value": _value(),
+                "weight": rng.choice([1, 2.5, 0, -1, None, True]),
+            }
+            for _ in range(rng.randint(1, 8))
+        ]
+        result = compile_accuracy_checks(checks).evaluate(payload)
+        assert (result["score"], result["passRatio"], result["failedChecks"]) == _interpreted(payload, checks)
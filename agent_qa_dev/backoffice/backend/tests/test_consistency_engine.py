@@ -0,0 +1,61 @@
+import pytest
+
+from app.lib.aqb_consistency import SIMILARITY_MINHASH, ConsistencyEngine
+from app.services.validation_scoring import build_consistency_summary
+
+
+def test_consistency_engine_three_run_rubric():
+    engine = ConsistencyEngine(tolerance_pct=1.0)
+
+    assert engine.score(["매출은 1,200원 입니다", "매출은 1,200원 입니다", "매출은 1,200원 입니다"]) == (
+        5,
+        "3회 모두 숫자/결론 일치",
+    )
+    assert engine.score(["매출은 1,000원 입니다", "매출은 1,005원 입니다", "매출은 1,008원 입니다"]) == (
+        4,
+        "3회 결론 일치 + 숫자 허용오차(±1.0%) 이내",
+    )
+    assert engine.score(["매출은 100원 입니다", "매출은 100원 입니다", "완전히 다른 응답 텍스트"]) == (
+        3,
+        "3회 중 2회는 숫자+결론 일치",
+    )
+    assert engine.score(["매출은 1,100원 입니다", "매출은 1,200원 입니다", "매출은 1,300원 입니다"]) == (
+        2,
+        "3회 중 2회 결론은 유사하나 숫자 불일치",
+    )
+    assert engine.score(["하나", "둘"]) == (0, "3회 응답이 없어 일관성 평가 불가")
+
+
+def test_consistency_engine_n_way_and_minhash():
+    texts = ["매출은 100원 입니다"] * 6 + ["전혀 관련 없는 답변 내용"] * 4
+
+    exact = ConsistencyEngine().summarize(texts)
+    minhash = ConsistencyEngine(similarity=SIMILARITY_MINHASH).summarize(texts)
+    lsh = ConsistencyEngine(similarity=SIMILARITY_MINHASH, lsh_min_runs=2).summarize(texts)
+
+    assert exact["runs"] == 10
+    assert (exact["score"], exact["reason"]) == (3, "10회 중 6회는 숫자+결론 일치")
+    assert exact["pairAgreement"] == pytest.approx((15 + 6) / 45, abs=1e-4)
+    assert minhash["score"] == exact["score"] == lsh["score"]
+    with pytest.raises(ValueError):
+        ConsistencyEngine(similarity="bogus")
+
+
+def test_consistency_summary_adds_response_consistency():
+    records = [
+        {"queryKey": "q1", "intentScore": 5, "accuracyScore": 5, "stabilityScore": 5, "responseText": "매출은 100원"},
+        {"queryKey": "q1", "intentScore": 5, "accuracyScore": 5, "stabilityScore": 5, "responseText": "매출은 100원"},
+        {"queryKey": "q2", "intentScore": 1, "accuracyScore": 5, "stabilityScore": 5, "responseText": "매출은 100원"},
+        {"queryKey": "q2", "intentScore": 5, "accuracyScore": 5, "stabilityScore": 5, "responseText": "다른 응답"},
+    ]
+
+    summary = build_consistency_summary(records)
+
+    assert (summary["status"], summary["score"], summary["eligibleQueryCount"], summary["consistentQueryCount"]) == (
+        "READY",
+        2.5,
+        2,
+        1,
+    )
+    assert summary["responseConsistency"] == {"status": "READY", "score": 2.5, "eligibleQueryCount": 2}
+    assert build_consistency_summary([{"queryKey": "q1"}])["responseConsistency"]["status"] == "PENDING"
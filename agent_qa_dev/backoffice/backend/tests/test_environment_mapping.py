@@ -1,5 +1,5 @@
 from app.core.enums import Environment
-from app.core.environment import to_ats_environment
+from app.core.environment import get_env_config, to_ats_environment
 
 
 def test_env_mapping():
@@ -7,3 +7,9 @@ def test_env_mapping():
     assert to_ats_environment(Environment.ST2) == 'QA'
     assert to_ats_environment(Environment.ST) == 'ST'
     assert to_ats_environment(Environment.PR) == 'PR'
+
+
+def test_ats_base_url_can_be_overridden_per_environment(monkeypatch):
+    monkeypatch.setenv("BACKOFFICE_ATS_BASE_URL_DEV", "http://127.0.0.1:8765/")
+    assert get_env_config(Environment.DEV).base_url == "http://127.0.0.1:8765"
+    assert get_env_config(Environment.PR).base_url.startswith("https://")
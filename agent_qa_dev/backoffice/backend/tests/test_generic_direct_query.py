@@ -10,7 +10,7 @@ def test_direct_run_creates_row_and_enqueues_execute(monkeypatch):
     client = TestClient(app)
 
     captured = {}
-    def fake_runner_run(job_id, job_coro_factory):
+    def fake_runner_run(job_id, job_coro_factory, **kwargs):
         captured["job_id"] = job_id
         generic_routes.runner.jobs[job_id] = "RUNNING"
 
@@ -16,7 +16,7 @@ def test_evaluate_endpoint_enqueues_job(monkeypatch):
     )
     run_id = create_resp.json()['runId']
 
-    def fake_run(job_id, job_coro_factory):
+    def fake_run(job_id, job_coro_factory, **kwargs):
         generic_routes.runner.jobs[job_id] = 'DONE'
 
     monkeypatch.setattr(generic_routes.runner, 'run', fake_run)
@@ -0,0 +1,30 @@
+from app.main import app as _app  # noqa: F401  # Ensure all ORM models are registered.
+from benchmarks.job_throughput import SCENARIOS, compare_results, run_scenario
+
+
+def test_benchmark_scenarios_run_against_local_stubs():
+    for scenario in SCENARIOS:
+        result = run_scenario(scenario, 5, parallel=2)
+
+        assert result["scenario"] == scenario
+        assert result["stubCalls"] == 5
+        assert result["itemsPerSec"] > 0
+        assert result["dbCommits"] >= 1
+        assert result["dbStatements"] > 0
+        assert result["itemOverheadMs"]["p50"] is not None
+
+
+def test_compare_results_flags_throughput_regressions():
+    def _report(items_per_sec):
+        row = {
+            "scenario": "execute_validation",
+            "items": 100,
+            "itemsPerSec": items_per_sec,
+            "itemOverheadMs": {"p50": 1.0, "p99": 2.0},
+            "dbCommits": 102,
+            "peakRssMb": 100.0,
+        }
+        return {"results": [row]}
+
+    assert compare_results(_report(200.0), _report(190.0), 0.15) == []
+    assert compare_results(_report(200.0), _report(100.0), 0.15) == ["execute_validation/100: items/sec -50.0%"]
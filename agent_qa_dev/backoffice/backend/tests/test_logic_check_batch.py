@@ -0,0 +1,72 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from app.core.db import SessionLocal
+from app.core.enums import Environment
+from app.jobs.generic_evaluate_job import evaluate_generic_run
+from app.models.generic_run import GenericRun
+from app.models.generic_run_row import GenericRunRow
+from app.services.logic_check import run_logic_check, run_logic_checks, run_logic_checks_async
+
+
+def _rows(count: int) -> list[tuple[str, str, str]]:
+    rng = random.Random(3)
+    raws = [
+        json.dumps({"data": {"items": [{"name": "서울", "count": 12}, {"name": "부산"}]}, "status": "OK"}, ensure_ascii=False),
+        '{"data": {"items": []}, "status": NaN}',
+        '{"data": {"items": [{"count": 123456789012345678901234567890}]}}',
+        '{"data": {"items": [{"name": "\\ud800"}]}}',
+        '{"a": 1, "a": 2}',
+        "null",
+        "not json",
+        "",
+        '"문자열"',
+    ]
+    paths = ["data.items[0].name", "data.items[1]", "data.items[0].count", "status", "a", "data.items[x]", "data", "[0]"]
+    expected = ["서울", "OK", "12", "NaN", "1234", "2", "{", ""]
+    return [(rng.choice(raws), rng.choice(paths + [""]), rng.choice(expected)) for _ in range(count)]
+
+
+def test_batch_logic_checks_match_row_by_row_results():
+    rows = _rows(400)
+    expected = [run_logic_check(raw, path, value) for raw, path, value in rows]
+
+    assert run_logic_checks(rows) == expected
+    assert run_logic_checks(rows, workers=2, min_rows=1) == expected
+    assert asyncio.run(run_logic_checks_async(rows)) == expected
+    assert any(result.startswith("PASS") for result in expected)
+
+
+def test_unclosed_index_path_still_raises_like_row_by_row_check():
+    with pytest.raises(ValueError):
+        run_logic_check('{"a": [1]}', "a[0", "1")
+    with pytest.raises(ValueError):
+        run_logic_checks([('{"a": [1]}', "a[0", "1")])
+    assert run_logic_checks([("null", "a[0", "1")]) == [run_logic_check("null", "a[0", "1")]
+
+
+def test_generic_evaluate_uses_batch_logic_checks():
+    db = SessionLocal()
+    run = GenericRun(environment=Environment.DEV)
+    db.add(run)
+    db.flush()
+    db.add(GenericRunRow(run_id=run.id, ordinal=0, query_id="q0", query="질의", raw_json='{"a": {"b": "서울"}}', field_path="a.b", expected_value="서울"))
+    db.add(GenericRunRow(run_id=run.id, ordinal=1, query_id="q1", query="질의", raw_json='{"a": {}}', field_path="a.b", expected_value="서울"))
+    db.add(GenericRunRow(run_id=run.id, ordinal=2, query_id="q2", query="질의", raw_json="{}"))
+    db.commit()
+    run_id = run.id
+    db.close()
+
+    asyncio.run(evaluate_generic_run(run_id, None, "gpt-5.2", max_chars=1000, max_parallel=1))
+
+    db = SessionLocal()
+    results = [row.logic_result for row in db.query(GenericRunRow).filter(GenericRunRow.run_id == run_id).order_by(GenericRunRow.ordinal)]
+    db.close()
+    assert results == [
+        "PASS: '서울' 포함 확인 (실제값: 서울)",
+        "FAIL: 필드 'a.b' 를 찾을 수 없음",
+        "SKIPPED_NO_CRITERIA",
+    ]
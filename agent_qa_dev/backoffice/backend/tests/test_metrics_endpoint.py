@@ -0,0 +1,77 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.adapters.openai_judge_adapter import OpenAIJudgeAdapter
+from app.core.environment import environment_label
+from app.core.metrics import MetricsRegistry, OPENAI_TOKENS, record_agent_call
+from app.jobs.runner import InMemoryRunner
+from app.main import app
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("demo_latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    registry.gauge("demo_active", "Active.", ("type",), collect=lambda: {("execute",): 2.0})
+
+    requests.inc(route='/a"b')
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5.0, route="/a")
+    text = registry.render()
+
+    assert "# TYPE demo_requests_total counter" in text
+    assert 'demo_requests_total{route="/a\\"b"} 1' in text
+    assert 'demo_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'demo_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'demo_latency_seconds_count{route="/a"} 3' in text
+    assert 'demo_active{type="execute"} 2' in text
+
+
+def test_runner_reports_active_jobs_by_type():
+    async def _scenario():
+        runner = InMemoryRunner()
+        release = asyncio.Event()
+
+        async def _job():
+            await release.wait()
+
+        runner.run("a", _job, job_type="validation_execute")
+        runner.run("b", _job, job_type="validation_execute")
+        runner.run("c", _job, job_type="validation_evaluate")
+        await asyncio.sleep(0)
+        active = runner.active_jobs_by_type()
+        release.set()
+        await asyncio.sleep(0.01)
+        return active, runner.active_jobs_by_type()
+
+    active, after = asyncio.run(_scenario())
+
+    assert active == {"validation_execute": 2, "validation_evaluate": 1}
+    assert after == {}
+
+
+def test_metrics_endpoint_exposes_route_latency_calls_and_tokens(monkeypatch):
+    async def fake_judge_with_retry(session, api_key, model, prompt, **kwargs):
+        return {"score": 5}, {"input_tokens": 120, "output_tokens": 30}, ""
+
+    monkeypatch.setattr("app.adapters.openai_judge_adapter.openai_judge_with_retry", fake_judge_with_retry)
+    before_tokens = OPENAI_TOKENS.value(model="metrics-test-model", direction="input")
+    asyncio.run(OpenAIJudgeAdapter().judge(None, "key", "metrics-test-model", "prompt"))
+    record_agent_call(environment_label("https://custom-ats.example/"), 0.2, "timeout")
+
+    client = TestClient(app)
+    assert client.get("/healthz").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'backoffice_http_request_duration_seconds_count{method="GET",route="/healthz",status="200"}' in body
+    assert 'backoffice_openai_call_duration_seconds_count{model="metrics-test-model"}' in body
+    assert OPENAI_TOKENS.value(model="metrics-test-model", direction="input") == before_tokens + 120
+    assert 'backoffice_agent_call_errors_total{environment="custom-ats.example",kind="timeout"}' in body
+    assert "backoffice_db_statements_total" in body
+    assert "# TYPE backoffice_active_jobs gauge" in body
@@ -0,0 +1,89 @@
+import asyncio
+import random
+
+from app.lib.aqb_agent_client import ApplicantAgentClient
+from app.lib.aqb_orchestrator_client import BACKEND_QUERY_SSE, ERROR_SERVER, ERROR_TIMEOUT
+from app.testing.mock_ats import LatencyDistribution, MockAtsConfig, MockAtsServer
+
+
+def _client(base_url: str) -> ApplicantAgentClient:
+    return ApplicantAgentClient(base_url, "bearer", "cms", "mrs", "origin", "referer", use_shared_circuit_breaker=False)
+
+
+def test_latency_distribution_parses_specs_and_samples_within_bounds():
+    rng = random.Random(3)
+    assert LatencyDistribution.parse("fixed:200").sample_ms(rng) == 200.0
+    uniform = LatencyDistribution.parse("uniform:100-400")
+    assert all(100.0 <= uniform.sample_ms(rng) <= 400.0 for _ in range(100))
+    lognormal = LatencyDistribution.parse("lognormal:300,1500")
+    samples = sorted(lognormal.sample_ms(rng) for _ in range(2000))
+    assert 250.0 < samples[1000] < 350.0
+    assert 1000.0 < samples[1980] < 2200.0
+
+
+def test_sync_endpoint_matches_client_payload_parsing_and_is_reproducible():
+    config = MockAtsConfig(
+        seed=11,
+        workers=("ORCHESTRATOR_WORKER_V3", "RESUME_WORKER_V3"),
+        worker_latency=LatencyDistribution.parse("uniform:100-900"),
+        time_scale=0.0,
+    )
+
+    async def _run():
+        results = []
+        for _ in range(2):
+            async with MockAtsServer(config) as server:
+                client = _client(server.base_url)
+                results.append(await client.test_orchestrator_sync(None, "지원자 보여줘"))
+                await client.aclose()
+        return results
+
+    first, second = asyncio.run(_run())
+
+    assert first["error"] == ""
+    assert first["assistant_message"] == "[mock] 지원자 보여줘"
+    assert set(first["worker_ms_map"]) == {"ORCHESTRATOR_WORKER_V3#0", "RESUME_WORKER_V3#0"}
+    assert first["execution_processes"][0]["messageSummary"] == "ORCHESTRATOR_WORKER_V3 -> RESUME_WORKER_V3"
+    assert first["worker_ms_map"] == second["worker_ms_map"]
+
+
+def test_query_and_sse_stream_deliver_execution_processes_and_assistant():
+    config = MockAtsConfig(seed=1, heartbeat_interval_sec=0.01, time_scale=0.0)
+
+    async def _run():
+        async with MockAtsServer(config) as server:
+            client = _client(server.base_url)
+            turn = await client.call("hello", backend=BACKEND_QUERY_SSE)
+            await client.aclose()
+            return turn, server.stats
+
+    turn, stats = asyncio.run(_run())
+
+    assert turn.error == ""
+    assert turn.conversation_id
+    assert turn.assistant_message == "[mock] hello"
+    assert [row["workerType"] for row in turn.execution_processes] == ["ORCHESTRATOR_WORKER_V3", "RESUME_WORKER_V3"]
+    assert stats["requests"] == {"query": 1, "subscribe": 1}
+
+
+def test_injected_errors_and_heartbeat_stalls_surface_as_client_error_kinds():
+    async def _run():
+        async with MockAtsServer(MockAtsConfig(error_rate=1.0, time_scale=0.0)) as server:
+            client = _client(server.base_url)
+            failed = await client.test_orchestrator_sync(None, "hello")
+            await client.aclose()
+            error_stats = server.stats
+        async with MockAtsServer(MockAtsConfig(heartbeat_stall_rate=1.0, heartbeat_interval_sec=0.05, time_scale=1.0)) as server:
+            client = _client(server.base_url)
+            client.heartbeat_timeout_sec = 0.3
+            stalled = await client.call("hello", backend=BACKEND_QUERY_SSE)
+            await client.aclose()
+        return failed, error_stats, stalled
+
+    failed, error_stats, stalled = asyncio.run(_run())
+
+    assert failed["error_kind"] == ERROR_SERVER
+    assert failed["error"].startswith("HTTP 503")
+    assert error_stats["injected"] == {"error": 1}
+    assert stalled.error_kind == ERROR_TIMEOUT
+    assert stalled.error.startswith("heartbeat timeout")
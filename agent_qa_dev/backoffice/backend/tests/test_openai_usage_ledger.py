@@ -0,0 +1,168 @@
+import asyncio
+import datetime as dt
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.adapters.openai_judge_adapter import OpenAIJudgeAdapter
+from app.lib import aqb_openai_judge
+from app.core.db import SessionLocal
+from app.core.enums import Environment
+from app.jobs.generic_evaluate_job import evaluate_generic_run
+from app.jobs.validation_evaluate_job import evaluate_validation_run
+from app.main import app
+from app.models.generic_run import GenericRun
+from app.models.generic_run_row import GenericRunRow
+from app.services.openai_usage import ModelPrice, OpenAIPriceTable, build_usage_report
+from tests.test_validation_evaluate_job_llm_only import _prepare_run
+
+PRICES = json.dumps({"gpt-5.2": {"input": 2.0, "cachedInput": 0.5, "output": 10.0}})
+
+
+def test_price_table_reads_env_and_matches_dated_models(monkeypatch):
+    monkeypatch.setenv("BACKOFFICE_OPENAI_PRICES", PRICES)
+    monkeypatch.setenv("OPENAI_PRICE_INPUT_PER_1M", "1.0")
+    table = OpenAIPriceTable.from_env()
+
+    assert table.for_model("gpt-5.2-2025-12-11") == ModelPrice(input=2.0, cached_input=0.5, output=10.0)
+    assert table.for_model("gpt-4.1-mini") == ModelPrice(input=1.0)
+    # 600k uncached input + 400k cached input + 100k output
+    assert table.for_model("gpt-5.2").cost_usd(1_000_000, 400_000, 100_000) == pytest.approx(1.2 + 0.2 + 1.0)
+
+
+def test_validation_evaluate_records_ledger_rows_and_usage_report(monkeypatch):
+    monkeypatch.setenv("BACKOFFICE_OPENAI_PRICES", PRICES)
+    run_id, item_ids = _prepare_run(repeat_in_conversation=2)
+    calls: list[int] = []
+
+    async def _fake_judge(self, session, api_key, model, prompt, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            return None, {"input_tokens": 1000, "output_tokens": 0}, "rate limited"
+        return (
+            {"intent": 5.0, "accuracy": 5.0, "reasoning": "ok"},
+            {"input_tokens": 1000, "cached_tokens": 800, "output_tokens": 100, "reasoning_tokens": 40, "total_tokens": 1100},
+            "",
+        )
+
+    monkeypatch.setattr(OpenAIJudgeAdapter, "judge", _fake_judge)
+    asyncio.run(
+        evaluate_validation_run(
+            run_id,
+            openai_key="test-key",
+            openai_model="gpt-5.2",
+            max_chars=5000,
+            max_parallel=1,
+            item_ids=item_ids,
+        )
+    )
+
+    client = TestClient(app)
+    resp = client.get("/api/v1/openai-usage", params={"groupBy": "run", "runId": run_id})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [row["group"] for row in body["rows"]] == [run_id]
+    row = body["rows"][0]
+    assert (row["calls"], row["errorCalls"], row["inputTokens"], row["cachedTokens"]) == (2, 1, 2000, 800)
+    assert (row["outputTokens"], row["reasoningTokens"], row["totalTokens"]) == (100, 40, 2100)
+    assert row["models"] == ["gpt-5.2"]
+    assert row["cachedRatio"] == 0.4
+    # (200 * 2 + 800 * 0.5 + 100 * 10) + (1000 * 2), per 1M tokens
+    assert row["costUsd"] == pytest.approx(0.0038)
+    # 1200 uncached input tokens * (2.0 - 0.5)
+    assert row["maxCacheSavingsUsd"] == pytest.approx(0.0018)
+    assert row["avgLatencyMs"] is not None
+
+    prompt_rows = client.get("/api/v1/openai-usage", params={"groupBy": "promptVersion", "runId": run_id}).json()["rows"]
+    assert len(prompt_rows) == 1 and prompt_rows[0]["group"]
+    day_rows = client.get(
+        "/api/v1/openai-usage",
+        params={"groupBy": "day", "runId": run_id, "dateFrom": dt.date.today().isoformat()},
+    ).json()["rows"]
+    assert [row["calls"] for row in day_rows] == [2]
+    assert client.get("/api/v1/openai-usage", params={"groupBy": "bogus"}).status_code == 400
+    assert client.get("/api/v1/openai-usage", params={"dateFrom": "yesterday"}).status_code == 400
+
+
+def test_generic_evaluate_records_ledger_rows(monkeypatch):
+    db = SessionLocal()
+    run = GenericRun(environment=Environment.DEV)
+    db.add(run)
+    db.flush()
+    for ordinal in range(2):
+        db.add(GenericRunRow(run_id=run.id, ordinal=ordinal, query_id=f"q{ordinal}", query="질의", llm_criteria="정확성"))
+    db.commit()
+    run_id = run.id
+    db.close()
+
+    async def _fake_judge(self, session, api_key, model, prompt, **kwargs):
+        return {"score": 5, "passed": True, "reason": "ok"}, {"input_tokens": 300, "output_tokens": 20}, ""
+
+    monkeypatch.setattr(OpenAIJudgeAdapter, "judge", _fake_judge)
+    asyncio.run(evaluate_generic_run(run_id, "test-key", "gpt-5.2", max_chars=1000, max_parallel=2))
+
+    db = SessionLocal()
+    report = build_usage_report(
+        db,
+        group_by="model",
+        source="generic_evaluate",
+        run_id=run_id,
+        prices=OpenAIPriceTable({}, ModelPrice(input=1.0, output=2.0)),
+    )
+    db.close()
+    assert report["rows"] == [
+        {
+            "group": "gpt-5.2",
+            "calls": 2,
+            "errorCalls": 0,
+            "inputTokens": 600,
+            "cachedTokens": 0,
+            "outputTokens": 40,
+            "reasoningTokens": 0,
+            "totalTokens": 640,
+            "models": ["gpt-5.2"],
+            "costUsd": report["rows"][0]["costUsd"],
+            "maxCacheSavingsUsd": 0.0006,
+            "avgLatencyMs": report["rows"][0]["avgLatencyMs"],
+            "cachedRatio": 0.0,
+        }
+    ]
+    assert report["totals"]["calls"] == 2
+
+
+def test_retried_judge_attempts_are_all_counted_in_the_ledger(monkeypatch):
+    db = SessionLocal()
+    run = GenericRun(environment=Environment.DEV)
+    db.add(run)
+    db.flush()
+    db.add(GenericRunRow(run_id=run.id, ordinal=0, query_id="q0", query="질의", llm_criteria="정확성"))
+    db.commit()
+    run_id = run.id
+    db.close()
+
+    attempts: list[int] = []
+
+    async def _fake_once(session, api_key, model, prompt_text, **kwargs):
+        attempts.append(1)
+        if len(attempts) == 1:
+            return None, {"input_tokens": 300, "output_tokens": 5, "total_tokens": 305}, "OpenAI output is not JSON. raw=..."
+        return {"score": 5, "passed": True, "reason": "ok"}, {"input_tokens": 300, "output_tokens": 20, "total_tokens": 320}, ""
+
+    real_sleep = asyncio.sleep
+
+    async def _no_wait(delay, *args, **kwargs):
+        await real_sleep(0)
+
+    monkeypatch.setattr(aqb_openai_judge, "openai_judge_once", _fake_once)
+    monkeypatch.setattr(aqb_openai_judge.asyncio, "sleep", _no_wait)
+    asyncio.run(evaluate_generic_run(run_id, "test-key", "gpt-5.2", max_chars=1000, max_parallel=1))
+
+    db = SessionLocal()
+    report = build_usage_report(db, group_by="run", source="generic_evaluate", run_id=run_id)
+    db.close()
+    assert len(attempts) == 2
+    totals = report["totals"]
+    # one ledger row for the call, billed for both attempts
+    assert (totals["calls"], totals["errorCalls"]) == (1, 0)
+    assert (totals["inputTokens"], totals["outputTokens"], totals["totalTokens"]) == (600, 25, 625)
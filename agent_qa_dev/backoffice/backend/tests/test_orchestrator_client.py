@@ -0,0 +1,251 @@
+import asyncio
+import random
+
+from app.lib.aqb_agent_client import ApplicantAgentClient
+from app.lib.aqb_orchestrator_client import (
+    BACKEND_QUERY,
+    BACKEND_QUERY_SSE,
+    BACKEND_SYNC,
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    ERROR_AUTH,
+    ERROR_CIRCUIT_OPEN,
+    ERROR_CONNECT,
+    ERROR_DEADLINE,
+    ERROR_SERVER,
+    ERROR_TIMEOUT,
+    AgentTurn,
+    CircuitBreaker,
+    Deadline,
+    OrchestratorClient,
+    RetryBudget,
+    RetryPolicy,
+    classify_http_status,
+    parse_sync_response,
+)
+
+
+def _client(**kwargs) -> ApplicantAgentClient:
+    return ApplicantAgentClient("https://example.test/", "bearer", "cms", "mrs", "origin", "referer", **kwargs)
+
+
+def _fast_policy(max_retries: int = 2) -> RetryPolicy:
+    return RetryPolicy(max_retries=max_retries, base_delay_sec=0.0, max_delay_sec=0.0)
+
+
+def test_parse_sync_response_builds_execution_chain_and_last_assistant_message():
+    turn = parse_sync_response(
+        {
+            "conversationId": "conv-1",
+            "worker": [
+                {"type": "ORCHESTRATOR", "ms": 1200, "output": {"subWorker": "PLAN"}},
+                {"type": "PLAN", "ms": "300.5", "output": {"assistantMessage": "first"}},
+                {"type": "PLAN", "ms": None, "output": {"assistantMessage": "last", "dataUIList": [{"uiValue": {"buttonUrl": "/x"}}]}},
+            ],
+        }
+    )
+
+    assert turn.conversation_id == "conv-1"
+    assert turn.assistant_message == "last"
+    assert turn.button_url == "/x"
+    assert turn.worker_ms_map == {"ORCHESTRATOR#0": 1200.0, "PLAN#0": 300.5, "PLAN#1": 0.0}
+    assert [row["messageSummary"] for row in turn.execution_processes] == ["ORCHESTRATOR -> PLAN", "PLAN", "PLAN"]
+    assert turn.response_time_sec == 1.5005
+    assert {
+        "conversation_id",
+        "assistant_message",
+        "data_ui_list",
+        "guide_list",
+        "execution_processes",
+        "workers",
+        "worker_ms_map",
+        "response_time_sec",
+        "error",
+    } <= set(turn.to_sync_dict())
+
+
+def test_call_retries_with_policy_and_records_metrics(monkeypatch):
+    calls = []
+
+    async def fake_call_sync(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        calls.append(message)
+        failed = len(calls) < 3
+        turn = AgentTurn(
+            BACKEND_SYNC,
+            conversation_id="conv-1",
+            assistant_message="ok",
+            error="HTTP 503: unavailable" if failed else "",
+            error_kind=ERROR_SERVER if failed else "",
+            status=503 if failed else 200,
+        )
+        self.metrics.record(BACKEND_SYNC, 0.01, turn.error)
+        return turn
+
+    monkeypatch.setattr(OrchestratorClient, "call_sync", fake_call_sync)
+    client = _client(retry_policy=_fast_policy())
+
+    result = asyncio.run(client.test_orchestrator_sync(None, "hello", context={"a": 1}))
+
+    assert result["error"] == ""
+    assert result["assistant_message"] == "ok"
+    assert result["attempts"] == 3
+    assert calls == ["hello", "hello", "hello"]
+    assert client.metrics.snapshot()[BACKEND_SYNC]["calls"] == 3
+    assert client.metrics.snapshot()[BACKEND_SYNC]["errors"] == 2
+    assert client.metrics.snapshot()[BACKEND_SYNC]["retries"] == 2
+
+
+def test_default_client_does_not_retry_and_reports_error(monkeypatch):
+    async def fake_call_sync(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        return AgentTurn(BACKEND_SYNC, error="timeout(120s)", error_kind=ERROR_TIMEOUT)
+
+    monkeypatch.setattr(OrchestratorClient, "call_sync", fake_call_sync)
+
+    result = asyncio.run(_client().test_orchestrator_sync(None, "hello"))
+
+    assert result["error"] == "timeout(120s)"
+    assert result["error_kind"] == ERROR_TIMEOUT
+    assert result["conversation_id"] == ""
+
+
+def test_fatal_errors_are_not_retried(monkeypatch):
+    calls = []
+
+    async def fake_call_sync(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        calls.append(message)
+        return AgentTurn(BACKEND_SYNC, error="HTTP 401: expired", error_kind=classify_http_status(401), status=401)
+
+    monkeypatch.setattr(OrchestratorClient, "call_sync", fake_call_sync)
+
+    result = asyncio.run(_client(retry_policy=_fast_policy()).test_orchestrator_sync(None, "hello"))
+
+    assert result["error_kind"] == ERROR_AUTH
+    assert len(calls) == 1
+
+
+def test_non_idempotent_query_only_retries_undelivered_errors(monkeypatch):
+    outcomes = [
+        AgentTurn(BACKEND_QUERY, error="ClientConnectorError: refused", error_kind=ERROR_CONNECT, stage="send"),
+        AgentTurn(BACKEND_QUERY, error="timeout(30s)", error_kind=ERROR_TIMEOUT, stage="send"),
+        AgentTurn(BACKEND_QUERY, conversation_id="conv-1", stage="send"),
+    ]
+    calls = []
+
+    async def fake_post_query(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        calls.append(conversation_id)
+        return outcomes[len(calls) - 1]
+
+    monkeypatch.setattr(OrchestratorClient, "post_query", fake_post_query)
+    client = _client(retry_policy=_fast_policy(max_retries=5))
+
+    turn = asyncio.run(client.call("follow-up", backend=BACKEND_QUERY, conversation_id="conv-1"))
+
+    # A refused connection never reached ATS, but a timeout might have appended the message already.
+    assert calls == ["conv-1", "conv-1"]
+    assert turn.error_kind == ERROR_TIMEOUT
+    assert turn.attempts == 2
+
+
+def test_follow_up_resubscribes_after_sse_failure_without_reposting(monkeypatch):
+    posts = []
+    subscribes = []
+
+    async def fake_post_query(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        posts.append(conversation_id)
+        return AgentTurn(BACKEND_QUERY, conversation_id=conversation_id, status=200, stage="send")
+
+    async def fake_subscribe(self, session, conversation_id, collect_raw_events=False, deadline=None):
+        subscribes.append(conversation_id)
+        if len(subscribes) == 1:
+            return AgentTurn(
+                BACKEND_QUERY_SSE,
+                conversation_id=conversation_id,
+                error="HTTP 503: unavailable",
+                error_kind=classify_http_status(503),
+                status=503,
+                stage="sse",
+            )
+        return AgentTurn(BACKEND_QUERY_SSE, conversation_id=conversation_id, assistant_message="ok", status=200, stage="sse")
+
+    monkeypatch.setattr(OrchestratorClient, "post_query", fake_post_query)
+    monkeypatch.setattr(OrchestratorClient, "subscribe", fake_subscribe)
+    client = _client(retry_policy=_fast_policy(max_retries=3), use_shared_circuit_breaker=False)
+
+    turn = asyncio.run(client.call("follow-up", backend=BACKEND_QUERY_SSE, conversation_id="conv-1"))
+
+    # The 503 came from the SSE GET after the POST succeeded, so the message is posted exactly once.
+    assert posts == ["conv-1"]
+    assert subscribes == ["conv-1", "conv-1"]
+    assert turn.ok and turn.assistant_message == "ok"
+    assert turn.attempts == 2
+    assert AgentTurn(BACKEND_QUERY_SSE, error="HTTP 503", status=503, stage="sse").delivered is True
+    assert AgentTurn(BACKEND_QUERY, error="HTTP 503", status=503, stage="send").delivered is False
+
+
+def test_decorrelated_jitter_stays_within_bounds_and_honours_retry_after():
+    policy = RetryPolicy(max_retries=5, base_delay_sec=1.0, max_delay_sec=8.0, rng=random.Random(7))
+    delay = 0.0
+    for _ in range(50):
+        delay = policy.next_delay(delay)
+        assert 1.0 <= delay <= 8.0
+
+    throttled = AgentTurn(BACKEND_SYNC, error="HTTP 429", error_kind=classify_http_status(429), retry_after_sec=6.0)
+    assert policy.next_delay(0.0, throttled) >= 6.0
+
+
+def test_retry_budget_caps_retries_per_run():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    for _ in range(4):
+        budget.record_request()
+
+    granted = [budget.try_spend() for _ in range(5)]
+
+    assert granted == [True, True, True, False, False]
+    assert budget.snapshot() == {"requests": 4, "retries": 3, "denied": 2}
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    now = [0.0]
+    breaker = CircuitBreaker("https://dv.example", failure_threshold=2, reset_timeout_sec=10.0, clock=lambda: now[0])
+    timeout_turn = AgentTurn(BACKEND_SYNC, error="timeout", error_kind=ERROR_TIMEOUT)
+
+    breaker.record(timeout_turn)
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.record(timeout_turn)
+    assert breaker.state == CIRCUIT_OPEN
+    assert breaker.allow_request() is False
+
+    now[0] = 10.0
+    assert breaker.allow_request() is True
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert breaker.allow_request() is False
+
+    breaker.record(timeout_turn)
+    assert breaker.state == CIRCUIT_OPEN
+    now[0] = 20.0
+    assert breaker.allow_request() is True
+    breaker.record(AgentTurn(BACKEND_SYNC, error="HTTP 400", error_kind=classify_http_status(400)))
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+def test_open_circuit_and_expired_deadline_fail_without_calling(monkeypatch):
+    calls = []
+
+    async def fake_call_sync(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        calls.append(message)
+        return AgentTurn(BACKEND_SYNC, error="timeout", error_kind=ERROR_TIMEOUT)
+
+    monkeypatch.setattr(OrchestratorClient, "call_sync", fake_call_sync)
+    breaker = CircuitBreaker("dv", failure_threshold=1, reset_timeout_sec=60.0)
+    client = _client(retry_policy=_fast_policy(), circuit_breaker=breaker)
+
+    first = asyncio.run(client.call("a"))
+    second = asyncio.run(client.call("b"))
+    expired = asyncio.run(_client(use_shared_circuit_breaker=False).call("c", deadline=Deadline.after(0)))
+
+    assert calls == ["a"]
+    assert first.error_kind == ERROR_TIMEOUT
+    assert second.error_kind == ERROR_CIRCUIT_OPEN
+    assert expired.error_kind == ERROR_DEADLINE
+    assert client.metrics.snapshot()[BACKEND_SYNC]["short_circuits"] == 1
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.adapters.openai_judge_adapter import OpenAIJudgeAdapter
+from app.jobs.validation_evaluate_job import evaluate_validation_run
+from app.lib.aqb_prompt_assembly import (
+    LAYOUT_STATIC_PREFIX,
+    PromptCacheStats,
+    compile_template,
+    get_token_counter,
+    truncate_to_tokens,
+)
+from app.main import app
+from tests.test_validation_evaluate_job_llm_only import _prepare_run
+
+
+def test_compiled_template_matches_replace_and_keeps_static_prefix():
+    template = "## 역할\n평가하세요 {\"json\": 1}\n질의: {query}\n응답: {response_1}\n{unknown}"
+    compiled = compile_template(template, ("query", "response_1"))
+    mapping = {"query": "남성 지원자 수", "response_1": "총 {query}명"}
+
+    assert compiled.render(mapping) == "## 역할\n평가하세요 {\"json\": 1}\n질의: 남성 지원자 수\n응답: 총 {query}명\n{unknown}"
+    assert compiled.static_prefix == "## 역할\n평가하세요 {\"json\": 1}\n질의: "
+    assert compile_template(template, ("query", "response_1")) is compiled
+
+    first = compiled.render(mapping, layout=LAYOUT_STATIC_PREFIX)
+    second = compiled.render({"query": "다른 질의", "response_1": "x"}, layout=LAYOUT_STATIC_PREFIX)
+    assert first.startswith(template) and second.startswith(template)
+    assert first.endswith("{response_1}:\n총 {query}명\n")
+    with pytest.raises(ValueError):
+        compiled.render(mapping, layout="bogus")
+
+
+def test_truncate_to_tokens_respects_budget():
+    counter = get_token_counter()
+    text = "지원자 수는 1,234명입니다. " * 200
+
+    truncated = truncate_to_tokens(text, 50, counter)
+    kept = truncated.split("\n...(truncated,")[0]
+
+    assert counter.count(kept) <= 50
+    assert truncated.endswith(f"{counter.count(text)} tokens total)")
+    assert truncate_to_tokens("짧은 응답", 50, counter) == "짧은 응답"
+    assert truncate_to_tokens(text, None, counter) == text
+
+    stats = PromptCacheStats(prefix_tokens=10)
+    stats.add({"input_tokens": 2000, "cached_tokens": 1536})
+    stats.add({"input_tokens": 2000, "cached_tokens": "0"})
+    stats.add({})
+    assert stats.summary() == {"calls": 2, "inputTokens": 4000, "cachedTokens": 1536, "cachedRatio": 0.384, "prefixTokens": 10}
+
+
+def test_evaluate_job_uses_shared_prefix_token_budget_and_reports_cache_ratio(monkeypatch):
+    run_id, item_ids = _prepare_run(repeat_in_conversation=3)
+    prompts: list[str] = []
+
+    async def _fake_judge(self, session, api_key, model, prompt, **kwargs):
+        prompts.append(prompt)
+        return (
+            {"intent": 5.0, "accuracy": 5.0, "reasoning": "ok"},
+            {"input_tokens": 1000, "cached_tokens": 0 if len(prompts) == 1 else 900},
+            "",
+        )
+
+    monkeypatch.setattr(OpenAIJudgeAdapter, "judge", _fake_judge)
+
+    asyncio.run(
+        evaluate_validation_run(
+            run_id,
+            openai_key="test-key",
+            openai_model="gpt-5.2",
+            max_chars=5000,
+            max_parallel=1,
+            item_ids=item_ids,
+            max_input_tokens=20,
+        )
+    )
+
+    counter = get_token_counter()
+    prefixes = {prompt.split("<evaluation_input_json>\n")[0] for prompt in prompts}
+    bodies = [prompt.split("<evaluation_input_json>\n")[1].split("\n</evaluation_input_json>")[0] for prompt in prompts]
+    assert len(prompts) == 3 and len(prefixes) == 1
+    assert all(counter.count(body) <= 20 for body in bodies)
+
+    profile = TestClient(app).get(f"/api/v1/validation-runs/{run_id}/profile").json()["evaluate"]
+    assert profile["promptCache"]["calls"] == 3
+    assert profile["promptCache"]["cachedRatio"] == 0.6
+    assert profile["promptCache"]["prefixTokens"] > 0
@@ -0,0 +1,74 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.adapters.agent_client_adapter import AgentClientAdapter
+from app.core.tracing import RunProfiler
+from app.main import app
+from tests.test_validation_execute_job import _create_run_with_items, _execute_run
+
+
+def test_run_profiler_aggregates_spans_and_writes_otlp_json_lines(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    profiler = RunProfiler("run-1", "execute", trace_file=str(trace_file))
+
+    for index in range(3):
+        with profiler.span("item", itemId=f"item-{index}"):
+            with profiler.span("db_commit"):
+                pass
+    try:
+        with profiler.span("ats_call"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    summary = profiler.finish()
+
+    assert summary["phase"] == "execute"
+    assert summary["spans"]["item"]["count"] == 3
+    assert summary["spans"]["db_commit"]["count"] == 3
+    assert summary["spans"]["ats_call"]["errors"] == 1
+    assert {"totalMs", "p50Ms", "p95Ms", "p99Ms", "maxMs"} <= set(summary["spans"]["item"])
+
+    records = [json.loads(line) for line in trace_file.read_text(encoding="utf-8").splitlines()]
+    root = records[0]
+    items = {record["spanId"]: record for record in records if record["name"] == "item"}
+    commits = [record for record in records if record["name"] == "db_commit"]
+    assert root["name"] == "execute_run" and root["parentSpanId"] == ""
+    assert {record["traceId"] for record in records} == {summary["traceId"]}
+    assert all(record["parentSpanId"] == root["spanId"] for record in items.values())
+    assert all(record["parentSpanId"] in items for record in commits)
+    assert any({"key": "itemId", "value": {"stringValue": "item-0"}} in record["attributes"] for record in items.values())
+    failed = next(record for record in records if record["name"] == "ats_call")
+    assert failed["status"] == {"code": "STATUS_CODE_ERROR"}
+    assert int(failed["endTimeUnixNano"]) >= int(failed["startTimeUnixNano"])
+
+
+def test_profile_endpoint_returns_execute_breakdown_after_run(monkeypatch):
+    run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=3)
+
+    async def fake_orchestrator_sync(
+        self, session, query, conversation_id=None, context=None, target_assistant=None
+    ):
+        return {
+            "conversation_id": f"conv-{query}",
+            "assistant_message": "ok",
+            "response_time_sec": 0.01,
+            "error": "",
+        }
+
+    monkeypatch.setattr(AgentClientAdapter, "test_orchestrator_sync", fake_orchestrator_sync)
+    client = TestClient(app)
+
+    before = client.get(f"/api/v1/validation-runs/{run_id}/profile")
+    _execute_run(run_id, max_parallel=2)
+    after = client.get(f"/api/v1/validation-runs/{run_id}/profile")
+
+    assert before.status_code == 200
+    assert before.json() == {"runId": run_id, "execute": None, "evaluate": None}
+    payload = after.json()
+    spans = payload["execute"]["spans"]
+    assert payload["evaluate"] is None
+    assert payload["execute"]["wallMs"] > 0
+    for name in ("item", "semaphore_wait", "ats_call", "response_parse", "raw_json_dumps", "db_lock_wait", "db_commit"):
+        assert spans[name]["count"] == 3
+    assert client.get("/api/v1/validation-runs/missing/profile").status_code == 404
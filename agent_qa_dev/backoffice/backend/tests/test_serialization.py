@@ -0,0 +1,73 @@
+import datetime as dt
+import hashlib
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import serialization
+from app.main import app
+
+PAYLOAD = {
+    "assistantMessage": "조건에 맞는 지원자는 12명입니다.",
+    "dataUIList": [{"uiValue": {"formType": "APPLICANT_FILTER", "count": 12, "ratio": 0.25}}],
+    "workerMsMap": {"planner": 120.5, "search": 88},
+    "createdAt": dt.datetime(2026, 1, 2, 3, 4, 5),
+    "tags": ("a", "b"),
+    "wide": 2**70,
+    "error": None,
+}
+
+
+def _reference(value, sort_keys=False):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=str)
+
+
+@pytest.mark.parametrize("backend", ["default", "json"])
+def test_dumps_matches_json_module_and_round_trips(monkeypatch, backend):
+    if backend == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    assert serialization.dumps(PAYLOAD) == _reference(PAYLOAD)
+    assert serialization.dumps(PAYLOAD, sort_keys=True) == _reference(PAYLOAD, sort_keys=True)
+    assert serialization.dumps_bytes(PAYLOAD) == _reference(PAYLOAD).encode("utf-8")
+    # Non-string keys and lone surrogates are left to the json module.
+    assert serialization.dumps({1: "\ud800"}) == _reference({1: "\ud800"})
+
+    assert serialization.loads(serialization.dumps({"a": [1, 2.5, "한글"]})) == {"a": [1, 2.5, "한글"]}
+    assert serialization.loads(b'{"score": 4.5}') == {"score": 4.5}
+    assert serialization.loads('{"score": NaN}')["score"] != 0
+    with pytest.raises(ValueError):
+        serialization.loads("{broken")
+
+
+@pytest.mark.parametrize("backend", ["default", "json"])
+def test_canonical_dumps_hash_does_not_depend_on_backend(monkeypatch, backend):
+    if backend == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    value = {
+        "queryText": "지원자 수",
+        "responseTimeSec": 1e-07,
+        "latencyMs": 12,
+        "rawPayload": {"count": 1e16, "ratio": 0.25, "b": [True, None]},
+        "peerExecutions": [],
+    }
+
+    text = serialization.canonical_dumps(value)
+
+    assert text == (
+        '{"latencyMs":12,"peerExecutions":[],"queryText":"지원자 수",'
+        '"rawPayload":{"b":[true,null],"count":1e+16,"ratio":0.25},"responseTimeSec":1e-07}'
+    )
+    assert hashlib.sha256(text.encode("utf-8")).hexdigest() == (
+        "f72c5ed6769fbb878728c79b12f7d2d82513b6d43d541994f88f906ef0c29b62"
+    )
+
+
+def test_api_responses_render_through_serialization():
+    client = TestClient(app)
+    resp = client.get("/api/v1/openai-usage", params={"groupBy": "model", "runId": "missing-run"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.content == serialization.dumps_bytes(resp.json())
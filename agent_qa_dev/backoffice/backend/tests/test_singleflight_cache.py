@@ -0,0 +1,119 @@
+import datetime as dt
+import threading
+import time
+
+from app.core.data_version import DataVersionRegistry, run_scope
+from app.core.db import SessionLocal
+from app.core.enums import Environment
+from app.core.singleflight import SingleFlightCache
+from app.repositories.validation_runs import ValidationRunRepository
+from app.repositories.validation_test_sets import ValidationTestSetRepository
+from app.services.validation_dashboard import build_test_set_dashboard_cached
+
+
+def test_concurrent_identical_requests_share_one_computation():
+    cache = SingleFlightCache(DataVersionRegistry())
+    calls = []
+    release = threading.Event()
+
+    def _compute():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"value": 42}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", ["run:a"], _compute)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+
+
+def test_bump_invalidates_only_matching_scopes():
+    registry = DataVersionRegistry()
+    cache = SingleFlightCache(registry)
+    counter = {"a": 0, "b": 0}
+
+    def _compute(name):
+        counter[name] += 1
+        return counter[name]
+
+    assert cache.get_or_compute("a", [run_scope("a")], lambda: _compute("a")) == 1
+    assert cache.get_or_compute("b", [run_scope("b")], lambda: _compute("b")) == 1
+    registry.bump([run_scope("a")])
+    assert cache.get_or_compute("a", [run_scope("a")], lambda: _compute("a")) == 2
+    assert cache.get_or_compute("b", [run_scope("b")], lambda: _compute("b")) == 1
+
+
+def test_failed_computation_is_not_cached():
+    cache = SingleFlightCache(DataVersionRegistry())
+
+    def _boom():
+        raise ValueError("boom")
+
+    for _ in range(2):
+        try:
+            cache.get_or_compute("k", ["run:a"], _boom)
+        except ValueError:
+            pass
+    assert len(cache) == 0
+
+
+def test_test_set_dashboard_cache_invalidated_on_committed_item_write():
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    test_set = ValidationTestSetRepository(db).create(name="캐시 테스트세트", description="", config={}, query_ids=[])
+    run = repo.create_run(
+        environment=Environment.DEV,
+        test_set_id=test_set.id,
+        agent_id="ORCHESTRATOR_ASSISTANT",
+        test_model="gpt-5.2",
+        eval_model="gpt-5.2",
+        repeat_in_conversation=1,
+        conversation_room_count=1,
+        agent_parallel_calls=1,
+        timeout_ms=1000,
+    )
+    repo.add_items(run.id, [{"query_text_snapshot": "질의"}])
+    db.commit()
+
+    first = build_test_set_dashboard_cached(db, test_set.id)
+    assert first["executedItems"] == 0
+    assert build_test_set_dashboard_cached(db, test_set.id) is first
+
+    item = repo.list_items(run.id)[0]
+    repo.update_item_execution(
+        item.id,
+        conversation_id="conv",
+        raw_response="ok",
+        latency_ms=10,
+        error="",
+        raw_json="{}",
+        executed_at=dt.datetime.utcnow(),
+    )
+    db.rollback()
+    assert build_test_set_dashboard_cached(db, test_set.id) is first
+
+    repo.update_item_execution(
+        item.id,
+        conversation_id="conv",
+        raw_response="ok",
+        latency_ms=10,
+        error="",
+        raw_json="{}",
+        executed_at=dt.datetime.utcnow(),
+    )
+    db.commit()
+    refreshed = build_test_set_dashboard_cached(db, test_set.id)
+    assert refreshed is not first
+    assert refreshed["executedItems"] == 1
+    db.close()
@@ -10,7 +10,7 @@ from app.repositories.validation_runs import ValidationRunRepository
 
 
 def _make_sync_runner(monkeypatch):
-    def fake_runner_run(job_id, job_coro_factory):
+    def fake_runner_run(job_id, job_coro_factory, **kwargs):
         validation_agents_route.runner.jobs[job_id] = "RUNNING"
         asyncio.run(job_coro_factory())
         validation_agents_route.runner.jobs[job_id] = "DONE"
@@ -0,0 +1,100 @@
+from fastapi.testclient import TestClient
+
+from app.core.db import SessionLocal
+from app.core.enums import Environment, RunStatus
+from app.main import app
+from app.repositories.validation_queries import ValidationQueryRepository
+from app.repositories.validation_query_groups import ValidationQueryGroupRepository
+from app.repositories.validation_runs import ValidationRunRepository
+from app.services.validation_compare import compare_validation_runs, compare_validation_runs_significance
+
+
+def _create_scored_run(repo: ValidationRunRepository, queries, scores_by_query: dict[str, list[float]]) -> str:
+    run = repo.create_run(
+        environment=Environment.DEV,
+        agent_id="ORCHESTRATOR_ASSISTANT",
+        test_model="gpt-5.2",
+        eval_model="gpt-5.2",
+        repeat_in_conversation=2,
+        conversation_room_count=2,
+        agent_parallel_calls=1,
+        timeout_ms=1000,
+    )
+    payloads = []
+    for query in queries:
+        for sample_index, _ in enumerate(scores_by_query[query.id]):
+            payloads.append(
+                {
+                    "query_id": query.id,
+                    "query_text_snapshot": query.query_text,
+                    "conversation_room_index": sample_index // 2 + 1,
+                    "repeat_index": sample_index % 2 + 1,
+                }
+            )
+    repo.add_items(run.id, payloads)
+    for item in repo.list_items(run.id):
+        score = scores_by_query[item.query_id][(item.conversation_room_index - 1) * 2 + item.repeat_index - 1]
+        repo.upsert_llm_eval(
+            item.id,
+            eval_model="gpt-5.2",
+            metric_scores={"intent": score},
+            total_score=score,
+            llm_comment="ok",
+            status="DONE",
+        )
+    repo.set_status(run.id, RunStatus.DONE)
+    return run.id
+
+
+def test_significance_compare_surfaces_only_real_regressions():
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    group = ValidationQueryGroupRepository(db).create("비교 그룹")
+    query_repo = ValidationQueryRepository(db)
+    noisy = query_repo.create(query_text="노이즈 질의", expected_result="", category="Happy path", group_id=group.id, created_by="t")
+    broken = query_repo.create(query_text="회귀 질의", expected_result="", category="Happy path", group_id=group.id, created_by="t")
+    queries = [noisy, broken]
+
+    base_run_id = _create_scored_run(repo, queries, {noisy.id: [4.0, 4.5, 4.0, 4.5], broken.id: [5.0, 4.75, 5.0, 4.75]})
+    run_id = _create_scored_run(repo, queries, {noisy.id: [4.5, 4.0, 4.5, 4.0], broken.id: [1.0, 1.5, 1.0, 1.25]})
+    db.commit()
+
+    exact = compare_validation_runs(repo, run_id, base_run_id=base_run_id)
+    assert len(exact["changedRows"]) == 8
+
+    result = compare_validation_runs_significance(repo, run_id, base_run_id=base_run_id, resamples=500)
+    assert result["baseRunId"] == base_run_id
+    assert result["delta"]["comparedQueries"] == 2
+    assert [row["queryId"] for row in result["changedRows"]] == [broken.id]
+    row = result["changedRows"][0]
+    assert row["type"] == "REGRESSION"
+    assert row["ciHigh"] < 0
+    assert row["current"]["sampleCount"] == 4
+    assert [entry["groupId"] for entry in result["groupRegressions"]] == [group.id]
+    db.close()
+
+
+def test_compare_endpoint_significance_mode_and_validation():
+    client = TestClient(app)
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    group = ValidationQueryGroupRepository(db).create("비교 API 그룹")
+    query = ValidationQueryRepository(db).create(
+        query_text="질의", expected_result="", category="Happy path", group_id=group.id, created_by="t"
+    )
+    base_run_id = _create_scored_run(repo, [query], {query.id: [3.0, 3.0, 3.5, 3.5]})
+    run_id = _create_scored_run(repo, [query], {query.id: [3.5, 3.5, 3.0, 3.0]})
+    db.commit()
+    db.close()
+
+    resp = client.get(
+        f"/api/v1/validation-runs/{run_id}/compare",
+        params={"baseRunId": base_run_id, "mode": "significance", "resamples": 200},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["mode"] == "significance"
+    assert body["changedRows"] == []
+
+    invalid = client.get(f"/api/v1/validation-runs/{run_id}/compare", params={"mode": "fuzzy"})
+    assert invalid.status_code == 400
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.adapters.openai_judge_adapter import OpenAIJudgeAdapter
+from app.core import serialization
+from app.core.db import SessionLocal
+from app.core.enums import EvalStatus, ItemEvalState
+from app.jobs.validation_evaluate_job import evaluate_validation_run
+from app.main import app
+from app.repositories.validation_runs import ValidationRunRepository
+from tests.test_validation_evaluate_job_llm_only import _prepare_run
+
+JUDGED = {"intent": 4.0, "accuracy": 4.0, "reasoning": "ok"}
+
+
+def _evaluate(run_id: str, **kwargs) -> None:
+    asyncio.run(evaluate_validation_run(run_id, "test-key", "gpt-5.2", max_chars=5000, max_parallel=1, **kwargs))
+
+
+def _states(run_id: str) -> dict[str, tuple[ItemEvalState, int]]:
+    db = SessionLocal()
+    items = ValidationRunRepository(db).list_items(run_id, limit=100)
+    db.close()
+    return {item.id: (item.eval_state, item.eval_attempts) for item in items}
+
+
+def test_repeated_evaluation_only_judges_unfinished_or_changed_items(monkeypatch):
+    run_id, item_ids = _prepare_run(repeat_in_conversation=3)
+    prompts: list[str] = []
+
+    async def _fake_judge(self, session, api_key, model, prompt, **kwargs):
+        prompts.append(prompt)
+        if len(prompts) == 2:
+            return None, {}, "rate limited"
+        return dict(JUDGED), {"input_tokens": 100, "output_tokens": 10}, ""
+
+    monkeypatch.setattr(OpenAIJudgeAdapter, "judge", _fake_judge)
+    _evaluate(run_id)
+    states = _states(run_id)
+    assert len(prompts) == 3
+    assert sorted(states.values()) == [(ItemEvalState.DONE, 1), (ItemEvalState.DONE, 1), (ItemEvalState.FAILED, 1)]
+    failed_id = next(item_id for item_id, (state, _) in states.items() if state == ItemEvalState.FAILED)
+
+    # The rerun retries only the failed item; finished items keep their results without a call.
+    _evaluate(run_id)
+    assert len(prompts) == 4
+    assert _states(run_id)[failed_id] == (ItemEvalState.DONE, 2)
+    _evaluate(run_id)
+    assert len(prompts) == 4
+
+    # A changed input (new expected result) is judged again even though the item is DONE.
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    repo.get_item(item_ids[0]).expected_result_snapshot = "바뀐 기대결과"
+    db.commit()
+    db.close()
+    _evaluate(run_id)
+    assert len(prompts) == 5 and "바뀐 기대결과" in prompts[-1]
+
+    _evaluate(run_id, force=True)
+    assert len(prompts) == 8
+
+    items = TestClient(app).get(f"/api/v1/validation-runs/{run_id}/items").json()["items"]
+    assert {item["evalState"] for item in items} == {"DONE"}
+    assert sorted(item["evalAttempts"] for item in items) == [2, 3, 3]
+
+
+def test_stored_results_are_reused_whether_or_not_orjson_is_installed(monkeypatch):
+    run_id, item_ids = _prepare_run()
+    db = SessionLocal()
+    # Floats that orjson and the json module spell differently (1e16 vs 1e+16).
+    ValidationRunRepository(db).get_item(item_ids[0]).raw_json = '{"assistantMessage":"결과","dataUIList":[{"count":1e16}]}'
+    db.commit()
+    db.close()
+    prompts: list[str] = []
+
+    async def _fake_judge(self, session, api_key, model, prompt, **kwargs):
+        prompts.append(prompt)
+        return dict(JUDGED), {"input_tokens": 100, "output_tokens": 10}, ""
+
+    monkeypatch.setattr(OpenAIJudgeAdapter, "judge", _fake_judge)
+    _evaluate(run_id)
+    assert len(prompts) == 1
+
+    monkeypatch.setattr(serialization, "orjson", None)
+    _evaluate(run_id)
+    assert len(prompts) == 1
+
+
+def test_cancelled_evaluation_releases_in_flight_items_and_resumes(monkeypatch):
+    run_id, item_ids = _prepare_run(repeat_in_conversation=3)
+    calls: list[int] = []
+
+    async def _cancelled_after_first(self, session, api_key, model, prompt, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise asyncio.CancelledError()
+        return dict(JUDGED), {}, ""
+
+    monkeypatch.setattr(OpenAIJudgeAdapter, "judge", _cancelled_after_first)
+    with pytest.raises(asyncio.CancelledError):
+        _evaluate(run_id)
+
+    states = _states(run_id)
+    assert sorted(state for state, _ in states.values()) == [ItemEvalState.DONE, ItemEvalState.PENDING, ItemEvalState.PENDING]
+    db = SessionLocal()
+    assert ValidationRunRepository(db).get_run(run_id).eval_status == EvalStatus.PENDING
+    db.close()
+
+    resumed: list[int] = []
+
+    async def _judge(self, session, api_key, model, prompt, **kwargs):
+        resumed.append(1)
+        return dict(JUDGED), {}, ""
+
+    monkeypatch.setattr(OpenAIJudgeAdapter, "judge", _judge)
+    _evaluate(run_id)
+    assert len(resumed) == 2
+    assert {state for state, _ in _states(run_id).values()} == {ItemEvalState.DONE}
@@ -3,9 +3,19 @@ import json
 import time
 
 from app.adapters.agent_client_adapter import AgentClientAdapter
+from app.core.ats_circuit import (
+    CIRCUIT_FAILURES_ENV,
+    CIRCUIT_RESET_SEC_ENV,
+    GATE_BLOCKED,
+    GATE_PASS,
+    GATE_PROBE,
+    CircuitGate,
+)
 from app.core.db import SessionLocal
 from app.core.enums import Environment, RunStatus
+from app.core.run_events import RUN_EVENT_CIRCUIT, run_events
 from app.jobs.validation_execute_job import execute_validation_run
+from app.lib.aqb_orchestrator_client import BACKEND_SYNC, ERROR_TIMEOUT, AgentTurn, CircuitBreaker, OrchestratorClient
 from app.main import app as _app  # noqa: F401  # Ensure all ORM models are registered.
 from app.repositories.validation_runs import ValidationRunRepository
 
@@ -61,7 +71,7 @@ def _create_run_with_items(
     return run_id
 
 
-def _execute_run(run_id: str, *, max_parallel: int = 3):
+def _execute_run(run_id: str, *, max_parallel: int = 3, timeout_ms: int = 5000):
     asyncio.run(
         execute_validation_run(
             run_id=run_id,
@@ -74,11 +84,24 @@ def _execute_run(run_id: str, *, max_parallel: int = 3):
             default_context=None,
             run_default_target_assistant=None,
             max_parallel=max_parallel,
-            timeout_ms=5000,
+            timeout_ms=timeout_ms,
         )
     )
 
 
+def _record_circuit_events(monkeypatch) -> list[str]:
+    states: list[str] = []
+    publish = run_events.publish
+
+    def recording_publish(run_id, event_type, data=None):
+        if event_type == RUN_EVENT_CIRCUIT:
+            states.append(data["state"])
+        return publish(run_id, event_type, data)
+
+    monkeypatch.setattr(run_events, "publish", recording_publish)
+    return states
+
+
 def test_execute_validation_run_keeps_query_parallel_limit(monkeypatch):
     run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=6)
     state = {
@@ -239,3 +262,101 @@ def test_execute_validation_run_recovers_from_partial_errors(monkeypatch):
     assert failed_item.executed_at is not None
     assert all((item.error or "") == "" for item in success_items)
     assert all(item.executed_at is not None for item in success_items)
+
+
+def test_execute_validation_run_fails_fast_while_environment_circuit_is_open(monkeypatch):
+    monkeypatch.setenv(CIRCUIT_FAILURES_ENV, "1")
+    monkeypatch.setenv(CIRCUIT_RESET_SEC_ENV, "60")
+    run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=4)
+    calls = []
+    states = _record_circuit_events(monkeypatch)
+
+    async def fake_call_sync(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        calls.append(message)
+        return AgentTurn(BACKEND_SYNC, error="timeout(1s)", error_kind=ERROR_TIMEOUT)
+
+    monkeypatch.setattr(OrchestratorClient, "call_sync", fake_call_sync)
+
+    started = time.monotonic()
+    _execute_run(run_id, max_parallel=1, timeout_ms=5000)
+    elapsed = time.monotonic() - started
+
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    run = repo.get_run(run_id)
+    run_items = repo.list_items(run_id, limit=100)
+    db.close()
+
+    assert len(calls) == 1
+    # Blocked items are rejected right away instead of waiting out their call timeout.
+    assert elapsed < 1.0
+    assert run is not None
+    assert run.status == RunStatus.DONE
+    errors = sorted(str(item.error or "") for item in run_items)
+    assert errors[-1] == "timeout(5000ms)"
+    assert all(error.startswith("circuit open: ATS https://example.com unavailable") for error in errors[:-1])
+    assert all(item.executed_at is not None for item in run_items)
+    assert states == ["open"]
+
+
+def test_execute_validation_run_resumes_after_half_open_probe_succeeds(monkeypatch):
+    monkeypatch.setenv(CIRCUIT_FAILURES_ENV, "1")
+    monkeypatch.setenv(CIRCUIT_RESET_SEC_ENV, "0.2")
+    failing_run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=2)
+    resumed_run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=3)
+    calls = []
+    states = _record_circuit_events(monkeypatch)
+
+    async def fake_call_sync(self, session, message, conversation_id=None, context=None, target_assistant=None, deadline=None):
+        calls.append(message)
+        if len(calls) == 1:
+            return AgentTurn(BACKEND_SYNC, error="timeout(1s)", error_kind=ERROR_TIMEOUT)
+        return AgentTurn(BACKEND_SYNC, conversation_id=f"conv-{message}", assistant_message="ok")
+
+    monkeypatch.setattr(OrchestratorClient, "call_sync", fake_call_sync)
+
+    _execute_run(failing_run_id, max_parallel=1, timeout_ms=2000)
+    assert len(calls) == 1
+    time.sleep(0.25)
+    _execute_run(resumed_run_id, max_parallel=1, timeout_ms=2000)
+
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    failed_errors = sorted(str(item.error or "") for item in repo.list_items(failing_run_id, limit=100))
+    resumed_items = repo.list_items(resumed_run_id, limit=100)
+    db.close()
+
+    assert len(calls) == 4
+    assert failed_errors[0].startswith("circuit open: ATS https://example.com unavailable")
+    assert failed_errors[1] == "timeout(2000ms)"
+    assert all(item.raw_response == "ok" and not item.error for item in resumed_items)
+    assert states[0] == "open"
+    assert states[-1] == "closed"
+
+
+def test_circuit_gate_lets_a_single_probe_through_after_cool_down():
+    now = [0.0]
+    breaker = CircuitBreaker("https://example.com", failure_threshold=1, reset_timeout_sec=10.0, clock=lambda: now[0])
+    gate = CircuitGate(breaker)
+    assert gate.acquire() == GATE_PASS
+
+    breaker.record_failure()
+    assert gate.acquire() == GATE_BLOCKED
+
+    # Cool-down over: one probe, everyone else still fails fast until it finishes.
+    now[0] = 10.0
+    probe = gate.acquire()
+    assert probe == GATE_PROBE
+    assert gate.acquire() == GATE_BLOCKED
+    assert breaker.allow_request()
+    breaker.record_failure()
+    gate.release(probe)
+    assert gate.acquire() == GATE_BLOCKED
+
+    now[0] = 20.0
+    probe = gate.acquire()
+    assert probe == GATE_PROBE
+    assert breaker.allow_request()
+    breaker.record_success()
+    gate.release(probe)
+    assert gate.acquire() == GATE_PASS
@@ -129,3 +129,53 @@ def test_validation_run_activity_actor_key_and_run_ids_validation():
         json={"environment": "dev", "actorKey": "actor-1"},
     )
     assert missing_run_ids_resp.status_code == 400
+
+
+def test_validation_run_activity_counter_folds_new_events():
+    client = TestClient(app)
+    params = {"environment": "dev", "actorKey": "actor-1"}
+
+    assert client.get("/api/v1/validation-run-activity", params=params).json()["unreadCount"] == 0
+
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    short_run = _create_run(repo, environment=Environment.DEV, name="짧은 Run")
+    repo.set_status(short_run.id, RunStatus.RUNNING)
+    repo.set_status(short_run.id, RunStatus.DONE)
+    running_run = _create_run(repo, environment=Environment.DEV, name="실행중 Run")
+    repo.set_status(running_run.id, RunStatus.RUNNING)
+    other_env_run = _create_run(repo, environment=Environment.ST2, name="타 환경 Run")
+    repo.set_status(other_env_run.id, RunStatus.RUNNING)
+    short_run_id = short_run.id
+    running_run_id = running_run.id
+    db.commit()
+    db.close()
+
+    data = client.get("/api/v1/validation-run-activity", params=params).json()
+    assert data["unreadCount"] == 2
+    assert {item["runId"] for item in data["items"]} == {short_run_id, running_run_id}
+
+    client.post(
+        "/api/v1/validation-run-activity/read",
+        json={"environment": "dev", "actorKey": "actor-1", "runIds": [running_run_id]},
+    )
+
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    repo.set_status(running_run_id, RunStatus.DONE)
+    repo.set_eval_status(running_run_id, EvalStatus.RUNNING)
+    db.commit()
+    db.close()
+
+    data = client.get("/api/v1/validation-run-activity", params=params).json()
+    assert data["unreadCount"] == 1
+    by_run_id = {item["runId"]: item for item in data["items"]}
+    assert by_run_id[running_run_id]["isRead"] is True
+    assert by_run_id[short_run_id]["isRead"] is False
+
+    other_actor = client.get(
+        "/api/v1/validation-run-activity",
+        params={"environment": "dev", "actorKey": "actor-2"},
+    ).json()
+    assert other_actor["unreadCount"] == 1
+    assert [item["runId"] for item in other_actor["items"]] == [running_run_id]
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.adapters.agent_client_adapter import AgentClientAdapter
+from app.core.run_events import RunEventBus, run_events
+from app.main import app
+from app.services.validation_run_events import stream_run_events
+from tests.test_validation_execute_job import _create_run_with_items, _execute_run
+
+
+def _parse_frames(chunks: list[str]) -> list[dict]:
+    frames = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+        if "data" in fields:
+            frames.append({"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])})
+    return frames
+
+
+async def _collect(stream, count: int) -> list[str]:
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if len(_parse_frames(chunks)) >= count:
+            break
+    await stream.aclose()
+    return chunks
+
+
+def test_execute_job_publishes_item_and_status_events(monkeypatch):
+    run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=2)
+
+    async def fake_orchestrator_sync(
+        self, session, query, conversation_id=None, context=None, target_assistant=None
+    ):
+        return {
+            "conversation_id": f"conv-{query}",
+            "assistant_message": "ok",
+            "response_time_sec": 0.01,
+            "error": "boom" if query.endswith("-2") else "",
+        }
+
+    monkeypatch.setattr(AgentClientAdapter, "test_orchestrator_sync", fake_orchestrator_sync)
+    _execute_run(run_id, max_parallel=2)
+
+    async def _replay():
+        return await _collect(stream_run_events(run_id, last_event_id=0), 4)
+
+    frames = _parse_frames(asyncio.run(_replay()))
+    assert [frame["id"] for frame in frames] == [1, 2, 3, 4]
+    assert frames[0]["event"] == "status"
+    assert frames[0]["data"]["status"] == "RUNNING"
+    assert sorted(frame["event"] for frame in frames[1:3]) == ["item_done", "item_error"]
+    assert frames[3]["data"]["status"] == "DONE"
+
+
+def test_stream_resumes_from_last_event_id_and_delivers_live_events():
+    bus = RunEventBus(history_size=3)
+    for index in range(5):
+        bus.publish("run-1", "item_done", {"itemId": f"item-{index}"})
+
+    async def _scenario():
+        resumed = stream_run_events("run-1", last_event_id=3, bus=bus)
+        first = await resumed.__anext__()
+        replayed = await resumed.__anext__()
+        live_task = asyncio.create_task(_collect(resumed, 2))
+        await asyncio.sleep(0.01)
+        bus.publish("run-1", "status", {"status": "DONE"})
+        live = await live_task
+
+        stale = await _collect(stream_run_events("run-1", last_event_id=1, bus=bus), 1)
+        return first, [replayed], live, stale
+
+    first, replayed, live, stale = asyncio.run(_scenario())
+    assert first.startswith("retry:")
+    assert [frame["data"]["itemId"] for frame in _parse_frames(replayed)] == ["item-3"]
+    assert [frame["id"] for frame in _parse_frames(live)] == [5, 6]
+    assert _parse_frames(live)[1]["data"]["status"] == "DONE"
+    assert _parse_frames(stale)[0]["event"] == "resync"
+
+
+def test_events_endpoint_rejects_unknown_run():
+    client = TestClient(app)
+    assert client.get("/api/v1/validation-runs/missing/events").status_code == 404
+    assert run_events.last_event_id("missing") == 0
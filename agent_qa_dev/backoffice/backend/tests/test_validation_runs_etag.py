@@ -0,0 +1,105 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.db import SessionLocal
+from app.core.enums import Environment
+from app.main import app
+from app.repositories.validation_runs import ValidationRunRepository
+
+
+def _create_run_with_item() -> tuple[str, str]:
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    run = repo.create_run(
+        environment=Environment.DEV,
+        agent_id="ORCHESTRATOR_ASSISTANT",
+        test_model="gpt-5.2",
+        eval_model="gpt-5.2",
+        repeat_in_conversation=1,
+        conversation_room_count=1,
+        agent_parallel_calls=1,
+        timeout_ms=1000,
+    )
+    repo.add_items(
+        run.id,
+        [{"query_text_snapshot": "질의", "conversation_room_index": 1, "repeat_index": 1}],
+    )
+    db.commit()
+    item_id = repo.list_items(run.id)[0].id
+    db.close()
+    return run.id, item_id
+
+
+def _record_response(run_id: str, item_id: str, text: str) -> None:
+    db = SessionLocal()
+    ValidationRunRepository(db).update_item_execution(
+        item_id,
+        conversation_id="conv-1",
+        raw_response=text,
+        latency_ms=10,
+        error="",
+        raw_json="{}",
+    )
+    db.commit()
+    db.close()
+
+
+def test_run_detail_and_items_support_conditional_get():
+    client = TestClient(app)
+    run_id, item_id = _create_run_with_item()
+
+    for path in (f"/api/v1/validation-runs/{run_id}", f"/api/v1/validation-runs/{run_id}/items"):
+        first = client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+
+        cached = client.get(path, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+
+    items_path = f"/api/v1/validation-runs/{run_id}/items"
+    etag = client.get(items_path).headers["etag"]
+    _record_response(run_id, item_id, "응답")
+    refreshed = client.get(items_path, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["items"][0]["rawResponse"] == "응답"
+
+
+def test_run_list_etag_changes_when_rows_change():
+    client = TestClient(app)
+    run_id, item_id = _create_run_with_item()
+
+    first = client.get("/api/v1/validation-runs")
+    etag = first.headers["etag"]
+    assert client.get("/api/v1/validation-runs", headers={"If-None-Match": etag}).status_code == 304
+
+    _record_response(run_id, item_id, "변경")
+    assert client.get("/api/v1/validation-runs", headers={"If-None-Match": etag}).status_code == 200
+
+    _create_run_with_item()
+    assert client.get("/api/v1/validation-runs", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_etag_follows_persisted_data_not_process_state():
+    client = TestClient(app)
+    run_id, item_id = _create_run_with_item()
+    items_path = f"/api/v1/validation-runs/{run_id}/items"
+    etag = client.get(items_path).headers["etag"]
+
+    # A write from another worker process: committed in the database, never seen by this process.
+    db = SessionLocal()
+    db.execute(text("UPDATE validation_run_items SET raw_response = :text WHERE id = :id"), {"text": "다른 워커", "id": item_id})
+    db.commit()
+    db.close()
+
+    refreshed = client.get(items_path, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["items"][0]["rawResponse"] == "다른 워커"
+
+    # Same data gives the same tag again, as it would in a restarted or different worker.
+    new_etag = refreshed.headers["etag"]
+    assert new_etag != etag
+    assert client.get(items_path).headers["etag"] == new_etag
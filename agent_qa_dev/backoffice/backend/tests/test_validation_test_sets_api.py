@@ -152,7 +152,7 @@ def test_validation_run_execute_requires_pending_state(monkeypatch):
     assert run_resp.status_code == 200
     run_id = run_resp.json()["id"]
 
-    def fake_runner_run(job_id, job_coro_factory):
+    def fake_runner_run(job_id, job_coro_factory, **kwargs):
         from app.api.routes import validation_runs as route
 
         route.runner.jobs[job_id] = "DONE"
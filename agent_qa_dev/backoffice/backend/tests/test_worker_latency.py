@@ -0,0 +1,109 @@
+import datetime as dt
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.adapters.agent_client_adapter import AgentClientAdapter
+from app.core.db import SessionLocal
+from app.core.enums import Environment
+from app.main import app
+from app.models.prompt_snapshot import PromptSnapshot
+from app.repositories.validation_runs import ValidationRunRepository
+from app.services.worker_latency import extract_worker_latencies, prompt_version_label
+from tests.test_validation_execute_job import _create_run_with_items, _execute_run
+
+
+def test_extract_worker_latencies_splits_type_and_index():
+    rows = extract_worker_latencies({"ORCHESTRATOR_WORKER_V3#0": 1200, "PLAN#1": "300.5", "BROKEN#x": None, "URL": 5})
+
+    assert sorted(rows) == [("ORCHESTRATOR_WORKER_V3", 0, 1200.0), ("PLAN", 1, 300.5), ("URL", 0, 5.0)]
+    assert extract_worker_latencies(None) == []
+
+
+def test_worker_latency_report_compare_and_backfill(monkeypatch):
+    worker_type = f"LATENCY_TEST_WORKER_{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    db.add(PromptSnapshot(environment=Environment.DEV, worker_type=worker_type, current_prompt="prompt v2"))
+    db.commit()
+    db.close()
+
+    base_run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=4)
+    run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=4)
+    slow = {"value": False}
+
+    async def fake_orchestrator_sync(
+        self, session, query, conversation_id=None, context=None, target_assistant=None
+    ):
+        ordinal = int(str(query).rsplit("-", 1)[-1])
+        return {
+            "conversation_id": f"conv-{query}",
+            "assistant_message": "ok",
+            "response_time_sec": 0.01,
+            "worker_ms_map": {
+                "ORCHESTRATOR_WORKER_V3#0": 100.0,
+                f"{worker_type}#0": ordinal * (300.0 if slow["value"] else 100.0),
+            },
+            "error": "",
+        }
+
+    monkeypatch.setattr(AgentClientAdapter, "test_orchestrator_sync", fake_orchestrator_sync)
+    _execute_run(base_run_id)
+    slow["value"] = True
+    _execute_run(run_id)
+    client = TestClient(app)
+
+    report = client.get(
+        "/api/v1/validation-analytics/worker-latency",
+        params={"groupBy": "promptVersion", "runId": run_id, "workerType": worker_type},
+    ).json()
+    compare = client.get(
+        "/api/v1/validation-analytics/worker-latency/compare",
+        params={"baseRunId": base_run_id, "runId": run_id},
+    ).json()
+
+    assert report["sampleCount"] == 4
+    assert report["rows"] == [
+        {
+            "workerType": worker_type,
+            "group": prompt_version_label("prompt v2"),
+            "count": 4,
+            "avgMs": 750.0,
+            "p50Ms": 900.0,
+            "p95Ms": 1200.0,
+            "p99Ms": 1200.0,
+            "maxMs": 1200.0,
+        }
+    ]
+    assert compare["rows"][0]["workerType"] == worker_type
+    assert compare["rows"][0]["deltaP95Ms"] == 800.0
+    assert compare["rows"][1]["deltaP95Ms"] == 0.0
+    assert client.get("/api/v1/validation-analytics/worker-latency", params={"groupBy": "bogus"}).status_code == 400
+
+    # Items executed before the table existed only have raw_json; backfill re-extracts them.
+    legacy_run_id = _create_run_with_items(room_count=1, repeat_count=1, queries_per_batch=2)
+    db = SessionLocal()
+    repo = ValidationRunRepository(db)
+    for item in repo.list_items(legacy_run_id):
+        repo.update_item_execution(
+            item.id,
+            conversation_id="conv",
+            raw_response="ok",
+            latency_ms=10,
+            error="",
+            raw_json=json.dumps({"worker": [{"type": worker_type, "ms": 40}, {"type": worker_type, "ms": 60}]}),
+            executed_at=dt.datetime.utcnow(),
+        )
+    db.commit()
+    db.close()
+
+    backfill = client.post("/api/v1/validation-analytics/worker-latency/backfill", json={"runId": legacy_run_id})
+    legacy = client.get(
+        "/api/v1/validation-analytics/worker-latency",
+        params={"groupBy": "run", "runId": legacy_run_id, "environment": "dev"},
+    ).json()
+
+    assert backfill.json() == {"runs": 1, "items": 2, "rows": 4}
+    assert legacy["rows"] == [
+        {"workerType": worker_type, "group": legacy_run_id, "count": 4, "avgMs": 50.0, "p50Ms": 60.0, "p95Ms": 60.0, "p99Ms": 60.0, "maxMs": 60.0}
+    ]
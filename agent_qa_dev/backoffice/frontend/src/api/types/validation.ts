@@ -160,6 +160,8 @@ export type ValidationRunUpdateRequest = {
   context?: Record<string, unknown> | null;
 };
 
+export type ValidationItemEvalState = 'PENDING' | 'IN_FLIGHT' | 'DONE' | 'FAILED';
+
 export type ValidationRunItem = {
   id: string;
   runId: string;
@@ -179,6 +181,8 @@ export type ValidationRunItem = {
   error: string;
   rawJson: string;
   executedAt?: string | null;
+  evalState?: ValidationItemEvalState;
+  evalAttempts?: number;
   llmEvaluation?: {
     status: string;
     evalModel: string;
@@ -14,6 +14,7 @@ import type {
   ValidationRunCreateRequest,
   ValidationRunUpdateRequest,
   ValidationRunItem,
+  ValidationItemEvalState,
   ValidationRunExpectedBulkPreviewResult,
   ValidationRunExpectedBulkUpdateResult,
   ValidationSettings,
@@ -227,9 +228,13 @@ export async function executeValidationRun(
 
 export async function evaluateValidationRun(
   runId: string,
-  payload: { openaiModel?: string; maxChars?: number; maxParallel?: number; itemIds?: string[] },
+  payload: { openaiModel?: string; maxChars?: number; maxParallel?: number; itemIds?: string[]; force?: boolean },
 ) {
-  const { data } = await api.post<{ jobId: string; status: string }>(`/validation-runs/${runId}/evaluate`, payload);
+  const { data } = await api.post<{
+    jobId: string;
+    status: string;
+    itemEvalStates?: Record<ValidationItemEvalState, number>;
+  }>(`/validation-runs/${runId}/evaluate`, payload);
   return data;
 }
 